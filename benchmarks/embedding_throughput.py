@@ -0,0 +1,92 @@
+"""
+Embedding throughput of the HuggingFaceEmbedding backends on the same sentence set.
+
+Compares the torch path with ONNX Runtime (float32 and dynamically quantized
+int8) and reports sentences/s plus the cosine similarity of each backend's
+vectors to the torch ones, so accuracy loss from quantization is visible. ONNX
+runs need `pip install sentence-transformers[onnx]`; quantized runs export the
+int8 model next to the weights on first use.
+
+    python benchmarks/embedding_throughput.py --model /models/bge-small-en-v1.5 --device cpu --threads 4
+"""
+
+import argparse
+import json
+import time
+
+import numpy as np
+
+from jmemory.configs.embeddings.base import BaseEmbedderConfig
+from jmemory.embeddings.huggingface import HuggingFaceEmbedding
+
+VARIANTS = {
+    "torch": {"backend": "torch"},
+    "onnx": {"backend": "onnx"},
+    "onnx-int8": {"backend": "onnx", "quantize": True},
+}
+
+SUBJECTS = ["I", "My sister", "The team", "Our landlord", "The new manager", "My doctor"]
+PREDICATES = [
+    "prefers green tea over coffee in the morning",
+    "is moving to Lisbon at the end of the summer",
+    "asked to be reminded about the dentist appointment on Friday",
+    "does not eat shellfish because of an allergy",
+    "is learning to play the cello and practices every evening",
+    "wants the quarterly report to include the churn numbers",
+]
+
+
+def sentences(count):
+    return [
+        f"{SUBJECTS[i % len(SUBJECTS)]} {PREDICATES[(i // len(SUBJECTS)) % len(PREDICATES)]} (note {i})."
+        for i in range(count)
+    ]
+
+
+def run(variant, args, texts):
+    config = BaseEmbedderConfig(model=args.model, num_threads=args.threads, **VARIANTS[variant])
+    embedder = HuggingFaceEmbedding(config, model_kwargs={"device": args.device} if args.device else None)
+    load_start = time.perf_counter()
+    embedder.embed_batch(texts[: args.batch_size])
+    load_s = time.perf_counter() - load_start
+
+    vectors = []
+    start = time.perf_counter()
+    for offset in range(0, len(texts), args.batch_size):
+        vectors.extend(embedder.embed_batch(texts[offset : offset + args.batch_size]))
+    elapsed = time.perf_counter() - start
+    return np.asarray(vectors, dtype=np.float32), {
+        "variant": variant,
+        "load_and_first_batch_s": round(load_s, 2),
+        "sentences_per_s": round(len(texts) / elapsed, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", default="/models/bge-small-en-v1.5")
+    parser.add_argument("--device", default=None, help="Defaults to auto-detection")
+    parser.add_argument("--threads", type=int, default=None)
+    parser.add_argument("--sentences", type=int, default=2000)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--variants", nargs="+", choices=list(VARIANTS), default=list(VARIANTS))
+    args = parser.parse_args()
+
+    texts = sentences(args.sentences)
+    reference = None
+    for variant in args.variants:
+        try:
+            vectors, result = run(variant, args, texts)
+        except Exception as e:
+            print(json.dumps({"variant": variant, "error": str(e)}))
+            continue
+        if reference is None:
+            reference = vectors
+        else:
+            norms = np.linalg.norm(vectors, axis=1) * np.linalg.norm(reference, axis=1) + 1e-12
+            result["mean_cosine_to_first"] = round(float(np.mean(np.sum(vectors * reference, axis=1) / norms)), 4)
+        print(json.dumps(result))
+
+
+if __name__ == "__main__":
+    main()
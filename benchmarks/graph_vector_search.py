@@ -0,0 +1,113 @@
+"""
+Latency of graph entity lookup through the vector index versus a full scan.
+
+Seeds 1k, 10k and 100k entities for a single user into Memgraph and times
+`MemoryGraph._find_similar_nodes` with the `memzero` vector index and with the
+exact scan fallback.
+
+Start Memgraph with `make start` (or `docker-compose up -d memgraph`), then run:
+
+    python benchmarks/graph_vector_search.py --url bolt://localhost:7690
+"""
+
+import argparse
+import json
+import statistics
+import time
+from types import SimpleNamespace
+from unittest import mock
+
+import numpy as np
+from stand_ins import FakeLLM
+
+from jmemory.configs.embeddings.base import BaseEmbedderConfig
+from jmemory.embeddings.configs import EmbedderConfig
+from jmemory.embeddings.mock import MockEmbeddings
+from jmemory.memory.memgraph_memory import MemoryGraph
+
+USER_ID = "benchmark-user"
+
+
+def build_graph(url, username, password, dims):
+    """Connect a `MemoryGraph` to Memgraph with `MockEmbeddings` and a `FakeLLM`; lookups never call either."""
+    config = SimpleNamespace(
+        graph_store=SimpleNamespace(
+            config=SimpleNamespace(url=url, username=username, password=password), llm=None, custom_prompt=None
+        ),
+        embedder=EmbedderConfig(config={"embedding_dims": dims}),
+        llm=SimpleNamespace(provider="openai", config={}),
+    )
+    with mock.patch(
+        "jmemory.memory.memgraph_memory.EmbedderFactory.create",
+        return_value=MockEmbeddings(BaseEmbedderConfig(embedding_dims=dims)),
+    ):
+        with mock.patch("jmemory.memory.memgraph_memory.LlmFactory.create", return_value=FakeLLM()):
+            return MemoryGraph(config)
+
+
+def seed(graph, count, dims, rng, batch_size=5000):
+    graph.graph.query("MATCH (n:Entity {user_id: $user_id}) DETACH DELETE n", params={"user_id": USER_ID})
+    for start in range(0, count, batch_size):
+        rows = [
+            {"name": f"entity-{i}", "embedding": rng.standard_normal(dims).tolist()}
+            for i in range(start, min(start + batch_size, count))
+        ]
+        graph.graph.query(
+            """
+            UNWIND $rows AS row
+            CREATE (:Entity {name: row.name, user_id: $user_id, embedding: row.embedding})
+            """,
+            params={"rows": rows, "user_id": USER_ID},
+        )
+
+
+def measure(graph, queries, threshold, use_index):
+    graph.vector_index = "memzero" if use_index else None
+    latencies = []
+    for embeddings in queries:
+        start = time.perf_counter()
+        graph._find_similar_nodes(embeddings, {"user_id": USER_ID}, threshold=threshold)
+        latencies.append((time.perf_counter() - start) * 1000)
+    latencies.sort()
+    return {
+        "p50_ms": round(statistics.median(latencies), 2),
+        "p95_ms": round(latencies[int(len(latencies) * 0.95) - 1], 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="bolt://localhost:7690")
+    parser.add_argument("--username", default="memgraph")
+    parser.add_argument("--password", default="memgraph")
+    parser.add_argument("--dims", type=int, default=1024)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--entities-per-query", type=int, default=5)
+    parser.add_argument("--threshold", type=float, default=0.9)
+    args = parser.parse_args()
+
+    graph = build_graph(args.url, args.username, args.password, args.dims)
+    rng = np.random.default_rng(0)
+
+    results = []
+    for size in args.sizes:
+        seed(graph, size, args.dims, rng)
+        queries = [
+            {f"query-{j}": rng.standard_normal(args.dims).tolist() for j in range(args.entities_per_query)}
+            for _ in range(args.queries)
+        ]
+        results.append(
+            {
+                "entities": size,
+                "index": measure(graph, queries, args.threshold, use_index=True),
+                "scan": measure(graph, queries, args.threshold, use_index=False),
+            }
+        )
+        print(json.dumps(results[-1]))
+
+    graph.graph.query("MATCH (n:Entity {user_id: $user_id}) DETACH DELETE n", params={"user_id": USER_ID})
+
+
+if __name__ == "__main__":
+    main()
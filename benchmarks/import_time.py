@@ -0,0 +1,68 @@
+"""
+Cold import time of the jmemory entry points.
+
+Each module is imported in a fresh interpreter so nothing is cached between
+runs, and the wall time of the import statement is reported as JSON. Use it
+to catch heavy dependencies (torch, sentence-transformers, vector store SDKs)
+creeping back into module scope:
+
+    python benchmarks/import_time.py --repeat 5
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+MODULES = [
+    "jmemory",
+    "jmemory.configs.base",
+    "jmemory.client.main",
+    "jmemory.memory.main",
+    "jmemory.proxy.main",
+]
+
+TIMER = "import time; start = time.perf_counter(); import {module}; print(time.perf_counter() - start)"
+
+
+def time_import(module):
+    output = subprocess.run(
+        [sys.executable, "-c", TIMER.format(module=module)], capture_output=True, text=True, check=True
+    ).stdout
+    return float(output.strip().splitlines()[-1]) * 1000
+
+
+def heavy_modules(module, candidates=("torch", "sentence_transformers", "transformers")):
+    """Return which of `candidates` end up in `sys.modules` after importing `module`."""
+    code = f"import sys, {module}; print(','.join(m for m in {list(candidates)!r} if m in sys.modules))"
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    return [name for name in output.strip().split(",") if name]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--modules", nargs="+", default=MODULES)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    for module in args.modules:
+        try:
+            timings = [time_import(module) for _ in range(args.repeat)]
+        except subprocess.CalledProcessError as e:
+            print(json.dumps({"module": module, "error": e.stderr.strip().splitlines()[-1]}))
+            continue
+        print(
+            json.dumps(
+                {
+                    "module": module,
+                    "median_ms": round(statistics.median(timings), 1),
+                    "min_ms": round(min(timings), 1),
+                    "heavy_modules": heavy_modules(module),
+                }
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+"""
+Throughput and latency of the Memory API at several corpus sizes.
+
+Drives `Memory.add`, `search` (vector, hybrid and layered), `get_all` and `delete_all`
+against an embedded Qdrant in a temporary directory, with `MockEmbeddings`
+and a deterministic fake LLM, so runs need no network and are comparable
+between commits. For every corpus size it reports ops/s and p50/p95/p99 per
+operation, plus the p50 of each internal stage (embedding, vector search,
+lexical search, ...) from the telemetry spans. `MockEmbeddings` maps every
+text to the same vector, so vector search cost is that of a full scan of ties.
+
+    python benchmarks/memory_ops.py --sizes 100 1000 10000 --output results/HEAD.json
+    python benchmarks/memory_ops.py --compare results/main.json
+
+Pass `--graph-url bolt://localhost:7690` with Memgraph running (`docker-compose
+up -d memgraph`) to also time `MemoryGraph.add` and `search`.
+"""
+
+import argparse
+import json
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+from stand_ins import build_memory
+
+from jmemory import __version__
+from jmemory.configs.graph_store import GraphStoreConfig
+from jmemory.memory.telemetry import InMemoryExporter, telemetry
+
+SUBJECTS = ["Alice", "Bruno", "Chen", "Dana", "Emeka", "Farah", "Goran", "Hana"]
+VERBS = ["works at", "moved to", "is allergic to", "prefers", "is learning", "manages", "visited", "owns"]
+OBJECTS = ["Acme", "Lisbon", "peanuts", "green tea", "the cello", "Project Atlas", "Kyoto", "a Corgi named Rex"]
+
+
+def sentence(rng):
+    return f"{rng.choice(SUBJECTS)} {rng.choice(VERBS)} {rng.choice(OBJECTS)} (note {rng.randrange(10**6)})."
+
+
+def latency_summary(latencies, elapsed):
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) * 1000
+    return {
+        "ops": len(latencies),
+        "ops_per_s": round(len(latencies) / elapsed, 1) if elapsed else None,
+        "p50_ms": round(float(p50), 3),
+        "p95_ms": round(float(p95), 3),
+        "p99_ms": round(float(p99), 3),
+    }
+
+
+def timed(operation, calls):
+    """Run every call in `calls` and summarize their latencies."""
+    latencies = []
+    start = time.perf_counter()
+    for call in calls:
+        call_start = time.perf_counter()
+        operation(*call)
+        latencies.append(time.perf_counter() - call_start)
+    return latency_summary(latencies, time.perf_counter() - start)
+
+
+def stage_summary(exporter):
+    stages = {}
+    for name in sorted({span.name for span in exporter.spans}):
+        if name.startswith("memory."):
+            continue
+        summary = exporter.summary(name)
+        stages[name] = {"count": summary["count"], "p50_ms": round(summary["p50"] * 1000, 3)}
+    return stages
+
+
+def seed(memory, users, size, rng, batch_size):
+    """Add `size` memories spread over `users`, `batch_size` messages per call."""
+    for offset in range(0, size, batch_size):
+        user_id = users[(offset // batch_size) % len(users)]
+        messages = [{"role": "user", "content": sentence(rng)} for _ in range(min(batch_size, size - offset))]
+        memory.add(messages, user_id=user_id)
+
+
+def run_size(size, args, exporter):
+    rng = random.Random(args.seed + size)
+    users = [f"user-{i}" for i in range(args.users)]
+    path = tempfile.mkdtemp(prefix="jmemory-bench-")
+    graph_store = None
+    if args.graph_url:
+        graph_store = GraphStoreConfig(url=args.graph_url, username=args.username, password=args.password)
+    try:
+        memory = build_memory(path, graph_store=graph_store, llm_latency=args.llm_latency)
+        # Seed and time the vector path on its own; graph operations are timed separately below.
+        graph, memory.graph_store = memory.graph_store, None
+        seed(memory, users, size, rng, args.seed_batch_size)
+        exporter.reset()
+
+        operations = {
+            "add": timed(
+                lambda text, user_id: memory.add(text, user_id=user_id),
+                [(sentence(rng), rng.choice(users)) for _ in range(args.ops)],
+            ),
+            "search": timed(
+                lambda query, user_id: memory.search(query, user_id=user_id, limit=args.limit),
+                [(sentence(rng), rng.choice(users)) for _ in range(args.ops)],
+            ),
+            "search_hybrid": timed(
+                lambda query, user_id: memory.search(query, user_id=user_id, limit=args.limit, mode="hybrid"),
+                [(sentence(rng), rng.choice(users)) for _ in range(args.ops)],
+            ),
+            "search_layered": timed(
+                lambda query, user_id: memory.search(query, user_id=user_id, limit=args.limit, mode="layered"),
+                [(sentence(rng), rng.choice(users)) for _ in range(args.ops)],
+            ),
+            "get_all": timed(
+                lambda user_id: memory.get_all(user_id=user_id, limit=100),
+                [(rng.choice(users),) for _ in range(args.ops)],
+            ),
+        }
+        if graph is not None:
+            operations["graph_add"] = timed(
+                graph.add, [(sentence(rng), {"user_id": rng.choice(users)}) for _ in range(args.ops)]
+            )
+            operations["graph_search"] = timed(
+                graph.search, [(sentence(rng), {"user_id": rng.choice(users)}) for _ in range(args.ops)]
+            )
+        memory.graph_store = graph
+        # Last, as it empties the corpus: one call per user.
+        operations["delete_all"] = timed(lambda user_id: memory.delete_all(user_id=user_id), [(u,) for u in users])
+        return {"corpus_size": size, "operations": operations, "stages": stage_summary(exporter)}
+    finally:
+        shutil.rmtree(path, ignore_errors=True)
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(current, baseline):
+    """Print the p50 and ops/s ratio of every operation against a previous results file."""
+    previous = {
+        (result["corpus_size"], name): summary
+        for result in baseline["results"]
+        for name, summary in result["operations"].items()
+    }
+    for result in current["results"]:
+        for name, summary in result["operations"].items():
+            before = previous.get((result["corpus_size"], name))
+            if not before:
+                continue
+            print(
+                json.dumps(
+                    {
+                        "corpus_size": result["corpus_size"],
+                        "operation": name,
+                        "p50_ratio": round(summary["p50_ms"] / before["p50_ms"], 3) if before["p50_ms"] else None,
+                        "ops_per_s_ratio": (
+                            round(summary["ops_per_s"] / before["ops_per_s"], 3) if before["ops_per_s"] else None
+                        ),
+                    }
+                )
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1_000, 10_000])
+    parser.add_argument("--ops", type=int, default=200, help="Timed calls per operation and size")
+    parser.add_argument("--users", type=int, default=10)
+    parser.add_argument("--limit", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--seed-batch-size", type=int, default=100)
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="Simulated seconds per LLM call")
+    parser.add_argument("--graph-url", default=None, help="Memgraph bolt URL; graph operations are skipped without")
+    parser.add_argument("--username", default="memgraph")
+    parser.add_argument("--password", default="memgraph")
+    parser.add_argument("--output", default=None, help="Write the results as JSON to this file")
+    parser.add_argument("--compare", default=None, help="Results file of a previous run to compare against")
+    args = parser.parse_args()
+
+    exporter = telemetry.add_exporter(InMemoryExporter(max_samples=max(args.ops * 10, 10000)))
+    report = {
+        "benchmark": "memory_ops",
+        "commit": git_commit(),
+        "jmemory_version": __version__,
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "parameters": {key: value for key, value in vars(args).items() if key not in ("output", "compare", "password")},
+        "results": [],
+    }
+    for size in args.sizes:
+        report["results"].append(run_size(size, args, exporter))
+        print(json.dumps(report["results"][-1]))
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            compare(report, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
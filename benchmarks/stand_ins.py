@@ -0,0 +1,100 @@
+"""
+Local stand-ins for the network services `Memory` depends on, so benchmarks need no API keys.
+
+`FakeLLM` answers deterministically from the prompt text and `build_memory` wires it, together with
+`MockEmbeddings` and an embedded Qdrant under a local path, into a `Memory` instance.
+"""
+
+import json
+import re
+import time
+from typing import Dict, List, Optional
+from unittest import mock
+
+from jmemory.configs.base import MemoryConfig
+from jmemory.configs.embeddings.base import BaseEmbedderConfig
+from jmemory.configs.llms.base import BaseLlmConfig
+from jmemory.configs.vector_store import VectorStoreConfig
+from jmemory.embeddings.mock import MockEmbeddings
+from jmemory.llms.base import LLMBase
+from jmemory.memory.main import Memory
+
+_ENTITY = re.compile(r"\b[A-Z][a-z]+\b")
+
+
+class FakeLLM(LLMBase):
+    """
+    Deterministic LLM: the same messages always produce the same response.
+
+    Tool calls name the capitalized words of the last message as entities and chain them into relations;
+    JSON requests get the sentences of the last message back as "facts"; plain requests get an acknowledgement.
+
+    Args:
+        config (BaseLlmConfig, optional): LLM configuration. Defaults to None.
+        latency (float, optional): Seconds to sleep per call, to stand in for network time. Defaults to 0.
+    """
+
+    def __init__(self, config: Optional[BaseLlmConfig] = None, latency: float = 0.0):
+        super().__init__(config or BaseLlmConfig(model="fake-llm"))
+        self.latency = latency
+        self.calls = 0
+
+    def generate_response(
+        self,
+        messages: List[Dict[str, str]],
+        response_format=None,
+        tools: Optional[List[Dict]] = None,
+        tool_choice: str = "auto",
+    ):
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        text = str(messages[-1].get("content", "")) if messages else ""
+        entities = list(dict.fromkeys(word.lower() for word in _ENTITY.findall(text)))
+
+        if tools:
+            name = tools[0].get("function", {}).get("name", "")
+            if "relation" in name:
+                arguments = {
+                    "entities": [
+                        {"source": source, "relationship": "related_to", "destination": destination}
+                        for source, destination in zip(entities, entities[1:])
+                    ]
+                }
+            elif "entit" in name:
+                arguments = {"entities": [{"entity": entity, "entity_type": "entity"} for entity in entities]}
+            else:
+                return {"content": None, "tool_calls": []}
+            return {"content": None, "tool_calls": [{"name": name, "arguments": arguments}]}
+
+        if response_format:
+            facts = [sentence.strip() for sentence in re.split(r"[.!?]", text) if sentence.strip()]
+            return json.dumps({"facts": facts})
+        return f"Noted: {text[:80]}"
+
+
+def build_memory(path: str, graph_store=None, llm_latency: float = 0.0, **config) -> Memory:
+    """
+    Build a `Memory` backed by an embedded Qdrant under `path`, `MockEmbeddings` and a `FakeLLM`.
+
+    Args:
+        path (str): Directory for the Qdrant data and the lexical index.
+        graph_store (GraphStoreConfig, optional): Graph store to use. Defaults to None.
+        llm_latency (float, optional): Simulated seconds per LLM call. Defaults to 0.
+        **config: Other `MemoryConfig` fields.
+
+    Returns:
+        Memory: The memory instance.
+    """
+    memory_config = MemoryConfig(
+        vector_store=VectorStoreConfig(collection_name="benchmark", path=path, on_disk=True),
+        graph_store=graph_store,
+        **config,
+    )
+    embedder = MockEmbeddings(BaseEmbedderConfig(embedding_dims=10))
+    llm = FakeLLM(latency=llm_latency)
+    # Only the constructor resolves the LLM and embedder, so the patches do not outlive it.
+    with mock.patch("jmemory.memory.main.LlmLoader") as loader:
+        loader.return_value.load.return_value = llm
+        with mock.patch("jmemory.memory.main._create_embedder", return_value=embedder):
+            return Memory(memory_config)
@@ -0,0 +1,185 @@
+"""
+In-process FAISS store versus local Qdrant: insert throughput, search latency, recall and cold start.
+
+Seeds both stores with the same random vectors, spread over `--users` users and the memory layers, and for
+every corpus size reports:
+
+- insert points/s (batches of `--batch-size`);
+- p50/p95/p99 of an unfiltered search, of a user-scoped search (`Memory.search`) and of a layered-style
+  search (user scope plus a `memory_type` exclusion, the untyped layer of `search(mode="layered")`);
+- recall@k of the user-scoped search against an exact NumPy scan;
+- the time to reopen the collection from disk and run the first search.
+
+Qdrant runs embedded in a temporary directory by default. Pass `--qdrant-url http://localhost:6333` with
+the server running (`docker-compose up -d qdrant`) to compare against it instead; its cold start then only
+measures reconnecting.
+
+    python benchmarks/vector_store.py --sizes 1000 10000 100000 --output results/vector_store.json
+"""
+
+import argparse
+import json
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+
+import numpy as np
+
+from jmemory import __version__
+from jmemory.configs.enums import MemoryType
+from jmemory.vector_stores.faiss import FAISS
+from jmemory.vector_stores.qdrant import Qdrant
+
+LAYERS = [memory_type.value for memory_type in MemoryType] + [None]
+
+
+def latency_summary(latencies):
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) * 1000
+    return {"p50_ms": round(float(p50), 3), "p95_ms": round(float(p95), 3), "p99_ms": round(float(p99), 3)}
+
+
+def corpus(size, args, rng):
+    vectors = rng.standard_normal((size, args.dims)).astype(np.float32)
+    users = rng.integers(args.users, size=size)
+    layers = rng.integers(len(LAYERS), size=size)
+    payloads = [
+        {"data": f"memory {i}", "user_id": f"user-{users[i]}", "memory_type": LAYERS[layers[i]]} for i in range(size)
+    ]
+    for payload in payloads:
+        if payload["memory_type"] is None:
+            del payload["memory_type"]
+    ids = [str(uuid.uuid4()) for _ in range(size)]
+    return vectors, users, ids, payloads
+
+
+def open_store(backend, path, collection_name, args):
+    if backend == "faiss":
+        return FAISS(collection_name=collection_name, embedding_model_dims=args.dims, path=path, on_disk=True)
+    if args.qdrant_url:
+        return Qdrant(collection_name=collection_name, embedding_model_dims=args.dims, url=args.qdrant_url)
+    return Qdrant(collection_name=collection_name, embedding_model_dims=args.dims, path=path, on_disk=True)
+
+
+def close_store(backend, store):
+    if backend == "faiss":
+        store.close()
+    else:
+        store.client.close()
+
+
+def exact_top_k(vectors, users, query, user, k):
+    normalized = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    rows = np.flatnonzero(users == user)
+    scores = normalized[rows] @ (query / np.linalg.norm(query))
+    return rows[np.argsort(-scores)[:k]]
+
+
+def run_backend(backend, size, args, data, queries):
+    vectors, users, ids, payloads = data
+    path = tempfile.mkdtemp(prefix=f"jmemory-bench-{backend}-")
+    collection_name = f"bench_{uuid.uuid4().hex[:8]}"
+    try:
+        store = open_store(backend, path, collection_name, args)
+        start = time.perf_counter()
+        for offset in range(0, size, args.batch_size):
+            end = offset + args.batch_size
+            store.insert(vectors[offset:end].tolist(), payloads[offset:end], ids[offset:end])
+        insert_seconds = time.perf_counter() - start
+
+        searches = {
+            "search": lambda user: None,
+            "search_user": lambda user: {"user_id": f"user-{user}"},
+            "search_layered": lambda user: {
+                "user_id": f"user-{user}",
+                "memory_type": {"nin": [layer for layer in LAYERS if layer and layer != "long_term_memory"]},
+            },
+        }
+        operations = {}
+        recall = []
+        for name, filters in searches.items():
+            latencies = []
+            for query, user in queries:
+                call_start = time.perf_counter()
+                hits = store.search("", query.tolist(), limit=args.limit, filters=filters(user))
+                latencies.append(time.perf_counter() - call_start)
+                if name == "search_user":
+                    expected = {ids[row] for row in exact_top_k(vectors, users, query, user, args.limit)}
+                    recall.append(len(expected & {str(hit.id) for hit in hits}) / max(len(expected), 1))
+            operations[name] = latency_summary(latencies)
+
+        close_store(backend, store)
+        start = time.perf_counter()
+        store = open_store(backend, path, collection_name, args)
+        store.search("", queries[0][0].tolist(), limit=args.limit, filters={"user_id": f"user-{queries[0][1]}"})
+        cold_start = time.perf_counter() - start
+        if args.qdrant_url and backend == "qdrant":
+            store.delete_col()
+        close_store(backend, store)
+        return {
+            "insert_points_per_s": round(size / insert_seconds, 1),
+            "operations": operations,
+            "recall_at_k": round(float(np.mean(recall)), 4),
+            "cold_start_ms": round(cold_start * 1000, 3),
+        }
+    finally:
+        shutil.rmtree(path, ignore_errors=True)
+
+
+def run_size(size, args):
+    rng = np.random.default_rng(args.seed + size)
+    data = corpus(size, args, rng)
+    queries = [
+        (rng.standard_normal(args.dims).astype(np.float32), int(rng.integers(args.users))) for _ in range(args.ops)
+    ]
+    backends = {backend: run_backend(backend, size, args, data, queries) for backend in args.backends}
+    return {"corpus_size": size, "backends": backends}
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000])
+    parser.add_argument("--backends", nargs="+", default=["faiss", "qdrant"], choices=["faiss", "qdrant"])
+    parser.add_argument("--dims", type=int, default=384)
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--ops", type=int, default=200, help="Timed searches per operation and size")
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--qdrant-url", default=None, help="Qdrant server URL; embedded Qdrant is used without")
+    parser.add_argument("--output", default=None, help="Write the results as JSON to this file")
+    args = parser.parse_args()
+
+    report = {
+        "benchmark": "vector_store",
+        "commit": git_commit(),
+        "jmemory_version": __version__,
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "parameters": {key: value for key, value in vars(args).items() if key != "output"},
+        "results": [],
+    }
+    for size in args.sizes:
+        report["results"].append(run_size(size, args))
+        print(json.dumps(report["results"][-1]))
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
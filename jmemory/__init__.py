@@ -1,3 +1,21 @@
 __version__ = "0.1.0"
 
-from jmemory.memory.main import Memory  # noqa
\ No newline at end of file
+# Heavy submodules (vector store clients, embedding models) are only imported on first attribute access.
+_LAZY_ATTRIBUTES = {
+    "Memory": "jmemory.memory.main",
+    "AsyncMemory": "jmemory.memory.main",
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_ATTRIBUTES:
+        import importlib
+
+        value = getattr(importlib.import_module(_LAZY_ATTRIBUTES[name]), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted([*globals(), *_LAZY_ATTRIBUTES])
@@ -1,3 +1,8 @@
+from typing import Any, Dict, Optional
+
+from jmemory.configs.base import MemoryConfig
+
+
 class APIError(Exception):
     """Exception raised for errors in the API."""
 
@@ -12,7 +17,41 @@ class MemoryClient:
 
 
 class AsyncMemoryClient:
-    """Simplified async client without telemetry."""
+    """Simplified async client without telemetry, backed by an in-process `AsyncMemory`."""
 
-    def __init__(self, *args, **kwargs):
-        pass
+    def __init__(self, config: Optional[MemoryConfig] = None, memory=None):
+        if memory is None:
+            from jmemory.memory.main import AsyncMemory
+
+            memory = AsyncMemory(config or MemoryConfig())
+        self.memory = memory
+
+    async def add(self, messages, **kwargs) -> Dict[str, Any]:
+        return await self.memory.add(messages, **kwargs)
+
+    async def search(self, query: str, **kwargs) -> Dict[str, Any]:
+        return await self.memory.search(query, **kwargs)
+
+    async def get_all(self, **kwargs) -> Dict[str, Any]:
+        return await self.memory.get_all(**kwargs)
+
+    def iter_all(self, **kwargs):
+        return self.memory.iter_all(**kwargs)
+
+    async def get(self, memory_id: str) -> Optional[Dict[str, Any]]:
+        return await self.memory.get(memory_id)
+
+    async def update(self, memory_id: str, data: Dict[str, Any]):
+        return await self.memory.update(memory_id, data)
+
+    async def delete(self, memory_id: str):
+        return await self.memory.delete(memory_id)
+
+    async def delete_all(self, **kwargs):
+        return await self.memory.delete_all(**kwargs)
+
+    async def reset(self):
+        return await self.memory.reset()
+
+    async def close(self):
+        return await self.memory.close()
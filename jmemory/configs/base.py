@@ -3,6 +3,12 @@ from typing import Any, Dict, Optional
 
 from pydantic import BaseModel, Field
 
+from jmemory.configs.graph_store import GraphStoreConfig
+from jmemory.configs.lifecycle import LifecycleConfig
+from jmemory.configs.retrieval import RetrievalConfig
+from jmemory.configs.short_term import ShortTermConfig
+from jmemory.configs.vector_store import VectorStoreConfig
+from jmemory.embeddings.configs import EmbedderConfig
 from jmemory.llms.configs import LlmConfig
 
 # Set up the directory path
@@ -28,10 +34,82 @@ class MemoryConfig(BaseModel):
         description="Configuration for the language model",
         default_factory=LlmConfig,
     )
-    history_db_path: str = Field(
-        description="Path to the history database",
+    embedder: EmbedderConfig = Field(
+        description="Configuration for the embedding model",
+        default_factory=EmbedderConfig,
+    )
+    vector_store: VectorStoreConfig = Field(
+        description="Configuration for the vector store",
+        default_factory=VectorStoreConfig,
+    )
+    graph_store: Optional[GraphStoreConfig] = Field(
+        description="Configuration for the graph store. Set to None to disable graph memory",
+        default_factory=GraphStoreConfig,
+    )
+    short_term: Optional[ShortTermConfig] = Field(
+        description="Configuration for the in-process short-term buffer. Set to None to write short-term "
+        "memories straight to the vector store",
+        default_factory=ShortTermConfig,
+    )
+    lifecycle: Optional[LifecycleConfig] = Field(
+        description="Configuration for the background pass that promotes repeated mid-term memories to long-term "
+        "and archives faded ones. None (the default) disables it",
+        default=None,
+    )
+    retrieval: RetrievalConfig = Field(
+        description="Per-layer budgets, deadlines and weights for search(mode='layered')",
+        default_factory=RetrievalConfig,
+    )
+    history_db_path: Optional[str] = Field(
+        description="Path to the history database. Set to None to keep no history of memory changes",
         default=os.path.join(jmemory_dir, "history.db"),
     )
+    history_write_behind: bool = Field(
+        description="Write history events in batches from a background thread instead of on the calling thread. "
+        "Queued events are flushed by Memory.close() and at interpreter exit",
+        default=False,
+    )
+    embedding_cache_path: Optional[str] = Field(
+        description="Path to the persistent embedding cache database",
+        default=os.path.join(jmemory_dir, "embeddings.db"),
+    )
+    embedding_cache_size: int = Field(
+        description="Number of embeddings kept in the in-process LRU cache. Set to 0 to disable caching",
+        default=10000,
+    )
+    embedding_batch_size: int = Field(
+        description="Number of texts that triggers a fused embedding call across concurrent requests. "
+        "Set to 0 to disable micro-batching",
+        default=64,
+    )
+    embedding_batch_wait_ms: float = Field(
+        description="Milliseconds to wait for concurrent embedding requests to fuse into one call. "
+        "A request that arrives while no other is queued is sent at once",
+        default=3.0,
+    )
+    embedding_sidecar_url: Optional[str] = Field(
+        description="URL of a shared embedding sidecar (python -m jmemory.embeddings.sidecar). "
+        "When set, no model is loaded in-process",
+        default=None,
+    )
+    lexical_index: bool = Field(
+        description="Maintain a BM25 index of memory texts for search(mode='hybrid')",
+        default=True,
+    )
+    lexical_index_path: Optional[str] = Field(
+        description="Path to the BM25 index database. Defaults to bm25.db inside a local vector store path, "
+        "or under the jmemory directory for a Qdrant server or Postgres",
+        default=None,
+    )
+    dedup_index: bool = Field(
+        description="Keep an index of normalized content hashes so that add() turns exact repeats within a "
+        "session and memory type into a mention count bump instead of a new memory",
+        default=True,
+    )
+    dedup_index_path: Optional[str] = Field(
+        description="Path to the content hash index database. Defaults to hashes.db next to the BM25 index",
+        default=None,
+    )
     version: str = Field(
         description="The version of the API",
         default="v1.1",
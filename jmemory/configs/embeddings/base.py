@@ -23,6 +23,9 @@ class BaseEmbedderConfig(ABC):
         # Huggingface specific
         model_kwargs: Optional[dict] = None,
         huggingface_base_url: Optional[str] = None,
+        backend: Optional[str] = None,
+        quantize: Optional[Union[bool, str]] = None,
+        num_threads: Optional[int] = None,
         # AzureOpenAI specific
         azure_kwargs: Optional[AzureConfig] = {},
         http_client_proxies: Optional[Union[Dict, str]] = None,
@@ -53,6 +56,13 @@ class BaseEmbedderConfig(ABC):
         :type model_kwargs: Optional[Dict[str, Any]], defaults a dict inside init
         :param huggingface_base_url: Huggingface base URL to be use, defaults to None
         :type huggingface_base_url: Optional[str], optional
+        :param backend: Inference backend for the huggingface model, "torch" or "onnx", defaults to "torch"
+        :type backend: Optional[str], optional
+        :param quantize: Use a dynamically int8-quantized ONNX model. True picks the quantization target for this
+            CPU; "arm64", "avx2", "avx512" or "avx512_vnni" force one. Only used with the onnx backend, defaults to None
+        :type quantize: Optional[Union[bool, str]], optional
+        :param num_threads: Number of CPU threads used for huggingface inference, defaults to None (library default)
+        :type num_threads: Optional[int], optional
         :param openai_base_url: Openai base URL to be use, defaults to "https://api.openai.com/v1"
         :type openai_base_url: Optional[str], optional
         :param azure_kwargs: key-value arguments for the AzureOpenAI embedding model, defaults a dict inside init
@@ -85,6 +95,9 @@ class BaseEmbedderConfig(ABC):
         # Huggingface specific
         self.model_kwargs = model_kwargs or {}
         self.huggingface_base_url = huggingface_base_url
+        self.backend = backend
+        self.quantize = quantize
+        self.num_threads = num_threads
         # AzureOpenAI specific
         self.azure_kwargs = AzureConfig(**azure_kwargs) or {}
 
@@ -0,0 +1,20 @@
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+
+class LifecycleConfig(BaseModel):
+    interval: float = Field(5 * 60, description="Seconds between background promotion and decay passes")
+    page_size: int = Field(1000, description="Number of points scanned and scored per batch")
+    half_life: float = Field(
+        7 * 24 * 60 * 60, description="Seconds for the strength of an untouched mid-term memory to halve"
+    )
+    promote_after: int = Field(
+        3, description="Mentions plus search hits after which a mid-term memory is promoted to long-term"
+    )
+    archive_below: float = Field(
+        0.1, description="Strength below which a mid-term memory is moved out of the primary collection"
+    )
+    archive_collection: Optional[str] = Field(
+        None, description="Collection that demoted memories are moved to. Defaults to '<collection>_archive'"
+    )
@@ -48,6 +48,12 @@ class BaseLlmConfig(ABC):
         aws_access_key_id: Optional[str] = None,
         aws_secret_access_key: Optional[str] = None,
         aws_region: Optional[str] = "us-west-2",
+        # Response cache
+        cache_mode: Optional[str] = None,
+        cache_size: int = 1024,
+        cache_ttl: Optional[float] = 24 * 60 * 60,
+        cache_path: Optional[str] = None,
+        cache_similarity_threshold: float = 0.95,
     ):
         """
         Initializes a configuration class instance for the LLM.
@@ -99,6 +105,18 @@ class BaseLlmConfig(ABC):
         :type lmstudio_base_url: Optional[str], optional
         :param lmstudio_response_format: LM Studio response format to be use, defaults to None
         :type lmstudio_response_format: Optional[Dict], optional
+        :param cache_mode: Cache responses: "exact" for identical requests, "semantic" to also reuse the response
+        of a request whose last message is nearly identical, defaults to None (no caching)
+        :type cache_mode: Optional[str], optional
+        :param cache_size: Number of responses kept in the in-process LRU, defaults to 1024
+        :type cache_size: int, optional
+        :param cache_ttl: Seconds a cached response stays valid, defaults to 24 hours
+        :type cache_ttl: Optional[float], optional
+        :param cache_path: Path of the persistent cache tier, defaults to llm_cache.db in the jmemory directory.
+        Pass ":memory:" or False to keep responses in-process only
+        :type cache_path: Optional[str], optional
+        :param cache_similarity_threshold: Minimum cosine similarity for a semantic cache hit, defaults to 0.95
+        :type cache_similarity_threshold: float, optional
         """
 
         self.model = model
@@ -143,4 +161,10 @@ class BaseLlmConfig(ABC):
         # AWS Bedrock specific
         self.aws_access_key_id = aws_access_key_id
         self.aws_secret_access_key = aws_secret_access_key
-        self.aws_region = aws_region
\ No newline at end of file
+        self.aws_region = aws_region
+        # Response cache
+        self.cache_mode = cache_mode
+        self.cache_size = cache_size
+        self.cache_ttl = cache_ttl
+        self.cache_path = cache_path
+        self.cache_similarity_threshold = cache_similarity_threshold
@@ -0,0 +1,53 @@
+from typing import Dict, Optional
+
+from pydantic import BaseModel, Field, field_validator
+
+from jmemory.configs.enums import MemoryType
+
+HOUR = 60 * 60
+DAY = 24 * HOUR
+
+
+class LayerConfig(BaseModel):
+    weight: float = Field(1.0, description="Multiplier applied to the combined score of the layer's hits")
+    top_k: Optional[int] = Field(None, description="Candidates fetched from the layer. Defaults to the search limit")
+    half_life: Optional[float] = Field(
+        None, description="Seconds after which the recency term of a hit halves. None disables recency decay"
+    )
+    deadline_ms: Optional[float] = Field(
+        None, description="Milliseconds to wait for the layer. Defaults to RetrievalConfig.deadline_ms"
+    )
+    enabled: bool = Field(True, description="Whether layered search queries the layer")
+
+
+def _default_layers() -> Dict[str, LayerConfig]:
+    return {
+        MemoryType.SHORT_TERM.value: LayerConfig(weight=1.0, half_life=6 * HOUR),
+        MemoryType.MEDIUM_TERM.value: LayerConfig(weight=0.9, half_life=7 * DAY),
+        MemoryType.LONG_TERM.value: LayerConfig(weight=1.0),
+        MemoryType.SEMANTIC.value: LayerConfig(weight=1.0),
+        MemoryType.EPISODIC.value: LayerConfig(weight=0.8, half_life=30 * DAY),
+        MemoryType.PROCEDURAL.value: LayerConfig(weight=0.9),
+    }
+
+
+class RetrievalConfig(BaseModel):
+    layers: Dict[str, LayerConfig] = Field(
+        default_factory=_default_layers, description="Per-layer budgets and weights, keyed by memory type"
+    )
+    deadline_ms: float = Field(250.0, description="Milliseconds to wait for a layer without its own deadline")
+    recency_weight: float = Field(
+        0.2, ge=0.0, le=1.0, description="Share of the combined score given to recency rather than similarity"
+    )
+    untyped_layer: str = Field(
+        MemoryType.LONG_TERM.value, description="Layer that memories added without a memory type are searched in"
+    )
+
+    @field_validator("layers")
+    @classmethod
+    def check_layers(cls, layers: Dict[str, LayerConfig]) -> Dict[str, LayerConfig]:
+        known = {memory_type.value for memory_type in MemoryType}
+        unknown = set(layers) - known
+        if unknown:
+            raise ValueError(f"Unknown memory layers {sorted(unknown)}, expected some of {sorted(known)}")
+        return layers
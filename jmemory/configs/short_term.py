@@ -0,0 +1,8 @@
+from pydantic import BaseModel, Field
+
+
+class ShortTermConfig(BaseModel):
+    capacity: int = Field(256, description="Number of recent entries kept per session")
+    ttl: float = Field(24 * 60 * 60, description="Seconds an entry stays readable from the buffer")
+    promote_batch_size: int = Field(64, description="Number of entries written to the vector store per batch")
+    promote_interval: float = Field(1.0, description="Seconds between background promotions to the vector store")
@@ -1,6 +1,47 @@
-from pydantic import BaseModel, Field
+from typing import Optional
+
+from pydantic import BaseModel, Field, field_validator, model_validator
+
+from jmemory.configs.vector_stores.faiss import FAISSConfig
+from jmemory.configs.vector_stores.pgvector import PGVectorConfig
+
+VECTOR_STORE_PROVIDERS = ("qdrant", "faiss", "pgvector")
+
 
 class VectorStoreConfig(BaseModel):
-    collection_name: str = Field("jmemory", description="Name of the Qdrant collection")
-    path: str = Field("/qdrant/storage", description="Path to Qdrant storage")
-    on_disk: bool = Field(True, description="Whether to store Qdrant data on disk")
+    provider: str = Field(
+        "qdrant",
+        description="Vector store backend: 'qdrant', 'faiss' for an in-process index under `path`, "
+        "or 'pgvector' for Postgres",
+    )
+    collection_name: str = Field("jmemory", description="Name of the collection")
+    path: str = Field("/qdrant/storage", description="Path to embedded Qdrant or FAISS storage")
+    on_disk: bool = Field(True, description="Whether to store the collection on disk")
+    host: Optional[str] = Field(None, description="Host of a Qdrant server, used instead of `path`")
+    port: Optional[int] = Field(None, description="Port of a Qdrant server")
+    url: Optional[str] = Field(None, description="Full URL of a Qdrant server, used instead of `path`")
+    api_key: Optional[str] = Field(None, description="API key for a Qdrant server")
+    prefer_grpc: bool = Field(False, description="Talk to a Qdrant server over gRPC")
+    batch_size: int = Field(256, description="Number of points per upsert request")
+    parallel: int = Field(4, description="Number of concurrent upsert requests")
+    wait: bool = Field(True, description="Wait for upserts to be applied before returning")
+    faiss: Optional[FAISSConfig] = Field(
+        None, description="Index options for the 'faiss' provider; its collection_name and path are not used"
+    )
+
+    pgvector: Optional[PGVectorConfig] = Field(
+        None, description="Connection and index options for the 'pgvector' provider; its collection_name is not used"
+    )
+
+    @field_validator("provider")
+    @classmethod
+    def validate_provider(cls, provider: str) -> str:
+        if provider not in VECTOR_STORE_PROVIDERS:
+            raise ValueError(f"Unsupported vector store provider: {provider}. Use one of {VECTOR_STORE_PROVIDERS}")
+        return provider
+
+    @model_validator(mode="after")
+    def check_provider_settings(self):
+        if self.provider == "pgvector" and self.pgvector is None:
+            raise ValueError("The 'pgvector' provider needs its connection settings in `pgvector`")
+        return self
@@ -7,12 +7,20 @@ class FAISSConfig(BaseModel):
     collection_name: str = Field("jmemory", description="Default name for the collection")
     path: Optional[str] = Field(None, description="Path to store FAISS index and metadata")
     distance_strategy: str = Field(
-        "euclidean", description="Distance strategy to use. Options: 'euclidean', 'inner_product', 'cosine'"
+        "cosine", description="Distance strategy to use. Options: 'euclidean', 'inner_product', 'cosine'"
     )
     normalize_L2: bool = Field(
         False, description="Whether to normalize L2 vectors (only applicable for euclidean distance)"
     )
     embedding_model_dims: int = Field(1536, description="Dimension of the embedding vector")
+    index_type: str = Field("hnsw", description="Index to search. Options: 'hnsw', 'flat' (exact search only)")
+    hnsw_m: int = Field(16, description="Neighbours per HNSW node")
+    ef_construction: int = Field(100, description="HNSW candidate list size while inserting")
+    ef_search: int = Field(128, description="HNSW candidate list size while searching")
+    exact_search_threshold: int = Field(
+        4096, description="Filters selecting at most this many points are searched exactly instead of through HNSW"
+    )
+    checkpoint_every: int = Field(10000, description="Points written between on-disk snapshots")
 
     @model_validator(mode="before")
     @classmethod
@@ -20,6 +28,9 @@ class FAISSConfig(BaseModel):
         distance_strategy = values.get("distance_strategy")
         if distance_strategy and distance_strategy not in ["euclidean", "inner_product", "cosine"]:
             raise ValueError("Invalid distance_strategy. Must be one of: 'euclidean', 'inner_product', 'cosine'")
+        index_type = values.get("index_type")
+        if index_type and index_type not in ["hnsw", "flat"]:
+            raise ValueError("Invalid index_type. Must be one of: 'hnsw', 'flat'")
         return values
 
     @model_validator(mode="before")
@@ -1,10 +1,12 @@
 import os
-from typing import Literal, Optional
+from typing import List, Literal, Optional
 
 from openai import AzureOpenAI
 
 from jmemory.configs.embeddings.base import BaseEmbedderConfig
 from jmemory.embeddings.base import EmbeddingBase
+from jmemory.embeddings.openai import MAX_BATCH_INPUTS
+from jmemory.utils.http import shared_client
 
 
 class AzureOpenAIEmbedding(EmbeddingBase):
@@ -17,7 +19,8 @@ class AzureOpenAIEmbedding(EmbeddingBase):
         api_version = self.config.azure_kwargs.api_version or os.getenv("EMBEDDING_AZURE_API_VERSION")
         default_headers = self.config.azure_kwargs.default_headers
 
-        self.client = AzureOpenAI(
+        self.client = shared_client(
+            AzureOpenAI,
             azure_deployment=azure_deployment,
             azure_endpoint=azure_endpoint,
             api_version=api_version,
@@ -38,3 +41,24 @@ class AzureOpenAIEmbedding(EmbeddingBase):
         """
         text = text.replace("\n", " ")
         return self.client.embeddings.create(input=[text], model=self.config.model).data[0].embedding
+
+    def embed_batch(self, texts: List[str], memory_action: Optional[Literal["add", "search", "update"]] = None):
+        """
+        Get the embeddings for a list of texts using Azure OpenAI, in one request per `MAX_BATCH_INPUTS` texts.
+
+        Args:
+            texts (list): The texts to embed.
+            memory_action (optional): The type of embedding to use. Must be one of "add", "search", or "update". Defaults to None.
+        Returns:
+            list: The embedding vectors, in the same order as `texts`.
+        """
+        if not texts:
+            return []
+        texts = [text.replace("\n", " ") for text in texts]
+        embeddings = []
+        for start in range(0, len(texts), MAX_BATCH_INPUTS):
+            response = self.client.embeddings.create(
+                input=texts[start : start + MAX_BATCH_INPUTS], model=self.config.model
+            )
+            embeddings.extend(item.embedding for item in sorted(response.data, key=lambda item: item.index))
+        return embeddings
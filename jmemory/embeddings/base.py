@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Literal, Optional
+from typing import List, Literal, Optional
 
 from jmemory.configs.embeddings.base import BaseEmbedderConfig
 
@@ -28,4 +28,19 @@ class EmbeddingBase(ABC):
         Returns:
             list: The embedding vector.
         """
-        pass
\ No newline at end of file
+        pass
+
+    def embed_batch(self, texts: List[str], memory_action: Optional[Literal["add", "search", "update"]] = None):
+        """
+        Get the embeddings for a list of texts.
+
+        Providers that support batched inference should override this to issue a single call. The default
+        implementation falls back to calling `embed` once per text.
+
+        Args:
+            texts (list): The texts to embed.
+            memory_action (optional): The type of embedding to use. Must be one of "add", "search", or "update". Defaults to None.
+        Returns:
+            list: The embedding vectors, in the same order as `texts`.
+        """
+        return [self.embed(text, memory_action) for text in texts]
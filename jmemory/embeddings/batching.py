@@ -0,0 +1,169 @@
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import List, Literal, Optional
+
+from jmemory.embeddings.base import EmbeddingBase
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class _Request:
+    __slots__ = ("texts", "memory_action", "future")
+
+    def __init__(self, texts: List[str], memory_action: Optional[str]):
+        self.texts = texts
+        self.memory_action = memory_action
+        self.future = Future()
+
+
+class BatchingEmbedding(EmbeddingBase):
+    """Micro-batching dispatcher in front of any embedder.
+
+    Calls from any number of threads are queued and a single dispatcher thread fuses them into one `embed_batch`
+    call on the wrapped embedder. A request that finds the queue empty is dispatched at once; requests that queue
+    up behind others (for instance while the model is busy) are fused with everything that arrives within
+    `max_wait` seconds of the first, or until `max_batch_size` texts are queued. Each caller blocks on a future
+    for its own slice of the result, so concurrent single-sentence searches share one forward pass instead of
+    queuing for the model one by one.
+
+    :param embedder: The embedder whose calls should be batched
+    :type embedder: EmbeddingBase
+    :param max_batch_size: Number of texts that triggers a dispatch without waiting for the window, defaults to 64
+    :type max_batch_size: int, optional
+    :param max_wait: Seconds to wait for more requests once several are queued, defaults to 0.003
+    :type max_wait: float, optional
+    """
+
+    def __init__(self, embedder: EmbeddingBase, max_batch_size: int = 64, max_wait: float = 0.003):
+        self.embedder = embedder
+        self.config = embedder.config
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.requests = 0
+        self.batches = 0
+
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._closed = False
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name="jmemory-embed-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, texts: List[str], memory_action: Optional[str] = None) -> Future:
+        """
+        Queue texts for the next fused batch.
+
+        Args:
+            texts (list): The texts to embed.
+            memory_action (optional): The type of embedding to use. Must be one of "add", "search", or "update". Defaults to None.
+        Returns:
+            Future: Resolves to the embedding vectors, in the same order as `texts`.
+        """
+        if self._closed:
+            raise RuntimeError("BatchingEmbedding has been closed")
+        request = _Request(list(texts), memory_action)
+        self._queue.put(request)
+        return request.future
+
+    def embed(self, text, memory_action: Optional[Literal["add", "search", "update"]] = None):
+        """
+        Get the embedding for the given text, batched with concurrent callers.
+
+        Args:
+            text (str): The text to embed.
+            memory_action (optional): The type of embedding to use. Must be one of "add", "search", or "update". Defaults to None.
+        Returns:
+            list: The embedding vector.
+        """
+        return self.submit([text], memory_action).result()[0]
+
+    def embed_batch(self, texts: List[str], memory_action: Optional[Literal["add", "search", "update"]] = None):
+        """
+        Get the embeddings for a list of texts, batched with concurrent callers.
+
+        Args:
+            texts (list): The texts to embed.
+            memory_action (optional): The type of embedding to use. Must be one of "add", "search", or "update". Defaults to None.
+        Returns:
+            list: The embedding vectors, in the same order as `texts`.
+        """
+        if not texts:
+            return []
+        return self.submit(texts, memory_action).result()
+
+    def _collect(self, first: _Request) -> List[_Request]:
+        batch = [first]
+        size = len(first.texts)
+        deadline = time.monotonic() + self.max_wait
+        while size < self.max_batch_size:
+            try:
+                request = self._queue.get_nowait()
+            except queue.Empty:
+                # A request that arrives alone goes out at once: the window is only worth waiting for when
+                # callers are already queuing up behind each other.
+                remaining = deadline - time.monotonic()
+                if len(batch) == 1 or remaining <= 0:
+                    break
+                try:
+                    request = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+            if request is _STOP:
+                self._stopping = True
+                break
+            batch.append(request)
+            size += len(request.texts)
+        return batch
+
+    def _run(self) -> None:
+        while not self._stopping:
+            request = self._queue.get()
+            if request is _STOP:
+                return
+            self._dispatch(self._collect(request))
+
+    def _dispatch(self, batch: List[_Request]) -> None:
+        groups = {}
+        for request in batch:
+            if request.future.set_running_or_notify_cancel():
+                groups.setdefault(request.memory_action, []).append(request)
+
+        for memory_action, requests in groups.items():
+            # Concurrent callers often ask for the same text (e.g. a popular query); encode it once.
+            unique = list(dict.fromkeys(text for request in requests for text in request.texts))
+            try:
+                vectors = dict(zip(unique, self.embedder.embed_batch(unique, memory_action)))
+            except Exception as e:
+                logger.warning(f"Batched embedding of {len(unique)} texts failed: {e}")
+                for request in requests:
+                    request.future.set_exception(e)
+                continue
+            for request in requests:
+                request.future.set_result([vectors[text] for text in request.texts])
+
+        with self._lock:
+            self.requests += len(batch)
+            self.batches += len(groups)
+
+    def stats(self) -> dict:
+        """
+        Get the batching counters.
+
+        Returns:
+            dict: Requests served, wrapped-embedder calls made and the number of requests waiting.
+        """
+        with self._lock:
+            return {"requests": self.requests, "batches": self.batches, "queued": self._queue.qsize()}
+
+    def close(self) -> None:
+        """Serve every queued request, then stop the dispatcher thread."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join()
@@ -0,0 +1,179 @@
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+from array import array
+from collections import OrderedDict
+from typing import List, Literal, Optional
+
+from jmemory.configs.base import jmemory_dir
+from jmemory.embeddings.base import EmbeddingBase
+
+logger = logging.getLogger(__name__)
+
+
+class CachedEmbedding(EmbeddingBase):
+    """Content-addressed cache in front of any embedder.
+
+    Vectors are keyed by (model, embedding dims, memory action, sha256 of the text). Lookups go through a
+    bounded in-process LRU first and then a persistent SQLite store, so identical strings are only ever sent
+    to the wrapped embedder once.
+
+    :param embedder: The embedder whose results should be cached
+    :type embedder: EmbeddingBase
+    :param max_size: Maximum number of vectors kept in the in-process LRU, defaults to 10000
+    :type max_size: int, optional
+    :param db_path: Path of the SQLite store, defaults to `embeddings.db` under `jmemory_dir`.
+        Pass ":memory:" to keep the second tier in memory or `False` to disable it.
+    :type db_path: Optional[str], optional
+    """
+
+    def __init__(self, embedder: EmbeddingBase, max_size: int = 10000, db_path: Optional[str] = None):
+        self.embedder = embedder
+        self.config = embedder.config
+        self.max_size = max_size
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        self._lru = OrderedDict()
+        self._lock = threading.Lock()
+
+        if db_path is False:
+            self.connection = None
+        else:
+            db_path = db_path or os.path.join(jmemory_dir, "embeddings.db")
+            if db_path != ":memory:":
+                os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+            self.connection = sqlite3.connect(db_path, check_same_thread=False)
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS embeddings (
+                    key     TEXT PRIMARY KEY,
+                    vector  BLOB
+                )
+                """
+            )
+            self.connection.commit()
+
+    def _key(self, text: str, memory_action: Optional[str]) -> str:
+        text_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        return f"{self.config.model}:{self.config.embedding_dims}:{memory_action or ''}:{text_hash}"
+
+    def _remember(self, key: str, vector: List[float]) -> None:
+        self._lru[key] = vector
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.max_size:
+            self._lru.popitem(last=False)
+
+    def _lookup(self, keys: List[str]) -> dict:
+        """Resolve as many keys as possible from the LRU and then the SQLite store."""
+        found = {}
+        with self._lock:
+            missing = []
+            for key in dict.fromkeys(keys):
+                if key in self._lru:
+                    self._lru.move_to_end(key)
+                    found[key] = self._lru[key]
+                else:
+                    missing.append(key)
+
+            if missing and self.connection:
+                # Stay well below SQLite's bound-parameter limit.
+                for start in range(0, len(missing), 500):
+                    chunk = missing[start : start + 500]
+                    placeholders = ", ".join("?" for _ in chunk)
+                    rows = self.connection.execute(
+                        f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})", chunk
+                    ).fetchall()
+                    for key, blob in rows:
+                        vector = array("d", blob).tolist()
+                        found[key] = vector
+                        self._remember(key, vector)
+                    self.disk_hits += len(rows)
+
+            self.hits += len(found)
+        return found
+
+    def _store(self, items: dict) -> None:
+        with self._lock:
+            for key, vector in items.items():
+                self._remember(key, vector)
+            if self.connection:
+                self.connection.executemany(
+                    "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)",
+                    [(key, array("d", vector).tobytes()) for key, vector in items.items()],
+                )
+                self.connection.commit()
+
+    def embed(self, text, memory_action: Optional[Literal["add", "search", "update"]] = None):
+        """
+        Get the embedding for the given text, consulting the cache first.
+
+        Args:
+            text (str): The text to embed.
+            memory_action (optional): The type of embedding to use. Must be one of "add", "search", or "update". Defaults to None.
+        Returns:
+            list: The embedding vector.
+        """
+        return self.embed_batch([text], memory_action)[0]
+
+    def embed_batch(self, texts: List[str], memory_action: Optional[Literal["add", "search", "update"]] = None):
+        """
+        Get the embeddings for a list of texts. Only texts missing from both cache tiers are sent to the
+        wrapped embedder, in a single `embed_batch` call.
+
+        Args:
+            texts (list): The texts to embed.
+            memory_action (optional): The type of embedding to use. Must be one of "add", "search", or "update". Defaults to None.
+        Returns:
+            list: The embedding vectors, in the same order as `texts`.
+        """
+        keys = [self._key(text, memory_action) for text in texts]
+        found = self._lookup(keys)
+
+        pending = {}
+        for key, text in zip(keys, texts):
+            if key not in found:
+                pending.setdefault(key, text)
+
+        if pending:
+            vectors = self.embedder.embed_batch(list(pending.values()), memory_action)
+            computed = dict(zip(pending.keys(), vectors))
+            self._store(computed)
+            found.update(computed)
+            with self._lock:
+                self.misses += len(pending)
+
+        return [found[key] for key in keys]
+
+    def stats(self) -> dict:
+        """
+        Get the cache counters.
+
+        Returns:
+            dict: Hits (of which served from disk), misses and the current LRU size.
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "size": len(self._lru),
+            }
+
+    def clear(self) -> None:
+        """Drop every cached vector from both tiers and reset the counters."""
+        with self._lock:
+            self._lru.clear()
+            self.hits = self.disk_hits = self.misses = 0
+            if self.connection:
+                self.connection.execute("DELETE FROM embeddings")
+                self.connection.commit()
+
+    def close(self) -> None:
+        if self.connection:
+            self.connection.close()
+            self.connection = None
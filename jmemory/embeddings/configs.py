@@ -9,10 +9,11 @@ class EmbedderConfig(BaseModel):
         default="huggingface",
     )
     config: dict = Field(
-        description="Configuration for the Hugging Face embedding model",
+        description="Configuration for the Hugging Face embedding model: `model` (e.g. "
+        "'/models/bge-small-en-v1.5' for a smaller, faster model), `model_kwargs`, `backend` ('torch' or 'onnx'), "
+        "`quantize` and `num_threads`. The device is auto-detected unless `model_kwargs['device']` is set",
         default_factory=lambda: {
             "model": "/models/bge-large-en-v1.5",
-            "model_kwargs": {"device": "cuda:0"},
         },
     )
 
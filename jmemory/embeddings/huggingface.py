@@ -1,29 +1,169 @@
 import logging
 import os
-from typing import Literal, Optional
+import platform
+import threading
+from typing import List, Literal, Optional
 
 from sentence_transformers import SentenceTransformer
 
 from jmemory.configs.embeddings.base import BaseEmbedderConfig
 from jmemory.embeddings.base import EmbeddingBase
 
+logger = logging.getLogger(__name__)
+
 logging.getLogger("transformers").setLevel(logging.WARNING)
 logging.getLogger("sentence_transformers").setLevel(logging.WARNING)
 logging.getLogger("huggingface_hub").setLevel(logging.WARNING)
 
+DEFAULT_MODEL = "/models/bge-large-en-v1.5"
+
+# Output size of the bundled models, so `embedding_dims` is known without loading the weights.
+KNOWN_EMBEDDING_DIMS = {
+    "bge-large-en-v1.5": 1024,
+    "bge-base-en-v1.5": 768,
+    "bge-small-en-v1.5": 384,
+}
+
+BACKENDS = ("torch", "onnx")
+QUANTIZATION_TARGETS = ("arm64", "avx2", "avx512", "avx512_vnni")
+
+
+def detect_device() -> str:
+    """Pick the best available torch device: cuda, then mps, then cpu."""
+    import torch
+
+    if torch.cuda.is_available():
+        return "cuda"
+    if getattr(torch.backends, "mps", None) is not None and torch.backends.mps.is_available():
+        return "mps"
+    return "cpu"
+
+
+def detect_quantization_target() -> str:
+    """Pick the int8 quantization target matching this CPU's instruction set."""
+    if platform.machine().lower() in ("arm64", "aarch64"):
+        return "arm64"
+    try:
+        with open("/proc/cpuinfo") as f:
+            flags = next((line.split(":", 1)[1].split() for line in f if line.startswith("flags")), [])
+    except OSError:
+        flags = []
+    if "avx512_vnni" in flags:
+        return "avx512_vnni"
+    if "avx512f" in flags:
+        return "avx512"
+    return "avx2"
+
 
 class HuggingFaceEmbedding(EmbeddingBase):
-    def __init__(self, config: Optional[BaseEmbedderConfig] = None, model: str = "/models/bge-large-en-v1.5", model_kwargs: Optional[dict] = None):
+    def __init__(self, config: Optional[BaseEmbedderConfig] = None, model: Optional[str] = None, model_kwargs: Optional[dict] = None):
         super().__init__(config)
 
-        self.config.model = model
-        self.config.model_kwargs = model_kwargs or {}
+        self.config.model = model or self.config.model or DEFAULT_MODEL
+        if model_kwargs is not None:
+            self.config.model_kwargs = model_kwargs
+        self.config.backend = self.config.backend or "torch"
+        if self.config.backend not in BACKENDS:
+            raise ValueError(f"Unsupported backend {self.config.backend!r}, expected one of {BACKENDS}")
+        if self.config.quantize not in (None, True, False) and self.config.quantize not in QUANTIZATION_TARGETS:
+            raise ValueError(
+                f"Unsupported quantization target {self.config.quantize!r}, expected one of {QUANTIZATION_TARGETS}"
+            )
 
+        # The weights are loaded on first use (or by `warmup`); only load now if the output size is unknown.
+        self._model = None
+        self._model_lock = threading.Lock()
+        self.config.embedding_dims = self.config.embedding_dims or KNOWN_EMBEDDING_DIMS.get(
+            os.path.basename(self.config.model.rstrip("/"))
+        )
+        if not self.config.embedding_dims:
+            self.config.embedding_dims = self.model.get_sentence_embedding_dimension()
+
+    @property
+    def model(self):
+        if self._model is None:
+            with self._model_lock:
+                if self._model is None:
+                    self._model = self._load_model()
+        return self._model
+
+    def _load_model(self):
         # Try to load from cache first, then download if needed
         model_path = self._get_or_download_model(self.config.model)
-        self.model = SentenceTransformer(model_path, **self.config.model_kwargs)
+        kwargs = dict(self.config.model_kwargs)
+        kwargs["device"] = kwargs.get("device") or detect_device()
+
+        if self.config.backend == "torch":
+            if self.config.num_threads:
+                import torch
+
+                torch.set_num_threads(self.config.num_threads)
+            return SentenceTransformer(model_path, **kwargs)
+
+        # ONNX Runtime: `model_kwargs` here are passed on to optimum's ORTModel.from_pretrained.
+        ort_kwargs = dict(kwargs.pop("model_kwargs", None) or {})
+        if "provider" not in ort_kwargs:
+            on_gpu = kwargs["device"].startswith("cuda")
+            ort_kwargs["provider"] = "CUDAExecutionProvider" if on_gpu else "CPUExecutionProvider"
+        if self.config.num_threads and "session_options" not in ort_kwargs:
+            import onnxruntime
+
+            session_options = onnxruntime.SessionOptions()
+            session_options.intra_op_num_threads = self.config.num_threads
+            ort_kwargs["session_options"] = session_options
+
+        if self.config.quantize:
+            ort_kwargs["file_name"] = self._quantized_model_file(model_path, kwargs, ort_kwargs)
+        return SentenceTransformer(model_path, backend="onnx", model_kwargs=ort_kwargs, **kwargs)
+
+    def _quantized_model_file(self, model_path: str, kwargs: dict, ort_kwargs: dict) -> str:
+        """
+        Return the int8 ONNX file for `model_path`, exporting it next to the model on first use.
 
-        self.config.embedding_dims = self.config.embedding_dims or self.model.get_sentence_embedding_dimension()
+        Args:
+            model_path: Local model directory.
+            kwargs: SentenceTransformer keyword arguments.
+            ort_kwargs: ONNX Runtime keyword arguments.
+        Returns:
+            str: The quantized file, relative to `model_path`.
+        """
+        target = self.config.quantize if isinstance(self.config.quantize, str) else detect_quantization_target()
+        file_name = f"onnx/model_qint8_{target}.onnx"
+        if os.path.exists(os.path.join(model_path, file_name)):
+            return file_name
+        if not os.path.isdir(model_path):
+            raise ValueError(f"Quantization needs a local model directory to write to, got {model_path!r}")
+
+        try:
+            # Only in sentence-transformers >= 3.2, which the torch backend does not need.
+            from sentence_transformers import export_dynamic_quantized_onnx_model
+        except ImportError:
+            raise ImportError(
+                "Quantization requires sentence-transformers>=3.2. "
+                "Please install it using 'pip install \"sentence-transformers[onnx]>=3.2\"'."
+            )
+
+        logger.info(f"Exporting {target} int8 ONNX model to {os.path.join(model_path, file_name)}")
+        export_kwargs = {key: value for key, value in ort_kwargs.items() if key != "file_name"}
+        float_model = SentenceTransformer(model_path, backend="onnx", model_kwargs=export_kwargs, **kwargs)
+        export_dynamic_quantized_onnx_model(float_model, target, model_path)
+        return file_name
+
+    def warmup(self, background: bool = False) -> Optional[threading.Thread]:
+        """
+        Load the model ahead of the first embed call.
+
+        Args:
+            background (bool, optional): Load on a daemon thread instead of blocking. Defaults to False.
+        Returns:
+            threading.Thread: The loading thread when `background` is True, otherwise None.
+        """
+        if not background:
+            self.model
+            return None
+        thread = threading.Thread(target=lambda: self.model, name="jmemory-embedder-warmup", daemon=True)
+        thread.start()
+        return thread
 
     def _get_or_download_model(self, model_path: str) -> str:
         """
@@ -43,14 +183,14 @@ class HuggingFaceEmbedding(EmbeddingBase):
         if model_path.startswith("/models/"):
             hf_model_name = self._local_to_hf_name(model_path)
             if hf_model_name:
-                print(f"Local model path {model_path} not found, downloading {hf_model_name} from HuggingFace...")
+                logger.info(f"Local model path {model_path} not found, downloading {hf_model_name} from HuggingFace...")
                 # Download and cache
                 temp_model = SentenceTransformer(hf_model_name)
                 # Create cache directory if it doesn't exist
                 os.makedirs(os.path.dirname(model_path), exist_ok=True)
                 # Save to cache location
                 temp_model.save(model_path)
-                print(f"Model cached to {model_path}")
+                logger.info(f"Model cached to {model_path}")
                 return model_path
         
         # Otherwise assume it's a HuggingFace model name
@@ -76,3 +216,17 @@ class HuggingFaceEmbedding(EmbeddingBase):
             list: The embedding vector.
         """
         return self.model.encode(text, convert_to_numpy=True).tolist()
+
+    def embed_batch(self, texts: List[str], memory_action: Optional[Literal["add", "search", "update"]] = None):
+        """
+        Get the embeddings for a list of texts using Hugging Face in a single forward pass.
+
+        Args:
+            texts (list): The texts to embed.
+            memory_action (optional): The type of embedding to use. Must be one of "add", "search", or "update". Defaults to None.
+        Returns:
+            list: The embedding vectors, in the same order as `texts`.
+        """
+        if not texts:
+            return []
+        return self.model.encode(list(texts), convert_to_numpy=True).tolist()
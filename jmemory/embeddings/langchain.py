@@ -1,4 +1,4 @@
-from typing import Literal, Optional
+from typing import List, Literal, Optional
 
 from jmemory.configs.embeddings.base import BaseEmbedderConfig
 from jmemory.embeddings.base import EmbeddingBase
@@ -33,3 +33,17 @@ class LangchainEmbedding(EmbeddingBase):
         """
 
         return self.langchain_model.embed_query(text)
+
+    def embed_batch(self, texts: List[str], memory_action: Optional[Literal["add", "search", "update"]] = None):
+        """
+        Get the embeddings for a list of texts using Langchain in a single call.
+
+        Args:
+            texts (list): The texts to embed.
+            memory_action (optional): The type of embedding to use. Must be one of "add", "search", or "update". Defaults to None.
+        Returns:
+            list: The embedding vectors, in the same order as `texts`.
+        """
+        if not texts:
+            return []
+        return self.langchain_model.embed_documents(list(texts))
@@ -1,9 +1,10 @@
-from typing import Literal, Optional
+from typing import List, Literal, Optional
 
 from openai import OpenAI
 
 from jmemory.configs.embeddings.base import BaseEmbedderConfig
 from jmemory.embeddings.base import EmbeddingBase
+from jmemory.utils.http import shared_client
 
 
 class LMStudioEmbedding(EmbeddingBase):
@@ -14,7 +15,7 @@ class LMStudioEmbedding(EmbeddingBase):
         self.config.embedding_dims = self.config.embedding_dims or 1536
         self.config.api_key = self.config.api_key or "lm-studio"
 
-        self.client = OpenAI(base_url=self.config.lmstudio_base_url, api_key=self.config.api_key)
+        self.client = shared_client(OpenAI, base_url=self.config.lmstudio_base_url, api_key=self.config.api_key)
 
     def embed(self, text, memory_action: Optional[Literal["add", "search", "update"]] = None):
         """
@@ -27,3 +28,19 @@ class LMStudioEmbedding(EmbeddingBase):
         """
         text = text.replace("\n", " ")
         return self.client.embeddings.create(input=[text], model=self.config.model).data[0].embedding
+
+    def embed_batch(self, texts: List[str], memory_action: Optional[Literal["add", "search", "update"]] = None):
+        """
+        Get the embeddings for a list of texts using LM Studio in a single request.
+
+        Args:
+            texts (list): The texts to embed.
+            memory_action (optional): The type of embedding to use. Must be one of "add", "search", or "update". Defaults to None.
+        Returns:
+            list: The embedding vectors, in the same order as `texts`.
+        """
+        if not texts:
+            return []
+        texts = [text.replace("\n", " ") for text in texts]
+        response = self.client.embeddings.create(input=texts, model=self.config.model)
+        return [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
@@ -1,9 +1,10 @@
 import subprocess
 import sys
-from typing import Literal, Optional
+from typing import List, Literal, Optional
 
 from jmemory.configs.embeddings.base import BaseEmbedderConfig
 from jmemory.embeddings.base import EmbeddingBase
+from jmemory.utils.http import shared_client
 
 try:
     from ollama import Client
@@ -28,7 +29,7 @@ class OllamaEmbedding(EmbeddingBase):
         self.config.model = self.config.model or "nomic-embed-text"
         self.config.embedding_dims = self.config.embedding_dims or 512
 
-        self.client = Client(host=self.config.ollama_base_url)
+        self.client = shared_client(Client, http_client_param=None, host=self.config.ollama_base_url)
         self._ensure_model_exists()
 
     def _ensure_model_exists(self):
@@ -51,3 +52,18 @@ class OllamaEmbedding(EmbeddingBase):
         """
         response = self.client.embeddings(model=self.config.model, prompt=text)
         return response["embedding"]
+
+    def embed_batch(self, texts: List[str], memory_action: Optional[Literal["add", "search", "update"]] = None):
+        """
+        Get the embeddings for a list of texts using Ollama in a single request.
+
+        Args:
+            texts (list): The texts to embed.
+            memory_action (optional): The type of embedding to use. Must be one of "add", "search", or "update". Defaults to None.
+        Returns:
+            list: The embedding vectors, in the same order as `texts`.
+        """
+        if not texts:
+            return []
+        response = self.client.embed(model=self.config.model, input=list(texts))
+        return response["embeddings"]
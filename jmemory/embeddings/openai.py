@@ -1,11 +1,15 @@
 import os
 import warnings
-from typing import Literal, Optional
+from typing import List, Literal, Optional
 
 from openai import OpenAI
 
 from jmemory.configs.embeddings.base import BaseEmbedderConfig
 from jmemory.embeddings.base import EmbeddingBase
+from jmemory.utils.http import shared_client
+
+# Most inputs the embeddings endpoint accepts in one request.
+MAX_BATCH_INPUTS = 2048
 
 
 class OpenAIEmbeddingConfig(BaseEmbedderConfig):
@@ -36,7 +40,7 @@ class OpenAIEmbedding(EmbeddingBase):
                 DeprecationWarning,
             )
 
-        self.client = OpenAI(api_key=api_key, base_url=base_url)
+        self.client = shared_client(OpenAI, api_key=api_key, base_url=base_url)
 
     def embed(self, text, memory_action: Optional[Literal["add", "search", "update"]] = None):
         """
@@ -54,3 +58,26 @@ class OpenAIEmbedding(EmbeddingBase):
             .data[0]
             .embedding
         )
+
+    def embed_batch(self, texts: List[str], memory_action: Optional[Literal["add", "search", "update"]] = None):
+        """
+        Get the embeddings for a list of texts using OpenAI, in one request per `MAX_BATCH_INPUTS` texts.
+
+        Args:
+            texts (list): The texts to embed.
+            memory_action (optional): The type of embedding to use. Must be one of "add", "search", or "update". Defaults to None.
+        Returns:
+            list: The embedding vectors, in the same order as `texts`.
+        """
+        if not texts:
+            return []
+        texts = [text.replace("\n", " ") for text in texts]
+        embeddings = []
+        for start in range(0, len(texts), MAX_BATCH_INPUTS):
+            response = self.client.embeddings.create(
+                input=texts[start : start + MAX_BATCH_INPUTS],
+                model=self.config.model,
+                dimensions=self.config.embedding_dims,
+            )
+            embeddings.extend(item.embedding for item in sorted(response.data, key=lambda item: item.index))
+        return embeddings
@@ -0,0 +1,194 @@
+"""
+Shared local embedding sidecar.
+
+One process loads the model and serves every jmemory process on the host, so the weights are held once and
+requests from all of them are fused by a single `BatchingEmbedding`:
+
+    python -m jmemory.embeddings.sidecar --port 8765 --model /models/bge-small-en-v1.5 --backend onnx
+
+Point `MemoryConfig.embedding_sidecar_url` at it (e.g. "http://127.0.0.1:8765") to use it from `Memory`.
+"""
+
+import argparse
+import json
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Literal, Optional
+
+import httpx
+
+from jmemory.configs.embeddings.base import BaseEmbedderConfig
+from jmemory.embeddings.base import EmbeddingBase
+from jmemory.embeddings.batching import BatchingEmbedding
+
+logger = logging.getLogger(__name__)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: "EmbeddingSidecar"
+
+    def _reply(self, status: int, body: dict) -> None:
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path != "/info":
+            return self._reply(404, {"error": f"Unknown path {self.path}"})
+        config = self.server.embedder.config
+        self._reply(200, {"model": config.model, "embedding_dims": config.embedding_dims})
+
+    def do_POST(self):
+        if self.path != "/embed":
+            return self._reply(404, {"error": f"Unknown path {self.path}"})
+        try:
+            request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+            embeddings = self.server.embedder.embed_batch(request["texts"], request.get("memory_action"))
+        except (ValueError, KeyError, TypeError) as e:
+            return self._reply(400, {"error": str(e)})
+        except Exception as e:
+            logger.exception("Embedding request failed")
+            return self._reply(500, {"error": str(e)})
+        self._reply(200, {"embeddings": embeddings})
+
+    def log_message(self, format, *args):
+        logger.debug(format, *args)
+
+
+class EmbeddingSidecar(ThreadingHTTPServer):
+    """
+    HTTP server exposing an embedder to other processes.
+
+    `GET /info` returns the model and embedding dims; `POST /embed` takes `{"texts": [...], "memory_action": ...}`
+    and returns `{"embeddings": [...]}`. Each connection is handled on its own thread and all of them go through
+    one `BatchingEmbedding`, so concurrent clients share forward passes.
+
+    Args:
+        embedder (EmbeddingBase): The embedder to serve.
+        host (str, optional): Interface to bind. Defaults to "127.0.0.1".
+        port (int, optional): Port to bind; 0 picks a free one. Defaults to 8765.
+        max_batch_size (int, optional): See `BatchingEmbedding`. Defaults to 64.
+        max_wait (float, optional): See `BatchingEmbedding`. Defaults to 0.003.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        embedder: EmbeddingBase,
+        host: str = "127.0.0.1",
+        port: int = 8765,
+        max_batch_size: int = 64,
+        max_wait: float = 0.003,
+    ):
+        self.embedder = BatchingEmbedding(embedder, max_batch_size=max_batch_size, max_wait=max_wait)
+        self._thread = None
+        super().__init__((host, port), _Handler)
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "EmbeddingSidecar":
+        """Serve on a background thread."""
+        self._thread = threading.Thread(target=self.serve_forever, name="jmemory-embed-sidecar", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop serving and close the batching dispatcher."""
+        self.shutdown()
+        self.server_close()
+        self.embedder.close()
+
+
+class RemoteEmbedding(EmbeddingBase):
+    """Embedder backed by an `EmbeddingSidecar`.
+
+    :param url: Base URL of the sidecar, e.g. "http://127.0.0.1:8765"
+    :type url: str
+    :param timeout: Request timeout in seconds, defaults to 30
+    :type timeout: float, optional
+    """
+
+    def __init__(self, url: str, timeout: float = 30.0):
+        self.client = httpx.Client(base_url=url, timeout=timeout)
+        info = self.client.get("/info").raise_for_status().json()
+        super().__init__(BaseEmbedderConfig(model=info["model"], embedding_dims=info["embedding_dims"]))
+
+    def embed(self, text, memory_action: Optional[Literal["add", "search", "update"]] = None):
+        """
+        Get the embedding for the given text from the sidecar.
+
+        Args:
+            text (str): The text to embed.
+            memory_action (optional): The type of embedding to use. Must be one of "add", "search", or "update". Defaults to None.
+        Returns:
+            list: The embedding vector.
+        """
+        return self.embed_batch([text], memory_action)[0]
+
+    def embed_batch(self, texts: List[str], memory_action: Optional[Literal["add", "search", "update"]] = None):
+        """
+        Get the embeddings for a list of texts from the sidecar in a single request.
+
+        Args:
+            texts (list): The texts to embed.
+            memory_action (optional): The type of embedding to use. Must be one of "add", "search", or "update". Defaults to None.
+        Returns:
+            list: The embedding vectors, in the same order as `texts`.
+        """
+        if not texts:
+            return []
+        response = self.client.post("/embed", json={"texts": list(texts), "memory_action": memory_action})
+        return response.raise_for_status().json()["embeddings"]
+
+    def close(self) -> None:
+        self.client.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--model", default="/models/bge-large-en-v1.5")
+    parser.add_argument("--device", default=None, help="Defaults to auto-detection")
+    parser.add_argument("--backend", choices=["torch", "onnx"], default="torch")
+    parser.add_argument("--quantize", action="store_true", help="Use an int8 ONNX model (onnx backend only)")
+    parser.add_argument("--num-threads", type=int, default=None)
+    parser.add_argument("--max-batch-size", type=int, default=64)
+    parser.add_argument("--max-wait-ms", type=float, default=3.0)
+    args = parser.parse_args()
+
+    from jmemory.embeddings.huggingface import HuggingFaceEmbedding
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    config = BaseEmbedderConfig(
+        model=args.model,
+        model_kwargs={"device": args.device} if args.device else None,
+        backend=args.backend,
+        quantize=args.quantize or None,
+        num_threads=args.num_threads,
+    )
+    embedder = HuggingFaceEmbedding(config)
+    embedder.warmup()
+    sidecar = EmbeddingSidecar(
+        embedder, args.host, args.port, max_batch_size=args.max_batch_size, max_wait=args.max_wait_ms / 1000
+    )
+    logger.info(f"Serving {args.model} on {sidecar.url}")
+    try:
+        sidecar.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        sidecar.server_close()
+        sidecar.embedder.close()
+
+
+if __name__ == "__main__":
+    main()
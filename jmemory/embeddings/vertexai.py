@@ -1,5 +1,5 @@
 import os
-from typing import Literal, Optional
+from typing import List, Literal, Optional
 
 from vertexai.language_models import TextEmbeddingInput, TextEmbeddingModel
 
@@ -31,6 +31,13 @@ class VertexAIEmbedding(EmbeddingBase):
 
         self.model = TextEmbeddingModel.from_pretrained(self.config.model)
 
+    def _get_embedding_type(self, memory_action):
+        if memory_action is None:
+            return "SEMANTIC_SIMILARITY"
+        if memory_action not in self.embedding_types:
+            raise ValueError(f"Invalid memory action: {memory_action}")
+        return self.embedding_types[memory_action]
+
     def embed(self, text, memory_action: Optional[Literal["add", "search", "update"]] = None):
         """
         Get the embedding for the given text using Vertex AI.
@@ -41,14 +48,25 @@ class VertexAIEmbedding(EmbeddingBase):
         Returns:
             list: The embedding vector.
         """
-        embedding_type = "SEMANTIC_SIMILARITY"
-        if memory_action is not None:
-            if memory_action not in self.embedding_types:
-                raise ValueError(f"Invalid memory action: {memory_action}")
-
-            embedding_type = self.embedding_types[memory_action]
-
+        embedding_type = self._get_embedding_type(memory_action)
         text_input = TextEmbeddingInput(text=text, task_type=embedding_type)
         embeddings = self.model.get_embeddings(texts=[text_input], output_dimensionality=self.config.embedding_dims)
 
         return embeddings[0].values
+
+    def embed_batch(self, texts: List[str], memory_action: Optional[Literal["add", "search", "update"]] = None):
+        """
+        Get the embeddings for a list of texts using Vertex AI in a single request.
+
+        Args:
+            texts (list): The texts to embed.
+            memory_action (optional): The type of embedding to use. Must be one of "add", "search", or "update". Defaults to None.
+        Returns:
+            list: The embedding vectors, in the same order as `texts`.
+        """
+        if not texts:
+            return []
+        embedding_type = self._get_embedding_type(memory_action)
+        text_inputs = [TextEmbeddingInput(text=text, task_type=embedding_type) for text in texts]
+        embeddings = self.model.get_embeddings(texts=text_inputs, output_dimensionality=self.config.embedding_dims)
+        return [embedding.values for embedding in embeddings]
@@ -9,7 +9,7 @@ logger = logging.getLogger(__name__)
 
 
 class MemoryGraph:
-    def __init__(self, config):
+    def __init__(self, config, embedding_dims=None):
         self.config = config
         self.graph = Memgraph(
             self.config.graph_store.url,
@@ -20,7 +20,9 @@ class MemoryGraph:
         # Setup Memgraph:
         # 1. Create vector index (created Entity label on all nodes)
         # 2. Create label property index for performance optimizations
-        embedding_dims = self.config.embedder.config.embedding_dims
+        embedding_dims = embedding_dims or self.config.embedder.config.get("embedding_dims")
+        if not embedding_dims:
+            raise ValueError("MemoryGraph needs embedding_dims, or `embedding_dims` in the embedder config")
         create_vector_index_query = f"CREATE VECTOR INDEX memzero ON :Entity(embedding) WITH CONFIG {{'dimension': {embedding_dims}, 'capacity': 1000, 'metric': 'cos'}};"
         self.graph.query(create_vector_index_query, params={})
         create_label_prop_index_query = "CREATE INDEX ON :Entity(user_id);"
@@ -31,20 +33,19 @@ class MemoryGraph:
     def add(self, data, filters):
         # This is a simplified version. In a real implementation, this would be much more complex.
         # It would involve using an LLM to extract entities and relationships from the data.
-        print(f"Adding data to graph: {data} with filters {filters}")
-        # For now, we'll just print a message.
+        logger.debug(f"Adding data to graph: {data} with filters {filters}")
 
     def search(self, query, filters, limit=100):
         # This is a simplified version. In a real implementation, this would be much more complex.
         # It would involve querying the graph database for relevant entities and relationships.
-        print(f"Searching graph for query: {query} with filters {filters}")
+        logger.debug(f"Searching graph for query: {query} with filters {filters}")
         return []
 
-    def delete_all(self, filters):
-        print(f"Deleting all graph memories with filters {filters}")
+    def delete_all(self, filters=None):
+        logger.debug(f"Deleting all graph memories with filters {filters}")
         # This is a simplified version. In a real implementation, this would be much more complex.
         # It would involve deleting all nodes and relationships for the given filters.
 
     def get_all(self, filters, limit=100):
-        print(f"Getting all graph memories with filters {filters}")
+        logger.debug(f"Getting all graph memories with filters {filters}")
         return []
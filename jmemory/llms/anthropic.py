@@ -8,6 +8,8 @@ except ImportError:
 
 from jmemory.configs.llms.base import BaseLlmConfig
 from jmemory.llms.base import LLMBase
+from jmemory.memory.telemetry import record_usage
+from jmemory.utils.http import shared_client
 
 
 class AnthropicLLM(LLMBase):
@@ -18,7 +20,7 @@ class AnthropicLLM(LLMBase):
             self.config.model = "claude-3-5-sonnet-20240620"
 
         api_key = self.config.api_key or os.getenv("ANTHROPIC_API_KEY")
-        self.client = anthropic.Anthropic(api_key=api_key)
+        self.client = shared_client(anthropic.Anthropic, api_key=api_key)
 
     def generate_response(
         self,
@@ -61,4 +63,6 @@ class AnthropicLLM(LLMBase):
             params["tool_choice"] = tool_choice
 
         response = self.client.messages.create(**params)
+
+        record_usage(response, self.config.model)
         return response.content[0].text
@@ -6,6 +6,8 @@ from openai import AzureOpenAI
 
 from jmemory.configs.llms.base import BaseLlmConfig
 from jmemory.llms.base import LLMBase
+from jmemory.memory.telemetry import record_usage
+from jmemory.utils.http import shared_client
 
 
 class AzureOpenAILLM(LLMBase):
@@ -22,7 +24,8 @@ class AzureOpenAILLM(LLMBase):
         api_version = self.config.azure_kwargs.api_version or os.getenv("LLM_AZURE_API_VERSION")
         default_headers = self.config.azure_kwargs.default_headers
 
-        self.client = AzureOpenAI(
+        self.client = shared_client(
+            AzureOpenAI,
             azure_deployment=azure_deployment,
             azure_endpoint=azure_endpoint,
             api_version=api_version,
@@ -102,4 +105,6 @@ class AzureOpenAILLM(LLMBase):
             params["tool_choice"] = tool_choice
 
         response = self.client.chat.completions.create(**params)
+
+        record_usage(response, self.config.model)
         return self._parse_response(response, tools)
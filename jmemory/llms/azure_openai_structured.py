@@ -5,6 +5,8 @@ from openai import AzureOpenAI
 
 from jmemory.configs.llms.base import BaseLlmConfig
 from jmemory.llms.base import LLMBase
+from jmemory.memory.telemetry import record_usage
+from jmemory.utils.http import shared_client
 
 
 class AzureOpenAIStructuredLLM(LLMBase):
@@ -22,7 +24,8 @@ class AzureOpenAIStructuredLLM(LLMBase):
         default_headers = self.config.azure_kwargs.default_headers
 
         # Can display a warning if API version is of model and api-version
-        self.client = AzureOpenAI(
+        self.client = shared_client(
+            AzureOpenAI,
             azure_deployment=azure_deployment,
             azure_endpoint=azure_endpoint,
             api_version=api_version,
@@ -67,4 +70,6 @@ class AzureOpenAIStructuredLLM(LLMBase):
             params["tool_choice"] = tool_choice
 
         response = self.client.chat.completions.create(**params)
+
+        record_usage(response, self.config.model)
         return self._parse_response(response, tools)
@@ -1,7 +1,53 @@
+import functools
+import inspect
+import json
 from abc import ABC, abstractmethod
 from typing import Dict, List, Optional
 
 from jmemory.configs.llms.base import BaseLlmConfig
+from jmemory.llms.cache import MISS, cache_from_config, describe_request
+from jmemory.memory.telemetry import telemetry, text_bytes
+
+
+def _cached(generate_response):
+    """
+    Route calls to a provider's `generate_response` through the instance's response cache, if any, and time
+    them as "llm.generate" spans.
+    """
+    signature = inspect.signature(generate_response)
+
+    def generate(self, *args, **kwargs):
+        cache = getattr(self, "cache", None)
+        if cache is None:
+            return generate_response(self, *args, **kwargs)
+
+        bound = signature.bind(self, *args, **kwargs)
+        bound.apply_defaults()
+        arguments = {name: value for name, value in bound.arguments.items() if name != "self"}
+        request = describe_request(self, arguments)
+        response, vector = cache.lookup(request)
+        if response is MISS:
+            response = generate_response(self, *args, **kwargs)
+            cache.store(request, response, vector)
+        else:
+            telemetry.count("llm.cache_hits", model=self.config.model)
+        return response
+
+    @functools.wraps(generate_response)
+    def wrapper(self, *args, **kwargs):
+        if not telemetry.enabled:
+            return generate(self, *args, **kwargs)
+        provider = type(self).__name__
+        with telemetry.span("llm.generate", provider=provider, model=self.config.model):
+            response = generate(self, *args, **kwargs)
+        messages = kwargs.get("messages", args[0] if args else None)
+        model = self.config.model
+        telemetry.count("llm.calls", provider=provider, model=model)
+        telemetry.count("llm.request_bytes", text_bytes(json.dumps(messages, default=str)), model=model)
+        telemetry.count("llm.response_bytes", text_bytes(json.dumps(response, default=str)), model=model)
+        return response
+
+    return wrapper
 
 
 class LLMBase(ABC):
@@ -15,6 +61,13 @@ class LLMBase(ABC):
             self.config = BaseLlmConfig()
         else:
             self.config = config
+        # Responses are cached when the config sets `cache_mode`; assign an `LLMResponseCache` to plug in another.
+        self.cache = cache_from_config(self.config)
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if "generate_response" in cls.__dict__:
+            cls.generate_response = _cached(cls.__dict__["generate_response"])
 
     @abstractmethod
     def generate_response(self, messages, tools: Optional[List[Dict]] = None, tool_choice: str = "auto"):
@@ -0,0 +1,303 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+from jmemory.configs.base import jmemory_dir
+
+logger = logging.getLogger(__name__)
+
+CACHE_MODES = ("exact", "semantic")
+# Returned by `LLMResponseCache.lookup` on a miss; None is a legitimate cached response.
+MISS = object()
+
+
+def _digest(value: Any) -> str:
+    return hashlib.sha256(json.dumps(value, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+class LLMResponseCache:
+    """Cache of LLM responses keyed on the full request.
+
+    The key covers the provider, model, temperature and every `generate_response` argument (messages, tools,
+    tool_choice, response_format, ...). In "semantic" mode a miss on the exact key falls back to the cached
+    request whose last message is closest in embedding space, provided everything else about the request
+    (system prompt, earlier messages, tools, model) is identical and the cosine similarity reaches
+    `similarity_threshold`. Entries expire after `ttl` seconds; an in-process LRU of `max_size` entries sits in
+    front of an optional SQLite tier that survives restarts.
+
+    :param mode: "exact" or "semantic", defaults to "exact"
+    :type mode: str, optional
+    :param max_size: Maximum number of responses kept in the in-process LRU, defaults to 1024
+    :type max_size: int, optional
+    :param ttl: Seconds a response stays valid, defaults to 24 hours. None never expires.
+    :type ttl: Optional[float], optional
+    :param db_path: Path of the SQLite tier, defaults to `llm_cache.db` under `jmemory_dir`.
+        Pass ":memory:" to keep it in memory or `False` to disable it.
+    :type db_path: Optional[str], optional
+    :param embedder: Embedder used to compare prompts in semantic mode; can be attached later
+    :type embedder: Optional[EmbeddingBase], optional
+    :param similarity_threshold: Minimum cosine similarity for a semantic hit, defaults to 0.95
+    :type similarity_threshold: float, optional
+    """
+
+    def __init__(
+        self,
+        mode: str = "exact",
+        max_size: int = 1024,
+        ttl: Optional[float] = 24 * 60 * 60,
+        db_path: Optional[str] = None,
+        embedder=None,
+        similarity_threshold: float = 0.95,
+    ):
+        if mode not in CACHE_MODES:
+            raise ValueError(f"Unknown cache mode {mode!r}, expected one of {CACHE_MODES}")
+        self.mode = mode
+        self.max_size = max_size
+        self.ttl = ttl
+        self.embedder = embedder
+        self.similarity_threshold = similarity_threshold
+        self.hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+
+        # key -> (scope, expires_at, response)
+        self._lru: "OrderedDict[str, Tuple[str, float, Any]]" = OrderedDict()
+        # scope -> {key: normalized prompt embedding}; filled from disk the first time a scope is seen
+        self._vectors: Dict[str, Dict[str, np.ndarray]] = {}
+        self._lock = threading.Lock()
+
+        if db_path is False:
+            self.connection = None
+        else:
+            db_path = db_path or os.path.join(jmemory_dir, "llm_cache.db")
+            if db_path != ":memory:":
+                os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+            self.connection = sqlite3.connect(db_path, check_same_thread=False)
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS llm_responses (
+                    key         TEXT PRIMARY KEY,
+                    scope       TEXT,
+                    embedding   BLOB,
+                    response    TEXT,
+                    expires_at  REAL
+                )
+                """
+            )
+            self.connection.execute("CREATE INDEX IF NOT EXISTS idx_llm_responses_scope ON llm_responses (scope)")
+            self.connection.commit()
+
+    @staticmethod
+    def request_keys(request: Dict[str, Any]) -> Tuple[str, str, str]:
+        """
+        Derive the exact key, the semantic scope and the prompt text of a request.
+
+        Args:
+            request (dict): Provider, model, temperature and the `generate_response` arguments.
+
+        Returns:
+            tuple: (key, scope, prompt). The scope hashes the request with the content of the last message
+            blanked out; the prompt is that content.
+        """
+        messages = request.get("arguments", {}).get("messages") or []
+        prompt = ""
+        scoped = request
+        if messages and isinstance(messages[-1], dict):
+            prompt = str(messages[-1].get("content", ""))
+            arguments = dict(request["arguments"], messages=[*messages[:-1], {**messages[-1], "content": None}])
+            scoped = dict(request, arguments=arguments)
+        return _digest(request), _digest(scoped), prompt
+
+    def _expires_at(self) -> float:
+        return time.time() + self.ttl if self.ttl is not None else float("inf")
+
+    def _remember(self, key: str, scope: str, expires_at: float, response: Any) -> None:
+        self._lru[key] = (scope, expires_at, response)
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.max_size:
+            self._lru.popitem(last=False)
+
+    def _get(self, key: str) -> Any:
+        """Look `key` up in the LRU and then on disk. Must be called with the lock held."""
+        now = time.time()
+        if key in self._lru:
+            scope, expires_at, response = self._lru[key]
+            if expires_at > now:
+                self._lru.move_to_end(key)
+                return response
+            del self._lru[key]
+        if self.connection:
+            row = self.connection.execute(
+                "SELECT scope, response, expires_at FROM llm_responses WHERE key = ? AND expires_at > ?", (key, now)
+            ).fetchone()
+            if row:
+                response = json.loads(row[1])
+                self._remember(key, row[0], row[2], response)
+                return response
+        return MISS
+
+    def _embed(self, prompt: str) -> Optional[np.ndarray]:
+        if self.mode != "semantic" or self.embedder is None or not prompt:
+            return None
+        vector = np.asarray(self.embedder.embed(prompt), dtype=np.float32)
+        return vector / (np.linalg.norm(vector) + 1e-12)
+
+    def _scope_vectors(self, scope: str) -> Dict[str, np.ndarray]:
+        """Embeddings of the cached prompts in `scope`. Must be called with the lock held."""
+        if scope not in self._vectors:
+            vectors = {}
+            if self.connection:
+                rows = self.connection.execute(
+                    "SELECT key, embedding FROM llm_responses "
+                    "WHERE scope = ? AND embedding IS NOT NULL AND expires_at > ?",
+                    (scope, time.time()),
+                ).fetchall()
+                vectors = {key: np.frombuffer(blob, dtype=np.float32) for key, blob in rows}
+            self._vectors[scope] = vectors
+        return self._vectors[scope]
+
+    def _nearest(self, scope: str, vector: np.ndarray) -> Any:
+        """Return the response of the most similar cached prompt in `scope`. Must be called with the lock held."""
+        candidates = self._scope_vectors(scope)
+        while candidates:
+            keys = list(candidates)
+            scores = np.stack([candidates[key] for key in keys]) @ vector
+            best = int(np.argmax(scores))
+            if scores[best] < self.similarity_threshold:
+                return MISS
+            response = self._get(keys[best])
+            if response is not MISS:
+                return response
+            # Expired or evicted everywhere; forget it and try the next best.
+            del candidates[keys[best]]
+        return MISS
+
+    def lookup(self, request: Dict[str, Any]) -> Tuple[Any, Optional[np.ndarray]]:
+        """
+        Find a cached response for `request`.
+
+        Args:
+            request (dict): Provider, model, temperature and the `generate_response` arguments.
+
+        Returns:
+            tuple: (response or `MISS`, prompt embedding to pass to `store`).
+        """
+        key, scope, prompt = self.request_keys(request)
+        with self._lock:
+            response = self._get(key)
+            if response is not MISS:
+                self.hits += 1
+                return response, None
+        vector = self._embed(prompt)
+        with self._lock:
+            if vector is not None:
+                response = self._nearest(scope, vector)
+                if response is not MISS:
+                    self.hits += 1
+                    self.semantic_hits += 1
+                    return response, vector
+            self.misses += 1
+        return MISS, vector
+
+    def store(self, request: Dict[str, Any], response: Any, vector: Optional[np.ndarray] = None) -> None:
+        """
+        Cache `response` for `request`. Responses that are not JSON serializable are skipped.
+
+        Args:
+            request (dict): Provider, model, temperature and the `generate_response` arguments.
+            response: The LLM response.
+            vector (np.ndarray, optional): Prompt embedding returned by `lookup`.
+        """
+        try:
+            serialized = json.dumps(response)
+        except (TypeError, ValueError):
+            logger.debug(f"Not caching a {type(response).__name__} LLM response: not JSON serializable")
+            return
+        key, scope, _ = self.request_keys(request)
+        expires_at = self._expires_at()
+        with self._lock:
+            self._remember(key, scope, expires_at, json.loads(serialized))
+            if self.connection:
+                blob = array("f", vector.tolist()).tobytes() if vector is not None else None
+                self.connection.execute(
+                    "INSERT OR REPLACE INTO llm_responses (key, scope, embedding, response, expires_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (key, scope, blob, serialized, expires_at),
+                )
+                self.connection.execute("DELETE FROM llm_responses WHERE expires_at <= ?", (time.time(),))
+                self.connection.commit()
+            if vector is not None:
+                self._scope_vectors(scope)[key] = vector
+
+    def stats(self) -> dict:
+        """
+        Get the cache counters.
+
+        Returns:
+            dict: Hits (of which semantic), misses and the current LRU size.
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "semantic_hits": self.semantic_hits,
+                "misses": self.misses,
+                "size": len(self._lru),
+            }
+
+    def clear(self) -> None:
+        """Drop every cached response and reset the counters."""
+        with self._lock:
+            self._lru.clear()
+            self._vectors.clear()
+            self.hits = self.semantic_hits = self.misses = 0
+            if self.connection:
+                self.connection.execute("DELETE FROM llm_responses")
+                self.connection.commit()
+
+    def close(self) -> None:
+        if self.connection:
+            self.connection.close()
+            self.connection = None
+
+
+def cache_from_config(config) -> Optional[LLMResponseCache]:
+    """Build the response cache described by the `cache_*` options of a `BaseLlmConfig`, if any."""
+    if not getattr(config, "cache_mode", None):
+        return None
+    return LLMResponseCache(
+        mode=config.cache_mode,
+        max_size=config.cache_size,
+        ttl=config.cache_ttl,
+        db_path=config.cache_path,
+        similarity_threshold=config.cache_similarity_threshold,
+    )
+
+
+def attach_embedder(llm, embedder) -> None:
+    """Let the response cache of `llm`, if any, compare prompts with `embedder` in semantic mode."""
+    cache = getattr(llm, "cache", None)
+    if isinstance(cache, LLMResponseCache) and cache.embedder is None:
+        cache.embedder = embedder
+
+
+def describe_request(llm, arguments: Dict[str, Any]) -> Dict[str, Any]:
+    """The cache identity of a `generate_response` call on `llm`."""
+    config = llm.config
+    return {
+        "provider": type(llm).__name__,
+        "model": config.model,
+        "temperature": getattr(config, "temperature", None),
+        "top_p": getattr(config, "top_p", None),
+        "max_tokens": getattr(config, "max_tokens", None),
+        "arguments": arguments,
+    }
@@ -6,6 +6,8 @@ from openai import OpenAI
 
 from jmemory.configs.llms.base import BaseLlmConfig
 from jmemory.llms.base import LLMBase
+from jmemory.memory.telemetry import record_usage
+from jmemory.utils.http import shared_client
 
 
 class DeepSeekLLM(LLMBase):
@@ -17,7 +19,7 @@ class DeepSeekLLM(LLMBase):
 
         api_key = self.config.api_key or os.getenv("DEEPSEEK_API_KEY")
         base_url = self.config.deepseek_base_url or os.getenv("DEEPSEEK_API_BASE") or "https://api.deepseek.com"
-        self.client = OpenAI(api_key=api_key, base_url=base_url)
+        self.client = shared_client(OpenAI, api_key=api_key, base_url=base_url)
 
     def _parse_response(self, response, tools):
         """
@@ -81,4 +83,6 @@ class DeepSeekLLM(LLMBase):
             params["tool_choice"] = tool_choice
 
         response = self.client.chat.completions.create(**params)
+
+        record_usage(response, self.config.model)
         return self._parse_response(response, tools)
@@ -9,6 +9,8 @@ except ImportError:
 
 from jmemory.configs.llms.base import BaseLlmConfig
 from jmemory.llms.base import LLMBase
+from jmemory.memory.telemetry import record_usage
+from jmemory.utils.http import shared_client
 
 
 class GroqLLM(LLMBase):
@@ -19,7 +21,7 @@ class GroqLLM(LLMBase):
             self.config.model = "llama3-70b-8192"
 
         api_key = self.config.api_key or os.getenv("GROQ_API_KEY")
-        self.client = Groq(api_key=api_key)
+        self.client = shared_client(Groq, api_key=api_key)
 
     def _parse_response(self, response, tools):
         """
@@ -84,4 +86,6 @@ class GroqLLM(LLMBase):
             params["tool_choice"] = tool_choice
 
         response = self.client.chat.completions.create(**params)
+
+        record_usage(response, self.config.model)
         return self._parse_response(response, tools)
@@ -8,6 +8,7 @@ except ImportError:
 
 from jmemory.configs.llms.base import BaseLlmConfig
 from jmemory.llms.base import LLMBase
+from jmemory.memory.telemetry import record_usage
 
 
 class LiteLLM(LLMBase):
@@ -83,4 +84,6 @@ class LiteLLM(LLMBase):
             params["tool_choice"] = tool_choice
 
         response = litellm.completion(**params)
+
+        record_usage(response, self.config.model)
         return self._parse_response(response, tools)
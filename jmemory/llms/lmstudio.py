@@ -4,6 +4,8 @@ from openai import OpenAI
 
 from jmemory.configs.llms.base import BaseLlmConfig
 from jmemory.llms.base import LLMBase
+from jmemory.memory.telemetry import record_usage
+from jmemory.utils.http import shared_client
 
 
 class LMStudioLLM(LLMBase):
@@ -16,7 +18,7 @@ class LMStudioLLM(LLMBase):
         )
         self.config.api_key = self.config.api_key or "lm-studio"
 
-        self.client = OpenAI(base_url=self.config.lmstudio_base_url, api_key=self.config.api_key)
+        self.client = shared_client(OpenAI, base_url=self.config.lmstudio_base_url, api_key=self.config.api_key)
 
     def generate_response(
         self,
@@ -50,4 +52,6 @@ class LMStudioLLM(LLMBase):
             params["response_format"] = self.config.lmstudio_response_format
 
         response = self.client.chat.completions.create(**params)
+
+        record_usage(response, self.config.model)
         return response.choices[0].message.content
@@ -7,6 +7,8 @@ except ImportError:
 
 from jmemory.configs.llms.base import BaseLlmConfig
 from jmemory.llms.base import LLMBase
+from jmemory.memory.telemetry import record_usage
+from jmemory.utils.http import shared_client
 
 
 class OllamaLLM(LLMBase):
@@ -15,7 +17,7 @@ class OllamaLLM(LLMBase):
 
         if not self.config.model:
             self.config.model = "llama3.1:70b"
-        self.client = Client(host=self.config.ollama_base_url)
+        self.client = shared_client(Client, http_client_param=None, host=self.config.ollama_base_url)
         self._ensure_model_exists()
 
     def _ensure_model_exists(self):
@@ -91,4 +93,6 @@ class OllamaLLM(LLMBase):
             params["tools"] = tools
 
         response = self.client.chat(**params)
+
+        record_usage(response, self.config.model)
         return self._parse_response(response, tools)
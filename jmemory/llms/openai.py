@@ -7,6 +7,8 @@ from openai import OpenAI
 
 from jmemory.configs.llms.base import BaseLlmConfig
 from jmemory.llms.base import LLMBase
+from jmemory.memory.telemetry import record_usage
+from jmemory.utils.http import shared_client
 
 
 class OpenAILLM(LLMBase):
@@ -17,7 +19,8 @@ class OpenAILLM(LLMBase):
             self.config.model = "gpt-4o-mini"
 
         if os.environ.get("OPENROUTER_API_KEY"):  # Use OpenRouter
-            self.client = OpenAI(
+            self.client = shared_client(
+                OpenAI,
                 api_key=os.environ.get("OPENROUTER_API_KEY"),
                 base_url=self.config.openrouter_base_url
                 or os.getenv("OPENROUTER_API_BASE")
@@ -38,7 +41,7 @@ class OpenAILLM(LLMBase):
                     DeprecationWarning,
                 )
 
-            self.client = OpenAI(api_key=api_key, base_url=base_url)
+            self.client = shared_client(OpenAI, api_key=api_key, base_url=base_url)
 
     def _parse_response(self, response, tools):
         """
@@ -120,4 +123,6 @@ class OpenAILLM(LLMBase):
             params["tool_choice"] = tool_choice
 
         response = self.client.chat.completions.create(**params)
+
+        record_usage(response, self.config.model)
         return self._parse_response(response, tools)
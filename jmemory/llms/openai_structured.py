@@ -5,6 +5,8 @@ from openai import OpenAI
 
 from jmemory.configs.llms.base import BaseLlmConfig
 from jmemory.llms.base import LLMBase
+from jmemory.memory.telemetry import record_usage
+from jmemory.utils.http import shared_client
 
 
 class OpenAIStructuredLLM(LLMBase):
@@ -16,7 +18,7 @@ class OpenAIStructuredLLM(LLMBase):
 
         api_key = self.config.api_key or os.getenv("OPENAI_API_KEY")
         base_url = self.config.openai_base_url or os.getenv("OPENAI_API_BASE") or "https://api.openai.com/v1"
-        self.client = OpenAI(api_key=api_key, base_url=base_url)
+        self.client = shared_client(OpenAI, api_key=api_key, base_url=base_url)
 
     def generate_response(
         self,
@@ -49,4 +51,6 @@ class OpenAIStructuredLLM(LLMBase):
             params["tool_choice"] = tool_choice
 
         response = self.client.beta.chat.completions.parse(**params)
+
+        record_usage(response, self.config.model)
         return response.choices[0].message.content
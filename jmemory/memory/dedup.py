@@ -0,0 +1,151 @@
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import unicodedata
+from typing import Any, Dict, List, Optional, Tuple
+
+# Columns that scope a hash: the same text is a duplicate only within one session and memory layer.
+SCOPE_KEYS = ("user_id", "agent_id", "run_id", "memory_type")
+
+_SPACE = re.compile(r"\s+")
+# Punctuation and symbols that do not change what a turn says: "Thanks!" repeats "thanks".
+_EDGE = " \t\n.,;:!?¡¿…'\"`()[]{}-–—~*_"
+
+
+def normalize_text(text: str) -> str:
+    """Case-fold, NFKC-normalize and collapse whitespace, dropping punctuation at either end."""
+    text = unicodedata.normalize("NFKC", text or "").casefold()
+    return _SPACE.sub(" ", text).strip(_EDGE)
+
+
+def content_hash(text: str) -> str:
+    """Hash of the normalized text, stored as the memory's `hash`."""
+    return hashlib.md5(normalize_text(text).encode("utf-8")).hexdigest()
+
+
+class ContentHashIndex:
+    """
+    Persistent index from normalized content hash to memory id, one entry per session and memory layer.
+
+    `Memory.add` consults it before embedding anything: a text whose hash is already known in its scope is a
+    repeat, which costs one primary key lookup and a mention count increment instead of an embedding, a vector
+    store upsert and, through the graph store, LLM calls.
+
+    Args:
+        db_path (str, optional): SQLite database path. Defaults to ":memory:".
+    """
+
+    def __init__(self, db_path: str = ":memory:"):
+        self.db_path = db_path
+        if db_path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self.connection = sqlite3.connect(db_path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute("PRAGMA synchronous=NORMAL")
+            self._create_tables()
+
+    def _create_tables(self) -> None:
+        with self.connection:
+            # Scope columns hold "" rather than NULL so that they can take part in the primary key.
+            self.connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS content_hashes (
+                    user_id     TEXT NOT NULL,
+                    agent_id    TEXT NOT NULL,
+                    run_id      TEXT NOT NULL,
+                    memory_type TEXT NOT NULL,
+                    hash        TEXT NOT NULL,
+                    memory_id   TEXT NOT NULL,
+                    mentions    INTEGER NOT NULL DEFAULT 1,
+                    PRIMARY KEY (user_id, agent_id, run_id, memory_type, hash)
+                ) WITHOUT ROWID
+                """
+            )
+            self.connection.execute(
+                "CREATE INDEX IF NOT EXISTS idx_content_hashes_memory ON content_hashes (memory_id)"
+            )
+
+    @staticmethod
+    def _scope(payload: Dict[str, Any]) -> Tuple[str, ...]:
+        return tuple(str(payload.get(key) or "") for key in SCOPE_KEYS)
+
+    def claim(
+        self, ids: List[str], hashes: List[str], payloads: List[Dict[str, Any]]
+    ) -> List[Optional[Tuple[str, int]]]:
+        """
+        Record new hashes and count the mentions of known ones, in one transaction.
+
+        Args:
+            ids (list): Ids the memories get if they are new.
+            hashes (list): Content hash of each memory.
+            payloads (list): Payload of each memory; its session ids and memory type scope the hash.
+
+        Returns:
+            list: None for each memory that is new (its id is now recorded), or (id of the existing memory,
+                mention count after this one) for each repeat, including repeats within `hashes`.
+        """
+        where = "user_id = ? AND agent_id = ? AND run_id = ? AND memory_type = ? AND hash = ?"
+        results = []
+        with self._lock, self.connection:
+            for memory_id, text_hash, payload in zip(ids, hashes, payloads):
+                key = (*self._scope(payload), text_hash)
+                inserted = self.connection.execute(
+                    "INSERT OR IGNORE INTO content_hashes (user_id, agent_id, run_id, memory_type, hash, memory_id) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (*key, memory_id),
+                ).rowcount
+                if inserted:
+                    results.append(None)
+                    continue
+                self.connection.execute(f"UPDATE content_hashes SET mentions = mentions + 1 WHERE {where}", key)
+                row = self.connection.execute(
+                    f"SELECT memory_id, mentions FROM content_hashes WHERE {where}", key
+                ).fetchone()
+                results.append((row[0], row[1]))
+        return results
+
+    def mentions(self, memory_id: str) -> int:
+        """Number of times the memory was added, or 0 if it is not indexed."""
+        with self._lock:
+            row = self.connection.execute(
+                "SELECT mentions FROM content_hashes WHERE memory_id = ?", (memory_id,)
+            ).fetchone()
+        return row[0] if row else 0
+
+    def update(self, memory_id: str, text_hash: str) -> None:
+        """Re-key a memory whose text changed. An entry of another memory with the new hash is replaced."""
+        with self._lock, self.connection:
+            self.connection.execute(
+                "UPDATE OR REPLACE content_hashes SET hash = ? WHERE memory_id = ?", (text_hash, memory_id)
+            )
+
+    def delete(self, ids: List[str]) -> None:
+        ids = list(ids)
+        with self._lock, self.connection:
+            for start in range(0, len(ids), 500):
+                chunk = ids[start : start + 500]
+                placeholders = ", ".join("?" for _ in chunk)
+                self.connection.execute(f"DELETE FROM content_hashes WHERE memory_id IN ({placeholders})", chunk)
+
+    def delete_by_filter(self, filters: Dict[str, Any]) -> None:
+        """Remove every entry in the session scope of `filters`."""
+        keys = [key for key in ("user_id", "agent_id", "run_id") if filters.get(key) is not None]
+        if not keys:
+            raise ValueError("delete_by_filter requires at least one of user_id, agent_id or run_id")
+        with self._lock, self.connection:
+            self.connection.execute(
+                f"DELETE FROM content_hashes WHERE {' AND '.join(f'{key} = ?' for key in keys)}",
+                [str(filters[key]) for key in keys],
+            )
+
+    def reset(self) -> None:
+        with self._lock, self.connection:
+            self.connection.execute("DELETE FROM content_hashes")
+
+    def close(self) -> None:
+        with self._lock:
+            self.connection.close()
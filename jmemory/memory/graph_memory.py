@@ -1,5 +1,12 @@
+import contextvars
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
+from jmemory.embeddings.cache import CachedEmbedding
+from jmemory.llms.cache import attach_embedder
+from jmemory.memory.lexical import bm25_rank, tokenize
+from jmemory.memory.telemetry import telemetry, traced
 from jmemory.memory.utils import format_entities
 
 try:
@@ -7,11 +14,6 @@ try:
 except ImportError:
     raise ImportError("langchain_neo4j is not installed. Please install it using pip install langchain-neo4j")
 
-try:
-    from rank_bm25 import BM25Okapi
-except ImportError:
-    raise ImportError("rank_bm25 is not installed. Please install it using pip install rank-bm25")
-
 from jmemory.graphs.tools import (
     DELETE_MEMORY_STRUCT_TOOL_GRAPH,
     DELETE_MEMORY_TOOL_GRAPH,
@@ -37,8 +39,10 @@ class MemoryGraph:
             refresh_schema=False,
             driver_config={"notifications_min_severity": "OFF"},
         )
-        self.embedding_model = EmbedderFactory.create(
-            self.config.embedder.provider, self.config.embedder.config, self.config.vector_store.config
+        self.embedding_model = CachedEmbedding(
+            EmbedderFactory.create(
+                self.config.embedder.provider, self.config.embedder.config, self.config.vector_store.config
+            )
         )
         self.node_label = ":`__Entity__`" if self.config.graph_store.config.base_label else ""
 
@@ -55,6 +59,31 @@ class MemoryGraph:
             except Exception:
                 pass
 
+        # The vector index needs a single label to cover, so it is only available with `base_label`.
+        self.vector_index = None
+        embedding_dims = self.config.embedder.config.get("embedding_dims") or getattr(
+            self.embedding_model.config, "embedding_dims", None
+        )
+        if self.config.graph_store.config.base_label and embedding_dims:
+            try:
+                self.graph.query(
+                    f"""
+                    CREATE VECTOR INDEX entity_embedding IF NOT EXISTS
+                    FOR (n {self.node_label}) ON (n.embedding)
+                    OPTIONS {{indexConfig: {{
+                        `vector.dimensions`: {int(embedding_dims)},
+                        `vector.similarity_function`: 'cosine'
+                    }}}}
+                    """
+                )
+                self.vector_index = "entity_embedding"
+            except Exception as e:
+                logger.warning(f"Could not create vector index, falling back to full scans: {e}")
+        # The vector index returns the top-k nodes across all users and results are filtered afterwards, so k
+        # grows up to `vector_search_max_k` for entities whose top-k was filled by other users' nodes.
+        self.vector_search_k = 100
+        self.vector_search_max_k = 6400
+
         self.llm_provider = "openai_structured"
         if self.config.llm.provider:
             self.llm_provider = self.config.llm.provider
@@ -62,9 +91,16 @@ class MemoryGraph:
             self.llm_provider = self.config.graph_store.llm.provider
 
         self.llm = LlmFactory.create(self.llm_provider, self.config.llm.config)
+        attach_embedder(self.llm, self.embedding_model)
         self.user_id = None
         self.threshold = 0.7
 
+        # Run independent stages of add() (LLM calls and graph search) concurrently.
+        self.concurrent_stages = True
+        self._executor = None
+        self._executor_lock = threading.Lock()
+
+    @traced("graph.add")
     def add(self, data, filters):
         """
         Adds data to the graph.
@@ -73,18 +109,64 @@ class MemoryGraph:
             data (str): The data to add to the graph.
             filters (dict): A dictionary containing filters to be applied during the addition.
         """
-        entity_type_map = self._retrieve_nodes_from_data(data, filters)
-        to_be_added = self._establish_nodes_relations_from_data(data, filters, entity_type_map)
-        search_output = self._search_graph_db(node_list=list(entity_type_map.keys()), filters=filters)
-        to_be_deleted = self._get_delete_entities_from_search_output(search_output, data, filters)
+        entity_type_map = self._stage("extract_entities", self._retrieve_nodes_from_data, data, filters)
+        node_list = list(entity_type_map.keys())
+
+        if self.concurrent_stages:
+            # Relation extraction only needs the entities and the delete decision only needs the
+            # search output, so the two chains run side by side.
+            deletes_future = self._get_executor().submit(
+                contextvars.copy_context().run, self._search_and_plan_deletes, node_list, data, filters
+            )
+            to_be_added = self._stage(
+                "extract_relations", self._establish_nodes_relations_from_data, data, filters, entity_type_map
+            )
+            node_plan = self._stage("resolve_nodes", self._plan_nodes, to_be_added, filters, entity_type_map)
+            to_be_deleted = deletes_future.result()
+        else:
+            to_be_added = self._stage(
+                "extract_relations", self._establish_nodes_relations_from_data, data, filters, entity_type_map
+            )
+            to_be_deleted = self._search_and_plan_deletes(node_list, data, filters)
+            node_plan = self._stage("resolve_nodes", self._plan_nodes, to_be_added, filters, entity_type_map)
 
-        # TODO: Batch queries with APOC plugin
         # TODO: Add more filter support
-        deleted_entities = self._delete_entities(to_be_deleted, filters)
-        added_entities = self._add_entities(to_be_added, filters, entity_type_map)
+        deleted_entities, added_entities = self._stage(
+            "write",
+            self._write_transaction,
+            lambda tx: (
+                self._delete_entities_tx(tx, to_be_deleted, filters),
+                self._add_entities_tx(tx, to_be_added, filters, node_plan),
+            ),
+        )
 
         return {"deleted_entities": deleted_entities, "added_entities": added_entities}
 
+    def _search_and_plan_deletes(self, node_list, data, filters):
+        search_output = self._stage("search_graph", self._search_graph_db, node_list=node_list, filters=filters)
+        return self._stage(
+            "decide_deletes", self._get_delete_entities_from_search_output, search_output, data, filters
+        )
+
+    @staticmethod
+    def _stage(stage, func, *args, **kwargs):
+        """Call `func` inside a `graph.add.<stage>` span."""
+        with telemetry.span(f"graph.add.{stage}"):
+            return func(*args, **kwargs)
+
+    def _get_executor(self):
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="jmemory-graph")
+            return self._executor
+
+    def close(self):
+        """Shut down the thread pool used for concurrent stages. A later `add` starts a new one."""
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+
     def search(self, query, filters, limit=100):
         """
         Search for memories and related graph data.
@@ -108,10 +190,9 @@ class MemoryGraph:
         search_outputs_sequence = [
             [item["source"], item["relationship"], item["destination"]] for item in search_output
         ]
-        bm25 = BM25Okapi(search_outputs_sequence)
-
-        tokenized_query = query.split(" ")
-        reranked_results = bm25.get_top_n(tokenized_query, search_outputs_sequence, n=5)
+        # Rank the triples by their words; names like "san_francisco" or "works_at" split into separate tokens.
+        ranked = bm25_rank(query, [tokenize(" ".join(item)) for item in search_outputs_sequence], limit=5)
+        reranked_results = [search_outputs_sequence[index] for index in ranked]
 
         search_results = []
         for item in reranked_results:
@@ -244,48 +325,48 @@ class MemoryGraph:
 
     def _search_graph_db(self, node_list, filters, limit=100):
         """Search similar nodes among and their respective incoming and outgoing relations."""
-        result_relations = []
+        if not node_list:
+            return []
+
+        node_embeddings = self.embedding_model.embed_batch(node_list)
+        matches = self._find_similar_nodes(
+            dict(zip(node_list, node_embeddings)), filters, threshold=self.threshold, limit=limit
+        )
+        rows = [{"matches": matches.get(node, [])} for node in dict.fromkeys(node_list)]
+
         agent_filter = ""
+        params = {"rows": rows, "user_id": filters["user_id"], "limit": limit}
         if filters.get("agent_id"):
-            agent_filter = "AND n.agent_id = $agent_id AND m.agent_id = $agent_id"
-
-        for node in node_list:
-            n_embedding = self.embedding_model.embed(node)
+            agent_filter = "AND m.agent_id = $agent_id"
+            params["agent_id"] = filters["agent_id"]
 
-            cypher_query = f"""
-            MATCH (n {self.node_label})
-            WHERE n.embedding IS NOT NULL AND n.user_id = $user_id
-            {agent_filter}
-            WITH n, round(2 * vector.similarity.cosine(n.embedding, $n_embedding) - 1, 4) AS similarity // denormalize for backward compatibility
-            WHERE similarity >= $threshold
+        cypher_query = f"""
+        UNWIND $rows AS row
+        CALL {{
+            WITH row
+            UNWIND row.matches AS match
+            MATCH (n)
+            WHERE elementId(n) = match.id
             CALL {{
+                WITH n
                 MATCH (n)-[r]->(m)
-                WHERE m.user_id = $user_id {agent_filter.replace("n.", "m.")} 
+                WHERE m.user_id = $user_id {agent_filter}
                 RETURN n.name AS source, elementId(n) AS source_id, type(r) AS relationship, elementId(r) AS relation_id, m.name AS destination, elementId(m) AS destination_id
                 UNION
+                WITH n
                 MATCH (m)-[r]->(n)
-                WHERE m.user_id = $user_id {agent_filter.replace("n.", "m.")}
+                WHERE m.user_id = $user_id {agent_filter}
                 RETURN m.name AS source, elementId(m) AS source_id, type(r) AS relationship, elementId(r) AS relation_id, n.name AS destination, elementId(n) AS destination_id
             }}
-            WITH distinct source, source_id, relationship, relation_id, destination, destination_id, similarity
+            WITH distinct source, source_id, relationship, relation_id, destination, destination_id, match.similarity AS similarity
             RETURN source, source_id, relationship, relation_id, destination, destination_id, similarity
             ORDER BY similarity DESC
             LIMIT $limit
-            """
-
-            params = {
-                "n_embedding": n_embedding,
-                "threshold": self.threshold,
-                "user_id": filters["user_id"],
-                "limit": limit,
-            }
-            if filters.get("agent_id"):
-                params["agent_id"] = filters["agent_id"]
-
-            ans = self.graph.query(cypher_query, params=params)
-            result_relations.extend(ans)
+        }}
+        RETURN source, source_id, relationship, relation_id, destination, destination_id, similarity
+        """
 
-        return result_relations
+        return self.graph.query(cypher_query, params=params)
 
     def _get_delete_entities_from_search_output(self, search_output, data, filters):
         """Get the entities to be deleted from the search output."""
@@ -321,225 +402,180 @@ class MemoryGraph:
         logger.debug(f"Deleted relationships: {to_be_deleted}")
         return to_be_deleted
 
+    def _write_transaction(self, work):
+        """Run `work(tx)` inside a single write transaction and return its result."""
+        with self.graph._driver.session(database=self.graph._database) as session:
+            return session.execute_write(work)
+
     def _delete_entities(self, to_be_deleted, filters):
         """Delete the entities from the graph."""
+        return self._write_transaction(lambda tx: self._delete_entities_tx(tx, to_be_deleted, filters))
+
+    def _delete_entities_tx(self, tx, to_be_deleted, filters):
+        """Delete the relationships in `to_be_deleted`, one UNWIND statement per relationship type."""
         user_id = filters["user_id"]
         agent_id = filters.get("agent_id", None)
-        results = []
-        
-        for item in to_be_deleted:
-            source = item["source"]
-            destination = item["destination"]
-            relationship = item["relationship"]
-
-            # Build the agent filter for the query
-            agent_filter = ""
-            params = {
-                "source_name": source,
-                "dest_name": destination,
-                "user_id": user_id,
-            }
-            
-            if agent_id:
-                agent_filter = "AND n.agent_id = $agent_id AND m.agent_id = $agent_id"
-                params["agent_id"] = agent_id
-
-            # Delete the specific relationship between nodes
+
+        agent_filter = ""
+        params = {"user_id": user_id}
+        if agent_id:
+            agent_filter = "AND n.agent_id = $agent_id AND m.agent_id = $agent_id"
+            params["agent_id"] = agent_id
+
+        rows_by_relationship = {}
+        for idx, item in enumerate(to_be_deleted):
+            rows_by_relationship.setdefault(item["relationship"], []).append(
+                {"idx": idx, "source": item["source"], "destination": item["destination"]}
+            )
+
+        results = [[] for _ in to_be_deleted]
+        for relationship, rows in rows_by_relationship.items():
+            # Relationship types cannot be parameterized, so deletes are grouped per type.
             cypher = f"""
-            MATCH (n {self.node_label} {{name: $source_name, user_id: $user_id}})
+            UNWIND $rows AS row
+            MATCH (n {self.node_label} {{name: row.source, user_id: $user_id}})
             -[r:{relationship}]->
-            (m {self.node_label} {{name: $dest_name, user_id: $user_id}})
+            (m {self.node_label} {{name: row.destination, user_id: $user_id}})
             WHERE 1=1 {agent_filter}
             DELETE r
-            RETURN 
+            RETURN
+                row.idx AS idx,
                 n.name AS source,
                 m.name AS target,
                 type(r) AS relationship
             """
-            
-            result = self.graph.query(cypher, params=params)
-            results.append(result)
-        
+            for record in tx.run(cypher, {**params, "rows": rows}).data():
+                results[record.pop("idx")].append(record)
+
         return results
 
     def _add_entities(self, to_be_added, filters, entity_type_map):
         """Add the new entities to the graph. Merge the nodes if they already exist."""
+        node_plan = self._plan_nodes(to_be_added, filters, entity_type_map)
+        return self._write_transaction(lambda tx: self._add_entities_tx(tx, to_be_added, filters, node_plan))
+
+    def _plan_nodes(self, to_be_added, filters, entity_type_map):
+        """
+        Embed every entity referenced by `to_be_added` and resolve it against the existing graph.
+
+        Returns:
+            dict: Entity name -> {"type", "embedding", "mentions", "existing_id"} where `existing_id` is the
+            element id of the closest existing node above the match threshold, or None.
+        """
+        plan = {}
+        for item in to_be_added:
+            for name in (item["source"], item["destination"]):
+                if name not in plan:
+                    plan[name] = {"type": entity_type_map.get(name, "__User__"), "mentions": 0}
+                plan[name]["mentions"] += 1
+
+        if not plan:
+            return plan
+
+        names = list(plan)
+        for name, embedding in zip(names, self.embedding_model.embed_batch(names)):
+            plan[name]["embedding"] = embedding
+
+        candidates = self._search_node_candidates(
+            {name: plan[name]["embedding"] for name in names}, filters, threshold=0.9
+        )
+        for name in names:
+            plan[name]["existing_id"] = candidates.get(name)
+        return plan
+
+    def _add_entities_tx(self, tx, to_be_added, filters, node_plan):
+        """
+        Apply all node MERGEs and relationship MERGEs for `to_be_added` inside `tx`.
+
+        Statements are grouped by node label and relationship type (neither can be parameterized), so the
+        number of statements depends on the variety of types rather than the number of relations.
+        """
         user_id = filters["user_id"]
         agent_id = filters.get("agent_id", None)
-        results = []
-        for item in to_be_added:
-            # entities
-            source = item["source"]
-            destination = item["destination"]
-            relationship = item["relationship"]
-
-            # types
-            source_type = entity_type_map.get(source, "__User__")
-            source_label = self.node_label if self.node_label else f":`{source_type}`"
-            source_extra_set = f", source:`{source_type}`" if self.node_label else ""
-            destination_type = entity_type_map.get(destination, "__User__")
-            destination_label = self.node_label if self.node_label else f":`{destination_type}`"
-            destination_extra_set = f", destination:`{destination_type}`" if self.node_label else ""
-
-            # embeddings
-            source_embedding = self.embedding_model.embed(source)
-            dest_embedding = self.embedding_model.embed(destination)
-
-            # search for the nodes with the closest embeddings
-            source_node_search_result = self._search_source_node(source_embedding, filters, threshold=0.9)
-            destination_node_search_result = self._search_destination_node(dest_embedding, filters, threshold=0.9)
-
-            # TODO: Create a cypher query and common params for all the cases
-            if not destination_node_search_result and source_node_search_result:
-                # Build destination MERGE properties
-                merge_props = ["name: $destination_name", "user_id: $user_id"]
-                if agent_id:
-                    merge_props.append("agent_id: $agent_id")
-                merge_props_str = ", ".join(merge_props)
-
-                cypher = f"""
-                MATCH (source)
-                WHERE elementId(source) = $source_id
-                SET source.mentions = coalesce(source.mentions, 0) + 1
-                WITH source
-                MERGE (destination {destination_label} {{{merge_props_str}}})
-                ON CREATE SET
-                    destination.created = timestamp(),
-                    destination.mentions = 1
-                    {destination_extra_set}
-                ON MATCH SET
-                    destination.mentions = coalesce(destination.mentions, 0) + 1
-                WITH source, destination
-                CALL db.create.setNodeVectorProperty(destination, 'embedding', $destination_embedding)
-                WITH source, destination
-                MERGE (source)-[r:{relationship}]->(destination)
-                ON CREATE SET 
-                    r.created = timestamp(),
-                    r.mentions = 1
-                ON MATCH SET
-                    r.mentions = coalesce(r.mentions, 0) + 1
-                RETURN source.name AS source, type(r) AS relationship, destination.name AS target
-                """
-                
-                params = {
-                    "source_id": source_node_search_result[0]["elementId(source_candidate)"],
-                    "destination_name": destination,
-                    "destination_embedding": dest_embedding,
-                    "user_id": user_id,
-                }
-                if agent_id:
-                    params["agent_id"] = agent_id
-
-            elif destination_node_search_result and not source_node_search_result:
-                # Build source MERGE properties
-                merge_props = ["name: $source_name", "user_id: $user_id"]
-                if agent_id:
-                    merge_props.append("agent_id: $agent_id")
-                merge_props_str = ", ".join(merge_props)
-
-                cypher = f"""
-                MATCH (destination)
-                WHERE elementId(destination) = $destination_id
-                SET destination.mentions = coalesce(destination.mentions, 0) + 1
-                WITH destination
-                MERGE (source {source_label} {{{merge_props_str}}})
-                ON CREATE SET
-                    source.created = timestamp(),
-                    source.mentions = 1
-                    {source_extra_set}
-                ON MATCH SET
-                    source.mentions = coalesce(source.mentions, 0) + 1
-                WITH source, destination
-                CALL db.create.setNodeVectorProperty(source, 'embedding', $source_embedding)
-                WITH source, destination
-                MERGE (source)-[r:{relationship}]->(destination)
-                ON CREATE SET 
-                    r.created = timestamp(),
-                    r.mentions = 1
-                ON MATCH SET
-                    r.mentions = coalesce(r.mentions, 0) + 1
-                RETURN source.name AS source, type(r) AS relationship, destination.name AS target
-                """
-
-                params = {
-                    "destination_id": destination_node_search_result[0]["elementId(destination_candidate)"],
-                    "source_name": source,
-                    "source_embedding": source_embedding,
-                    "user_id": user_id,
-                }
-                if agent_id:
-                    params["agent_id"] = agent_id
-
-            elif source_node_search_result and destination_node_search_result:
-                cypher = f"""
-                MATCH (source)
-                WHERE elementId(source) = $source_id
-                SET source.mentions = coalesce(source.mentions, 0) + 1
-                WITH source
-                MATCH (destination)
-                WHERE elementId(destination) = $destination_id
-                SET destination.mentions = coalesce(destination.mentions, 0) + 1
-                MERGE (source)-[r:{relationship}]->(destination)
-                ON CREATE SET 
-                    r.created_at = timestamp(),
-                    r.updated_at = timestamp(),
-                    r.mentions = 1
-                ON MATCH SET r.mentions = coalesce(r.mentions, 0) + 1
-                RETURN source.name AS source, type(r) AS relationship, destination.name AS target
-                """
-
-                params = {
-                    "source_id": source_node_search_result[0]["elementId(source_candidate)"],
-                    "destination_id": destination_node_search_result[0]["elementId(destination_candidate)"],
-                    "user_id": user_id,
-                }
-                if agent_id:
-                    params["agent_id"] = agent_id
+        params = {"user_id": user_id}
+        if agent_id:
+            params["agent_id"] = agent_id
 
-            else:
-                # Build dynamic MERGE props for both source and destination
-                source_props = ["name: $source_name", "user_id: $user_id"]
-                dest_props = ["name: $dest_name", "user_id: $user_id"]
-                if agent_id:
-                    source_props.append("agent_id: $agent_id")
-                    dest_props.append("agent_id: $agent_id")
-                source_props_str = ", ".join(source_props)
-                dest_props_str = ", ".join(dest_props)
-
-                cypher = f"""
-                MERGE (source {source_label} {{{source_props_str}}})
-                ON CREATE SET source.created = timestamp(),
-                            source.mentions = 1
-                            {source_extra_set}
-                ON MATCH SET source.mentions = coalesce(source.mentions, 0) + 1
-                WITH source
-                CALL db.create.setNodeVectorProperty(source, 'embedding', $source_embedding)
-                WITH source
-                MERGE (destination {destination_label} {{{dest_props_str}}})
-                ON CREATE SET destination.created = timestamp(),
-                            destination.mentions = 1
-                            {destination_extra_set}
-                ON MATCH SET destination.mentions = coalesce(destination.mentions, 0) + 1
-                WITH source, destination
-                CALL db.create.setNodeVectorProperty(destination, 'embedding', $dest_embedding)
-                WITH source, destination
-                MERGE (source)-[rel:{relationship}]->(destination)
-                ON CREATE SET rel.created = timestamp(), rel.mentions = 1
-                ON MATCH SET rel.mentions = coalesce(rel.mentions, 0) + 1
-                RETURN source.name AS source, type(rel) AS relationship, destination.name AS target
-                """
-
-                params = {
-                    "source_name": source,
-                    "dest_name": destination,
-                    "source_embedding": source_embedding,
-                    "dest_embedding": dest_embedding,
-                    "user_id": user_id,
+        node_ids = {}
+
+        # Bump mentions on nodes that matched an existing candidate.
+        existing_rows = [
+            {"name": name, "id": node["existing_id"], "mentions": node["mentions"]}
+            for name, node in node_plan.items()
+            if node["existing_id"]
+        ]
+        if existing_rows:
+            cypher = """
+            UNWIND $rows AS row
+            MATCH (n)
+            WHERE elementId(n) = row.id
+            SET n.mentions = coalesce(n.mentions, 0) + row.mentions
+            RETURN row.name AS name, elementId(n) AS id
+            """
+            for record in tx.run(cypher, {"rows": existing_rows}).data():
+                node_ids[record["name"]] = record["id"]
+
+        # Merge the remaining nodes, one statement per entity type.
+        merge_props = ["name: row.name", "user_id: $user_id"]
+        if agent_id:
+            merge_props.append("agent_id: $agent_id")
+        merge_props_str = ", ".join(merge_props)
+
+        new_rows_by_type = {}
+        for name, node in node_plan.items():
+            if not node["existing_id"]:
+                new_rows_by_type.setdefault(node["type"], []).append(
+                    {"name": name, "embedding": node["embedding"], "mentions": node["mentions"]}
+                )
+        for node_type, rows in new_rows_by_type.items():
+            label = self.node_label if self.node_label else f":`{node_type}`"
+            extra_set = f", n:`{node_type}`" if self.node_label else ""
+            cypher = f"""
+            UNWIND $rows AS row
+            MERGE (n {label} {{{merge_props_str}}})
+            ON CREATE SET
+                n.created = timestamp(),
+                n.mentions = row.mentions
+                {extra_set}
+            ON MATCH SET
+                n.mentions = coalesce(n.mentions, 0) + row.mentions
+            WITH n, row
+            CALL db.create.setNodeVectorProperty(n, 'embedding', row.embedding)
+            RETURN row.name AS name, elementId(n) AS id
+            """
+            for record in tx.run(cypher, {**params, "rows": rows}).data():
+                node_ids[record["name"]] = record["id"]
+
+        # Merge the relationships, one statement per relationship type.
+        rows_by_relationship = {}
+        for idx, item in enumerate(to_be_added):
+            rows_by_relationship.setdefault(item["relationship"], []).append(
+                {
+                    "idx": idx,
+                    "source_id": node_ids[item["source"]],
+                    "destination_id": node_ids[item["destination"]],
                 }
-                if agent_id:
-                    params["agent_id"] = agent_id
-            result = self.graph.query(cypher, params=params)
-            results.append(result)
+            )
+
+        results = [[] for _ in to_be_added]
+        for relationship, rows in rows_by_relationship.items():
+            cypher = f"""
+            UNWIND $rows AS row
+            MATCH (source)
+            WHERE elementId(source) = row.source_id
+            MATCH (destination)
+            WHERE elementId(destination) = row.destination_id
+            MERGE (source)-[r:{relationship}]->(destination)
+            ON CREATE SET
+                r.created = timestamp(),
+                r.mentions = 1
+            ON MATCH SET
+                r.mentions = coalesce(r.mentions, 0) + 1
+            RETURN row.idx AS idx, source.name AS source, type(r) AS relationship, destination.name AS target
+            """
+            for record in tx.run(cypher, {"rows": rows}).data():
+                results[record.pop("idx")].append(record)
+
         return results
 
     def _remove_spaces_from_entities(self, entity_list):
@@ -549,70 +585,125 @@ class MemoryGraph:
             item["destination"] = item["destination"].lower().replace(" ", "_")
         return entity_list
 
-    def _search_source_node(self, source_embedding, filters, threshold=0.9):
-        agent_filter = ""
-        if filters.get("agent_id"):
-            agent_filter = "AND source_candidate.agent_id = $agent_id"
+    def _search_node_candidates(self, embeddings, filters, threshold=0.9):
+        """
+        Resolve many entities against the existing graph in a single query.
 
-        cypher = f"""
-            MATCH (source_candidate {self.node_label})
-            WHERE source_candidate.embedding IS NOT NULL 
-            AND source_candidate.user_id = $user_id
-            {agent_filter}
+        Args:
+            embeddings (dict): Entity name -> embedding.
+            filters (dict): A dictionary containing filters to be applied during the search.
+            threshold (float): Minimum similarity for a node to be considered the same entity.
+
+        Returns:
+            dict: Entity name -> element id of the most similar existing node, for the entities that matched.
+        """
+        matches = self._find_similar_nodes(embeddings, filters, threshold=threshold, limit=1)
+        return {name: found[0]["id"] for name, found in matches.items() if found}
 
-            WITH source_candidate,
-            round(2 * vector.similarity.cosine(source_candidate.embedding, $source_embedding) - 1, 4) AS source_similarity // denormalize for backward compatibility
-            WHERE source_similarity >= $threshold
+    def _find_similar_nodes(self, embeddings, filters, threshold, limit=1):
+        """
+        Find the existing entities closest to each embedding.
 
-            WITH source_candidate, source_similarity
-            ORDER BY source_similarity DESC
-            LIMIT 1
+        Uses the `entity_embedding` vector index through `db.index.vector.queryNodes`. When the top-k returned by
+        the index was exhausted by other users' nodes while still above the threshold, those entities are asked
+        again with a four times larger k, up to `vector_search_max_k`. Falls back to an exact scan over the
+        user's nodes when the index is unavailable or an entity is still unresolved at the largest k.
 
-            RETURN elementId(source_candidate)
-            """
+        Args:
+            embeddings (dict): Entity name -> embedding.
+            filters (dict): A dictionary containing filters to be applied during the search.
+            threshold (float): Minimum similarity for a node to match.
+            limit (int): Maximum number of matches per entity. Defaults to 1.
+
+        Returns:
+            dict: Entity name -> list of {"id", "similarity"} ordered by decreasing similarity.
+        """
+        if not embeddings:
+            return {}
 
+        pending = dict(embeddings)
+        matches = {}
+        k = max(self.vector_search_k, limit)
+        while pending and self.vector_index:
+            try:
+                found, rescan = self._search_vector_index(pending, filters, threshold, limit, k)
+            except Exception as e:
+                logger.warning(f"Vector index search failed, falling back to a full scan: {e}")
+                self.vector_index = None
+                break
+            matches.update(found)
+            pending = {name: pending[name] for name in rescan}
+            if k >= self.vector_search_max_k:
+                break
+            k = min(k * 4, self.vector_search_max_k)
+
+        if pending:
+            matches.update(self._scan_similar_nodes(pending, filters, threshold, limit))
+        return matches
+
+    def _similar_nodes_params(self, embeddings, filters, threshold, limit):
         params = {
-            "source_embedding": source_embedding,
+            "items": [{"name": name, "embedding": embedding} for name, embedding in embeddings.items()],
             "user_id": filters["user_id"],
             "threshold": threshold,
+            "limit": limit,
         }
         if filters.get("agent_id"):
             params["agent_id"] = filters["agent_id"]
+        return params
 
-        result = self.graph.query(cypher, params=params)
-        return result
-
-
-    def _search_destination_node(self, destination_embedding, filters, threshold=0.9):
-        agent_filter = ""
-        if filters.get("agent_id"):
-            agent_filter = "AND destination_candidate.agent_id = $agent_id"
+    def _search_vector_index(self, embeddings, filters, threshold, limit, k):
+        agent_filter = "AND hit.node.agent_id = $agent_id" if filters.get("agent_id") else ""
+        params = self._similar_nodes_params(embeddings, filters, threshold, limit)
+        params.update({"index_name": self.vector_index, "k": k})
 
         cypher = f"""
-            MATCH (destination_candidate {self.node_label})
-            WHERE destination_candidate.embedding IS NOT NULL 
-            AND destination_candidate.user_id = $user_id
-            {agent_filter}
-
-            WITH destination_candidate,
-            round(2 * vector.similarity.cosine(destination_candidate.embedding, $destination_embedding) - 1, 4) AS destination_similarity // denormalize for backward compatibility
+            UNWIND $items AS item
+            CALL {{
+                WITH item
+                CALL db.index.vector.queryNodes($index_name, $k, item.embedding) YIELD node, score
+                WITH collect({{node: node, similarity: round(2 * score - 1, 4)}}) AS hits // denormalize for backward compatibility
+                RETURN
+                    [hit IN hits WHERE hit.node.user_id = $user_id {agent_filter} AND hit.similarity >= $threshold
+                        | {{id: elementId(hit.node), similarity: hit.similarity}}][..$limit] AS matches,
+                    size(hits) = $k AND hits[-1].similarity >= $threshold AS truncated
+            }}
+            RETURN item.name AS name, matches, truncated
+            """
 
-            WHERE destination_similarity >= $threshold
+        matches, rescan = {}, []
+        for row in self.graph.query(cypher, params=params):
+            if row["truncated"] and len(row["matches"]) < limit:
+                rescan.append(row["name"])
+            else:
+                matches[row["name"]] = row["matches"]
+        return matches, rescan
 
-            WITH destination_candidate, destination_similarity
-            ORDER BY destination_similarity DESC
-            LIMIT 1
+    def _scan_similar_nodes(self, embeddings, filters, threshold, limit):
+        agent_filter = "AND candidate.agent_id = $agent_id" if filters.get("agent_id") else ""
+        params = self._similar_nodes_params(embeddings, filters, threshold, limit)
 
-            RETURN elementId(destination_candidate)
+        cypher = f"""
+            UNWIND $items AS item
+            CALL {{
+                WITH item
+                MATCH (candidate {self.node_label})
+                WHERE candidate.embedding IS NOT NULL
+                AND candidate.user_id = $user_id
+                {agent_filter}
+
+                WITH candidate,
+                round(2 * vector.similarity.cosine(candidate.embedding, item.embedding) - 1, 4) AS similarity // denormalize for backward compatibility
+                WHERE similarity >= $threshold
+
+                RETURN elementId(candidate) AS id, similarity
+                ORDER BY similarity DESC
+                LIMIT $limit
+            }}
+            RETURN item.name AS name, collect({{id: id, similarity: similarity}}) AS matches
             """
 
-        params = {
-            "destination_embedding": destination_embedding,
-            "user_id": filters["user_id"],
-            "threshold": threshold,
-        }
-        if filters.get("agent_id"):
-            params["agent_id"] = filters["agent_id"]
-
-        result = self.graph.query(cypher, params=params)
-        return result
+        matches = {name: [] for name in embeddings}
+        for row in self.graph.query(cypher, params=params):
+            matches[row["name"]] = row["matches"]
+        return matches
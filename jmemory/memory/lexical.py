@@ -0,0 +1,273 @@
+import math
+import os
+import re
+import sqlite3
+import threading
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from jmemory.vector_stores.base import condition_kind
+
+SESSION_KEYS = ("user_id", "agent_id", "run_id")
+# Reciprocal rank fusion constant from Cormack et al.; dampens the weight of the very top ranks.
+RRF_K = 60
+
+_TOKEN = re.compile(r"[^\W_]+", re.UNICODE)
+
+
+def tokenize(text: str) -> List[str]:
+    """Lower-case word tokens. Punctuation and underscores split tokens, so "INV-2024-17" matches "inv 2024 17"."""
+    return _TOKEN.findall(text.lower()) if text else []
+
+
+def bm25_weight(tf: int, length: int, avg_length: float, idf: float, k1: float, b: float) -> float:
+    return idf * tf * (k1 + 1) / (tf + k1 * (1 - b + b * length / (avg_length or 1.0)))
+
+
+def bm25_idf(doc_count: int, doc_freq: int) -> float:
+    # The +1 inside the log (as in Lucene) keeps terms that occur in most documents from scoring negative.
+    return math.log((doc_count - doc_freq + 0.5) / (doc_freq + 0.5) + 1)
+
+
+def bm25_rank(
+    query: str, documents: Sequence[Sequence[str]], limit: int, k1: float = 1.2, b: float = 0.75
+) -> List[int]:
+    """
+    Rank a small, already tokenized candidate set against `query` with BM25.
+
+    Args:
+        query (str): Query text.
+        documents (list): Tokens of each candidate.
+        limit (int): Maximum number of candidates to return.
+        k1 (float, optional): Term frequency saturation. Defaults to 1.2.
+        b (float, optional): Length normalization. Defaults to 0.75.
+
+    Returns:
+        list: Indexes into `documents`, best first. Ties keep their input order.
+    """
+    documents = [[token.lower() for token in doc] for doc in documents]
+    terms = set(tokenize(query))
+    if not documents:
+        return []
+    avg_length = sum(len(doc) for doc in documents) / len(documents)
+    doc_freq = Counter(term for doc in documents for term in set(doc) & terms)
+    scores = []
+    for index, doc in enumerate(documents):
+        counts = Counter(doc)
+        score = sum(
+            bm25_weight(counts[term], len(doc), avg_length, bm25_idf(len(documents), doc_freq[term]), k1, b)
+            for term in terms
+            if counts[term]
+        )
+        scores.append((-score, index))
+    return [index for _, index in sorted(scores)[:limit]]
+
+
+def reciprocal_rank_fusion(rankings: Iterable[Sequence[str]], k: int = RRF_K) -> Dict[str, float]:
+    """
+    Fuse several rankings of ids into one score per id.
+
+    Args:
+        rankings (iterable): Lists of ids, best first.
+        k (int, optional): Rank offset. Defaults to 60.
+
+    Returns:
+        dict: Id -> sum of 1 / (k + rank) over the rankings it appears in.
+    """
+    scores = {}
+    for ranking in rankings:
+        for rank, item_id in enumerate(ranking, start=1):
+            scores[item_id] = scores.get(item_id, 0.0) + 1.0 / (k + rank)
+    return scores
+
+
+class BM25Index:
+    """
+    Persistent, incrementally updated BM25 inverted index over memory texts.
+
+    Postings live in SQLite next to the vector store data, keyed by term, and every document records its
+    (user_id, agent_id, run_id) session. Corpus statistics (document count, average length, document frequency)
+    are computed over the documents in the query's scope, so each user is scored as if they had their own index
+    while adds and deletes only touch the postings of the affected documents.
+
+    Args:
+        db_path (str, optional): SQLite database path. Defaults to ":memory:".
+        k1 (float, optional): Term frequency saturation. Defaults to 1.2.
+        b (float, optional): Length normalization. Defaults to 0.75.
+    """
+
+    def __init__(self, db_path: str = ":memory:", k1: float = 1.2, b: float = 0.75):
+        self.db_path = db_path
+        self.k1 = k1
+        self.b = b
+        if db_path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self.connection = sqlite3.connect(db_path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute("PRAGMA synchronous=NORMAL")
+            self._create_tables()
+
+    def _create_tables(self) -> None:
+        with self.connection:
+            self.connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS lexical_docs (
+                    doc_id      TEXT PRIMARY KEY,
+                    user_id     TEXT,
+                    agent_id    TEXT,
+                    run_id      TEXT,
+                    length      INTEGER
+                )
+                """
+            )
+            self.connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS lexical_postings (
+                    term        TEXT,
+                    doc_id      TEXT,
+                    tf          INTEGER,
+                    PRIMARY KEY (term, doc_id)
+                ) WITHOUT ROWID
+                """
+            )
+            self.connection.execute("CREATE INDEX IF NOT EXISTS idx_lexical_postings_doc ON lexical_postings (doc_id)")
+            self.connection.execute(
+                "CREATE INDEX IF NOT EXISTS idx_lexical_docs_session ON lexical_docs (user_id, agent_id, run_id)"
+            )
+
+    @staticmethod
+    def _scope(filters: Optional[Dict[str, Any]]) -> Tuple[str, list]:
+        """SQL condition on `lexical_docs d` for the session keys of `filters`, with `matches_filters` semantics."""
+        clauses, params = [], []
+        for key in SESSION_KEYS:
+            condition = filters.get(key) if filters else None
+            if condition is None:
+                continue
+            kind = condition_kind(condition)
+            if kind == "range":
+                clauses.append(f"d.{key} BETWEEN ? AND ?")
+                params.extend((condition["gte"], condition["lte"]))
+            elif kind in ("in", "nin"):
+                values = list(condition[kind])
+                placeholders = ", ".join("?" for _ in values)
+                if kind == "in":
+                    clauses.append(f"d.{key} IN ({placeholders})")
+                else:
+                    clauses.append(f"(d.{key} IS NULL OR d.{key} NOT IN ({placeholders}))")
+                params.extend(values)
+            else:
+                clauses.append(f"d.{key} = ?")
+                params.append(condition)
+        if not clauses:
+            return "1 = 1", []
+        return " AND ".join(clauses), params
+
+    def _remove_postings(self, doc_ids: List[str]) -> None:
+        for start in range(0, len(doc_ids), 500):
+            chunk = doc_ids[start : start + 500]
+            placeholders = ", ".join("?" for _ in chunk)
+            self.connection.execute(f"DELETE FROM lexical_postings WHERE doc_id IN ({placeholders})", chunk)
+
+    def add(self, ids: List[str], texts: List[str], payloads: List[Dict[str, Any]]) -> None:
+        """
+        Index documents, replacing any previous version of the same ids.
+
+        Args:
+            ids (list): Memory ids.
+            texts (list): Memory texts.
+            payloads (list): Payload of each memory; its session ids scope the document.
+        """
+        docs, postings = [], []
+        for doc_id, text, payload in zip(ids, texts, payloads):
+            counts = Counter(tokenize(text))
+            docs.append((doc_id, *(payload.get(key) for key in SESSION_KEYS), sum(counts.values())))
+            postings.extend((term, doc_id, tf) for term, tf in counts.items())
+        with self._lock, self.connection:
+            self._remove_postings(list(ids))
+            self.connection.executemany("INSERT OR REPLACE INTO lexical_docs VALUES (?, ?, ?, ?, ?)", docs)
+            self.connection.executemany("INSERT INTO lexical_postings VALUES (?, ?, ?)", postings)
+
+    def update(self, doc_id: str, text: str) -> None:
+        """Re-index the text of an already indexed document, keeping its session."""
+        counts = Counter(tokenize(text))
+        with self._lock, self.connection:
+            updated = self.connection.execute(
+                "UPDATE lexical_docs SET length = ? WHERE doc_id = ?", (sum(counts.values()), doc_id)
+            ).rowcount
+            if not updated:
+                return
+            self._remove_postings([doc_id])
+            self.connection.executemany(
+                "INSERT INTO lexical_postings VALUES (?, ?, ?)", [(term, doc_id, tf) for term, tf in counts.items()]
+            )
+
+    def delete(self, ids: List[str]) -> None:
+        ids = list(ids)
+        with self._lock, self.connection:
+            self._remove_postings(ids)
+            for start in range(0, len(ids), 500):
+                chunk = ids[start : start + 500]
+                placeholders = ", ".join("?" for _ in chunk)
+                self.connection.execute(f"DELETE FROM lexical_docs WHERE doc_id IN ({placeholders})", chunk)
+
+    def delete_by_filter(self, filters: Dict[str, Any]) -> None:
+        """Remove every document in the session scope of `filters`."""
+        scope, params = self._scope(filters)
+        if not params:
+            raise ValueError("delete_by_filter requires at least one of user_id, agent_id or run_id")
+        with self._lock, self.connection:
+            self.connection.execute(
+                f"DELETE FROM lexical_postings WHERE doc_id IN (SELECT d.doc_id FROM lexical_docs d WHERE {scope})",
+                params,
+            )
+            self.connection.execute(f"DELETE FROM lexical_docs AS d WHERE {scope}", params)
+
+    def search(self, query: str, filters: Optional[Dict[str, Any]] = None, limit: int = 5) -> List[Tuple[str, float]]:
+        """
+        Score the documents in the session scope of `filters` against `query`.
+
+        Args:
+            query (str): Query text.
+            filters (dict, optional): Session filters (user_id, agent_id, run_id); other keys are ignored.
+            limit (int, optional): Maximum number of results. Defaults to 5.
+
+        Returns:
+            list: (doc_id, score) pairs, best first.
+        """
+        terms = sorted(set(tokenize(query)))
+        if not terms:
+            return []
+        scope, params = self._scope(filters)
+        placeholders = ", ".join("?" for _ in terms)
+        with self._lock:
+            doc_count, avg_length = self.connection.execute(
+                f"SELECT COUNT(*), AVG(length) FROM lexical_docs d WHERE {scope}", params
+            ).fetchone()
+            if not doc_count:
+                return []
+            rows = self.connection.execute(
+                f"""
+                SELECT p.term, p.doc_id, p.tf, d.length
+                FROM lexical_postings p JOIN lexical_docs d ON d.doc_id = p.doc_id
+                WHERE p.term IN ({placeholders}) AND {scope}
+                """,
+                [*terms, *params],
+            ).fetchall()
+
+        doc_freq = Counter(term for term, _, _, _ in rows)
+        idf = {term: bm25_idf(doc_count, freq) for term, freq in doc_freq.items()}
+        scores = {}
+        for term, doc_id, tf, length in rows:
+            scores[doc_id] = scores.get(doc_id, 0.0) + bm25_weight(tf, length, avg_length, idf[term], self.k1, self.b)
+        return sorted(scores.items(), key=lambda item: item[1], reverse=True)[:limit]
+
+    def reset(self) -> None:
+        with self._lock, self.connection:
+            self.connection.execute("DELETE FROM lexical_postings")
+            self.connection.execute("DELETE FROM lexical_docs")
+
+    def close(self) -> None:
+        with self._lock:
+            self.connection.close()
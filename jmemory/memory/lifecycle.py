@@ -0,0 +1,315 @@
+"""
+Background promotion and decay of mid-term memories.
+
+Search hits and repeated mentions are counted in-process (`UsageCounters`) so the hot paths never write to the
+vector store for bookkeeping. A periodic pass scrolls the collection page by page, folds the pending counts into
+the payloads, and scores each page in one NumPy pass:
+
+- a mid-term memory mentioned or recalled `promote_after` times is promoted to long-term;
+- a mid-term memory whose strength (`exposures * 0.5 ** (idle time / half_life)`) falls below `archive_below` is
+  moved, with a bulk upsert, to the archive collection, out of the primary index that every search scans.
+
+Nothing is deleted: archived memories stay readable through `Memory.get` and are removed only by explicit deletes.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+
+from jmemory.configs.enums import MemoryType
+from jmemory.configs.lifecycle import LifecycleConfig
+from jmemory.memory.retrieval import LAYER_KEY, parse_timestamp, written_at
+from jmemory.memory.telemetry import telemetry
+
+logger = logging.getLogger(__name__)
+
+ACCESS_COUNT = "access_count"
+MENTIONS = "mentions"
+LAST_ACCESSED_AT = "last_accessed_at"
+PROMOTED_AT = "promoted_at"
+ARCHIVED_AT = "archived_at"
+
+
+def _isoformat(timestamp: float) -> str:
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc).isoformat()
+
+
+@dataclass
+class Usage:
+    """Counts not yet written to a memory's payload."""
+
+    accesses: int = 0
+    mentions: int = 0
+    last_accessed: Optional[float] = None
+
+    def merge(self, other: "Usage") -> None:
+        self.accesses += other.accesses
+        self.mentions += other.mentions
+        if other.last_accessed is not None:
+            self.last_accessed = max(self.last_accessed or 0.0, other.last_accessed)
+
+
+class UsageCounters:
+    """Thread-safe, in-process accumulator of search hits and repeated mentions per memory id."""
+
+    def __init__(self):
+        self._pending: Dict[str, Usage] = {}
+        self._lock = threading.Lock()
+
+    def record_access(self, ids: Iterable[str], at: Optional[float] = None) -> None:
+        at = time.time() if at is None else at
+        with self._lock:
+            for memory_id in ids:
+                usage = self._pending.setdefault(str(memory_id), Usage())
+                usage.accesses += 1
+                usage.last_accessed = at
+
+    def record_mentions(self, ids: Iterable[str]) -> None:
+        with self._lock:
+            for memory_id in ids:
+                self._pending.setdefault(str(memory_id), Usage()).mentions += 1
+
+    def drain(self) -> Dict[str, Usage]:
+        """Take every pending count, leaving the accumulator empty."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        return pending
+
+    def requeue(self, pending: Dict[str, Usage]) -> None:
+        """Put back counts that could not be written, merging them with anything recorded since."""
+        with self._lock:
+            for memory_id, usage in pending.items():
+                self._pending.setdefault(memory_id, Usage()).merge(usage)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+
+@dataclass
+class PagePlan:
+    """Payload changes for one scanned page: `updates` stay in the collection, `archived` move to the archive."""
+
+    updates: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    archived: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    promoted: int = 0
+
+
+def plan_page(points: List[Any], pending: Dict[str, Usage], config: LifecycleConfig, now: float) -> PagePlan:
+    """
+    Fold pending counts into a page of points and decide which are promoted or archived.
+
+    Args:
+        points (list): Points with `id` and `payload`.
+        pending (dict): Unwritten counts by memory id.
+        config (LifecycleConfig): Promotion and decay thresholds.
+        now (float): Current time in seconds since the epoch.
+
+    Returns:
+        PagePlan: Payload keys to set per point.
+    """
+    plan = PagePlan()
+    if not points:
+        return plan
+    ids = [str(point.id) for point in points]
+    payloads = [point.payload or {} for point in points]
+    usage = [pending.get(memory_id) for memory_id in ids]
+
+    accesses = np.array([payload.get(ACCESS_COUNT, 0) for payload in payloads], dtype=np.int64)
+    accesses += np.array([u.accesses if u else 0 for u in usage], dtype=np.int64)
+    # The add that created a memory is its first mention.
+    mentions = np.array([payload.get(MENTIONS, 1) for payload in payloads], dtype=np.int64)
+    mentions += np.array([u.mentions if u else 0 for u in usage], dtype=np.int64)
+    last_accessed = np.fmax(
+        np.array([parse_timestamp(payload.get(LAST_ACCESSED_AT)) for payload in payloads], dtype=np.float64),
+        np.array([u.last_accessed if u and u.last_accessed else np.nan for u in usage], dtype=np.float64),
+    )
+    last_touch = np.fmax(np.array([written_at(payload) for payload in payloads], dtype=np.float64), last_accessed)
+    # Memories without any timestamp count as fresh.
+    idle = np.clip(np.nan_to_num(now - last_touch, nan=0.0), 0.0, None)
+
+    exposures = mentions + accesses
+    strength = exposures * np.exp2(-idle / config.half_life)
+    mid_term = np.array([payload.get(LAYER_KEY) == MemoryType.MEDIUM_TERM.value for payload in payloads])
+    promote = mid_term & (exposures >= config.promote_after)
+    archive = mid_term & ~promote & (strength < config.archive_below)
+    changed = np.array([u is not None for u in usage]) | promote | archive
+
+    for index in np.flatnonzero(changed):
+        changes = {ACCESS_COUNT: int(accesses[index]), MENTIONS: int(mentions[index])}
+        if not np.isnan(last_accessed[index]):
+            changes[LAST_ACCESSED_AT] = _isoformat(float(last_accessed[index]))
+        if promote[index]:
+            changes[LAYER_KEY] = MemoryType.LONG_TERM.value
+            changes[PROMOTED_AT] = _isoformat(now)
+            plan.promoted += 1
+        if archive[index]:
+            changes[ARCHIVED_AT] = _isoformat(now)
+            plan.archived[ids[index]] = changes
+        else:
+            plan.updates[ids[index]] = changes
+    return plan
+
+
+def _pages(points: Iterable[Any], size: int) -> Iterable[List[Any]]:
+    page = []
+    for point in points:
+        page.append(point)
+        if len(page) >= size:
+            yield page
+            page = []
+    if page:
+        yield page
+
+
+def run_lifecycle_pass(
+    store,
+    archive,
+    counters: UsageCounters,
+    config: LifecycleConfig,
+    on_archive: Optional[Callable[[List[str]], None]] = None,
+    now: Optional[float] = None,
+) -> Dict[str, int]:
+    """
+    Scan `store` once, writing pending counts and promoting or archiving memories page by page.
+
+    Args:
+        store (Qdrant): The primary collection.
+        archive (Qdrant): The collection archived memories move to.
+        counters (UsageCounters): Counts recorded since the last pass.
+        config (LifecycleConfig): Promotion and decay thresholds.
+        on_archive (callable, optional): Called with the ids moved out of `store`. Defaults to None.
+        now (float, optional): Current time in seconds since the epoch. Defaults to the clock.
+
+    Returns:
+        dict: Number of points "scanned", "updated", "promoted" and "archived".
+    """
+    now = time.time() if now is None else now
+    # Counts for ids the scan never reaches (deleted, or still in the short-term buffer) are dropped.
+    pending = counters.drain()
+    stats = Counter(scanned=0, updated=0, promoted=0, archived=0)
+    try:
+        with telemetry.span("lifecycle.pass") as span:
+            for page in _pages(store.iter_all(page_size=config.page_size), config.page_size):
+                plan = plan_page(page, pending, config, now)
+                store.set_payloads(plan.updates)
+                if plan.archived:
+                    points = store.get_many(list(plan.archived), with_vectors=True)
+                    # Copy before deleting: an interrupted move leaves a memory in both collections, never in neither.
+                    archive.insert(
+                        vectors=[point.vector for point in points],
+                        payloads=[{**point.payload, **plan.archived[str(point.id)]} for point in points],
+                        ids=[point.id for point in points],
+                    )
+                    store.delete_many([point.id for point in points])
+                    if on_archive:
+                        on_archive([str(point.id) for point in points])
+                for point in page:
+                    pending.pop(str(point.id), None)
+                _tally(stats, page, plan)
+            for key, value in stats.items():
+                span.set_attribute(key, value)
+    except Exception:
+        counters.requeue(pending)
+        raise
+    _count(stats)
+    return dict(stats)
+
+
+async def arun_lifecycle_pass(
+    store,
+    archive,
+    counters: UsageCounters,
+    config: LifecycleConfig,
+    on_archive: Optional[Callable[[List[str]], Any]] = None,
+    now: Optional[float] = None,
+) -> Dict[str, int]:
+    """Async version of `run_lifecycle_pass` for `AsyncQdrant` stores; `on_archive` may be a coroutine function."""
+    now = time.time() if now is None else now
+    pending = counters.drain()
+    stats = Counter(scanned=0, updated=0, promoted=0, archived=0)
+
+    async def apply(page):
+        plan = plan_page(page, pending, config, now)
+        await store.set_payloads(plan.updates)
+        if plan.archived:
+            points = await store.get_many(list(plan.archived), with_vectors=True)
+            await archive.insert(
+                vectors=[point.vector for point in points],
+                payloads=[{**point.payload, **plan.archived[str(point.id)]} for point in points],
+                ids=[point.id for point in points],
+            )
+            await store.delete_many([point.id for point in points])
+            if on_archive:
+                result = on_archive([str(point.id) for point in points])
+                if asyncio.iscoroutine(result):
+                    await result
+        for point in page:
+            pending.pop(str(point.id), None)
+        _tally(stats, page, plan)
+
+    try:
+        with telemetry.span("lifecycle.pass") as span:
+            page = []
+            async for point in store.iter_all(page_size=config.page_size):
+                page.append(point)
+                if len(page) >= config.page_size:
+                    await apply(page)
+                    page = []
+            if page:
+                await apply(page)
+            for key, value in stats.items():
+                span.set_attribute(key, value)
+    except Exception:
+        counters.requeue(pending)
+        raise
+    _count(stats)
+    return dict(stats)
+
+
+def _tally(stats: Counter, page: List[Any], plan: PagePlan) -> None:
+    stats["scanned"] += len(page)
+    stats["updated"] += len(plan.updates)
+    stats["promoted"] += plan.promoted
+    stats["archived"] += len(plan.archived)
+
+
+def _count(stats: Counter) -> None:
+    if telemetry.enabled:
+        telemetry.count("lifecycle.promoted", stats["promoted"])
+        telemetry.count("lifecycle.archived", stats["archived"])
+
+
+class LifecycleScheduler:
+    """
+    Background thread that runs a lifecycle pass every `interval` seconds.
+
+    Args:
+        run (callable): Runs one pass, e.g. `Memory.run_lifecycle`.
+        interval (float, optional): Seconds between passes. Defaults to 300.
+    """
+
+    def __init__(self, run: Callable[[], Any], interval: float = 5 * 60):
+        self.run = run
+        self.interval = interval
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._loop, name="jmemory-lifecycle", daemon=True)
+        self._thread.start()
+
+    def _loop(self) -> None:
+        while not self._stopped.wait(self.interval):
+            try:
+                self.run()
+            except Exception as e:
+                logger.warning(f"Lifecycle pass failed, will retry: {e}")
+
+    def stop(self) -> None:
+        self._stopped.set()
+        self._thread.join()
@@ -1,44 +1,55 @@
 
 import asyncio
 import concurrent
+import functools
 import gc
 import hashlib
+import itertools
 import json
 import logging
 import os
+import threading
 import uuid
 import warnings
 from copy import deepcopy
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional, Union
 
 import pytz
 from pydantic import ValidationError
 
 from jmemory.configs.base import MemoryConfig, MemoryItem
+from jmemory.configs.embeddings.base import BaseEmbedderConfig
 from jmemory.configs.enums import MemoryType
 from jmemory.configs.prompts import (PROCEDURAL_MEMORY_SYSTEM_PROMPT,
                                   get_update_memory_messages)
+from jmemory.configs.vector_stores.faiss import FAISSConfig
 from jmemory.memory.base import MemoryBase
+from jmemory.memory.dedup import ContentHashIndex, content_hash
+from jmemory.memory.lexical import BM25Index, reciprocal_rank_fusion
+from jmemory.memory.lifecycle import LifecycleScheduler, UsageCounters, arun_lifecycle_pass, run_lifecycle_pass
+from jmemory.memory.retrieval import LayeredRetriever
 from jmemory.memory.setup import jmemory_dir, setup_config
+from jmemory.memory.short_term import ShortTermBuffer, ShortTermPromoter
 from jmemory.memory.storage import SQLiteManager
+from jmemory.memory.telemetry import capture_event  # noqa: F401  (re-exported for callers patching it here)
+from jmemory.memory.telemetry import telemetry, text_bytes, traced
 from jmemory.memory.utils import (
     get_fact_retrieval_messages,
     parse_messages,
     parse_vision_messages,
     remove_code_blocks,
 )
-from jmemory.vector_stores.qdrant import Qdrant
-from jmemory.graphs.memgraph_memory import MemoryGraph
-from jmemory.embeddings.huggingface import HuggingFaceEmbedding
+from jmemory.vector_stores.base import matches_filters
+from jmemory.vector_stores.qdrant import AsyncQdrant, Qdrant
+from jmemory.embeddings.batching import BatchingEmbedding
+from jmemory.embeddings.cache import CachedEmbedding
+from jmemory.embeddings.sidecar import RemoteEmbedding
+from jmemory.llms.cache import attach_embedder
 from jmemory.llms.utils.llm_loader import LlmLoader
 
 
-def capture_event(event_name: str, data: Optional[dict] = None) -> None:
-    """Placeholder telemetry hook used in tests."""
-    logging.debug("capture_event %s: %s", event_name, data)
-
-
 def _build_filters_and_metadata(
     *,  # Enforce keyword-only arguments
     user_id: Optional[str] = None,
@@ -117,72 +128,1160 @@ def _build_filters_and_metadata(
 
 logger = logging.getLogger(__name__)
 
+# Payload keys surfaced at the top level of a formatted memory rather than under "metadata".
+PROMOTED_PAYLOAD_KEYS = ["user_id", "agent_id", "run_id", "actor_id", "role"]
+CORE_PAYLOAD_KEYS = ["data", "hash", "created_at", "updated_at"]
+# Upper bound on points fetched per scroll request when paging through memories.
+MAX_PAGE_SIZE = 1000
+SEARCH_MODES = ("vector", "hybrid", "layered")
+# In hybrid search each ranking contributes this many candidates per requested result before fusion.
+HYBRID_CANDIDATE_FACTOR = 4
+
+
+def _create_embedder(config: MemoryConfig):
+    if config.embedding_sidecar_url:
+        embedder = RemoteEmbedding(config.embedding_sidecar_url)
+    else:
+        # Imported here so that `import jmemory` does not pull in sentence-transformers and torch.
+        from jmemory.embeddings.huggingface import HuggingFaceEmbedding
+
+        embedder = HuggingFaceEmbedding(BaseEmbedderConfig(**config.embedder.config))
+        # Load the weights off the calling thread; the first embed call waits for them if still loading.
+        embedder.warmup(background=True)
+        if config.embedding_batch_size:
+            embedder = BatchingEmbedding(
+                embedder,
+                max_batch_size=config.embedding_batch_size,
+                max_wait=config.embedding_batch_wait_ms / 1000,
+            )
+    if config.embedding_cache_size:
+        embedder = CachedEmbedding(
+            embedder,
+            max_size=config.embedding_cache_size,
+            db_path=config.embedding_cache_path,
+        )
+    return embedder
+
+
+def _embed(embedder, text):
+    with telemetry.span("embed", texts=1):
+        if telemetry.enabled:
+            telemetry.count("embed.texts")
+            telemetry.count("embed.bytes", text_bytes(str(text)))
+        return embedder.embed(text)
+
+
+def _embed_batch(embedder, texts: List[str]):
+    with telemetry.span("embed", texts=len(texts)):
+        if telemetry.enabled:
+            telemetry.count("embed.texts", len(texts))
+            telemetry.count("embed.bytes", text_bytes(texts))
+        return embedder.embed_batch(texts)
+
+
+def _normalize_messages(messages) -> List[Dict[str, Any]]:
+    if isinstance(messages, str):
+        return [{"role": "user", "content": messages}]
+    if isinstance(messages, dict):
+        return [messages]
+    return messages
+
+
+def _build_payloads(
+    messages: List[Dict[str, Any]], metadata: Dict[str, Any], memory_type: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    created_at = datetime.now(pytz.timezone("US/Pacific")).isoformat()
+    payloads = []
+    for message in messages:
+        payload = deepcopy(metadata)
+        payload["data"] = message["content"]
+        payload["hash"] = content_hash(message["content"])
+        payload["role"] = message.get("role")
+        payload["created_at"] = created_at
+        if memory_type:
+            payload["memory_type"] = memory_type
+        payloads.append(payload)
+    return payloads
+
+
+def _merge_points(points: list, short_term_points: list, limit: int) -> list:
+    """Merge vector store and short-term hits by score, keeping one hit per memory id."""
+    best = {}
+    for point in [*points, *short_term_points]:
+        key = str(point.id)
+        if key not in best or point.score > best[key].score:
+            best[key] = point
+    return sorted(best.values(), key=lambda point: point.score, reverse=True)[:limit]
+
+
+def _create_short_term_buffer(config: MemoryConfig):
+    if config.short_term is None:
+        return None
+    return ShortTermBuffer(capacity=config.short_term.capacity, ttl=config.short_term.ttl)
+
+
+def _sidecar_path(config: MemoryConfig, filename: str) -> str:
+    store = config.vector_store
+    embedded_qdrant = store.provider == "qdrant" and not (store.url or (store.host and store.port))
+    is_local = store.provider == "faiss" or embedded_qdrant
+    # Keep the index next to the points it describes when the vector store is on local disk.
+    return os.path.join(store.path if is_local else jmemory_dir, filename)
+
+
+def _create_lexical_index(config: MemoryConfig):
+    if not config.lexical_index:
+        return None
+    return BM25Index(config.lexical_index_path or _sidecar_path(config, "bm25.db"))
+
+
+def _create_dedup_index(config: MemoryConfig):
+    if not config.dedup_index:
+        return None
+    return ContentHashIndex(config.dedup_index_path or _sidecar_path(config, "hashes.db"))
+
+
+def _create_history_store(config: MemoryConfig):
+    if not config.history_db_path:
+        return None
+    if config.history_db_path != ":memory:":
+        os.makedirs(os.path.dirname(os.path.abspath(config.history_db_path)), exist_ok=True)
+    return SQLiteManager(config.history_db_path, write_behind=config.history_write_behind)
+
+
+def _record_history(db, event: str, records: List[Dict[str, Any]]):
+    """Queue one history event per record, see `SQLiteManager.add_history_many`. No-op without a history store."""
+    if db is not None and records:
+        db.add_history_many([{**record, "event": event} for record in records])
+
+
+def _added_history(ids: List[str], payloads: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return [
+        {
+            "memory_id": memory_id,
+            "old_memory": None,
+            "new_memory": payload["data"],
+            "created_at": payload["created_at"],
+            "actor_id": payload.get("actor_id"),
+            "role": payload.get("role"),
+        }
+        for memory_id, payload in zip(ids, payloads)
+    ]
+
+
+def _changed_history(memory_id: str, previous, new_memory: Optional[str], is_deleted: int = 0) -> Dict[str, Any]:
+    # Stamped with the time of the change, which orders the events of a memory (see `SQLiteManager.get_history`).
+    changed_at = datetime.now(pytz.timezone("US/Pacific")).isoformat()
+    payload = previous.payload if previous else {}
+    return {
+        "memory_id": memory_id,
+        "old_memory": payload.get("data"),
+        "new_memory": new_memory,
+        "created_at": changed_at,
+        "updated_at": changed_at,
+        "is_deleted": is_deleted,
+        "actor_id": payload.get("actor_id"),
+        "role": payload.get("role"),
+    }
+
+
+def _claim_hashes(dedup, ids: List[str], payloads: List[Dict[str, Any]]) -> list:
+    """Claim the content hash of each new memory; see `ContentHashIndex.claim`. All are new without an index."""
+    if dedup is None:
+        return [None] * len(ids)
+    with telemetry.span("dedup.claim", texts=len(ids)):
+        repeats = dedup.claim(ids, [payload["hash"] for payload in payloads], payloads)
+    if telemetry.enabled:
+        telemetry.count("dedup.repeats", sum(repeat is not None for repeat in repeats))
+    return repeats
+
+
+def _archive_collection(config: MemoryConfig) -> str:
+    return config.lifecycle.archive_collection or f"{config.vector_store.collection_name}_archive"
+
+
+def _create_vector_store(
+    config: MemoryConfig,
+    embedding_dims: int,
+    asynchronous: bool = False,
+    collection_name: Optional[str] = None,
+    pool=None,
+):
+    store = config.vector_store
+    collection_name = collection_name or store.collection_name
+    if store.provider == "faiss":
+        # Imported here so that faiss stays an optional dependency.
+        from jmemory.vector_stores.faiss import FAISS, AsyncFAISS
+
+        options = (store.faiss or FAISSConfig()).model_dump(exclude={"collection_name", "path", "embedding_model_dims"})
+        return (AsyncFAISS if asynchronous else FAISS)(
+            collection_name=collection_name,
+            embedding_model_dims=embedding_dims,
+            path=store.path,
+            on_disk=store.on_disk,
+            **options,
+        )
+    if store.provider == "pgvector":
+        # Imported here so that psycopg stays an optional dependency.
+        from jmemory.vector_stores.pgvector import AsyncPGVector, PGVector
+
+        options = store.pgvector.model_dump(exclude={"collection_name", "embedding_model_dims"})
+        return (AsyncPGVector if asynchronous else PGVector)(
+            collection_name=collection_name, embedding_model_dims=embedding_dims, pool=pool, **options
+        )
+    params = store.model_dump(exclude={"provider", "faiss", "pgvector"})
+    params["collection_name"] = collection_name
+    return (AsyncQdrant if asynchronous else Qdrant)(embedding_model_dims=embedding_dims, **params)
+
+
+def _create_archive(config: MemoryConfig, vector_store, embedding_dims: int, asynchronous: bool = False):
+    collection_name = _archive_collection(config)
+    if config.vector_store.provider == "pgvector":
+        # Another table in the same database, through the same connections.
+        return _create_vector_store(
+            config, embedding_dims, asynchronous, collection_name=collection_name, pool=vector_store.pool
+        )
+    if config.vector_store.provider != "qdrant":
+        return _create_vector_store(config, embedding_dims, asynchronous, collection_name=collection_name)
+    # Share the client: an embedded Qdrant locks its storage directory against a second one.
+    return (AsyncQdrant if asynchronous else Qdrant)(
+        collection_name=collection_name,
+        embedding_model_dims=embedding_dims,
+        client=vector_store.client,
+        on_disk=config.vector_store.on_disk,
+    )
+
+
+def _record_mentions(usage, repeats: list) -> None:
+    if usage is not None:
+        usage.record_mentions(repeat[0] for repeat in repeats if repeat is not None)
+
+
+def _record_access(usage, points: list) -> None:
+    if usage is not None and points:
+        usage.record_access(str(point.id) for point in points)
+
+
+def _add_results(ids: List[str], texts: List[str], repeats: list) -> List[Dict[str, Any]]:
+    return [
+        {"id": id, "memory": text, "event": "ADD"}
+        if repeat is None
+        else {"id": repeat[0], "memory": text, "event": "NONE", "mentions": repeat[1]}
+        for id, text, repeat in zip(ids, texts, repeats)
+    ]
+
+
+def _updated_payload(previous, data) -> Dict[str, Any]:
+    """The payload of `previous` with its text replaced by `data`, keeping its session ids, type and creation time."""
+    text = data if isinstance(data, str) else data.get("data", "")
+    return {
+        **(previous.payload if previous else {}),
+        **({} if isinstance(data, str) else data),
+        "data": text,
+        "hash": content_hash(text),
+        "updated_at": datetime.now(pytz.timezone("US/Pacific")).isoformat(),
+    }
+
+
+def _promote_short_term(vector_store, entries) -> None:
+    with telemetry.span("short_term.promote", memories=len(entries)):
+        vector_store.insert(
+            vectors=[entry.embedding.tolist() for entry in entries],
+            payloads=[entry.payload for entry in entries],
+            ids=[entry.id for entry in entries],
+        )
+
+
+def _check_search_mode(mode: str, lexical) -> None:
+    if mode not in SEARCH_MODES:
+        raise ValueError(f"Unknown search mode {mode!r}, expected one of {SEARCH_MODES}")
+    if mode == "hybrid" and lexical is None:
+        raise ValueError("Hybrid search requires MemoryConfig.lexical_index")
+
+
+def _fuse_points(dense_points: list, lexical_points: list, lexical_ranking: List[str], filters, limit: int) -> list:
+    """
+    Fuse dense and BM25 hits with reciprocal rank fusion.
+
+    Args:
+        dense_points (list): Vector hits, best first.
+        lexical_points (list): Points for the BM25 hits that are not among the vector hits.
+        lexical_ranking (list): BM25 hit ids, best first.
+        filters (dict): Search filters. The BM25 index only scopes by session, so other keys are checked here.
+        limit (int): Maximum number of results.
+
+    Returns:
+        list: Points with `score` set to the fused score, best first.
+    """
+    by_id = {str(point.id): point for point in lexical_points if matches_filters(point.payload or {}, filters)}
+    by_id.update((str(point.id), point) for point in dense_points)
+    scores = reciprocal_rank_fusion(
+        [[str(point.id) for point in dense_points], [doc_id for doc_id in lexical_ranking if doc_id in by_id]]
+    )
+    best = sorted(scores, key=scores.get, reverse=True)[:limit]
+    return [
+        SimpleNamespace(id=by_id[doc_id].id, payload=by_id[doc_id].payload, score=scores[doc_id]) for doc_id in best
+    ]
+
+
+def _format_memory(point) -> Dict[str, Any]:
+    """Convert a Qdrant point (record or scored point) or short-term entry into the public memory dict."""
+    payload = point.payload or {}
+    memory_item = MemoryItem(
+        id=str(point.id),
+        memory=payload.get("data", ""),
+        hash=payload.get("hash"),
+        created_at=payload.get("created_at"),
+        updated_at=payload.get("updated_at"),
+        score=getattr(point, "score", None),
+    ).model_dump()
+    if memory_item["score"] is None:
+        memory_item.pop("score")
+
+    for key in PROMOTED_PAYLOAD_KEYS:
+        if key in payload:
+            memory_item[key] = payload[key]
+
+    additional_metadata = {
+        k: v for k, v in payload.items() if k not in PROMOTED_PAYLOAD_KEYS and k not in CORE_PAYLOAD_KEYS
+    }
+    if additional_metadata:
+        memory_item["metadata"] = additional_metadata
+    return memory_item
+
 
 class Memory(MemoryBase):
     def __init__(self, config: MemoryConfig = MemoryConfig()):
         self.config = config
         self.llm = LlmLoader(self.config.llm.provider, self.config.llm.config).load()
 
-        # Initialize vector store (Qdrant)
-        self.embedder = HuggingFaceEmbedding(
-            model="/models/bge-large-en-v1.5",
-            model_kwargs={
-                "device": "cuda:0"
-            }
-        )
-        self.vector_store = Qdrant(
-            embedding_model_dims=self.embedder.config.embedding_dims,
-        )
+        # Initialize vector store (Qdrant, or in-process FAISS)
+        self.embedder = _create_embedder(self.config)
+        attach_embedder(self.llm, self.embedder)
+        self.vector_store = _create_vector_store(self.config, self.embedder.config.embedding_dims)
 
         # Initialize graph store (Memgraph)
-        self.graph_store = MemoryGraph()
+        self.graph_store = None
+        if self.config.graph_store:
+            from jmemory.graphs.memgraph_memory import MemoryGraph
+
+            self.graph_store = MemoryGraph(self.config, embedding_dims=self.embedder.config.embedding_dims)
 
-    def add(self, messages: List[Dict[str, Any]], user_id: str, metadata: Optional[Dict[str, Any]] = None):
+        self.lexical = _create_lexical_index(self.config)
+        self.dedup = _create_dedup_index(self.config)
+        self.db = _create_history_store(self.config)
+        self.retriever = LayeredRetriever(self.config.retrieval)
+
+        # Short-term memories are buffered in-process and promoted to the vector store in batches
+        self.short_term = _create_short_term_buffer(self.config)
+        self._promoter = None
+        if self.short_term:
+            self._promoter = ShortTermPromoter(
+                self.short_term,
+                # Bound to the vector store rather than to `self`, so the promoter does not keep this Memory alive.
+                functools.partial(_promote_short_term, self.vector_store),
+                batch_size=self.config.short_term.promote_batch_size,
+                interval=self.config.short_term.promote_interval,
+            )
+
+        # Access and mention counts are kept in-process and written back, with promotion and decay, in the background
+        self.usage = None
+        self.archive = None
+        self._lifecycle = None
+        self._lifecycle_lock = threading.Lock()
+        if self.config.lifecycle:
+            self.usage = UsageCounters()
+            self.archive = _create_archive(self.config, self.vector_store, self.embedder.config.embedding_dims)
+            self._lifecycle = LifecycleScheduler(self.run_lifecycle, interval=self.config.lifecycle.interval)
+
+    def run_lifecycle(self, now: Optional[float] = None) -> Dict[str, int]:
+        """
+        Run one promotion and decay pass over the vector store now, instead of waiting for the scheduler.
+
+        Args:
+            now (float, optional): Current time in seconds since the epoch. Defaults to the clock.
+
+        Returns:
+            dict: Number of memories "scanned", "updated", "promoted" and "archived".
+        """
+        if not self.config.lifecycle:
+            raise ValueError("Promotion and decay require MemoryConfig.lifecycle")
+        with self._lifecycle_lock:
+            return run_lifecycle_pass(
+                self.vector_store, self.archive, self.usage, self.config.lifecycle, self._forget_archived, now
+            )
+
+    def _forget_archived(self, ids: List[str]):
+        # Archived memories leave the search indexes; a repeat of one is stored as a new memory.
+        if self.lexical:
+            self.lexical.delete(ids)
+        if self.dedup:
+            self.dedup.delete(ids)
+
+    def _points_for(self, ids: List[str], known: list) -> list:
+        """Fetch the points for `ids` that are not in `known`, from the short-term buffer or the vector store."""
+        known_ids = {str(point.id) for point in known}
+        missing = [doc_id for doc_id in ids if doc_id not in known_ids]
+        points = [entry for entry in map(self.short_term.get, missing) if entry] if self.short_term else []
+        found = {point.id for point in points}
+        return points + self.vector_store.get_many([doc_id for doc_id in missing if doc_id not in found])
+
+    @traced("memory.add")
+    def add(
+        self,
+        messages,
+        user_id: Optional[str] = None,
+        agent_id: Optional[str] = None,
+        run_id: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+        filters: Optional[Dict[str, Any]] = None,
+        memory_type: Optional[str] = None,
+    ):
         # This is a simplified version. In a real implementation, this would be much more complex.
         # It would involve using an LLM to process the messages and update the different memory layers.
-        print(f"Adding {len(messages)} messages to memory for user {user_id}")
+        messages = _normalize_messages(messages)
+        metadata, filters = _build_filters_and_metadata(
+            user_id=user_id, agent_id=agent_id, run_id=run_id, input_metadata=metadata, input_filters=filters
+        )
+        logger.debug(f"Adding {len(messages)} messages to memory for {filters}")
         # For now, we'll just add the raw messages to the vector store.
         texts = [m["content"] for m in messages]
-        embeddings = [self.embedder.embed(text) for text in texts]
-        self.vector_store.insert(vectors=embeddings, payloads=[metadata] * len(texts), ids=[user_id] * len(texts))
+        ids = [str(uuid.uuid4()) for _ in texts]
+        payloads = _build_payloads(messages, metadata, memory_type)
+        all_ids, all_texts, repeats = ids, texts, _claim_hashes(self.dedup, ids, payloads)
+        _record_mentions(self.usage, repeats)
+        # Exact repeats only bump their mention count: nothing below (embedding, stores, LLM) runs for them.
+        new = [index for index, repeat in enumerate(repeats) if repeat is None]
+        if not new:
+            return {"results": _add_results(all_ids, all_texts, repeats)}
+        ids, texts, payloads = ([items[index] for index in new] for items in (ids, texts, payloads))
 
-    def search(self, query: str, user_id: str, limit: int = 5, filters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
-        # This is a simplified version. In a real implementation, this would be much more complex.
-        # It would involve querying all six memory layers and combining the results.
-        print(f"Searching memory for user {user_id} with query: {query}")
-        query_embedding = self.embedder.embed(query)
-        return self.vector_store.search(query=query_embedding, limit=limit, filters=filters)
+        try:
+            embeddings = _embed_batch(self.embedder, texts)
+            if self.short_term and memory_type == MemoryType.SHORT_TERM.value:
+                self.short_term.add(ids, embeddings, payloads)
+                self._promoter.notify()
+            else:
+                with telemetry.span("vector_store.insert", vectors=len(ids)):
+                    self.vector_store.insert(vectors=embeddings, payloads=payloads, ids=ids)
+        except Exception:
+            if self.dedup:
+                self.dedup.delete(ids)
+            raise
+        _record_history(self.db, "ADD", _added_history(ids, payloads))
+        if self.lexical:
+            with telemetry.span("lexical.add", documents=len(ids)):
+                self.lexical.add(ids, texts, payloads)
 
-    def get_all(self, user_id: str) -> List[Dict[str, Any]]:
-        print(f"Getting all memories for user {user_id}")
-        return self.vector_store.list(filters={"user_id": user_id})
+        if self.graph_store:
+            with telemetry.span("graph.add"):
+                self.graph_store.add("\n".join(texts), filters)
 
-    def update(self, memory_id: str, data: Dict[str, Any]):
-        print(f"Updating memory {memory_id}")
-        updated_embedding = self.embedder.embed(data)
-        self.vector_store.update(vector_id=memory_id, vector=updated_embedding, payload=data)
+        return {"results": _add_results(all_ids, all_texts, repeats)}
 
+    @traced("memory.search")
+    def search(
+        self,
+        query: str,
+        user_id: Optional[str] = None,
+        agent_id: Optional[str] = None,
+        run_id: Optional[str] = None,
+        limit: int = 5,
+        filters: Optional[Dict[str, Any]] = None,
+        mode: str = "vector",
+    ) -> Dict[str, Any]:
+        """
+        Search memories in scope.
+
+        Args:
+            query (str): Query text.
+            user_id (str, optional): User identifier. Defaults to None.
+            agent_id (str, optional): Agent identifier. Defaults to None.
+            run_id (str, optional): Run identifier. Defaults to None.
+            limit (int, optional): Maximum number of memories. Defaults to 5.
+            filters (dict, optional): Additional payload filters. Defaults to None.
+            mode (str, optional): "vector" for dense similarity, "hybrid" to fuse it with BM25 over the
+                memory texts (better recall of exact names and IDs), or "layered" to query every memory layer
+                concurrently within `MemoryConfig.retrieval` budgets and rank by similarity, recency and layer
+                weight. Defaults to "vector".
+
+        Returns:
+            dict: "results", plus "relations" when the graph store is enabled and, in layered mode, "layers"
+                with the status of each layer ("ok", "timeout" or "error").
+        """
+        _check_search_mode(mode, self.lexical)
+        _, filters = _build_filters_and_metadata(
+            user_id=user_id, agent_id=agent_id, run_id=run_id, input_filters=filters
+        )
+        logger.debug(f"Searching memory for {filters} with query: {query}")
+        candidates = limit * HYBRID_CANDIDATE_FACTOR if mode == "hybrid" else limit
+        query_embedding = _embed(self.embedder, query)
+        layers = None
+        if mode == "layered":
+
+            def search_layer(layer, layer_filters, top_k):
+                points = self.vector_store.search(
+                    query=query, vectors=query_embedding, limit=top_k, filters=layer_filters
+                )
+                if self.short_term and layer == MemoryType.SHORT_TERM.value:
+                    points = _merge_points(points, self.short_term.search(filters, query_embedding, top_k), top_k)
+                return points
+
+            points, layers = self.retriever.search(search_layer, filters, limit)
+        else:
+            with telemetry.span("vector_store.search", limit=candidates):
+                points = self.vector_store.search(
+                    query=query, vectors=query_embedding, limit=candidates, filters=filters
+                )
+            if self.short_term:
+                points = _merge_points(
+                    points, self.short_term.search(filters, query_embedding, candidates), candidates
+                )
+        if mode == "hybrid":
+            with telemetry.span("lexical.search", limit=candidates):
+                ranking = [doc_id for doc_id, _ in self.lexical.search(query, filters, candidates)]
+            points = _fuse_points(points, self._points_for(ranking, points), ranking, filters, limit)
+        _record_access(self.usage, points)
+        result = {"results": [_format_memory(point) for point in points]}
+        if layers is not None:
+            result["layers"] = layers
+        if self.graph_store:
+            with telemetry.span("graph.search"):
+                result["relations"] = self.graph_store.search(query, filters)
+        return result
+
+    @traced("memory.get_all")
+    def get_all(
+        self,
+        user_id: Optional[str] = None,
+        agent_id: Optional[str] = None,
+        run_id: Optional[str] = None,
+        limit: int = 100,
+    ) -> Dict[str, Any]:
+        _, filters = _build_filters_and_metadata(user_id=user_id, agent_id=agent_id, run_id=run_id)
+        logger.debug(f"Getting all memories for {filters}")
+        if self._promoter:
+            self._promoter.flush()
+        points = itertools.islice(
+            self.vector_store.iter_all(filters=filters, page_size=min(limit, MAX_PAGE_SIZE)), limit
+        )
+        result = {"results": [_format_memory(point) for point in points]}
+        if self.graph_store:
+            result["relations"] = self.graph_store.get_all(filters, limit)
+        return result
+
+    def iter_all(
+        self,
+        user_id: Optional[str] = None,
+        agent_id: Optional[str] = None,
+        run_id: Optional[str] = None,
+        page_size: int = 100,
+    ):
+        """
+        Stream every memory in scope without loading them all at once.
+
+        Args:
+            user_id (str, optional): User identifier. Defaults to None.
+            agent_id (str, optional): Agent identifier. Defaults to None.
+            run_id (str, optional): Run identifier. Defaults to None.
+            page_size (int, optional): Number of memories fetched per request. Defaults to 100.
+
+        Yields:
+            dict: Formatted memories.
+        """
+        _, filters = _build_filters_and_metadata(user_id=user_id, agent_id=agent_id, run_id=run_id)
+        if self._promoter:
+            self._promoter.flush()
+        for point in self.vector_store.iter_all(filters=filters, page_size=page_size):
+            yield _format_memory(point)
+
+    @traced("memory.recent")
+    def recent(
+        self,
+        user_id: Optional[str] = None,
+        agent_id: Optional[str] = None,
+        run_id: Optional[str] = None,
+        limit: int = 10,
+    ) -> Dict[str, Any]:
+        """
+        Most recent short-term memories in scope, newest first, served from the in-process buffer.
+
+        Args:
+            user_id (str, optional): User identifier. Defaults to None.
+            agent_id (str, optional): Agent identifier. Defaults to None.
+            run_id (str, optional): Run identifier. Defaults to None.
+            limit (int, optional): Maximum number of memories. Defaults to 10.
+
+        Returns:
+            dict: Formatted memories under "results"; empty without `MemoryConfig.short_term`.
+        """
+        _, filters = _build_filters_and_metadata(user_id=user_id, agent_id=agent_id, run_id=run_id)
+        entries = self.short_term.recent(filters, limit) if self.short_term else []
+        return {"results": [_format_memory(entry) for entry in entries]}
+
+    @traced("memory.lookup")
+    def lookup(
+        self,
+        text: str,
+        user_id: Optional[str] = None,
+        agent_id: Optional[str] = None,
+        run_id: Optional[str] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Most recent short-term memory in scope whose text is exactly `text`, from the in-process buffer.
+
+        Args:
+            text (str): Text to look for.
+            user_id (str, optional): User identifier. Defaults to None.
+            agent_id (str, optional): Agent identifier. Defaults to None.
+            run_id (str, optional): Run identifier. Defaults to None.
+
+        Returns:
+            dict: The formatted memory, or None.
+        """
+        _, filters = _build_filters_and_metadata(user_id=user_id, agent_id=agent_id, run_id=run_id)
+        entry = self.short_term.lookup(filters, text) if self.short_term else None
+        return _format_memory(entry) if entry else None
+
+    @traced("memory.update")
+    def update(self, memory_id: str, data: Union[str, Dict[str, Any]]):
+        logger.debug(f"Updating memory {memory_id}")
+        if self._promoter:
+            # A queued or in-flight promotion of this memory would land after the update and overwrite it.
+            self._promoter.flush()
+        previous = self._get_point(memory_id)
+        payload = _updated_payload(previous, data)
+        updated_embedding = _embed(self.embedder, payload["data"])
+        with telemetry.span("vector_store.update"):
+            self.vector_store.update(vector_id=memory_id, vector=updated_embedding, payload=payload)
+        if self.short_term:
+            self.short_term.update(memory_id, updated_embedding, payload)
+        _record_history(self.db, "UPDATE", [_changed_history(memory_id, previous, payload["data"])])
+        if self.lexical:
+            self.lexical.update(memory_id, payload["data"])
+        if self.dedup:
+            self.dedup.update(memory_id, payload["hash"])
+
+    @traced("memory.delete")
     def delete(self, memory_id: str):
-        print(f"Deleting memory {memory_id}")
+        logger.debug(f"Deleting memory {memory_id}")
+        previous = self._get_point(memory_id) if self.db else None
+        if self.short_term:
+            self.short_term.discard(memory_id)
+            # Wait out a batch the promoter has already drained, which could still re-insert this memory.
+            self._promoter.flush()
         self.vector_store.delete(vector_id=memory_id)
+        _record_history(self.db, "DELETE", [_changed_history(memory_id, previous, None, is_deleted=1)])
+        if self.archive:
+            self.archive.delete(vector_id=memory_id)
+        if self.lexical:
+            self.lexical.delete([memory_id])
+        if self.dedup:
+            self.dedup.delete([memory_id])
 
-    def delete_all(self, user_id: str):
-        print(f"Deleting all memories for user {user_id}")
+    @traced("memory.delete_all")
+    def delete_all(self, user_id: Optional[str] = None, agent_id: Optional[str] = None, run_id: Optional[str] = None):
+        _, filters = _build_filters_and_metadata(user_id=user_id, agent_id=agent_id, run_id=run_id)
+        logger.debug(f"Deleting all memories for {filters}")
         # This is a simplified version. In a real implementation, this would be much more complex.
         # It would would involve deleting all memories for the user from all six memory layers.
-        memories = self.get_all(user_id)
-        for memory in memories:
-            self.delete(memory["id"])
+        if self.short_term:
+            self.short_term.clear(filters)
+        self.vector_store.delete_by_filter(filters)
+        if self.archive:
+            self.archive.delete_by_filter(filters)
+        if self.lexical:
+            self.lexical.delete_by_filter(filters)
+        if self.dedup:
+            self.dedup.delete_by_filter(filters)
+        if self.graph_store:
+            self.graph_store.delete_all(filters)
 
+    @traced("memory.get")
     def get(self, memory_id: str) -> Optional[Dict[str, Any]]:
-        print(f"Getting memory {memory_id}")
+        logger.debug(f"Getting memory {memory_id}")
         # This is a simplified version. In a real implementation, this would involve retrieving a single memory from the vector store.
-        return self.vector_store.get(memory_id)
+        point = self._get_point(memory_id)
+        return _format_memory(point) if point else None
+
+    def _get_point(self, memory_id: str):
+        point = (self.short_term and self.short_term.get(memory_id)) or self.vector_store.get(memory_id)
+        if point is None and self.archive:
+            point = self.archive.get(memory_id)
+        return point
+
+    @traced("memory.history")
+    def history(self, memory_id: str) -> List[Dict[str, Any]]:
+        """
+        Changes made to a memory through add, update and delete, oldest first.
+
+        Args:
+            memory_id (str): ID of the memory.
 
-    def history(self, memory_id: str):
-        raise NotImplementedError("History is not yet implemented in the new Memory Palace.")
+        Returns:
+            list: History records with "event" ("ADD", "UPDATE" or "DELETE"), "old_memory", "new_memory",
+                "created_at", "updated_at" and "is_deleted".
+        """
+        if self.db is None:
+            raise ValueError("History requires MemoryConfig.history_db_path")
+        return self.db.get_history(memory_id)
 
+    def close(self):
+        """Stop the background threads, writing out whatever the short-term promoter and history queue still hold."""
+        if self._promoter:
+            self._promoter.stop()
+        if self._lifecycle:
+            self._lifecycle.stop()
+        self.retriever.close()
+        if self.db:
+            self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @traced("memory.reset")
     def reset(self):
-        print("Resetting the Memory Palace.")
+        logger.debug("Resetting the Memory Palace.")
+        if self.short_term:
+            self.short_term.clear()
         self.vector_store.reset()
-        self.graph_store.delete_all()
+        if self.archive:
+            self.archive.reset()
+        if self.lexical:
+            self.lexical.reset()
+        if self.dedup:
+            self.dedup.reset()
+        if self.db:
+            self.db.reset()
+        if self.graph_store:
+            self.graph_store.delete_all()
+
+
+class AsyncMemory(MemoryBase):
+    """
+    asyncio counterpart of `Memory`.
+
+    Vector store calls go through `AsyncQdrantClient` (or `AsyncFAISS`, `AsyncPGVector`), local SentenceTransformer
+    encoding and the (blocking) graph store are offloaded to the default thread pool, and independent vector and
+    graph work is awaited concurrently so a single request never blocks the event loop.
+    """
+
+    def __init__(self, config: MemoryConfig = MemoryConfig()):
+        self.config = config
+        self.llm = LlmLoader(self.config.llm.provider, self.config.llm.config).load()
+
+        self.embedder = _create_embedder(self.config)
+        attach_embedder(self.llm, self.embedder)
+        self.vector_store = _create_vector_store(self.config, self.embedder.config.embedding_dims, asynchronous=True)
+
+        self.graph_store = None
+        if self.config.graph_store:
+            from jmemory.graphs.memgraph_memory import MemoryGraph
+
+            self.graph_store = MemoryGraph(self.config, embedding_dims=self.embedder.config.embedding_dims)
+
+        self.lexical = _create_lexical_index(self.config)
+        self.dedup = _create_dedup_index(self.config)
+        self.db = _create_history_store(self.config)
+        self.retriever = LayeredRetriever(self.config.retrieval)
+
+        # Short-term memories are buffered in-process and promoted by a task on the running event loop
+        self.short_term = _create_short_term_buffer(self.config)
+        self._promote_task = None
+        # Created on first use so they bind to the running loop.
+        self._promote_wake = None
+        self._promote_lock = None
+
+        self.usage = None
+        self.archive = None
+        self._lifecycle_task = None
+        self._lifecycle_lock = None
+        if self.config.lifecycle:
+            self.usage = UsageCounters()
+            self.archive = _create_archive(
+                self.config, self.vector_store, self.embedder.config.embedding_dims, asynchronous=True
+            )
+
+    def _ensure_lifecycle(self):
+        if self.config.lifecycle and (self._lifecycle_task is None or self._lifecycle_task.done()):
+            self._lifecycle_task = asyncio.get_running_loop().create_task(self._lifecycle_loop())
+
+    async def _lifecycle_loop(self):
+        while True:
+            await asyncio.sleep(self.config.lifecycle.interval)
+            try:
+                await self.run_lifecycle()
+            except Exception as e:
+                logger.warning(f"Lifecycle pass failed, will retry: {e}")
+
+    async def run_lifecycle(self, now: Optional[float] = None) -> Dict[str, int]:
+        """Async version of `Memory.run_lifecycle`."""
+        if not self.config.lifecycle:
+            raise ValueError("Promotion and decay require MemoryConfig.lifecycle")
+        if self._lifecycle_lock is None:
+            self._lifecycle_lock = asyncio.Lock()
+        async with self._lifecycle_lock:
+            return await arun_lifecycle_pass(
+                self.vector_store, self.archive, self.usage, self.config.lifecycle, self._forget_archived, now
+            )
+
+    async def _forget_archived(self, ids: List[str]):
+        await self._lexical_call("delete", ids)
+        await self._dedup_call("delete", ids)
+
+    def _ensure_promoter(self):
+        if self._promote_wake is None:
+            self._promote_wake = asyncio.Event()
+        if self._promote_task is None or self._promote_task.done():
+            self._promote_task = asyncio.get_running_loop().create_task(self._promote_loop())
+        if self.short_term.pending() >= self.config.short_term.promote_batch_size:
+            self._promote_wake.set()
+
+    async def _promote_loop(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._promote_wake.wait(), self.config.short_term.promote_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._promote_wake.clear()
+            try:
+                await self.flush_short_term()
+            except Exception as e:
+                logger.warning(f"Short-term promotion failed, will retry: {e}")
+
+    async def flush_short_term(self):
+        """Promote every queued short-term memory to the vector store."""
+        if not self.short_term:
+            return
+        if self._promote_lock is None:
+            self._promote_lock = asyncio.Lock()
+        async with self._promote_lock:
+            while True:
+                entries = self.short_term.drain(self.config.short_term.promote_batch_size)
+                if not entries:
+                    return
+                try:
+                    with telemetry.span("short_term.promote", memories=len(entries)):
+                        await self.vector_store.insert(
+                            vectors=[entry.embedding.tolist() for entry in entries],
+                            payloads=[entry.payload for entry in entries],
+                            ids=[entry.id for entry in entries],
+                        )
+                except Exception:
+                    self.short_term.requeue(entries)
+                    raise
+
+    async def close(self):
+        """Stop the background tasks, writing out whatever the short-term promoter and history queue still hold."""
+        if self._lifecycle_task:
+            self._lifecycle_task.cancel()
+            try:
+                await self._lifecycle_task
+            except asyncio.CancelledError:
+                pass
+            self._lifecycle_task = None
+        if self._promote_task:
+            self._promote_task.cancel()
+            try:
+                await self._promote_task
+            except asyncio.CancelledError:
+                pass
+            self._promote_task = None
+        await self.flush_short_term()
+        self.retriever.close()
+        if self.db:
+            await asyncio.to_thread(self.db.close)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def _points_for(self, ids: List[str], known: list) -> list:
+        """Fetch the points for `ids` that are not in `known`, from the short-term buffer or the vector store."""
+        known_ids = {str(point.id) for point in known}
+        missing = [doc_id for doc_id in ids if doc_id not in known_ids]
+        points = [entry for entry in map(self.short_term.get, missing) if entry] if self.short_term else []
+        found = {point.id for point in points}
+        return points + await self.vector_store.get_many([doc_id for doc_id in missing if doc_id not in found])
+
+    async def _lexical_call(self, method: str, *args):
+        if not self.lexical:
+            return None
+        with telemetry.span(f"lexical.{method}"):
+            return await asyncio.to_thread(getattr(self.lexical, method), *args)
+
+    async def _dedup_call(self, method: str, *args):
+        if not self.dedup:
+            return None
+        return await asyncio.to_thread(getattr(self.dedup, method), *args)
+
+    async def _graph_call(self, method: str, *args):
+        if not self.graph_store:
+            return None
+        with telemetry.span(f"graph.{method}"):
+            return await asyncio.to_thread(getattr(self.graph_store, method), *args)
+
+    @traced("memory.add")
+    async def add(
+        self,
+        messages,
+        user_id: Optional[str] = None,
+        agent_id: Optional[str] = None,
+        run_id: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+        filters: Optional[Dict[str, Any]] = None,
+        memory_type: Optional[str] = None,
+    ):
+        messages = _normalize_messages(messages)
+        metadata, filters = _build_filters_and_metadata(
+            user_id=user_id, agent_id=agent_id, run_id=run_id, input_metadata=metadata, input_filters=filters
+        )
+        logger.debug(f"Adding {len(messages)} messages to memory for {filters}")
+        texts = [m["content"] for m in messages]
+        ids = [str(uuid.uuid4()) for _ in texts]
+        payloads = _build_payloads(messages, metadata, memory_type)
+        all_ids, all_texts = ids, texts
+        self._ensure_lifecycle()
+        repeats = await asyncio.to_thread(_claim_hashes, self.dedup, ids, payloads)
+        _record_mentions(self.usage, repeats)
+        new = [index for index, repeat in enumerate(repeats) if repeat is None]
+        if not new:
+            return {"results": _add_results(all_ids, all_texts, repeats)}
+        ids, texts, payloads = ([items[index] for index in new] for items in (ids, texts, payloads))
+
+        async def add_to_vector_store():
+            try:
+                embeddings = await asyncio.to_thread(_embed_batch, self.embedder, texts)
+                if self.short_term and memory_type == MemoryType.SHORT_TERM.value:
+                    self.short_term.add(ids, embeddings, payloads)
+                    self._ensure_promoter()
+                else:
+                    with telemetry.span("vector_store.insert", vectors=len(ids)):
+                        await self.vector_store.insert(vectors=embeddings, payloads=payloads, ids=ids)
+            except Exception:
+                await self._dedup_call("delete", ids)
+                raise
+            # The history store is write-behind, so recording only queues the rows.
+            _record_history(self.db, "ADD", _added_history(ids, payloads))
+            await self._lexical_call("add", ids, texts, payloads)
+
+        await asyncio.gather(add_to_vector_store(), self._graph_call("add", "\n".join(texts), filters))
+        return {"results": _add_results(all_ids, all_texts, repeats)}
+
+    @traced("memory.search")
+    async def search(
+        self,
+        query: str,
+        user_id: Optional[str] = None,
+        agent_id: Optional[str] = None,
+        run_id: Optional[str] = None,
+        limit: int = 5,
+        filters: Optional[Dict[str, Any]] = None,
+        mode: str = "vector",
+    ) -> Dict[str, Any]:
+        _check_search_mode(mode, self.lexical)
+        _, filters = _build_filters_and_metadata(
+            user_id=user_id, agent_id=agent_id, run_id=run_id, input_filters=filters
+        )
+        logger.debug(f"Searching memory for {filters} with query: {query}")
+        candidates = limit * HYBRID_CANDIDATE_FACTOR if mode == "hybrid" else limit
+
+        async def search_dense():
+            query_embedding = await asyncio.to_thread(_embed, self.embedder, query)
+            with telemetry.span("vector_store.search", limit=candidates):
+                points = await self.vector_store.search(
+                    query=query, vectors=query_embedding, limit=candidates, filters=filters
+                )
+            if self.short_term:
+                points = _merge_points(points, self.short_term.search(filters, query_embedding, candidates), candidates)
+            return points
+
+        async def search_layers():
+            query_embedding = await asyncio.to_thread(_embed, self.embedder, query)
+
+            async def search_layer(layer, layer_filters, top_k):
+                points = await self.vector_store.search(
+                    query=query, vectors=query_embedding, limit=top_k, filters=layer_filters
+                )
+                if self.short_term and layer == MemoryType.SHORT_TERM.value:
+                    points = _merge_points(points, self.short_term.search(filters, query_embedding, top_k), top_k)
+                return points
+
+            return await self.retriever.asearch(search_layer, filters, limit)
+
+        async def search_vector_store():
+            if mode == "layered":
+                return await search_layers()
+            if mode != "hybrid":
+                return await search_dense(), None
+            points, hits = await asyncio.gather(
+                search_dense(), self._lexical_call("search", query, filters, candidates)
+            )
+            ranking = [doc_id for doc_id, _ in hits]
+            return _fuse_points(points, await self._points_for(ranking, points), ranking, filters, limit), None
+
+        (points, layers), relations = await asyncio.gather(
+            search_vector_store(), self._graph_call("search", query, filters)
+        )
+        self._ensure_lifecycle()
+        _record_access(self.usage, points)
+        result = {"results": [_format_memory(point) for point in points]}
+        if layers is not None:
+            result["layers"] = layers
+        if self.graph_store:
+            result["relations"] = relations
+        return result
+
+    @traced("memory.get_all")
+    async def get_all(
+        self,
+        user_id: Optional[str] = None,
+        agent_id: Optional[str] = None,
+        run_id: Optional[str] = None,
+        limit: int = 100,
+    ) -> Dict[str, Any]:
+        _, filters = _build_filters_and_metadata(user_id=user_id, agent_id=agent_id, run_id=run_id)
+
+        async def list_vector_store():
+            await self.flush_short_term()
+            points = []
+            async for point in self.vector_store.iter_all(filters=filters, page_size=min(limit, MAX_PAGE_SIZE)):
+                points.append(point)
+                if len(points) >= limit:
+                    break
+            return points
+
+        points, relations = await asyncio.gather(list_vector_store(), self._graph_call("get_all", filters, limit))
+        result = {"results": [_format_memory(point) for point in points]}
+        if self.graph_store:
+            result["relations"] = relations
+        return result
+
+    async def iter_all(
+        self,
+        user_id: Optional[str] = None,
+        agent_id: Optional[str] = None,
+        run_id: Optional[str] = None,
+        page_size: int = 100,
+    ):
+        """
+        Stream every memory in scope without loading them all at once.
+
+        Args:
+            user_id (str, optional): User identifier. Defaults to None.
+            agent_id (str, optional): Agent identifier. Defaults to None.
+            run_id (str, optional): Run identifier. Defaults to None.
+            page_size (int, optional): Number of memories fetched per request. Defaults to 100.
+
+        Yields:
+            dict: Formatted memories.
+        """
+        _, filters = _build_filters_and_metadata(user_id=user_id, agent_id=agent_id, run_id=run_id)
+        await self.flush_short_term()
+        async for point in self.vector_store.iter_all(filters=filters, page_size=page_size):
+            yield _format_memory(point)
+
+    @traced("memory.recent")
+    async def recent(
+        self,
+        user_id: Optional[str] = None,
+        agent_id: Optional[str] = None,
+        run_id: Optional[str] = None,
+        limit: int = 10,
+    ) -> Dict[str, Any]:
+        """Async version of `Memory.recent`."""
+        _, filters = _build_filters_and_metadata(user_id=user_id, agent_id=agent_id, run_id=run_id)
+        entries = self.short_term.recent(filters, limit) if self.short_term else []
+        return {"results": [_format_memory(entry) for entry in entries]}
+
+    @traced("memory.lookup")
+    async def lookup(
+        self,
+        text: str,
+        user_id: Optional[str] = None,
+        agent_id: Optional[str] = None,
+        run_id: Optional[str] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """Async version of `Memory.lookup`."""
+        _, filters = _build_filters_and_metadata(user_id=user_id, agent_id=agent_id, run_id=run_id)
+        entry = self.short_term.lookup(filters, text) if self.short_term else None
+        return _format_memory(entry) if entry else None
+
+    @traced("memory.update")
+    async def update(self, memory_id: str, data: Union[str, Dict[str, Any]]):
+        # See `Memory.update`: land any promotion of this memory before updating it.
+        await self.flush_short_term()
+        previous = await self._get_point(memory_id)
+        payload = _updated_payload(previous, data)
+        updated_embedding = await asyncio.to_thread(_embed, self.embedder, payload["data"])
+        with telemetry.span("vector_store.update"):
+            await self.vector_store.update(vector_id=memory_id, vector=updated_embedding, payload=payload)
+        if self.short_term:
+            self.short_term.update(memory_id, updated_embedding, payload)
+        _record_history(self.db, "UPDATE", [_changed_history(memory_id, previous, payload["data"])])
+        await self._lexical_call("update", memory_id, payload["data"])
+        await self._dedup_call("update", memory_id, payload["hash"])
+
+    @traced("memory.delete")
+    async def delete(self, memory_id: str):
+        previous = await self._get_point(memory_id) if self.db else None
+        if self.short_term:
+            self.short_term.discard(memory_id)
+            await self.flush_short_term()
+        await self.vector_store.delete(vector_id=memory_id)
+        _record_history(self.db, "DELETE", [_changed_history(memory_id, previous, None, is_deleted=1)])
+        if self.archive:
+            await self.archive.delete(vector_id=memory_id)
+        await self._lexical_call("delete", [memory_id])
+        await self._dedup_call("delete", [memory_id])
+
+    @traced("memory.delete_all")
+    async def delete_all(
+        self, user_id: Optional[str] = None, agent_id: Optional[str] = None, run_id: Optional[str] = None
+    ):
+        _, filters = _build_filters_and_metadata(user_id=user_id, agent_id=agent_id, run_id=run_id)
+        if self.short_term:
+            self.short_term.clear(filters)
+        await asyncio.gather(
+            self.vector_store.delete_by_filter(filters),
+            *([self.archive.delete_by_filter(filters)] if self.archive else []),
+            self._lexical_call("delete_by_filter", filters),
+            self._dedup_call("delete_by_filter", filters),
+            self._graph_call("delete_all", filters),
+        )
+
+    @traced("memory.get")
+    async def get(self, memory_id: str) -> Optional[Dict[str, Any]]:
+        point = await self._get_point(memory_id)
+        return _format_memory(point) if point else None
+
+    async def _get_point(self, memory_id: str):
+        point = (self.short_term and self.short_term.get(memory_id)) or await self.vector_store.get(memory_id)
+        if point is None and self.archive:
+            point = await self.archive.get(memory_id)
+        return point
+
+    @traced("memory.history")
+    async def history(self, memory_id: str) -> List[Dict[str, Any]]:
+        """Async version of `Memory.history`."""
+        if self.db is None:
+            raise ValueError("History requires MemoryConfig.history_db_path")
+        return await asyncio.to_thread(self.db.get_history, memory_id)
+
+    @traced("memory.reset")
+    async def reset(self):
+        if self.short_term:
+            self.short_term.clear()
+        await self.vector_store.reset()
+        if self.archive:
+            await self.archive.reset()
+        await self._lexical_call("reset")
+        await self._dedup_call("reset")
+        if self.db:
+            await asyncio.to_thread(self.db.reset)
+        if self.graph_store:
+            await asyncio.to_thread(self.graph_store.delete_all)
@@ -1,17 +1,15 @@
 import logging
 
+import numpy as np
+
+from jmemory.memory.lexical import bm25_rank, tokenize
 from jmemory.memory.utils import format_entities
 
 try:
-    from langchain_memgraph import Memgraph
+    from langchain_memgraph.graphs.memgraph import Memgraph
 except ImportError:
     raise ImportError("langchain_memgraph is not installed. Please install it using pip install langchain-memgraph")
 
-try:
-    from rank_bm25 import BM25Okapi
-except ImportError:
-    raise ImportError("rank_bm25 is not installed. Please install it using pip install rank-bm25")
-
 from jmemory.graphs.tools import (
     DELETE_MEMORY_STRUCT_TOOL_GRAPH,
     DELETE_MEMORY_TOOL_GRAPH,
@@ -61,6 +59,12 @@ class MemoryGraph:
         create_label_index_query = "CREATE INDEX ON :Entity;"
         self.graph.query(create_label_index_query, params={})
 
+        self.vector_index = "memzero"
+        # The vector index returns the top-k nodes across all users and results are filtered afterwards, so k
+        # grows up to `vector_search_max_k` for entities whose top-k was filled by other users' nodes.
+        self.vector_search_k = 100
+        self.vector_search_max_k = 6400
+
     def add(self, data, filters):
         """
         Adds data to the graph.
@@ -76,8 +80,8 @@ class MemoryGraph:
 
         # TODO: Batch queries with APOC plugin
         # TODO: Add more filter support
-        deleted_entities = self._delete_entities(to_be_deleted, filters["user_id"])
-        added_entities = self._add_entities(to_be_added, filters["user_id"], entity_type_map)
+        deleted_entities = self._delete_entities(to_be_deleted, filters)
+        added_entities = self._add_entities(to_be_added, filters, entity_type_map)
 
         return {"deleted_entities": deleted_entities, "added_entities": added_entities}
 
@@ -104,10 +108,9 @@ class MemoryGraph:
         search_outputs_sequence = [
             [item["source"], item["relationship"], item["destination"]] for item in search_output
         ]
-        bm25 = BM25Okapi(search_outputs_sequence)
-
-        tokenized_query = query.split(" ")
-        reranked_results = bm25.get_top_n(tokenized_query, search_outputs_sequence, n=5)
+        # Rank the triples by their words; names like "san_francisco" or "works_at" split into separate tokens.
+        ranked = bm25_rank(query, [tokenize(" ".join(item)) for item in search_outputs_sequence], limit=5)
+        reranked_results = [search_outputs_sequence[index] for index in ranked]
 
         search_results = []
         for item in reranked_results:
@@ -255,74 +258,39 @@ class MemoryGraph:
 
     def _search_graph_db(self, node_list, filters, limit=100):
         """Search similar nodes among and their respective incoming and outgoing relations."""
-        result_relations = []
-
-        for node in node_list:
-            n_embedding = self.embedding_model.embed(node)
-
-            # Build query based on whether agent_id is provided
-            if filters.get("agent_id"):
-                cypher_query = """
-                MATCH (n:Entity {user_id: $user_id, agent_id: $agent_id})-[r]->(m:Entity)
-                WHERE n.embedding IS NOT NULL
-                WITH collect(n) AS nodes1, collect(m) AS nodes2, r
-                CALL node_similarity.cosine_pairwise("embedding", nodes1, nodes2)
-                YIELD node1, node2, similarity
-                WITH node1, node2, similarity, r
-                WHERE similarity >= $threshold
-                RETURN node1.name AS source, id(node1) AS source_id, type(r) AS relationship, id(r) AS relation_id, node2.name AS destination, id(node2) AS destination_id, similarity
-                UNION
-                MATCH (n:Entity {user_id: $user_id, agent_id: $agent_id})<-[r]-(m:Entity)
-                WHERE n.embedding IS NOT NULL
-                WITH collect(n) AS nodes1, collect(m) AS nodes2, r
-                CALL node_similarity.cosine_pairwise("embedding", nodes1, nodes2)
-                YIELD node1, node2, similarity
-                WITH node1, node2, similarity, r
-                WHERE similarity >= $threshold
-                RETURN node2.name AS source, id(node2) AS source_id, type(r) AS relationship, id(r) AS relation_id, node1.name AS destination, id(node1) AS destination_id, similarity
-                ORDER BY similarity DESC
-                LIMIT $limit;
-                """
-                params = {
-                    "n_embedding": n_embedding,
-                    "threshold": self.threshold,
-                    "user_id": filters["user_id"],
-                    "agent_id": filters["agent_id"],
-                    "limit": limit,
-                }
-            else:
-                cypher_query = """
-                MATCH (n:Entity {user_id: $user_id})-[r]->(m:Entity)
-                WHERE n.embedding IS NOT NULL
-                WITH collect(n) AS nodes1, collect(m) AS nodes2, r
-                CALL node_similarity.cosine_pairwise("embedding", nodes1, nodes2)
-                YIELD node1, node2, similarity
-                WITH node1, node2, similarity, r
-                WHERE similarity >= $threshold
-                RETURN node1.name AS source, id(node1) AS source_id, type(r) AS relationship, id(r) AS relation_id, node2.name AS destination, id(node2) AS destination_id, similarity
-                UNION
-                MATCH (n:Entity {user_id: $user_id})<-[r]-(m:Entity)
-                WHERE n.embedding IS NOT NULL
-                WITH collect(n) AS nodes1, collect(m) AS nodes2, r
-                CALL node_similarity.cosine_pairwise("embedding", nodes1, nodes2)
-                YIELD node1, node2, similarity
-                WITH node1, node2, similarity, r
-                WHERE similarity >= $threshold
-                RETURN node2.name AS source, id(node2) AS source_id, type(r) AS relationship, id(r) AS relation_id, node1.name AS destination, id(node1) AS destination_id, similarity
-                ORDER BY similarity DESC
-                LIMIT $limit;
-                """
-                params = {
-                    "n_embedding": n_embedding,
-                    "threshold": self.threshold,
-                    "user_id": filters["user_id"],
-                    "limit": limit,
-                }
-            
-            ans = self.graph.query(cypher_query, params=params)
-            result_relations.extend(ans)
+        if not node_list:
+            return []
+
+        node_embeddings = self.embedding_model.embed_batch(node_list)
+        matches = self._find_similar_nodes(
+            dict(zip(node_list, node_embeddings)), filters, threshold=self.threshold, limit=limit
+        )
+        rows = [{"matches": matches.get(node, [])} for node in dict.fromkeys(node_list)]
+
+        agent_filter = ""
+        params = {"rows": rows, "user_id": filters["user_id"], "limit": limit}
+        if filters.get("agent_id"):
+            agent_filter = "AND m.agent_id = $agent_id"
+            params["agent_id"] = filters["agent_id"]
+
+        cypher_query = f"""
+        UNWIND $rows AS row
+        CALL {{
+            WITH row
+            UNWIND row.matches AS match
+            MATCH (n:Entity)-[r]-(m:Entity)
+            WHERE id(n) = match.id AND m.user_id = $user_id {agent_filter}
+            WITH DISTINCT r, startNode(r) AS src, endNode(r) AS dst, match.similarity AS similarity
+            RETURN
+                src.name AS source, id(src) AS source_id, type(r) AS relationship, id(r) AS relation_id,
+                dst.name AS destination, id(dst) AS destination_id, similarity
+            ORDER BY similarity DESC
+            LIMIT $limit
+        }}
+        RETURN source, source_id, relationship, relation_id, destination, destination_id, similarity
+        """
 
-        return result_relations
+        return self.graph.query(cypher_query, params=params)
 
     def _get_delete_entities_from_search_output(self, search_output, data, filters):
         """Get the entities to be deleted from the search output."""
@@ -398,7 +366,12 @@ class MemoryGraph:
         user_id = filters["user_id"]
         agent_id = filters.get("agent_id", None)
         results = []
-        
+
+        # Embed every entity once and resolve them all against the graph in one lookup.
+        names = list(dict.fromkeys(name for item in to_be_added for name in (item["source"], item["destination"])))
+        embeddings = dict(zip(names, self.embedding_model.embed_batch(names))) if names else {}
+        candidates = self._search_node_candidates(embeddings, filters, threshold=0.9)
+
         for item in to_be_added:
             # entities
             source = item["source"]
@@ -409,13 +382,11 @@ class MemoryGraph:
             source_type = entity_type_map.get(source, "__User__")
             destination_type = entity_type_map.get(destination, "__User__")
 
-            # embeddings
-            source_embedding = self.embedding_model.embed(source)
-            dest_embedding = self.embedding_model.embed(destination)
-
-            # search for the nodes with the closest embeddings
-            source_node_search_result = self._search_source_node(source_embedding, filters, threshold=0.9)
-            destination_node_search_result = self._search_destination_node(dest_embedding, filters, threshold=0.9)
+            # embeddings and the existing nodes closest to them
+            source_embedding = embeddings[source]
+            dest_embedding = embeddings[destination]
+            source_id = candidates.get(source)
+            destination_id = candidates.get(destination)
 
             # Prepare agent_id for node creation
             agent_id_clause = ""
@@ -423,7 +394,7 @@ class MemoryGraph:
                 agent_id_clause = ", agent_id: $agent_id"
             
             # TODO: Create a cypher query and common params for all the cases
-            if not destination_node_search_result and source_node_search_result:
+            if destination_id is None and source_id is not None:
                 cypher = f"""
                     MATCH (source:Entity)
                     WHERE id(source) = $source_id
@@ -439,7 +410,7 @@ class MemoryGraph:
                     """
 
                 params = {
-                    "source_id": source_node_search_result[0]["id(source_candidate)"],
+                    "source_id": source_id,
                     "destination_name": destination,
                     "destination_embedding": dest_embedding,
                     "user_id": user_id,
@@ -447,7 +418,7 @@ class MemoryGraph:
                 if agent_id:
                     params["agent_id"] = agent_id
                 
-            elif destination_node_search_result and not source_node_search_result:
+            elif destination_id is not None and source_id is None:
                 cypher = f"""
                     MATCH (destination:Entity)
                     WHERE id(destination) = $destination_id
@@ -463,7 +434,7 @@ class MemoryGraph:
                     """
 
                 params = {
-                    "destination_id": destination_node_search_result[0]["id(destination_candidate)"],
+                    "destination_id": destination_id,
                     "source_name": source,
                     "source_embedding": source_embedding,
                     "user_id": user_id,
@@ -471,7 +442,7 @@ class MemoryGraph:
                 if agent_id:
                     params["agent_id"] = agent_id
                 
-            elif source_node_search_result and destination_node_search_result:
+            elif source_id is not None and destination_id is not None:
                 cypher = f"""
                     MATCH (source:Entity)
                     WHERE id(source) = $source_id
@@ -484,8 +455,8 @@ class MemoryGraph:
                     RETURN source.name AS source, type(r) AS relationship, destination.name AS target
                     """
                 params = {
-                    "source_id": source_node_search_result[0]["id(source_candidate)"],
-                    "destination_id": destination_node_search_result[0]["id(destination_candidate)"],
+                    "source_id": source_id,
+                    "destination_id": destination_id,
                     "user_id": user_id,
                 }
                 if agent_id:
@@ -526,78 +497,133 @@ class MemoryGraph:
 
     def _search_source_node(self, source_embedding, filters, threshold=0.9):
         """Search for source nodes with similar embeddings."""
-        user_id = filters["user_id"]
-        agent_id = filters.get("agent_id", None)
-        
-        if agent_id:
-            cypher = """
-                CALL vector_search.search("memzero", 1, $source_embedding) 
-                YIELD distance, node, similarity
-                WITH node AS source_candidate, similarity
-                WHERE source_candidate.user_id = $user_id 
-                AND source_candidate.agent_id = $agent_id 
-                AND similarity >= $threshold
-                RETURN id(source_candidate);
-                """
-            params = {
-                "source_embedding": source_embedding,
-                "user_id": user_id,
-                "agent_id": agent_id,
-                "threshold": threshold,
-            }
-        else:
-            cypher = """
-                CALL vector_search.search("memzero", 1, $source_embedding) 
-                YIELD distance, node, similarity
-                WITH node AS source_candidate, similarity
-                WHERE source_candidate.user_id = $user_id 
-                AND similarity >= $threshold
-                RETURN id(source_candidate);
-                """
-            params = {
-                "source_embedding": source_embedding,
-                "user_id": user_id,
-                "threshold": threshold,
-            }
-
-        result = self.graph.query(cypher, params=params)
-        return result
+        matches = self._find_similar_nodes({"source": source_embedding}, filters, threshold=threshold)
+        return [{"id(source_candidate)": match["id"]} for match in matches["source"]]
 
     def _search_destination_node(self, destination_embedding, filters, threshold=0.9):
         """Search for destination nodes with similar embeddings."""
-        user_id = filters["user_id"]
-        agent_id = filters.get("agent_id", None)
-        
-        if agent_id:
-            cypher = """
-                CALL vector_search.search("memzero", 1, $destination_embedding) 
-                YIELD distance, node, similarity
-                WITH node AS destination_candidate, similarity
-                WHERE node.user_id = $user_id 
-                AND node.agent_id = $agent_id 
-                AND similarity >= $threshold
-                RETURN id(destination_candidate);
-                """
-            params = {
-                "destination_embedding": destination_embedding,
-                "user_id": user_id,
-                "agent_id": agent_id,
-                "threshold": threshold,
-            }
-        else:
-            cypher = """
-                CALL vector_search.search("memzero", 1, $destination_embedding) 
-                YIELD distance, node, similarity
-                WITH node AS destination_candidate, similarity
-                WHERE node.user_id = $user_id 
-                AND similarity >= $threshold
-                RETURN id(destination_candidate);
-                """
-            params = {
-                "destination_embedding": destination_embedding,
-                "user_id": user_id,
-                "threshold": threshold,
-            }
+        matches = self._find_similar_nodes({"destination": destination_embedding}, filters, threshold=threshold)
+        return [{"id(destination_candidate)": match["id"]} for match in matches["destination"]]
+
+    def _search_node_candidates(self, embeddings, filters, threshold=0.9):
+        """
+        Resolve many entities against the existing graph at once.
+
+        Args:
+            embeddings (dict): Entity name -> embedding.
+            filters (dict): A dictionary containing filters to be applied during the search.
+            threshold (float): Minimum similarity for a node to be considered the same entity.
+
+        Returns:
+            dict: Entity name -> id of the most similar existing node, for the entities that matched.
+        """
+        matches = self._find_similar_nodes(embeddings, filters, threshold=threshold, limit=1)
+        return {name: found[0]["id"] for name, found in matches.items() if found}
+
+    def _find_similar_nodes(self, embeddings, filters, threshold, limit=1):
+        """
+        Find the existing entities closest to each embedding.
+
+        Uses the `memzero` vector index through `vector_search.search`. When the top-k returned by the index was
+        exhausted by other users' nodes while still above the threshold, those entities are asked again with a
+        four times larger k, up to `vector_search_max_k`. Falls back to an exact scan over the user's nodes when
+        the index is unavailable or an entity is still unresolved at the largest k.
+
+        Args:
+            embeddings (dict): Entity name -> embedding.
+            filters (dict): A dictionary containing filters to be applied during the search.
+            threshold (float): Minimum cosine similarity for a node to match.
+            limit (int): Maximum number of matches per entity. Defaults to 1.
+
+        Returns:
+            dict: Entity name -> list of {"id", "similarity"} ordered by decreasing similarity.
+        """
+        if not embeddings:
+            return {}
+
+        pending = dict(embeddings)
+        matches = {}
+        k = max(self.vector_search_k, limit)
+        while pending and self.vector_index:
+            try:
+                found, rescan = self._search_vector_index(pending, filters, threshold, limit, k)
+            except Exception as e:
+                logger.warning(f"Vector index search failed, falling back to a full scan: {e}")
+                self.vector_index = None
+                break
+            matches.update(found)
+            pending = {name: pending[name] for name in rescan}
+            if k >= self.vector_search_max_k:
+                break
+            k = min(k * 4, self.vector_search_max_k)
+
+        if pending:
+            matches.update(self._scan_similar_nodes(pending, filters, threshold, limit))
+        return matches
+
+    def _search_vector_index(self, embeddings, filters, threshold, limit, k):
+        agent_filter = ""
+        params = {
+            "index_name": self.vector_index,
+            "k": k,
+            "items": [{"name": name, "embedding": embedding} for name, embedding in embeddings.items()],
+            "user_id": filters["user_id"],
+            "threshold": threshold,
+            "limit": limit,
+        }
+        if filters.get("agent_id"):
+            agent_filter = "AND hit.node.agent_id = $agent_id"
+            params["agent_id"] = filters["agent_id"]
+
+        cypher = f"""
+        UNWIND $items AS item
+        CALL {{
+            WITH item
+            CALL vector_search.search($index_name, $k, item.embedding) YIELD node, similarity
+            WITH collect({{node: node, similarity: similarity}}) AS hits
+            RETURN
+                [hit IN hits WHERE hit.node.user_id = $user_id {agent_filter} AND hit.similarity >= $threshold
+                    | {{id: id(hit.node), similarity: hit.similarity}}][..$limit] AS matches,
+                size(hits) = $k AND hits[-1].similarity >= $threshold AS truncated
+        }}
+        RETURN item.name AS name, matches, truncated
+        """
+        matches, rescan = {}, []
+        for row in self.graph.query(cypher, params=params):
+            if row["truncated"] and len(row["matches"]) < limit:
+                rescan.append(row["name"])
+            else:
+                matches[row["name"]] = row["matches"]
+        return matches, rescan
 
-        result = self.graph.query(cypher, params=params)
-        return result
+    def _scan_similar_nodes(self, embeddings, filters, threshold, limit):
+        # Memgraph has no `vector.similarity.cosine`, so the scan fetches the user's embeddings and ranks them here.
+        agent_filter = ""
+        params = {"user_id": filters["user_id"]}
+        if filters.get("agent_id"):
+            agent_filter = "AND n.agent_id = $agent_id"
+            params["agent_id"] = filters["agent_id"]
+
+        cypher = f"""
+        MATCH (n:Entity)
+        WHERE n.user_id = $user_id AND n.embedding IS NOT NULL {agent_filter}
+        RETURN id(n) AS id, n.embedding AS embedding
+        """
+        rows = self.graph.query(cypher, params=params)
+        if not rows:
+            return {name: [] for name in embeddings}
+
+        ids = [row["id"] for row in rows]
+        nodes = np.asarray([row["embedding"] for row in rows], dtype=np.float32)
+        nodes /= np.linalg.norm(nodes, axis=1, keepdims=True) + 1e-12
+        queries = np.asarray(list(embeddings.values()), dtype=np.float32)
+        queries /= np.linalg.norm(queries, axis=1, keepdims=True) + 1e-12
+        similarities = queries @ nodes.T
+
+        matches = {}
+        for name, scores in zip(embeddings, similarities):
+            order = np.argsort(-scores)[:limit]
+            matches[name] = [
+                {"id": ids[i], "similarity": round(float(scores[i]), 4)} for i in order if scores[i] >= threshold
+            ]
+        return matches
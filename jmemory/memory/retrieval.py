@@ -0,0 +1,225 @@
+"""
+Layered retrieval: query every memory layer concurrently and merge the hits in one scoring pass.
+
+Each layer (short-term, medium-term, long-term, semantic, episodic, procedural) is searched on its own with its
+own top-k budget and deadline, so the slowest layer bounds a search instead of the sum of all of them. Layers that
+miss their deadline are reported and left out; the search returns what the other layers found.
+"""
+
+import asyncio
+import concurrent.futures
+import contextvars
+import logging
+import threading
+import time
+from datetime import datetime
+from types import SimpleNamespace
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from jmemory.configs.enums import MemoryType
+from jmemory.configs.retrieval import LayerConfig, RetrievalConfig
+from jmemory.memory.telemetry import telemetry
+
+logger = logging.getLogger(__name__)
+
+# Payload key that records which layer a memory belongs to.
+LAYER_KEY = "memory_type"
+
+# Called with (layer, filters including the layer condition, top_k) and returns scored points, best first.
+LayerSearch = Callable[[str, Dict[str, Any], int], List[Any]]
+AsyncLayerSearch = Callable[[str, Dict[str, Any], int], Awaitable[List[Any]]]
+
+
+def written_at(payload: Dict[str, Any]) -> float:
+    """Seconds since the epoch of the last write of a memory, or NaN when the payload has no usable timestamp."""
+    return parse_timestamp(payload.get("updated_at") or payload.get("created_at"))
+
+
+def parse_timestamp(value: Any) -> float:
+    """Seconds since the epoch of an ISO 8601 payload timestamp, or NaN when it is missing or malformed."""
+    if not value:
+        return np.nan
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except (TypeError, ValueError):
+        return np.nan
+
+
+class LayeredRetriever:
+    """
+    Fans a search out over the memory layers and ranks the merged hits.
+
+    The combined score of a hit is `weight * ((1 - recency_weight) * similarity + recency_weight * decay)`, where
+    `decay` halves every `half_life` seconds since the memory was last written (and is 1 for layers without a
+    half-life), so that layers can be tuned towards fresh or stable memories.
+
+    Args:
+        config (RetrievalConfig): Layer budgets, deadlines and weights.
+        max_workers (int, optional): Threads for synchronous searches. Defaults to two per layer.
+    """
+
+    def __init__(self, config: RetrievalConfig, max_workers: Optional[int] = None):
+        self.config = config
+        self.layers: Dict[str, LayerConfig] = {name: layer for name, layer in config.layers.items() if layer.enabled}
+        self.max_workers = max_workers or max(2 * len(self.layers), 1)
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def plan(self, filters: Dict[str, Any], limit: int) -> List[Tuple[str, Dict[str, Any], int, float]]:
+        """
+        Work out which layers to query, and how.
+
+        Args:
+            filters (dict): Search filters. A `memory_type` filter restricts the search to that layer.
+            limit (int): Number of results requested, the default top-k of each layer.
+
+        Returns:
+            list: (layer, layer filters, top_k, deadline in seconds) per layer to query.
+        """
+        requested = filters.get(LAYER_KEY)
+        base = {key: value for key, value in filters.items() if key != LAYER_KEY}
+        plan = []
+        for name, layer in self.layers.items():
+            if isinstance(requested, str) and requested != name:
+                continue
+            if name == self.config.untyped_layer:
+                # Memories added without a type live here too: exclude the other layers instead of matching this one.
+                others = [memory_type.value for memory_type in MemoryType if memory_type.value != name]
+                layer_filters = {**base, LAYER_KEY: {"nin": others}}
+            else:
+                layer_filters = {**base, LAYER_KEY: name}
+            deadline = (layer.deadline_ms if layer.deadline_ms is not None else self.config.deadline_ms) / 1000
+            plan.append((name, layer_filters, layer.top_k or limit, deadline))
+        return plan
+
+    def search(self, search_layer: LayerSearch, filters: Dict[str, Any], limit: int) -> Tuple[list, Dict[str, Dict]]:
+        """
+        Query the layers on a thread pool and rank what comes back before the deadlines.
+
+        Args:
+            search_layer (callable): Searches one layer, see `LayerSearch`.
+            filters (dict): Search filters.
+            limit (int): Maximum number of results.
+
+        Returns:
+            tuple: Ranked points, and a report per layer with its "status" ("ok", "timeout" or "error") and "hits".
+        """
+        plan = self.plan(filters, limit)
+        executor = self._get_executor()
+        start = time.monotonic()
+        futures = {
+            name: executor.submit(contextvars.copy_context().run, self._search_layer, search_layer, name, filters_, k)
+            for name, filters_, k, _ in plan
+        }
+        hits, report, errors = {}, {}, []
+        for name, _, _, deadline in sorted(plan, key=lambda entry: entry[3]):
+            try:
+                hits[name] = futures[name].result(timeout=max(start + deadline - time.monotonic(), 0))
+            except concurrent.futures.TimeoutError:
+                futures[name].cancel()
+                report[name] = self._timed_out(name, deadline)
+            except Exception as e:
+                errors.append(e)
+                report[name] = self._failed(name, e)
+            else:
+                report[name] = {"status": "ok", "hits": len(hits[name])}
+        if errors and len(errors) == len(plan):
+            raise errors[0]
+        return self.rank(hits, limit), report
+
+    async def asearch(
+        self, search_layer: AsyncLayerSearch, filters: Dict[str, Any], limit: int
+    ) -> Tuple[list, Dict[str, Dict]]:
+        """Async version of `search`, for a coroutine `search_layer`."""
+        plan = self.plan(filters, limit)
+
+        async def run(name, layer_filters, k, deadline):
+            with telemetry.span("retrieval.layer", layer=name, limit=k):
+                return await asyncio.wait_for(search_layer(name, layer_filters, k), timeout=deadline)
+
+        outcomes = await asyncio.gather(*(run(*entry) for entry in plan), return_exceptions=True)
+        hits, report, errors = {}, {}, []
+        for (name, _, _, deadline), outcome in zip(plan, outcomes):
+            if isinstance(outcome, asyncio.TimeoutError):
+                report[name] = self._timed_out(name, deadline)
+            elif isinstance(outcome, BaseException):
+                errors.append(outcome)
+                report[name] = self._failed(name, outcome)
+            else:
+                hits[name] = outcome
+                report[name] = {"status": "ok", "hits": len(outcome)}
+        if errors and len(errors) == len(plan):
+            raise errors[0]
+        return self.rank(hits, limit), report
+
+    def rank(self, hits: Dict[str, list], limit: int, now: Optional[float] = None) -> list:
+        """
+        Score the hits of all layers together and keep the best one per memory.
+
+        Args:
+            hits (dict): Points per layer, each with `id`, `payload` and a similarity `score`.
+            limit (int): Maximum number of results.
+            now (float, optional): Current time in seconds since the epoch. Defaults to the clock.
+
+        Returns:
+            list: Points with `score` set to the combined score, best first.
+        """
+        entries = [(name, point) for name, points in hits.items() for point in points]
+        if not entries:
+            return []
+        now = time.time() if now is None else now
+        similarity = np.array([point.score or 0.0 for _, point in entries], dtype=np.float64)
+        weight = np.array([self.layers[name].weight for name, _ in entries], dtype=np.float64)
+        half_life = np.array([self.layers[name].half_life or np.inf for name, _ in entries], dtype=np.float64)
+        written = np.array([written_at(point.payload or {}) for _, point in entries], dtype=np.float64)
+        # Memories without a timestamp count as fresh; clock skew never makes one younger than now.
+        age = np.clip(np.nan_to_num(now - written, nan=0.0), 0.0, None)
+        decay = np.exp2(-age / half_life)
+        recency_weight = self.config.recency_weight
+        scores = weight * ((1 - recency_weight) * similarity + recency_weight * decay)
+
+        results, seen = [], set()
+        # A memory can be a hit twice, e.g. from the short-term buffer and from the store while it is promoted.
+        for index in np.argsort(-scores, kind="stable"):
+            point = entries[index][1]
+            if str(point.id) in seen:
+                continue
+            seen.add(str(point.id))
+            results.append(SimpleNamespace(id=point.id, payload=point.payload, score=float(scores[index])))
+            if len(results) >= limit:
+                break
+        return results
+
+    def close(self):
+        """Shut down the thread pool. Searches still running are not waited for."""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+    def _get_executor(self) -> concurrent.futures.ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="jmemory-retrieval"
+                )
+            return self._executor
+
+    @staticmethod
+    def _search_layer(search_layer: LayerSearch, name: str, layer_filters: Dict[str, Any], k: int) -> list:
+        with telemetry.span("retrieval.layer", layer=name, limit=k):
+            return search_layer(name, layer_filters, k)
+
+    @staticmethod
+    def _timed_out(name: str, deadline: float) -> Dict[str, Any]:
+        logger.warning(f"Layer {name} missed its {deadline * 1000:.0f} ms deadline, returning partial results")
+        telemetry.count("retrieval.timeouts", layer=name)
+        return {"status": "timeout", "hits": 0}
+
+    @staticmethod
+    def _failed(name: str, error: BaseException) -> Dict[str, Any]:
+        logger.warning(f"Layer {name} search failed: {error!r}")
+        telemetry.count("retrieval.errors", layer=name)
+        return {"status": "error", "hits": 0, "error": str(error)}
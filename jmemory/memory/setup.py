@@ -6,10 +6,10 @@ import uuid
 VECTOR_ID = str(uuid.uuid4())
 home_dir = os.path.expanduser("~")
 jmemory_dir = os.environ.get("JMEMORY_DIR") or os.path.join(home_dir, ".jmemory")
-os.makedirs(jmemory_dir, exist_ok=True)
 
 
 def setup_config():
+    os.makedirs(jmemory_dir, exist_ok=True)
     config_path = os.path.join(jmemory_dir, "config.json")
     if not os.path.exists(config_path):
         user_id = str(uuid.uuid4())
@@ -0,0 +1,359 @@
+import hashlib
+import logging
+import threading
+import time
+import weakref
+from collections import deque
+from dataclasses import dataclass, field, replace
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+SESSION_KEYS = ("user_id", "agent_id", "run_id")
+
+
+def _text_hash(text: str) -> str:
+    return hashlib.md5(text.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class ShortTermEntry:
+    """A recent turn held in memory. Exposes `id`, `payload` and `score` like a Qdrant point."""
+
+    id: str
+    embedding: np.ndarray
+    payload: Dict[str, Any]
+    created_at: float = field(default_factory=time.time)
+    score: Optional[float] = None
+
+    @property
+    def text_hash(self) -> str:
+        return _text_hash(self.payload.get("data", ""))
+
+
+class _Session:
+    def __init__(self, capacity: int, index: Dict[str, ShortTermEntry]):
+        self.entries = deque(maxlen=capacity)
+        self.by_hash = {}
+        # Shared by every session of a buffer, so lookups by id need not know the session.
+        self.index = index
+
+    def append(self, entry: ShortTermEntry) -> None:
+        if len(self.entries) == self.entries.maxlen:
+            self._forget(self.entries[0])
+        self.entries.append(entry)
+        self.by_hash[entry.text_hash] = entry
+        self.index[entry.id] = entry
+
+    def _forget(self, entry: ShortTermEntry) -> None:
+        if self.by_hash.get(entry.text_hash) is entry:
+            del self.by_hash[entry.text_hash]
+        if self.index.get(entry.id) is entry:
+            del self.index[entry.id]
+
+    def remove(self, entry_id: str) -> None:
+        kept = [entry for entry in self.entries if entry.id != entry_id]
+        if len(kept) == len(self.entries):
+            return
+        for entry in self.entries:
+            self._forget(entry)
+        self.entries.clear()
+        for entry in kept:
+            self.append(entry)
+
+    def swap(self, old: ShortTermEntry, new: ShortTermEntry) -> bool:
+        """Put `new` in the place of `old`. Returns False if `old` is not in this session."""
+        for position, entry in enumerate(self.entries):
+            if entry is old:
+                self._forget(old)
+                self.entries[position] = new
+                self.by_hash[new.text_hash] = new
+                self.index[new.id] = new
+                return True
+        return False
+
+    def expire(self, cutoff: float) -> None:
+        while self.entries and self.entries[0].created_at < cutoff:
+            self._forget(self.entries.popleft())
+
+
+class ShortTermBuffer:
+    """
+    In-process ring buffer of recent turns, one ring per (user_id, agent_id, run_id) session.
+
+    Serves recency, exact-match and similarity reads without touching the vector store. Every entry is also
+    queued for promotion; `drain` hands queued entries to whoever persists them (see `ShortTermPromoter`), so
+    entries evicted from a ring are never lost.
+
+    Args:
+        capacity (int, optional): Number of recent entries kept per session. Defaults to 256.
+        ttl (float, optional): Seconds an entry stays readable. Defaults to 24 hours.
+    """
+
+    def __init__(self, capacity: int = 256, ttl: float = 24 * 60 * 60):
+        self.capacity = capacity
+        self.ttl = ttl
+        self._sessions: Dict[tuple, _Session] = {}
+        self._by_id: Dict[str, ShortTermEntry] = {}
+        self._pending: deque = deque()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _session_key(payload: Dict[str, Any]) -> tuple:
+        return tuple(payload.get(key) for key in SESSION_KEYS)
+
+    @staticmethod
+    def _matches(entry: ShortTermEntry, filters: Dict[str, Any]) -> bool:
+        return all(entry.payload.get(key) == value for key, value in filters.items())
+
+    def _scoped(self, filters: Dict[str, Any]) -> List[ShortTermEntry]:
+        """Entries visible under `filters`, oldest first. Must be called with the lock held."""
+        cutoff = time.time() - self.ttl
+        scoped = []
+        for key in list(self._sessions):
+            session = self._sessions[key]
+            session.expire(cutoff)
+            if not session.entries:
+                del self._sessions[key]
+                continue
+            if any(filters.get(name) not in (None, value) for name, value in zip(SESSION_KEYS, key)):
+                continue
+            scoped.extend(entry for entry in session.entries if self._matches(entry, filters))
+        scoped.sort(key=lambda entry: entry.created_at)
+        return scoped
+
+    def add(self, ids: List[str], embeddings: List[List[float]], payloads: List[Dict[str, Any]]) -> None:
+        """
+        Add entries to their sessions and queue them for promotion.
+
+        Args:
+            ids (list): Memory ids.
+            embeddings (list): Embedding of each entry.
+            payloads (list): Vector store payload of each entry; must include the session ids.
+        """
+        with self._lock:
+            for entry_id, embedding, payload in zip(ids, embeddings, payloads):
+                entry = ShortTermEntry(id=entry_id, embedding=np.asarray(embedding, dtype=np.float32), payload=payload)
+                key = self._session_key(payload)
+                if key not in self._sessions:
+                    self._sessions[key] = _Session(self.capacity, self._by_id)
+                self._sessions[key].append(entry)
+                self._pending.append(entry)
+
+    def recent(self, filters: Dict[str, Any], limit: int = 10) -> List[ShortTermEntry]:
+        """
+        Get the most recent entries in scope, newest first.
+
+        Args:
+            filters (dict): Session filters, matched against entry payloads.
+            limit (int, optional): Maximum number of entries. Defaults to 10.
+
+        Returns:
+            list: Matching entries.
+        """
+        with self._lock:
+            return self._scoped(filters)[::-1][:limit]
+
+    def lookup(self, filters: Dict[str, Any], text: str) -> Optional[ShortTermEntry]:
+        """
+        Find the most recent entry in scope whose text is exactly `text`.
+
+        Args:
+            filters (dict): Session filters, matched against entry payloads.
+            text (str): Text to look for.
+
+        Returns:
+            ShortTermEntry: The matching entry, or None.
+        """
+        text_hash = _text_hash(text)
+        with self._lock:
+            self._scoped({})  # expire stale entries
+            candidates = [
+                session.by_hash[text_hash]
+                for session in self._sessions.values()
+                if text_hash in session.by_hash and self._matches(session.by_hash[text_hash], filters)
+            ]
+        return max(candidates, key=lambda entry: entry.created_at) if candidates else None
+
+    def search(self, filters: Dict[str, Any], embedding: List[float], limit: int = 5) -> List[ShortTermEntry]:
+        """
+        Rank the entries in scope by cosine similarity to `embedding`.
+
+        Args:
+            filters (dict): Session filters, matched against entry payloads.
+            embedding (list): Query embedding.
+            limit (int, optional): Maximum number of entries. Defaults to 5.
+
+        Returns:
+            list: Copies of the best entries with `score` set, highest first.
+        """
+        with self._lock:
+            scoped = self._scoped(filters)
+        if not scoped:
+            return []
+
+        matrix = np.stack([entry.embedding for entry in scoped])
+        query = np.asarray(embedding, dtype=np.float32)
+        norms = np.linalg.norm(matrix, axis=1) * np.linalg.norm(query) + 1e-12
+        scores = matrix @ query / norms
+        top = np.argsort(-scores)[:limit]
+        return [replace(scoped[i], score=float(scores[i])) for i in top]
+
+    def get(self, entry_id: str) -> Optional[ShortTermEntry]:
+        with self._lock:
+            entry = self._by_id.get(entry_id)
+        if entry is None or entry.created_at < time.time() - self.ttl:
+            return None
+        return entry
+
+    def update(self, entry_id: str, embedding: List[float], payload: Dict[str, Any]) -> bool:
+        """
+        Replace the embedding and payload of a buffered entry, keeping its place in its session.
+
+        Args:
+            entry_id (str): Memory id.
+            embedding (list): New embedding.
+            payload (dict): New payload.
+
+        Returns:
+            bool: Whether the entry was in the buffer.
+        """
+        with self._lock:
+            entry = self._by_id.get(entry_id)
+            if entry is None:
+                return False
+            updated = replace(entry, embedding=np.asarray(embedding, dtype=np.float32), payload=payload)
+            for session in self._sessions.values():
+                if session.swap(entry, updated):
+                    break
+            # Still queued: promote the new version instead.
+            self._pending = deque(updated if queued is entry else queued for queued in self._pending)
+            return True
+
+    def discard(self, entry_id: str) -> None:
+        """Remove an entry from its session and from the promotion queue."""
+        with self._lock:
+            for session in self._sessions.values():
+                session.remove(entry_id)
+            self._pending = deque(entry for entry in self._pending if entry.id != entry_id)
+
+    def clear(self, filters: Optional[Dict[str, Any]] = None) -> None:
+        """Remove every entry in scope, or everything when `filters` is empty."""
+        with self._lock:
+            if not filters:
+                self._sessions.clear()
+                self._by_id.clear()
+                self._pending.clear()
+                return
+            doomed = {entry.id for entry in self._scoped(filters)}
+            doomed.update(entry.id for entry in self._pending if self._matches(entry, filters))
+            for session in self._sessions.values():
+                for entry_id in doomed:
+                    session.remove(entry_id)
+            self._pending = deque(entry for entry in self._pending if entry.id not in doomed)
+
+    def pending(self) -> int:
+        """Number of entries waiting to be promoted."""
+        return len(self._pending)
+
+    def drain(self, max_items: Optional[int] = None) -> List[ShortTermEntry]:
+        """Take up to `max_items` entries off the promotion queue, oldest first."""
+        with self._lock:
+            count = len(self._pending) if max_items is None else min(max_items, len(self._pending))
+            return [self._pending.popleft() for _ in range(count)]
+
+    def requeue(self, entries: List[ShortTermEntry]) -> None:
+        """Put entries whose promotion failed back at the front of the queue."""
+        with self._lock:
+            self._pending.extendleft(reversed(entries))
+
+
+class ShortTermPromoter:
+    """
+    Background thread that moves queued short-term entries into the vector store in batches.
+
+    The thread only holds a weak reference to the promoter. Queued entries are promoted by `stop()`, when the
+    promoter is garbage collected, or at interpreter exit, whichever comes first, so `sink` must not refer back to
+    the object that owns the promoter.
+
+    Args:
+        buffer (ShortTermBuffer): The buffer to drain.
+        sink (callable): Called with a list of entries to persist.
+        batch_size (int, optional): Maximum number of entries per `sink` call. Defaults to 64.
+        interval (float, optional): Seconds between promotions. Defaults to 1.0.
+    """
+
+    def __init__(
+        self,
+        buffer: ShortTermBuffer,
+        sink: Callable[[List[ShortTermEntry]], None],
+        batch_size: int = 64,
+        interval: float = 1.0,
+    ):
+        self.buffer = buffer
+        self.sink = sink
+        self.batch_size = batch_size
+        self.interval = interval
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._sink_lock = threading.Lock()
+        self._thread = threading.Thread(
+            target=_promote_loop,
+            args=(weakref.ref(self), self._wake, self._stopped, interval),
+            name="jmemory-short-term",
+            daemon=True,
+        )
+        self._thread.start()
+        self._finalizer = weakref.finalize(
+            self, _stop_promoter, self._wake, self._stopped, self._thread, buffer, sink, batch_size, self._sink_lock
+        )
+
+    def notify(self) -> None:
+        """Wake the promoter early, e.g. once a full batch is queued."""
+        if self.buffer.pending() >= self.batch_size:
+            self._wake.set()
+
+    def flush(self) -> None:
+        """Promote everything queued so far on the calling thread."""
+        _promote_pending(self.buffer, self.sink, self.batch_size, self._sink_lock)
+
+    def stop(self) -> None:
+        """Stop the thread after promoting whatever is still queued."""
+        self._finalizer()
+
+
+def _promote_pending(buffer: ShortTermBuffer, sink: Callable, batch_size: int, lock: threading.Lock) -> None:
+    with lock:
+        while True:
+            entries = buffer.drain(batch_size)
+            if not entries:
+                return
+            try:
+                sink(entries)
+            except Exception:
+                buffer.requeue(entries)
+                raise
+
+
+def _promote_loop(promoter_ref, wake: threading.Event, stopped: threading.Event, interval: float) -> None:
+    while not stopped.is_set():
+        wake.wait(interval)
+        wake.clear()
+        promoter = promoter_ref()
+        if promoter is None:
+            return
+        try:
+            promoter.flush()
+        except Exception as e:
+            logger.warning(f"Short-term promotion failed, will retry: {e}")
+        del promoter
+
+
+def _stop_promoter(wake, stopped, thread, buffer, sink, batch_size, lock) -> None:
+    stopped.set()
+    wake.set()
+    if thread is not threading.current_thread():
+        thread.join()
+    _promote_pending(buffer, sink, batch_size, lock)
@@ -1,20 +1,75 @@
 import logging
+import queue
 import sqlite3
 import threading
 import uuid
+import weakref
 from typing import Any, Dict, List, Optional
 
+from jmemory.memory.telemetry import telemetry
+
 logger = logging.getLogger(__name__)
 
 
+_HISTORY_COLUMNS = (
+    "id",
+    "memory_id",
+    "old_memory",
+    "new_memory",
+    "event",
+    "created_at",
+    "updated_at",
+    "is_deleted",
+    "actor_id",
+    "role",
+)
+
+
 class SQLiteManager:
-    def __init__(self, db_path: str = ":memory:"):
+    def __init__(
+        self,
+        db_path: str = ":memory:",
+        write_behind: bool = False,
+        batch_size: int = 500,
+        flush_interval: float = 0.5,
+    ):
+        """
+        SQLite-backed history store.
+
+        Args:
+            db_path (str, optional): Path of the database file. Defaults to ":memory:".
+            write_behind (bool, optional): Queue `add_history` calls and write them in batches from a background
+                thread instead of on the caller's thread. Defaults to False.
+            batch_size (int, optional): Maximum number of rows written per write-behind transaction. Defaults to 500.
+            flush_interval (float, optional): Seconds the write-behind thread waits for more rows before writing a
+                partial batch. Defaults to 0.5.
+        """
         self.db_path = db_path
+        # Writes share this connection under `_lock`. Reads go through a connection per thread (see
+        # `_read_connection`), which WAL lets proceed while a write is in flight.
         self.connection = sqlite3.connect(self.db_path, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        # In WAL mode NORMAL survives a crash of the process, but a power loss can drop the last commits.
+        self.connection.execute("PRAGMA synchronous=NORMAL")
         self._lock = threading.Lock()
+        self._readers = threading.local()
+        self._reader_connections = []
+        self._readers_lock = threading.Lock()
         self._migrate_history_table()
         self._create_history_table()
 
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue = None
+        self._writer = None
+        if write_behind:
+            self._queue = queue.Queue()
+            self._writer = threading.Thread(target=self._write_behind_loop, name="jmemory-history", daemon=True)
+            self._writer.start()
+            # The writer thread keeps `self` alive, so this runs on `close()` or at interpreter exit, whichever
+            # comes first, and writes out whatever is still queued before the daemon thread is killed.
+            self._stop_writer = weakref.finalize(self, _stop_writer, self._queue, self._writer)
+
     def _migrate_history_table(self) -> None:
         """
         If a pre-existing history table had the old group-chat columns,
@@ -99,29 +154,35 @@ class SQLiteManager:
 
     def _create_history_table(self) -> None:
         with self._lock:
-            try:
-                self.connection.execute("BEGIN")
-                self.connection.execute(
-                    """
-                    CREATE TABLE IF NOT EXISTS history (
-                        id           TEXT PRIMARY KEY,
-                        memory_id    TEXT,
-                        old_memory   TEXT,
-                        new_memory   TEXT,
-                        event        TEXT,
-                        created_at   DATETIME,
-                        updated_at   DATETIME,
-                        is_deleted   INTEGER,
-                        actor_id     TEXT,
-                        role         TEXT
-                    )
+            self._create_history_table_locked()
+
+    def _create_history_table_locked(self) -> None:
+        try:
+            self.connection.execute("BEGIN")
+            self.connection.execute(
                 """
+                CREATE TABLE IF NOT EXISTS history (
+                    id           TEXT PRIMARY KEY,
+                    memory_id    TEXT,
+                    old_memory   TEXT,
+                    new_memory   TEXT,
+                    event        TEXT,
+                    created_at   DATETIME,
+                    updated_at   DATETIME,
+                    is_deleted   INTEGER,
+                    actor_id     TEXT,
+                    role         TEXT
                 )
-                self.connection.execute("COMMIT")
-            except Exception as e:
-                self.connection.execute("ROLLBACK")
-                logger.error(f"Failed to create history table: {e}")
-                raise
+            """
+            )
+            self.connection.execute(
+                "CREATE INDEX IF NOT EXISTS idx_history_memory_id_created_at ON history (memory_id, created_at)"
+            )
+            self.connection.execute("COMMIT")
+        except Exception as e:
+            self.connection.execute("ROLLBACK")
+            logger.error(f"Failed to create history table: {e}")
+            raise
 
     def add_history(
         self,
@@ -136,10 +197,49 @@ class SQLiteManager:
         actor_id: Optional[str] = None,
         role: Optional[str] = None,
     ) -> None:
-        with self._lock:
+        row = self._history_row(
+            {
+                "memory_id": memory_id,
+                "old_memory": old_memory,
+                "new_memory": new_memory,
+                "event": event,
+                "created_at": created_at,
+                "updated_at": updated_at,
+                "is_deleted": is_deleted,
+                "actor_id": actor_id,
+                "role": role,
+            }
+        )
+        if self._queue is not None:
+            self._queue.put(row)
+        else:
+            self._insert_rows([row])
+
+    def add_history_many(self, records: List[Dict[str, Any]]) -> None:
+        """
+        Insert many history records in a single transaction.
+
+        Args:
+            records (list): Dicts with `memory_id`, `old_memory`, `new_memory` and `event`, and optionally
+                `created_at`, `updated_at`, `is_deleted`, `actor_id` and `role`.
+        """
+        rows = [self._history_row(record) for record in records]
+        if self._queue is not None:
+            for row in rows:
+                self._queue.put(row)
+        elif rows:
+            self._insert_rows(rows)
+
+    @staticmethod
+    def _history_row(record: Dict[str, Any]) -> tuple:
+        record = {"id": str(uuid.uuid4()), "is_deleted": 0, **record}
+        return tuple(record.get(column) for column in _HISTORY_COLUMNS)
+
+    def _insert_rows(self, rows: List[tuple]) -> None:
+        with telemetry.span("history.write", rows=len(rows)), self._lock:
             try:
                 self.connection.execute("BEGIN")
-                self.connection.execute(
+                self.connection.executemany(
                     """
                     INSERT INTO history (
                         id, memory_id, old_memory, new_memory, event,
@@ -147,38 +247,65 @@ class SQLiteManager:
                     )
                     VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                 """,
-                    (
-                        str(uuid.uuid4()),
-                        memory_id,
-                        old_memory,
-                        new_memory,
-                        event,
-                        created_at,
-                        updated_at,
-                        is_deleted,
-                        actor_id,
-                        role,
-                    ),
+                    rows,
                 )
                 self.connection.execute("COMMIT")
             except Exception as e:
                 self.connection.execute("ROLLBACK")
                 logger.error(f"Failed to add history record: {e}")
                 raise
+        telemetry.count("history.rows", len(rows))
+
+    def _write_behind_loop(self) -> None:
+        while True:
+            row = self._queue.get()
+            if row is None:
+                self._queue.task_done()
+                return
+            rows = [row]
+            stop = False
+            try:
+                while len(rows) < self.batch_size:
+                    row = self._queue.get(timeout=self.flush_interval)
+                    if row is None:
+                        stop = True
+                        break
+                    rows.append(row)
+            except queue.Empty:
+                pass
+
+            try:
+                self._insert_rows(rows)
+            except Exception:
+                # Already logged by _insert_rows; keep the writer alive for later batches.
+                pass
+            finally:
+                for _ in range(len(rows) + stop):
+                    self._queue.task_done()
+            if stop:
+                return
+
+    def flush(self) -> None:
+        """Block until every queued write-behind record has been written."""
+        if self._queue is not None:
+            self._queue.join()
 
     def get_history(self, memory_id: str) -> List[Dict[str, Any]]:
-        with self._lock:
-            cur = self.connection.execute(
-                """
-                SELECT id, memory_id, old_memory, new_memory, event,
-                       created_at, updated_at, is_deleted, actor_id, role
-                FROM history
-                WHERE memory_id = ?
-                ORDER BY created_at ASC, DATETIME(updated_at) ASC
-            """,
-                (memory_id,),
-            )
-            rows = cur.fetchall()
+        # Read-your-writes: make sure queued records for this process are visible.
+        self.flush()
+        query = """
+            SELECT id, memory_id, old_memory, new_memory, event,
+                   created_at, updated_at, is_deleted, actor_id, role
+            FROM history
+            WHERE memory_id = ?
+            ORDER BY created_at ASC, DATETIME(updated_at) ASC, rowid ASC
+        """
+        reader = self._read_connection()
+        if reader is None:
+            with self._lock:
+                rows = self.connection.execute(query, (memory_id,)).fetchall()
+        else:
+            rows = reader.execute(query, (memory_id,)).fetchall()
 
         return [
             {
@@ -196,23 +323,49 @@ class SQLiteManager:
             for r in rows
         ]
 
+    def _read_connection(self) -> Optional[sqlite3.Connection]:
+        """The calling thread's read connection, opened on first use. None for an in-memory database."""
+        if self.db_path == ":memory:":
+            # Each connection to ":memory:" is a separate, empty database.
+            return None
+        connection = getattr(self._readers, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._readers.connection = connection
+            with self._readers_lock:
+                self._reader_connections.append(connection)
+        return connection
+
     def reset(self) -> None:
         """Drop and recreate the history table."""
+        self.flush()
         with self._lock:
             try:
                 self.connection.execute("BEGIN")
                 self.connection.execute("DROP TABLE IF EXISTS history")
                 self.connection.execute("COMMIT")
-                self._create_history_table()
+                self._create_history_table_locked()
             except Exception as e:
                 self.connection.execute("ROLLBACK")
                 logger.error(f"Failed to reset history table: {e}")
                 raise
 
     def close(self) -> None:
+        """Write out queued history records, then close every connection."""
+        if self._writer is not None:
+            self._stop_writer()
+            self._writer = None
+            self._queue = None
+        with self._readers_lock:
+            for connection in self._reader_connections:
+                connection.close()
+            self._reader_connections = []
+        self._readers = threading.local()
         if self.connection:
             self.connection.close()
             self.connection = None
 
-    def __del__(self):
-        self.close()
\ No newline at end of file
+
+def _stop_writer(pending: queue.Queue, writer: threading.Thread) -> None:
+    pending.put(None)
+    writer.join()
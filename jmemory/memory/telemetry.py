@@ -0,0 +1,445 @@
+"""
+Span timing and counters for memory operations.
+
+Every stage of `Memory.add` / `search` (embedding, vector search, lexical search, graph calls, LLM calls and
+history writes) runs inside a `span`, and token and byte volumes are recorded with `count`. Nothing is recorded
+until an exporter is registered:
+
+    from jmemory.memory.telemetry import InMemoryExporter, telemetry
+
+    exporter = telemetry.add_exporter(InMemoryExporter())
+    memory.search("where do I live?", user_id="alice")
+    exporter.summary("memory.search")   # {"count": 1, "p50": ..., "p95": ..., "p99": ..., ...}
+
+`PrometheusExporter` renders the text exposition format (the REST server serves it on `/metrics`) and
+`OpenTelemetryExporter` forwards spans and counters to the globally configured OpenTelemetry providers.
+Spans nest through a context variable, so stages run on `asyncio.to_thread` or in `asyncio.gather` are
+attributed to the operation that started them.
+"""
+
+import bisect
+import contextvars
+import functools
+import inspect
+import logging
+import threading
+import time
+from collections import defaultdict, deque
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds, in seconds, of the Prometheus latency histogram buckets.
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+_current_span: contextvars.ContextVar = contextvars.ContextVar("jmemory_span", default=None)
+
+
+class Span:
+    """A timed stage of an operation. `attributes` describe it; only exporters that keep traces see them."""
+
+    __slots__ = ("name", "attributes", "parent", "start_ns", "duration", "error", "handles", "_start")
+
+    def __init__(self, name: str, attributes: Dict[str, Any], parent: Optional["Span"]):
+        self.name = name
+        self.attributes = attributes
+        self.parent = parent
+        self.start_ns = time.time_ns()
+        self.duration = None
+        self.error = None
+        # Per-exporter state, e.g. the OpenTelemetry span this one is mirrored to.
+        self.handles = {}
+        self._start = time.perf_counter()
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+
+class Exporter:
+    """Receives finished spans and counter increments. Subclasses override what they need."""
+
+    def span_started(self, span: Span) -> None:
+        pass
+
+    def span_ended(self, span: Span) -> None:
+        pass
+
+    def add(self, name: str, value: float, labels: Dict[str, str]) -> None:
+        pass
+
+
+class _NoopSpan:
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class _ActiveSpan:
+    __slots__ = ("telemetry", "span", "token")
+
+    def __init__(self, telemetry: "Telemetry", span: Span):
+        self.telemetry = telemetry
+        self.span = span
+        self.token = None
+
+    def __enter__(self) -> Span:
+        self.token = _current_span.set(self.span)
+        for exporter in self.telemetry.exporters:
+            try:
+                exporter.span_started(self.span)
+            except Exception as e:
+                logger.debug(f"{type(exporter).__name__} failed to start span {self.span.name}: {e}")
+        return self.span
+
+    def __exit__(self, exc_type, exc, tb):
+        span = self.span
+        span.duration = time.perf_counter() - span._start
+        if exc is not None:
+            span.error = type(exc).__name__
+        _current_span.reset(self.token)
+        for exporter in self.telemetry.exporters:
+            try:
+                exporter.span_ended(span)
+            except Exception as e:
+                logger.debug(f"{type(exporter).__name__} failed to export span {span.name}: {e}")
+        return False
+
+
+class Telemetry:
+    """Registry of exporters. Use the module-level `telemetry` instance."""
+
+    def __init__(self):
+        # Replaced rather than mutated, so recording never has to take the lock.
+        self.exporters: Tuple[Exporter, ...] = ()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.exporters)
+
+    def add_exporter(self, exporter: Exporter) -> Exporter:
+        with self._lock:
+            self.exporters = (*self.exporters, exporter)
+        return exporter
+
+    def remove_exporter(self, exporter: Exporter) -> None:
+        with self._lock:
+            self.exporters = tuple(e for e in self.exporters if e is not exporter)
+
+    def span(self, name: str, **attributes):
+        """
+        Time the enclosed block as a stage named `name`, nested under the current span.
+
+        Args:
+            name (str): Stage name, e.g. "embed" or "vector_store.search".
+            **attributes: Details of this call (sizes, modes); not used as metric labels.
+
+        Returns:
+            A context manager yielding the `Span`. It costs one attribute lookup when no exporter is registered.
+        """
+        if not self.exporters:
+            return _NOOP_SPAN
+        return _ActiveSpan(self, Span(name, attributes, _current_span.get()))
+
+    def count(self, name: str, value: float = 1, **labels) -> None:
+        """
+        Increment the counter `name`, e.g. "llm.prompt_tokens" or "embed.bytes".
+
+        Args:
+            name (str): Counter name.
+            value (float, optional): Increment. Defaults to 1.
+            **labels: Low-cardinality labels such as the model name.
+        """
+        if not self.exporters or not value:
+            return
+        labels = {key: str(label) for key, label in labels.items() if label is not None}
+        for exporter in self.exporters:
+            try:
+                exporter.add(name, value, labels)
+            except Exception as e:
+                logger.debug(f"{type(exporter).__name__} failed to export counter {name}: {e}")
+
+
+telemetry = Telemetry()
+
+
+def span(name: str, **attributes):
+    """Shorthand for `telemetry.span`."""
+    return telemetry.span(name, **attributes)
+
+
+def count(name: str, value: float = 1, **labels) -> None:
+    """Shorthand for `telemetry.count`."""
+    telemetry.count(name, value, **labels)
+
+
+def traced(name: str):
+    """Decorator running every call of a function or coroutine function inside `span(name)`."""
+
+    def decorator(func):
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with telemetry.span(name):
+                    return await func(*args, **kwargs)
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with telemetry.span(name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def text_bytes(texts) -> int:
+    """UTF-8 size of a string or a list of strings, for the byte counters."""
+    if isinstance(texts, str):
+        return len(texts.encode("utf-8"))
+    return sum(len(str(text).encode("utf-8")) for text in texts)
+
+
+def record_usage(response, model: Optional[str] = None) -> None:
+    """Count the tokens reported by an OpenAI-, Anthropic- or Ollama-style completion."""
+    if not telemetry.enabled:
+        return
+    usage = getattr(response, "usage", None)
+    if usage is not None:
+        prompt = getattr(usage, "prompt_tokens", None) or getattr(usage, "input_tokens", None)
+        completion = getattr(usage, "completion_tokens", None) or getattr(usage, "output_tokens", None)
+    else:
+        # Ollama reports the counts on the response itself.
+        prompt = getattr(response, "prompt_eval_count", None)
+        completion = getattr(response, "eval_count", None)
+    if isinstance(prompt, int):
+        telemetry.count("llm.prompt_tokens", prompt, model=model)
+    if isinstance(completion, int):
+        telemetry.count("llm.completion_tokens", completion, model=model)
+
+
+def capture_event(event_name: str, data: Optional[dict] = None) -> None:
+    """Count a named event; `data` is only logged."""
+    logger.debug("capture_event %s: %s", event_name, data)
+    telemetry.count("events", event=event_name)
+
+
+class InMemoryExporter(Exporter):
+    """Keeps recent span durations and counter totals in memory; meant for tests and benchmarks.
+
+    :param max_samples: Durations kept per span name, defaults to 10000
+    :type max_samples: int, optional
+    """
+
+    def __init__(self, max_samples: int = 10000):
+        self.max_samples = max_samples
+        self.spans: List[Span] = []
+        self._durations: Dict[str, deque] = defaultdict(lambda: deque(maxlen=self.max_samples))
+        self._counters: Dict[Tuple[str, Tuple], float] = defaultdict(float)
+        self._lock = threading.Lock()
+
+    def span_ended(self, span: Span) -> None:
+        with self._lock:
+            self._durations[span.name].append(span.duration)
+            self.spans.append(span)
+            if len(self.spans) > self.max_samples:
+                del self.spans[: len(self.spans) - self.max_samples]
+
+    def add(self, name: str, value: float, labels: Dict[str, str]) -> None:
+        with self._lock:
+            self._counters[(name, tuple(sorted(labels.items())))] += value
+
+    def durations(self, name: str) -> List[float]:
+        with self._lock:
+            return list(self._durations.get(name, ()))
+
+    def summary(self, name: str) -> Dict[str, float]:
+        """
+        Latency summary of a span.
+
+        Args:
+            name (str): Span name.
+
+        Returns:
+            dict: count, mean, p50, p95, p99 and max, in seconds. Only count when nothing was recorded.
+        """
+        durations = self.durations(name)
+        if not durations:
+            return {"count": 0}
+        p50, p95, p99 = np.percentile(durations, [50, 95, 99])
+        return {
+            "count": len(durations),
+            "mean": float(np.mean(durations)),
+            "p50": float(p50),
+            "p95": float(p95),
+            "p99": float(p99),
+            "max": float(max(durations)),
+        }
+
+    def counter(self, name: str, **labels) -> float:
+        """Total of counter `name` over every label set that includes `labels`."""
+        wanted = {key: str(value) for key, value in labels.items()}.items()
+        with self._lock:
+            return sum(
+                value for (counter, items), value in self._counters.items() if counter == name and wanted <= set(items)
+            )
+
+    def children(self, span: Span) -> List[Span]:
+        with self._lock:
+            return [candidate for candidate in self.spans if candidate.parent is span]
+
+    def reset(self) -> None:
+        with self._lock:
+            self.spans.clear()
+            self._durations.clear()
+            self._counters.clear()
+
+
+def _metric_name(name: str) -> str:
+    return "jmemory_" + "".join(char if char.isalnum() else "_" for char in name)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _sample(value: float) -> str:
+    """A sample value at full precision; integral values print without a fraction, e.g. byte and token counts."""
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in sorted(labels.items())) + "}"
+
+
+class PrometheusExporter(Exporter):
+    """Aggregates spans into latency histograms and counters, rendered in the Prometheus text format.
+
+    Spans become `jmemory_span_duration_seconds{span="...",status="ok|error"}`; counters become
+    `jmemory_<name>_total` with their labels.
+
+    :param buckets: Upper bounds of the histogram buckets in seconds, defaults to `DEFAULT_BUCKETS`
+    :type buckets: tuple, optional
+    """
+
+    content_type = "text/plain; version=0.0.4; charset=utf-8"
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        # (span, status) -> [bucket counts..., +Inf count], sum
+        self._histograms: Dict[Tuple[str, str], Tuple[List[int], List[float]]] = {}
+        self._counters: Dict[Tuple[str, Tuple], float] = defaultdict(float)
+        self._lock = threading.Lock()
+
+    def span_ended(self, span: Span) -> None:
+        key = (span.name, "error" if span.error else "ok")
+        index = bisect.bisect_left(self.buckets, span.duration)
+        with self._lock:
+            counts, total = self._histograms.setdefault(key, ([0] * (len(self.buckets) + 1), [0.0]))
+            counts[index] += 1
+            total[0] += span.duration
+
+    def add(self, name: str, value: float, labels: Dict[str, str]) -> None:
+        with self._lock:
+            self._counters[(name, tuple(sorted(labels.items())))] += value
+
+    def render(self) -> str:
+        """The current metrics in the Prometheus text exposition format."""
+        with self._lock:
+            histograms = {key: (list(counts), total[0]) for key, (counts, total) in self._histograms.items()}
+            counters = dict(self._counters)
+
+        lines = [
+            "# HELP jmemory_span_duration_seconds Duration of jmemory operation stages.",
+            "# TYPE jmemory_span_duration_seconds histogram",
+        ]
+        for (name, status), (counts, total) in sorted(histograms.items()):
+            labels = {"span": name, "status": status}
+            cumulative = 0
+            for bound, bucket_count in zip([*map(repr, self.buckets), "+Inf"], counts):
+                cumulative += bucket_count
+                lines.append(f"jmemory_span_duration_seconds_bucket{_labels({**labels, 'le': bound})} {cumulative}")
+            lines.append(f"jmemory_span_duration_seconds_sum{_labels(labels)} {total}")
+            lines.append(f"jmemory_span_duration_seconds_count{_labels(labels)} {cumulative}")
+
+        by_name = defaultdict(list)
+        for (name, items), value in counters.items():
+            by_name[name].append((dict(items), value))
+        for name in sorted(by_name):
+            metric = _metric_name(name) + "_total"
+            lines.append(f"# TYPE {metric} counter")
+            for labels, value in sorted(by_name[name], key=lambda item: sorted(item[0].items())):
+                lines.append(f"{metric}{_labels(labels)} {_sample(value)}")
+        return "\n".join(lines) + "\n"
+
+
+class OpenTelemetryExporter(Exporter):
+    """Mirrors spans to OpenTelemetry traces and counters to OpenTelemetry metrics.
+
+    Uses the global tracer and meter providers, so configure the OpenTelemetry SDK (exporters, resource,
+    sampling) before registering it. Requires `pip install opentelemetry-api`.
+
+    :param tracer_provider: Tracer provider to use instead of the global one
+    :param meter_provider: Meter provider to use instead of the global one
+    """
+
+    def __init__(self, tracer_provider=None, meter_provider=None):
+        try:
+            from opentelemetry import metrics, trace
+        except ImportError:
+            raise ImportError(
+                "The 'opentelemetry-api' library is required. Please install it using 'pip install opentelemetry-api'."
+            )
+        self._trace = trace
+        self.tracer = trace.get_tracer("jmemory", tracer_provider=tracer_provider)
+        self.meter = metrics.get_meter("jmemory", meter_provider=meter_provider)
+        self._instruments = {}
+        self._lock = threading.Lock()
+
+    def span_started(self, span: Span) -> None:
+        parent = span.parent.handles.get(self) if span.parent is not None else None
+        context = self._trace.set_span_in_context(parent) if parent is not None else None
+        span.handles[self] = self.tracer.start_span(
+            span.name, context=context, start_time=span.start_ns, attributes=_otel_attributes(span.attributes)
+        )
+
+    def span_ended(self, span: Span) -> None:
+        otel_span = span.handles.pop(self, None)
+        if otel_span is None:
+            return
+        otel_span.set_attributes(_otel_attributes(span.attributes))
+        if span.error:
+            otel_span.set_status(self._trace.Status(self._trace.StatusCode.ERROR, span.error))
+        otel_span.end(end_time=span.start_ns + int(span.duration * 1e9))
+
+    def add(self, name: str, value: float, labels: Dict[str, str]) -> None:
+        with self._lock:
+            instrument = self._instruments.get(name)
+            if instrument is None:
+                instrument = self._instruments[name] = self.meter.create_counter(f"jmemory.{name}")
+        instrument.add(value, attributes=labels)
+
+
+def _otel_attributes(attributes: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        key: value if isinstance(value, (str, bool, int, float)) else str(value)
+        for key, value in attributes.items()
+        if value is not None
+    }
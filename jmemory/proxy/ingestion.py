@@ -0,0 +1,171 @@
+import atexit
+import logging
+import queue
+import threading
+import time
+import zlib
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class IngestionJob:
+    messages: List[Any]
+    kwargs: Dict[str, Any]
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+    @property
+    def session(self) -> tuple:
+        return tuple(self.kwargs.get(key) for key in ("user_id", "agent_id", "run_id"))
+
+    def can_merge(self, other: "IngestionJob") -> bool:
+        return self.kwargs == other.kwargs
+
+
+_STOP = object()
+
+
+class IngestionQueue:
+    """
+    Bounded worker pool that writes conversation turns to memory in the background.
+
+    Each session (user_id, agent_id, run_id) is pinned to one worker, so its turns are added in order. Before
+    calling `add_fn`, a worker folds consecutive queued turns of the same session (and identical add arguments)
+    into a single call. `submit` blocks once a worker's queue is full, which pushes back on callers instead of
+    growing without bound.
+
+    Args:
+        add_fn (callable): Called as `add_fn(messages=..., **kwargs)` for each (coalesced) job.
+        num_workers (int, optional): Number of worker threads. Defaults to 4.
+        max_queue_size (int, optional): Maximum number of jobs queued per worker. Defaults to 1000.
+        max_batch (int, optional): Maximum number of jobs folded into one add. Defaults to 32.
+        put_timeout (float, optional): Seconds `submit` waits for room before raising `queue.Full`.
+            Defaults to None (wait indefinitely).
+    """
+
+    def __init__(
+        self,
+        add_fn: Callable[..., Any],
+        num_workers: int = 4,
+        max_queue_size: int = 1000,
+        max_batch: int = 32,
+        put_timeout: Optional[float] = None,
+    ):
+        self.add_fn = add_fn
+        self.max_batch = max_batch
+        self.put_timeout = put_timeout
+        self._queues = [queue.Queue(maxsize=max_queue_size) for _ in range(num_workers)]
+        self._lock = threading.Lock()
+        self._stats = {"submitted": 0, "processed": 0, "adds": 0, "failed": 0, "last_lag": 0.0, "max_lag": 0.0}
+        self._closed = False
+        self._workers = [
+            threading.Thread(target=self._run, args=(q,), name=f"jmemory-ingest-{i}", daemon=True)
+            for i, q in enumerate(self._queues)
+        ]
+        for worker in self._workers:
+            worker.start()
+        atexit.register(self.shutdown)
+
+    def _queue_for(self, session: tuple) -> queue.Queue:
+        # A stable hash keeps a session on the same worker across processes and restarts.
+        index = zlib.crc32(repr(session).encode("utf-8")) % len(self._queues)
+        return self._queues[index]
+
+    def submit(self, messages: List[Any], **kwargs) -> None:
+        """
+        Queue messages to be added to memory.
+
+        Args:
+            messages (list): Messages to add.
+            **kwargs: Keyword arguments forwarded to `add_fn` (user_id, agent_id, run_id, metadata, ...).
+        """
+        if self._closed:
+            raise RuntimeError("IngestionQueue has been shut down")
+        job = IngestionJob(list(messages), kwargs)
+        self._queue_for(job.session).put(job, timeout=self.put_timeout)
+        with self._lock:
+            self._stats["submitted"] += 1
+
+    def _run(self, jobs: queue.Queue) -> None:
+        carry = None
+        while True:
+            job = carry if carry is not None else jobs.get()
+            carry = None
+            if job is _STOP:
+                jobs.task_done()
+                return
+
+            batch = [job]
+            while len(batch) < self.max_batch:
+                try:
+                    nxt = jobs.get_nowait()
+                except queue.Empty:
+                    break
+                if nxt is not _STOP and job.can_merge(nxt):
+                    batch.append(nxt)
+                else:
+                    # Keep ordering: the first non-mergeable job is handled next.
+                    carry = nxt
+                    break
+
+            self._process(batch)
+            for _ in batch:
+                jobs.task_done()
+
+    def _process(self, batch: List[IngestionJob]) -> None:
+        lag = time.monotonic() - batch[0].enqueued_at
+        messages = [message for job in batch for message in job.messages]
+        failed = False
+        try:
+            self.add_fn(messages=messages, **batch[0].kwargs)
+        except Exception as e:
+            failed = True
+            logger.error(f"Failed to add {len(messages)} messages to memory: {e}")
+        with self._lock:
+            self._stats["processed"] += len(batch)
+            self._stats["adds"] += 1
+            self._stats["failed"] += len(batch) if failed else 0
+            self._stats["last_lag"] = lag
+            self._stats["max_lag"] = max(self._stats["max_lag"], lag)
+
+    def metrics(self) -> Dict[str, Any]:
+        """
+        Get queue depth and throughput counters.
+
+        Returns:
+            dict: `depth` (jobs queued), `worker_depths`, `submitted`, `processed`, `adds` (calls to `add_fn`),
+            `coalesced` (jobs folded into another job's add), `failed`, and `last_lag` / `max_lag`, the seconds
+            between a job being queued and its add starting.
+        """
+        worker_depths = [q.qsize() for q in self._queues]
+        with self._lock:
+            stats = dict(self._stats)
+        stats["coalesced"] = stats["processed"] - stats["adds"]
+        stats["depth"] = sum(worker_depths)
+        stats["worker_depths"] = worker_depths
+        return stats
+
+    def join(self) -> None:
+        """Block until every job submitted so far has been processed."""
+        for q in self._queues:
+            q.join()
+
+    def shutdown(self, timeout: Optional[float] = None) -> None:
+        """
+        Stop accepting jobs, process everything already queued, then stop the workers.
+
+        Args:
+            timeout (float, optional): Seconds to wait for each worker. Defaults to None (wait until drained).
+        """
+        if self._closed:
+            return
+        self._closed = True
+        atexit.unregister(self.shutdown)
+        for q in self._queues:
+            q.put(_STOP)
+        for worker in self._workers:
+            worker.join(timeout)
+            if worker.is_alive():
+                logger.warning(f"{worker.name} did not drain within {timeout}s")
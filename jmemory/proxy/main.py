@@ -1,5 +1,4 @@
 import logging
-import threading
 from typing import List, Optional, Union
 
 import httpx
@@ -9,6 +8,7 @@ import jmemory
 from jmemory import Memory
 from jmemory.configs.enums import MemoryType
 from jmemory.configs.prompts import MEMORY_ANSWER_PROMPT
+from jmemory.proxy.ingestion import IngestionQueue
 
 logger = logging.getLogger(__name__)
 
@@ -22,15 +22,20 @@ class Jmemory:
 
         self.chat = Chat(self.jmemory_client)
 
+    def close(self):
+        """Write out every queued conversation turn and stop the ingestion workers."""
+        self.chat.completions.ingestion.shutdown()
+
 
 class Chat:
-    def __init__(self, jmemory_client):
-        self.completions = Completions(jmemory_client)
+    def __init__(self, jmemory_client, ingestion: Optional[IngestionQueue] = None):
+        self.completions = Completions(jmemory_client, ingestion)
 
 
 class Completions:
-    def __init__(self, jmemory_client):
+    def __init__(self, jmemory_client, ingestion: Optional[IngestionQueue] = None):
         self.jmemory_client = jmemory_client
+        self.ingestion = ingestion or IngestionQueue(self._add_to_memory)
 
     def create(
         self,
@@ -139,19 +144,13 @@ class Completions:
         return messages
 
     def _async_add_to_memory(self, messages, user_id, agent_id, run_id, metadata, filters):
-        def add_task():
-            logger.debug("Adding to memory asynchronously")
-            self.jmemory_client.add(
-                messages=messages,
-                user_id=user_id,
-                agent_id=agent_id,
-                run_id=run_id,
-                metadata=metadata,
-                filters=filters,
-                memory_type=MemoryType.SHORT_TERM.value,
-            )
+        logger.debug("Queueing memory add")
+        self.ingestion.submit(
+            messages, user_id=user_id, agent_id=agent_id, run_id=run_id, metadata=metadata, filters=filters
+        )
 
-        threading.Thread(target=add_task, daemon=True).start()
+    def _add_to_memory(self, messages, **kwargs):
+        self.jmemory_client.add(messages=messages, memory_type=MemoryType.SHORT_TERM.value, **kwargs)
 
     def _fetch_relevant_memories(self, messages, user_id, agent_id, run_id, filters, limit):
         # Currently, only pass the last 6 messages to the search API to prevent long query
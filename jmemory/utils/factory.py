@@ -1,4 +1,6 @@
 import importlib
+import json
+import threading
 from typing import Optional
 
 from jmemory.configs.embeddings.base import BaseEmbedderConfig
@@ -12,6 +14,30 @@ def load_class(class_type):
     return getattr(module, class_name)
 
 
+class _InstanceRegistry:
+    """Instances built by a factory, keyed by provider class and config, so callers with the same config share one."""
+
+    def __init__(self):
+        self._instances = {}
+        self._lock = threading.Lock()
+
+    def get_or_create(self, provider_class, config: Optional[dict], build):
+        key = (provider_class, json.dumps(config or {}, sort_keys=True, default=repr))
+        with self._lock:
+            instance = self._instances.get(key)
+        if instance is not None:
+            return instance
+        # Built outside the lock, so a slow constructor (e.g. a model load) does not hold up other providers.
+        instance = build()
+        with self._lock:
+            # Another thread may have built the same instance meanwhile; keep the first one.
+            return self._instances.setdefault(key, instance)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._instances.clear()
+
+
 class LlmFactory:
     provider_to_class = {
         "ollama": "jmemory.llms.ollama.OllamaLLM",
@@ -32,13 +58,16 @@ class LlmFactory:
         "langchain": "jmemory.llms.langchain.LangchainLLM",
     }
 
+    instances = _InstanceRegistry()
+
     @classmethod
-    def create(cls, provider_name, config):
+    def create(cls, provider_name, config, reuse: bool = True):
         class_type = cls.provider_to_class.get(provider_name)
         if class_type:
             llm_instance = load_class(class_type)
-            base_config = BaseLlmConfig(**config)
-            return llm_instance(base_config)
+            if not reuse:
+                return llm_instance(BaseLlmConfig(**config))
+            return cls.instances.get_or_create(llm_instance, config, lambda: llm_instance(BaseLlmConfig(**config)))
         else:
             raise ValueError(f"Unsupported Llm provider: {provider_name}")
 
@@ -57,14 +86,19 @@ class EmbedderFactory:
         "aws_bedrock": "jmemory.embeddings.aws_bedrock.AWSBedrockEmbedding",
     }
 
+    instances = _InstanceRegistry()
+
     @classmethod
-    def create(cls, provider_name, config, vector_config: Optional[dict]):
+    def create(cls, provider_name, config, vector_config: Optional[dict], reuse: bool = True):
         if provider_name == "upstash_vector" and vector_config and vector_config.enable_embeddings:
             return MockEmbeddings()
         class_type = cls.provider_to_class.get(provider_name)
         if class_type:
             embedder_instance = load_class(class_type)
-            base_config = BaseEmbedderConfig(**config)
-            return embedder_instance(base_config)
+            if not reuse:
+                return embedder_instance(BaseEmbedderConfig(**config))
+            return cls.instances.get_or_create(
+                embedder_instance, config, lambda: embedder_instance(BaseEmbedderConfig(**config))
+            )
         else:
             raise ValueError(f"Unsupported Embedder provider: {provider_name}")
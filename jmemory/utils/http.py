@@ -0,0 +1,193 @@
+"""
+Process-wide registry of HTTP connection pools and provider SDK clients.
+
+Every LLM and embedder used to build its own SDK client, and with it its own `httpx` connection pool, so a
+`Memory`, its graph store and the proxy talking to the same endpoint each paid for their own TLS handshakes and
+kept their own idle sockets. `shared_client` hands out one SDK client per (client class, base URL, API key,
+other options) and backs all of them with one keep-alive `httpx.Client` per origin, negotiating HTTP/2 where the
+server supports it.
+
+Pool settings come from `configure_http` or from the environment:
+
+    JMEMORY_HTTP2                      "0" disables HTTP/2 (enabled when the `h2` package is installed)
+    JMEMORY_HTTP_MAX_CONNECTIONS       connections per origin, defaults to 100
+    JMEMORY_HTTP_MAX_KEEPALIVE         idle connections kept per origin, defaults to 20
+    JMEMORY_HTTP_KEEPALIVE_EXPIRY      seconds an idle connection is kept, defaults to 60
+"""
+
+import atexit
+import hashlib
+import importlib.util
+import json
+import logging
+import os
+import threading
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# Keyword arguments whose values are hashed rather than kept in registry keys.
+SECRET_KWARGS = ("api_key", "azure_ad_token")
+# Keyword arguments that name the endpoint of an SDK client, in order of preference.
+ENDPOINT_KWARGS = ("base_url", "azure_endpoint", "host")
+
+_settings = {
+    "http2": os.environ.get("JMEMORY_HTTP2", "1") != "0" and importlib.util.find_spec("h2") is not None,
+    "max_connections": int(os.environ.get("JMEMORY_HTTP_MAX_CONNECTIONS", 100)),
+    "max_keepalive_connections": int(os.environ.get("JMEMORY_HTTP_MAX_KEEPALIVE", 20)),
+    "keepalive_expiry": float(os.environ.get("JMEMORY_HTTP_KEEPALIVE_EXPIRY", 60.0)),
+}
+_pools: Dict[str, httpx.Client] = {}
+_clients: Dict[Tuple, Any] = {}
+_lock = threading.Lock()
+
+
+def configure_http(
+    http2: Optional[bool] = None,
+    max_connections: Optional[int] = None,
+    max_keepalive_connections: Optional[int] = None,
+    keepalive_expiry: Optional[float] = None,
+) -> Dict[str, Any]:
+    """
+    Tune the shared connection pools. Only pools created afterwards are affected, so call this at startup.
+
+    Args:
+        http2 (bool, optional): Negotiate HTTP/2 over TLS. Requires the `h2` package.
+        max_connections (int, optional): Maximum connections per origin.
+        max_keepalive_connections (int, optional): Maximum idle connections kept per origin.
+        keepalive_expiry (float, optional): Seconds an idle connection is kept open.
+
+    Returns:
+        dict: The resulting settings.
+    """
+    updates = {
+        "http2": http2,
+        "max_connections": max_connections,
+        "max_keepalive_connections": max_keepalive_connections,
+        "keepalive_expiry": keepalive_expiry,
+    }
+    if http2 and importlib.util.find_spec("h2") is None:
+        raise ImportError("HTTP/2 requires the 'h2' library. Please install it using 'pip install httpx[http2]'.")
+    with _lock:
+        _settings.update({key: value for key, value in updates.items() if value is not None})
+        return dict(_settings)
+
+
+def _origin(url: Optional[str]) -> str:
+    parts = urlsplit(url or "")
+    if not parts.scheme or not parts.hostname:
+        return url or ""
+    port = parts.port or {"http": 80, "https": 443}.get(parts.scheme)
+    return f"{parts.scheme}://{parts.hostname}:{port}"
+
+
+def _pool_options() -> Dict[str, Any]:
+    return {
+        "http2": _settings["http2"],
+        "limits": httpx.Limits(
+            max_connections=_settings["max_connections"],
+            max_keepalive_connections=_settings["max_keepalive_connections"],
+            keepalive_expiry=_settings["keepalive_expiry"],
+        ),
+    }
+
+
+def http_client(url: Optional[str] = None) -> httpx.Client:
+    """
+    Get the shared keep-alive `httpx.Client` for the origin of `url`.
+
+    Args:
+        url (str, optional): Any URL on the origin. Clients without one share a default pool.
+
+    Returns:
+        httpx.Client: A client without a base URL or default timeout; callers pass full URLs and timeouts.
+    """
+    origin = _origin(url)
+    with _lock:
+        client = _pools.get(origin)
+        if client is None or client.is_closed:
+            # SDKs set their own timeouts per request; this one only applies to direct use of the pool.
+            client = httpx.Client(timeout=httpx.Timeout(600.0, connect=5.0), follow_redirects=True, **_pool_options())
+            _pools[origin] = client
+        return client
+
+
+def _fingerprint(name: str, value: Any) -> Any:
+    if value is None:
+        return None
+    if name in SECRET_KWARGS:
+        return hashlib.sha256(str(value).encode("utf-8")).hexdigest()
+    try:
+        hash(value)
+        return value
+    except TypeError:
+        return json.dumps(value, sort_keys=True, default=repr)
+
+
+def shared_client(client_cls, http_client_param: Optional[str] = "http_client", **kwargs):
+    """
+    Get the process-wide instance of an SDK client, creating it on first use.
+
+    Clients are keyed by their class and every keyword argument (API keys are hashed), so two providers that
+    point at the same endpoint with the same credentials get the same object. When the SDK accepts an
+    `httpx.Client` through `http_client_param` and none was passed (e.g. a proxied one from the config), the
+    shared pool of the endpoint's origin is injected. SDKs that build their own `httpx.Client` from keyword
+    arguments, like ollama's, get the pool settings instead (`http_client_param=None`).
+
+    Args:
+        client_cls: The SDK client class, e.g. `openai.OpenAI`.
+        http_client_param (str, optional): Name of the constructor argument taking an `httpx.Client`.
+            Defaults to "http_client".
+        **kwargs: Constructor arguments of the client.
+
+    Returns:
+        The shared client instance.
+    """
+    key = (client_cls, tuple(sorted((name, _fingerprint(name, value)) for name, value in kwargs.items())))
+    with _lock:
+        client = _clients.get(key)
+    if client is not None:
+        return client
+
+    endpoint = next((kwargs[name] for name in ENDPOINT_KWARGS if kwargs.get(name)), None)
+    if http_client_param:
+        if kwargs.get(http_client_param) is None:
+            kwargs[http_client_param] = http_client(endpoint or f"{client_cls.__module__}.{client_cls.__qualname__}")
+    else:
+        with _lock:
+            options = _pool_options()
+        kwargs = {**options, **kwargs}
+    client = client_cls(**kwargs)
+    with _lock:
+        # Another thread may have built the same client meanwhile; keep the first one.
+        return _clients.setdefault(key, client)
+
+
+def stats() -> Dict[str, Any]:
+    """
+    Get the registry counters.
+
+    Returns:
+        dict: Number of shared SDK clients, the origins with a connection pool and the pool settings.
+    """
+    with _lock:
+        return {"clients": len(_clients), "pools": sorted(_pools), "settings": dict(_settings)}
+
+
+def close_all() -> None:
+    """Close every shared connection pool and forget the shared clients."""
+    with _lock:
+        pools = list(_pools.values())
+        _pools.clear()
+        _clients.clear()
+    for pool in pools:
+        try:
+            pool.close()
+        except Exception as e:
+            logger.debug(f"Failed to close HTTP pool: {e}")
+
+
+atexit.register(close_all)
@@ -0,0 +1,44 @@
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+
+@dataclass
+class Point:
+    """A stored point, with the attributes of Qdrant's `Record` and `ScoredPoint` that callers read."""
+
+    id: str
+    payload: Dict[str, Any]
+    score: Optional[float] = None
+    vector: Optional[List[float]] = None
+
+
+def condition_kind(condition: Any) -> str:
+    """Kind of a filter condition ("range", "in", "nin" or "eq"), checked in the order `_create_filter` uses."""
+    if isinstance(condition, dict):
+        if "gte" in condition and "lte" in condition:
+            return "range"
+        if "in" in condition:
+            return "in"
+        if "nin" in condition:
+            return "nin"
+    return "eq"
+
+
+def matches_filters(payload: Dict[str, Any], filters: Dict[str, Any]) -> bool:
+    """Evaluate filters on one payload with the semantics of `jmemory.vector_stores.qdrant._create_filter`."""
+    for key, condition in filters.items():
+        value = payload.get(key)
+        kind = condition_kind(condition)
+        if kind == "range":
+            try:
+                if value is None or not condition["gte"] <= value <= condition["lte"]:
+                    return False
+            except TypeError:
+                return False
+        elif kind == "in" and value not in condition["in"]:
+            return False
+        elif kind == "nin" and value in condition["nin"]:
+            return False
+        elif kind == "eq" and value != condition:
+            return False
+    return True
@@ -0,0 +1,830 @@
+"""
+In-process vector store on FAISS, for single-node and edge deployments that should not run a Qdrant process.
+
+Every point is a row: its vector sits in a FAISS HNSW graph (whose labels are row numbers) and in a float32
+matrix, its payload in a list, and the scoping keys (`user_id`, `agent_id`, `run_id` and `memory_type`) in
+dictionary-encoded int32 columns. A filter on those keys becomes a bitmap with one NumPy comparison per column
+and is handed to FAISS as an `IDSelectorBitmap`, so filtered search never reads payloads; conditions on other
+keys are checked on the rows the bitmap leaves. Filters that select few rows are answered by an exact scan of
+those rows instead of the graph, which keeps recall at 100% for small scopes.
+
+HNSW graphs cannot remove points: deletes tombstone the row, a new vector for an existing id is appended as a
+new row, and dead rows are dropped when a checkpoint compacts the collection.
+
+With `on_disk`, each write is appended to a write-ahead log before it is applied, and every `checkpoint_every`
+written points the collection is checkpointed to a snapshot whose index and vectors are memory-mapped when it
+is opened, so a cold start maps the snapshot and replays the log tail instead of rebuilding the graph. The log
+is flushed to the OS on every write: it survives a crash of the process, not of the machine.
+A collection must only be opened by one process at a time.
+"""
+
+import asyncio
+import base64
+import json
+import logging
+import os
+import shutil
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    import faiss
+except ImportError:
+    raise ImportError("The 'faiss' library is required. Please install it using 'pip install faiss-cpu'.")
+
+from jmemory.vector_stores.base import Point, condition_kind, matches_filters
+
+logger = logging.getLogger(__name__)
+
+# Payload keys stored as columns with filter bitmaps: the session scope and the memory layer.
+INDEXED_COLUMNS = ["user_id", "agent_id", "run_id", "memory_type"]
+DISTANCES = ("cosine", "inner_product", "euclidean")
+INDEX_TYPES = ("hnsw", "flat")
+# Code of a missing or null column value.
+MISSING = -1
+# Dead rows, as a share of all rows, above which a checkpoint rebuilds the collection without them.
+COMPACT_RATIO = 0.25
+SNAPSHOT_PREFIX = "snapshot-"
+WAL_FILE = "wal.log"
+CURRENT_FILE = "CURRENT"
+
+
+def _encode(value: Any) -> Any:
+    """Hashable key of a column value; lists and dicts are keyed by their JSON."""
+    if isinstance(value, (str, int, float, bool)):
+        return value
+    return json.dumps(value, sort_keys=True, default=str)
+
+
+def _weight(record: Dict[str, Any]) -> int:
+    """Number of points a log entry writes."""
+    return len(record.get("ids") or record.get("payloads") or ()) or 1
+
+
+def _write_atomic(path: str, data: bytes):
+    with open(path + ".tmp", "wb") as f:
+        f.write(data)
+    os.replace(path + ".tmp", path)
+
+
+class _ReadWriteLock:
+    """Concurrent readers or one writer; FAISS searches an HNSW graph safely from many threads, but not while adding."""
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._readers = 0
+        self._writing = False
+        self._waiting_writers = 0
+
+    @contextmanager
+    def read(self):
+        with self._condition:
+            # Waiting writers go first, so a stream of searches cannot starve writes.
+            while self._writing or self._waiting_writers:
+                self._condition.wait()
+            self._readers += 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._readers -= 1
+                if not self._readers:
+                    self._condition.notify_all()
+
+    @contextmanager
+    def write(self):
+        with self._condition:
+            self._waiting_writers += 1
+            while self._writing or self._readers:
+                self._condition.wait()
+            self._waiting_writers -= 1
+            self._writing = True
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._writing = False
+                self._condition.notify_all()
+
+
+class FAISS:
+    def __init__(
+        self,
+        collection_name: str,
+        embedding_model_dims: int,
+        path: str = None,
+        on_disk: bool = False,
+        distance_strategy: str = "cosine",
+        normalize_L2: bool = False,
+        index_type: str = "hnsw",
+        hnsw_m: int = 16,
+        ef_construction: int = 100,
+        ef_search: int = 128,
+        exact_search_threshold: int = 4096,
+        checkpoint_every: int = 10000,
+    ):
+        """
+        Initialize the FAISS vector store, opening the collection stored under `path` if there is one.
+
+        Args:
+            collection_name (str): Name of the collection, a directory under `path`.
+            embedding_model_dims (int): Dimensions of the embedding model.
+            path (str, optional): Directory for persistent collections. Defaults to None.
+            on_disk (bool, optional): Persist the collection under `path`; otherwise it lives in memory only.
+                Defaults to False.
+            distance_strategy (str, optional): "cosine", "inner_product" or "euclidean". Defaults to "cosine".
+            normalize_L2 (bool, optional): L2-normalize vectors for "euclidean". Defaults to False.
+            index_type (str, optional): "hnsw" for an HNSW graph, or "flat" for exact search only. Defaults to "hnsw".
+            hnsw_m (int, optional): Neighbours per HNSW node. Defaults to 16.
+            ef_construction (int, optional): HNSW candidate list size while inserting. Defaults to 100.
+            ef_search (int, optional): HNSW candidate list size while searching. Defaults to 128.
+            exact_search_threshold (int, optional): Filters selecting at most this many points are searched
+                exactly instead of through the graph. Defaults to 4096.
+            checkpoint_every (int, optional): Points written (inserted, updated or deleted) between snapshots.
+                Defaults to 10000.
+        """
+        if distance_strategy not in DISTANCES:
+            raise ValueError(f"Invalid distance_strategy {distance_strategy!r}, must be one of {DISTANCES}")
+        if index_type not in INDEX_TYPES:
+            raise ValueError(f"Invalid index_type {index_type!r}, must be one of {INDEX_TYPES}")
+        self.collection_name = collection_name
+        self.embedding_model_dims = embedding_model_dims
+        self.path = path
+        self.on_disk = on_disk
+        self.distance_strategy = distance_strategy
+        self.normalize = distance_strategy == "cosine" or (distance_strategy == "euclidean" and normalize_L2)
+        self.index_type = index_type
+        self.hnsw_m = hnsw_m
+        self.ef_construction = ef_construction
+        self.ef_search = ef_search
+        self.exact_search_threshold = exact_search_threshold
+        self.checkpoint_every = checkpoint_every
+        self.directory = os.path.join(path, collection_name) if path and on_disk else None
+
+        self._lock = _ReadWriteLock()
+        self._wal = None
+        self.create_col()
+
+    # Collection lifecycle
+
+    def create_col(self):
+        """Open the collection, loading its last snapshot and replaying the log, or create it empty."""
+        self._clear()
+        if self.directory is None:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        current = os.path.join(self.directory, CURRENT_FILE)
+        if os.path.exists(current):
+            with open(current) as f:
+                self._load(os.path.join(self.directory, f.read().strip()))
+        self._replay(os.path.join(self.directory, WAL_FILE))
+        self._wal = open(os.path.join(self.directory, WAL_FILE), "ab")
+        if self._logged >= self.checkpoint_every:
+            self._checkpoint()
+
+    def _clear(self):
+        dims = self.embedding_model_dims
+        self._size = 0
+        self._vectors = np.empty((0, dims), dtype=np.float32)
+        self._alive = np.empty(0, dtype=bool)
+        self._codes = np.empty((len(INDEXED_COLUMNS), 0), dtype=np.int32)
+        self._ids: List[str] = []
+        self._payloads: List[Optional[Dict[str, Any]]] = []
+        self._rows: Dict[str, int] = {}
+        self._values: List[List[Any]] = [[] for _ in INDEXED_COLUMNS]
+        self._vocab: List[Dict[Any, int]] = [{} for _ in INDEXED_COLUMNS]
+        self._index = self._new_index()
+        self._generation = 0
+        self._logged = 0
+        # Rows kept by the last compaction, to carry scroll offsets over it.
+        self._epoch = 0
+        self._kept = None
+
+    def _new_index(self):
+        if self.index_type == "flat":
+            return None
+        metric = faiss.METRIC_L2 if self.distance_strategy == "euclidean" else faiss.METRIC_INNER_PRODUCT
+        index = faiss.IndexHNSWFlat(self.embedding_model_dims, self.hnsw_m, metric)
+        index.hnsw.efConstruction = self.ef_construction
+        return index
+
+    def list_cols(self) -> list:
+        """
+        List the collections stored under `path`.
+
+        Returns:
+            list: List of collection names.
+        """
+        if not (self.path and self.on_disk and os.path.isdir(self.path)):
+            return [self.collection_name]
+        return sorted(
+            name for name in os.listdir(self.path) if os.path.exists(os.path.join(self.path, name, CURRENT_FILE))
+        )
+
+    def delete_col(self):
+        """
+        Delete the collection from memory and disk.
+        """
+        with self._lock.write():
+            self._close_wal()
+            if self.directory and os.path.isdir(self.directory):
+                shutil.rmtree(self.directory)
+            self._clear()
+
+    def col_info(self) -> dict:
+        """
+        Get information about the collection.
+
+        Returns:
+            dict: Collection information.
+        """
+        with self._lock.read():
+            return {
+                "name": self.collection_name,
+                "points": len(self._rows),
+                "rows": self._size,
+                "dims": self.embedding_model_dims,
+                "distance": self.distance_strategy,
+                "index_type": self.index_type,
+                "path": self.directory,
+            }
+
+    def reset(self):
+        """
+        Reset the collection by deleting and recreating it."""
+        logger.warning(f"Resetting index {self.collection_name}...")
+        self.delete_col()
+        with self._lock.write():
+            self.create_col()
+
+    def checkpoint(self):
+        """Write a snapshot now and truncate the log. A no-op for in-memory collections."""
+        if self.directory is None:
+            return
+        with self._lock.write():
+            self._checkpoint()
+
+    def close(self):
+        """Checkpoint outstanding writes, so the next open has no log to replay, and close the log."""
+        if self.directory is None:
+            return
+        with self._lock.write():
+            if self._logged:
+                self._checkpoint()
+            self._close_wal()
+
+    def _close_wal(self):
+        if self._wal is not None:
+            self._wal.close()
+            self._wal = None
+
+    # Writes
+
+    def insert(self, vectors: list, payloads: list = None, ids: list = None):
+        """
+        Insert vectors into the collection. Existing ids are overwritten.
+
+        Args:
+            vectors (list): List of vectors to insert.
+            payloads (list, optional): List of payloads corresponding to vectors. Defaults to None.
+            ids (list, optional): List of IDs corresponding to vectors. Defaults to None.
+        """
+        logger.info(f"Inserting {len(vectors)} vectors into collection {self.collection_name}")
+        if not len(vectors):
+            return
+        matrix = self._prepare(vectors)
+        ids = [str(idx if ids is None else ids[idx]) for idx in range(len(matrix))]
+        payloads = [dict(payloads[idx]) if payloads else {} for idx in range(len(matrix))]
+        record = {"op": "upsert", "ids": ids, "payloads": payloads, "vectors": self._pack(matrix)}
+        with self._lock.write():
+            self._commit(record)
+
+    def update(self, vector_id: str, vector: list = None, payload: dict = None):
+        """
+        Update a vector and its payload. Either left as None keeps its current value.
+
+        Args:
+            vector_id (str): ID of the vector to update.
+            vector (list, optional): Updated vector. Defaults to None.
+            payload (dict, optional): Updated payload. Defaults to None.
+        """
+        vector_id = str(vector_id)
+        matrix = None if vector is None else self._prepare([vector])
+        with self._lock.write():
+            row = self._rows.get(vector_id)
+            if matrix is None:
+                if row is None:
+                    raise ValueError(f"No point with id {vector_id} to update")
+                self._commit({"op": "replace", "id": vector_id, "payload": dict(payload or {})})
+                return
+            if payload is None:
+                payload = self._payloads[row] if row is not None else {}
+            record = {"op": "upsert", "ids": [vector_id], "payloads": [dict(payload)], "vectors": self._pack(matrix)}
+            self._commit(record)
+
+    def set_payloads(self, payloads: dict):
+        """
+        Merge new payload values into several points, leaving their other keys and vectors as they are.
+
+        Args:
+            payloads (dict): Payload keys to set, by point ID.
+        """
+        if not payloads:
+            return
+        with self._lock.write():
+            self._commit({"op": "set", "payloads": {str(key): dict(value) for key, value in payloads.items()}})
+
+    def delete(self, vector_id: str):
+        """
+        Delete a vector by ID.
+
+        Args:
+            vector_id (str): ID of the vector to delete.
+        """
+        self.delete_many([vector_id])
+
+    def delete_many(self, vector_ids: list):
+        """
+        Delete several vectors at once.
+
+        Args:
+            vector_ids (list): IDs of the vectors to delete.
+        """
+        if not vector_ids:
+            return
+        with self._lock.write():
+            self._commit({"op": "delete", "ids": [str(vector_id) for vector_id in vector_ids]})
+
+    def delete_by_filter(self, filters: dict):
+        """
+        Delete every vector matching the filters.
+
+        Args:
+            filters (dict): Filters selecting the vectors to delete. Must not be empty.
+        """
+        if not filters:
+            raise ValueError("Refusing to delete by an empty filter, use reset() to clear the collection.")
+        with self._lock.write():
+            rows = np.flatnonzero(self._mask(filters))
+            if len(rows):
+                self._commit({"op": "delete", "ids": [self._ids[row] for row in rows]})
+
+    def _commit(self, record: Dict[str, Any]):
+        """Log a write, then apply it. Callers hold the write lock."""
+        if self._wal is not None:
+            self._wal.write(json.dumps(record).encode("utf-8") + b"\n")
+            self._wal.flush()
+            self._logged += _weight(record)
+        self._apply(record)
+        if self._wal is not None and self._logged >= self.checkpoint_every:
+            self._checkpoint()
+
+    def _apply(self, record: Dict[str, Any]):
+        op = record["op"]
+        if op == "upsert":
+            self._append(record["ids"], self._unpack(record["vectors"]), record["payloads"])
+        elif op == "replace":
+            row = self._rows.get(record["id"])
+            if row is not None:
+                self._set_payload(row, record["payload"])
+        elif op == "set":
+            for point_id, values in record["payloads"].items():
+                row = self._rows.get(point_id)
+                if row is not None:
+                    self._set_payload(row, {**self._payloads[row], **values})
+        elif op == "delete":
+            for point_id in record["ids"]:
+                self._tombstone(self._rows.pop(point_id, None))
+        else:
+            raise ValueError(f"Unknown log entry {op!r}")
+
+    def _append(self, ids: List[str], matrix: np.ndarray, payloads: List[Dict[str, Any]]):
+        count = len(ids)
+        self._reserve(count)
+        start = self._size
+        self._vectors[start : start + count] = matrix
+        self._alive[start : start + count] = True
+        for offset, (point_id, payload) in enumerate(zip(ids, payloads)):
+            row = start + offset
+            self._tombstone(self._rows.get(point_id))
+            self._rows[point_id] = row
+            self._ids.append(point_id)
+            self._payloads.append(payload)
+            self._codes[:, row] = self._encode_columns(payload)
+        if self._index is not None:
+            self._index.add(matrix)
+        self._size += count
+
+    def _set_payload(self, row: int, payload: Dict[str, Any]):
+        self._payloads[row] = payload
+        self._codes[:, row] = self._encode_columns(payload)
+
+    def _tombstone(self, row: Optional[int]):
+        if row is not None:
+            self._alive[row] = False
+            self._payloads[row] = None
+
+    def _encode_columns(self, payload: Dict[str, Any]) -> List[int]:
+        codes = []
+        for column, key in enumerate(INDEXED_COLUMNS):
+            value = payload.get(key)
+            if value is None:
+                codes.append(MISSING)
+                continue
+            value = _encode(value)
+            code = self._vocab[column].get(value)
+            if code is None:
+                code = self._vocab[column][value] = len(self._values[column])
+                self._values[column].append(value)
+            codes.append(code)
+        return codes
+
+    def _reserve(self, count: int):
+        """Grow the row arrays, doubling, to fit `count` more rows; copies memory-mapped arrays into memory."""
+        capacity = len(self._alive)
+        if self._size + count <= capacity and self._vectors.flags.writeable:
+            return
+        capacity = max(2 * capacity, self._size + count, 1024)
+        vectors = np.empty((capacity, self.embedding_model_dims), dtype=np.float32)
+        vectors[: self._size] = self._vectors[: self._size]
+        alive = np.zeros(capacity, dtype=bool)
+        alive[: self._size] = self._alive[: self._size]
+        codes = np.full((len(INDEXED_COLUMNS), capacity), MISSING, dtype=np.int32)
+        codes[:, : self._size] = self._codes[:, : self._size]
+        self._vectors, self._alive, self._codes = vectors, alive, codes
+
+    def _prepare(self, vectors: list) -> np.ndarray:
+        matrix = np.array(vectors, dtype=np.float32, ndmin=2)
+        if matrix.shape[1] != self.embedding_model_dims:
+            raise ValueError(f"Expected vectors of {self.embedding_model_dims} dimensions, got {matrix.shape[1]}")
+        if self.normalize:
+            norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+            matrix /= np.where(norms > 0, norms, 1.0)
+        return matrix
+
+    @staticmethod
+    def _pack(matrix: np.ndarray) -> str:
+        return base64.b64encode(np.ascontiguousarray(matrix, dtype=np.float32).tobytes()).decode("ascii")
+
+    def _unpack(self, data: str) -> np.ndarray:
+        return np.frombuffer(base64.b64decode(data), dtype=np.float32).reshape(-1, self.embedding_model_dims)
+
+    # Reads
+
+    def search(self, query: str, vectors: list, limit: int = 5, filters: dict = None) -> list:
+        """
+        Search for similar vectors.
+
+        Args:
+            query (str): Query.
+            vectors (list): Query vector.
+            limit (int, optional): Number of results to return. Defaults to 5.
+            filters (dict, optional): Filters to apply to the search. Defaults to None.
+
+        Returns:
+            list: Search results, best first. Scores are similarities, or distances for "euclidean".
+        """
+        query_vector = self._prepare(vectors)
+        with self._lock.read():
+            mask = self._mask(filters)
+            selected = int(np.count_nonzero(mask))
+            if not selected or limit <= 0:
+                return []
+            k = min(limit, selected)
+            if self._index is None or selected <= self.exact_search_threshold:
+                rows, scores = self._exact_search(query_vector[0], mask, selected, k)
+            else:
+                rows, scores = self._graph_search(query_vector, mask, k)
+            return [
+                Point(id=self._ids[row], payload=dict(self._payloads[row]), score=float(score))
+                for row, score in zip(rows, scores)
+            ]
+
+    def _exact_search(self, query_vector: np.ndarray, mask: np.ndarray, selected: int, k: int):
+        rows = np.arange(self._size) if selected == self._size else np.flatnonzero(mask)
+        candidates = self._vectors[rows] if selected < self._size else self._vectors[: self._size]
+        if self.distance_strategy == "euclidean":
+            scores = np.sqrt(((candidates - query_vector) ** 2).sum(axis=1))
+            keys = scores
+        else:
+            scores = candidates @ query_vector
+            keys = -scores
+        top = np.argpartition(keys, k - 1)[:k] if k < len(keys) else np.arange(len(keys))
+        top = top[np.argsort(keys[top], kind="stable")]
+        return rows[top], scores[top]
+
+    def _graph_search(self, query_vector: np.ndarray, mask: np.ndarray, k: int):
+        bitmap = np.packbits(mask, bitorder="little")
+        params = faiss.SearchParametersHNSW(
+            sel=faiss.IDSelectorBitmap(len(mask), faiss.swig_ptr(bitmap)), efSearch=max(self.ef_search, k)
+        )
+        distances, labels = self._index.search(query_vector, k, params=params)
+        found = labels[0] >= 0
+        rows, scores = labels[0][found], distances[0][found]
+        if self.distance_strategy == "euclidean":
+            # FAISS reports squared L2 distances.
+            scores = np.sqrt(np.maximum(scores, 0.0))
+        return rows, scores
+
+    def _mask(self, filters: Optional[Dict[str, Any]], start: int = 0, end: Optional[int] = None) -> np.ndarray:
+        """Rows in [start, end) that are alive and match the filters, as a boolean array."""
+        end = self._size if end is None else end
+        mask = self._alive[start:end].copy()
+        if not filters:
+            return mask
+        residual = {}
+        for key, condition in filters.items():
+            kind = condition_kind(condition)
+            if key not in INDEXED_COLUMNS or kind == "range":
+                residual[key] = condition
+                continue
+            column = INDEXED_COLUMNS.index(key)
+            codes = self._codes[column, start:end]
+            vocab = self._vocab[column]
+            if kind == "eq":
+                code = vocab.get(_encode(condition))
+                if code is None:
+                    mask[:] = False
+                    return mask
+                mask &= codes == code
+            else:
+                known = [vocab[value] for value in map(_encode, condition[kind]) if value in vocab]
+                matched = np.isin(codes, known)
+                mask &= matched if kind == "in" else ~matched
+        if residual:
+            for offset in np.flatnonzero(mask):
+                if not matches_filters(self._payloads[start + offset], residual):
+                    mask[offset] = False
+        return mask
+
+    def get(self, vector_id: str) -> Optional[Point]:
+        """
+        Retrieve a vector by ID.
+
+        Args:
+            vector_id (str): ID of the vector to retrieve.
+
+        Returns:
+            Point: Retrieved point, or None.
+        """
+        points = self.get_many([vector_id])
+        return points[0] if points else None
+
+    def get_many(self, vector_ids: list, with_vectors: bool = False) -> list:
+        """
+        Retrieve several vectors at once.
+
+        Args:
+            vector_ids (list): IDs of the vectors to retrieve.
+            with_vectors (bool, optional): Include the vectors, not only the payloads. Defaults to False.
+
+        Returns:
+            list: Retrieved points; missing IDs are skipped.
+        """
+        with self._lock.read():
+            rows = [self._rows.get(str(vector_id)) for vector_id in vector_ids]
+            return [self._point(row, with_vectors) for row in rows if row is not None]
+
+    def _point(self, row: int, with_vectors: bool = False) -> Point:
+        vector = self._vectors[row].tolist() if with_vectors else None
+        return Point(id=self._ids[row], payload=dict(self._payloads[row]), vector=vector)
+
+    def scroll(self, filters: dict = None, limit: int = 100, offset: Tuple[int, int] = None) -> tuple:
+        """
+        Read one page of points in insertion order.
+
+        Args:
+            filters (dict, optional): Filters to apply. Defaults to None.
+            limit (int, optional): Number of points to return. Defaults to 100.
+            offset (tuple, optional): Where to continue, as returned by the previous page. Defaults to None.
+
+        Returns:
+            tuple: The points, and the offset of the next page or None after the last one.
+        """
+        with self._lock.read():
+            position = self._resume(offset)
+            rows = []
+            while position < self._size and len(rows) <= limit:
+                end = min(position + max(4 * limit, 4096), self._size)
+                rows.extend((np.flatnonzero(self._mask(filters, position, end)) + position).tolist())
+                position = end
+            next_offset = (self._epoch, rows[limit]) if len(rows) > limit else None
+            return [self._point(row) for row in rows[:limit]], next_offset
+
+    def _resume(self, offset: Optional[Tuple[int, int]]) -> int:
+        if offset is None:
+            return 0
+        epoch, row = offset
+        if epoch == self._epoch:
+            return row
+        if epoch == self._epoch - 1 and self._kept is not None:
+            # Rows keep their order through a compaction, so the next surviving row is where to continue.
+            return int(np.searchsorted(self._kept, row))
+        logger.warning("Collection was compacted more than once during a scroll, restarting from the first point")
+        return 0
+
+    def list(self, filters: dict = None, limit: int = 100) -> tuple:
+        """
+        List vectors in the collection.
+
+        Args:
+            filters (dict, optional): Filters to apply to the list. Defaults to None.
+            limit (int, optional): Number of vectors to return. Defaults to 100.
+
+        Returns:
+            tuple: List of points and the offset of the next page, like a Qdrant scroll.
+        """
+        return self.scroll(filters=filters, limit=limit)
+
+    def iter_all(self, filters: dict = None, page_size: int = 100):
+        """
+        Iterate over every vector in the collection, page by page.
+
+        Args:
+            filters (dict, optional): Filters to apply. Defaults to None.
+            page_size (int, optional): Number of points read per page. Defaults to 100.
+
+        Yields:
+            Point: Points with their payloads, without vectors.
+        """
+        offset = None
+        while True:
+            points, offset = self.scroll(filters=filters, limit=page_size, offset=offset)
+            yield from points
+            if offset is None:
+                return
+
+    # Persistence
+
+    def _checkpoint(self):
+        """Write a new snapshot, point CURRENT at it and truncate the log. Callers hold the write lock."""
+        if self._size and np.count_nonzero(~self._alive[: self._size]) > COMPACT_RATIO * self._size:
+            self._compact()
+        self._generation += 1
+        name = f"{SNAPSHOT_PREFIX}{self._generation:06d}"
+        target = os.path.join(self.directory, name)
+        os.makedirs(target, exist_ok=True)
+        size = self._size
+        np.save(os.path.join(target, "vectors.npy"), self._vectors[:size])
+        np.save(os.path.join(target, "alive.npy"), self._alive[:size])
+        np.save(os.path.join(target, "codes.npy"), self._codes[:, :size])
+        with open(os.path.join(target, "payloads.jsonl"), "w", encoding="utf-8") as f:
+            for payload in self._payloads:
+                f.write(json.dumps(payload) + "\n")
+        if self._index is not None:
+            faiss.write_index(self._index, os.path.join(target, "index.faiss"))
+        meta = {
+            "dims": self.embedding_model_dims,
+            "distance": self.distance_strategy,
+            "index_type": self.index_type,
+            "size": size,
+            "ids": self._ids,
+            "values": self._values,
+        }
+        _write_atomic(os.path.join(target, "meta.json"), json.dumps(meta).encode("utf-8"))
+        # The snapshot becomes visible in one rename; a crash before it leaves the previous one and the full log.
+        _write_atomic(os.path.join(self.directory, CURRENT_FILE), name.encode("utf-8"))
+        if self._wal is not None:
+            self._wal.truncate(0)
+            self._wal.seek(0)
+        self._logged = 0
+        for entry in os.listdir(self.directory):
+            if entry.startswith(SNAPSHOT_PREFIX) and entry != name:
+                shutil.rmtree(os.path.join(self.directory, entry), ignore_errors=True)
+
+    def _compact(self):
+        kept = np.flatnonzero(self._alive[: self._size])
+        self._vectors = self._vectors[kept]
+        self._alive = np.ones(len(kept), dtype=bool)
+        self._codes = self._codes[:, kept]
+        self._ids = [self._ids[row] for row in kept]
+        self._payloads = [self._payloads[row] for row in kept]
+        self._rows = {point_id: row for row, point_id in enumerate(self._ids)}
+        self._size = len(kept)
+        self._index = self._new_index()
+        if self._index is not None and self._size:
+            self._index.add(self._vectors)
+        self._epoch += 1
+        self._kept = kept
+
+    def _load(self, snapshot: str):
+        with open(os.path.join(snapshot, "meta.json"), encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta["dims"] != self.embedding_model_dims or meta["distance"] != self.distance_strategy:
+            raise ValueError(
+                f"Collection {self.collection_name} holds {meta['dims']}-dimensional {meta['distance']} vectors, "
+                f"not {self.embedding_model_dims}-dimensional {self.distance_strategy} ones"
+            )
+        self._generation = int(os.path.basename(snapshot)[len(SNAPSHOT_PREFIX) :])
+        self._size = meta["size"]
+        # Vectors stay on disk until the first insert; the index is mapped too and only read when searched.
+        self._vectors = np.load(os.path.join(snapshot, "vectors.npy"), mmap_mode="r")
+        self._alive = np.load(os.path.join(snapshot, "alive.npy"))
+        self._codes = np.load(os.path.join(snapshot, "codes.npy"))
+        self._ids = meta["ids"]
+        self._values = meta["values"]
+        self._vocab = [{value: code for code, value in enumerate(values)} for values in self._values]
+        with open(os.path.join(snapshot, "payloads.jsonl"), encoding="utf-8") as f:
+            self._payloads = [json.loads(line) for line in f]
+        self._rows = {point_id: row for row, point_id in enumerate(self._ids) if self._alive[row]}
+        index_path = os.path.join(snapshot, "index.faiss")
+        if self.index_type == "hnsw" and meta["index_type"] == "hnsw":
+            self._index = faiss.read_index(index_path, faiss.IO_FLAG_MMAP)
+            self._index.hnsw.efConstruction = self.ef_construction
+        elif self.index_type == "hnsw":
+            # Switched from "flat": build the graph once, the next checkpoint saves it.
+            self._index = self._new_index()
+            if self._size:
+                self._index.add(np.ascontiguousarray(self._vectors))
+
+    def _replay(self, path: str):
+        if not os.path.exists(path):
+            return
+        with open(path, "rb+") as f:
+            while True:
+                position = f.tell()
+                line = f.readline()
+                if not line:
+                    return
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # A write cut short by a crash; drop it and anything after it.
+                    logger.warning(f"Truncating a partial entry at byte {position} of the {self.collection_name} log")
+                    f.truncate(position)
+                    return
+                self._apply(record)
+                self._logged += _weight(record)
+
+
+class AsyncFAISS:
+    """
+    asyncio counterpart of `FAISS`. Calls run on the default thread pool, so the event loop never waits for a
+    search, a log write or a checkpoint; FAISS releases the GIL while it searches.
+
+    Takes the same arguments as `FAISS`.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self.store = FAISS(*args, **kwargs)
+        self.collection_name = self.store.collection_name
+
+    async def insert(self, vectors: list, payloads: list = None, ids: list = None):
+        await asyncio.to_thread(self.store.insert, vectors, payloads, ids)
+
+    async def search(self, query: str, vectors: list, limit: int = 5, filters: dict = None) -> list:
+        return await asyncio.to_thread(self.store.search, query, vectors, limit, filters)
+
+    async def delete(self, vector_id: str):
+        await asyncio.to_thread(self.store.delete, vector_id)
+
+    async def update(self, vector_id: str, vector: list = None, payload: dict = None):
+        await asyncio.to_thread(self.store.update, vector_id, vector, payload)
+
+    async def get(self, vector_id: str) -> Optional[Point]:
+        return await asyncio.to_thread(self.store.get, vector_id)
+
+    async def get_many(self, vector_ids: list, with_vectors: bool = False) -> list:
+        return await asyncio.to_thread(self.store.get_many, vector_ids, with_vectors)
+
+    async def delete_many(self, vector_ids: list):
+        await asyncio.to_thread(self.store.delete_many, vector_ids)
+
+    async def set_payloads(self, payloads: dict):
+        await asyncio.to_thread(self.store.set_payloads, payloads)
+
+    async def list_cols(self) -> list:
+        return self.store.list_cols()
+
+    async def delete_col(self):
+        await asyncio.to_thread(self.store.delete_col)
+
+    async def col_info(self) -> dict:
+        return self.store.col_info()
+
+    async def list(self, filters: dict = None, limit: int = 100) -> tuple:
+        return await asyncio.to_thread(self.store.list, filters, limit)
+
+    async def iter_all(self, filters: dict = None, page_size: int = 100):
+        offset = None
+        while True:
+            points, offset = await asyncio.to_thread(self.store.scroll, filters, page_size, offset)
+            for point in points:
+                yield point
+            if offset is None:
+                return
+
+    async def delete_by_filter(self, filters: dict):
+        await asyncio.to_thread(self.store.delete_by_filter, filters)
+
+    async def reset(self):
+        await asyncio.to_thread(self.store.reset)
+
+    async def checkpoint(self):
+        await asyncio.to_thread(self.store.checkpoint)
+
+    async def close(self):
+        await asyncio.to_thread(self.store.close)
@@ -0,0 +1,769 @@
+"""
+Vector store on Postgres with the pgvector extension, for deployments that would rather keep memories in an
+existing database than run Qdrant.
+
+A collection is a table with the vector, the payload as JSONB, and the session-scoping keys (`user_id`,
+`agent_id`, `run_id` and `memory_type`) as columns generated from the payload, so they can never disagree with
+it. The vectors have an HNSW index; the session columns have composite btree indexes that let the planner
+answer selective filters (one user, one run) with an index scan plus an exact sort instead of walking the graph.
+
+Every call takes a connection from a pool and is a single statement, hence a single round trip, whatever the
+number of points: small inserts, deletes and payload updates pass their rows as arrays and `unnest` them. Inserts
+of `copy_min_rows` points or more stream through `COPY` into a temporary staging table and are upserted from
+there, which is several times faster than any INSERT for bulk loads.
+"""
+
+import asyncio
+import json
+import logging
+from typing import Any, List, Optional, Tuple
+
+try:
+    import psycopg
+    from psycopg import sql
+    from psycopg_pool import AsyncConnectionPool, ConnectionPool
+except ImportError:
+    raise ImportError(
+        "The 'psycopg' library is required. Please install it using 'pip install \"psycopg[binary,pool]\"'."
+    )
+
+from jmemory.vector_stores.base import Point
+
+logger = logging.getLogger(__name__)
+
+# Payload keys mirrored into generated columns with btree indexes: the session scope and the memory layer.
+SESSION_COLUMNS = ["user_id", "agent_id", "run_id", "memory_type"]
+# Composite btree indexes on the session columns, named by suffix. Each serves the filters on its leading columns.
+SESSION_INDEXES = {
+    "session_idx": ["user_id", "agent_id", "run_id"],
+    "agent_idx": ["agent_id", "run_id"],
+    "run_idx": ["run_id"],
+    "layer_idx": ["user_id", "memory_type"],
+}
+# Distance operator and HNSW operator class per distance strategy.
+DISTANCES = {
+    "cosine": ("<=>", "vector_cosine_ops"),
+    "euclidean": ("<->", "vector_l2_ops"),
+    "inner_product": ("<#>", "vector_ip_ops"),
+}
+STAGING_TABLE = "jmemory_staging"
+
+
+def _vector_literal(vector: list) -> str:
+    """pgvector's text form of a vector, which Postgres casts with `::vector`."""
+    return "[" + ",".join(str(float(value)) for value in vector) + "]"
+
+
+def _column_text(value: Any) -> str:
+    """The text `payload ->> key` yields for a JSON value, to compare with a generated column."""
+    return value if isinstance(value, str) else json.dumps(value)
+
+
+def _create_filter(filters: dict) -> Tuple[sql.Composable, list]:
+    """
+    Create a WHERE condition from the provided filters.
+
+    Values are matched exactly, except for dicts: `{"gte": a, "lte": b}` is a range, `{"in": [...]}` matches any
+    of the values and `{"nin": [...]}` excludes them (rows without the key are kept), as in
+    `jmemory.vector_stores.qdrant._create_filter`. Session keys are compared on their indexed columns, other keys
+    on the JSONB payload.
+
+    Args:
+        filters (dict): Filters to apply.
+
+    Returns:
+        tuple: The condition and its parameters.
+    """
+    clauses, params = [], []
+    for key, value in (filters or {}).items():
+        ranged = isinstance(value, dict) and "gte" in value and "lte" in value
+        if key in SESSION_COLUMNS and not ranged:
+            column = sql.Identifier(key)
+            if isinstance(value, dict) and "in" in value:
+                clauses.append(sql.SQL("{} = ANY(%s)").format(column))
+                params.append([_column_text(item) for item in value["in"]])
+            elif isinstance(value, dict) and "nin" in value:
+                clauses.append(sql.SQL("({0} IS NULL OR {0} <> ALL(%s))").format(column))
+                params.append([_column_text(item) for item in value["nin"]])
+            else:
+                clauses.append(sql.SQL("{} = %s").format(column))
+                params.append(_column_text(value))
+            continue
+        field = sql.SQL("(payload -> {})").format(sql.Literal(key))
+        if ranged:
+            clauses.append(sql.SQL("{0} >= %s::jsonb AND {0} <= %s::jsonb").format(field))
+            params.extend([json.dumps(value["gte"]), json.dumps(value["lte"])])
+        elif isinstance(value, dict) and "in" in value:
+            clauses.append(sql.SQL("{} = ANY(%s::jsonb[])").format(field))
+            params.append([json.dumps(item) for item in value["in"]])
+        elif isinstance(value, dict) and "nin" in value:
+            clauses.append(sql.SQL("({0} IS NULL OR {0} <> ALL(%s::jsonb[]))").format(field))
+            params.append([json.dumps(item) for item in value["nin"]])
+        else:
+            clauses.append(sql.SQL("{} = %s::jsonb").format(field))
+            params.append(json.dumps(value))
+    if not clauses:
+        return sql.SQL("TRUE"), []
+    return sql.SQL(" AND ").join(clauses), params
+
+
+def _build_rows(vectors: list, payloads: list = None, ids: list = None) -> List[Tuple[str, str, str]]:
+    """(id, vector, payload) text rows; a repeated id keeps its last row, as consecutive upserts would."""
+    rows = {}
+    for idx, vector in enumerate(vectors):
+        point_id = str(idx if ids is None else ids[idx])
+        rows[point_id] = (point_id, _vector_literal(vector), json.dumps(payloads[idx] if payloads else {}))
+    return list(rows.values())
+
+
+def _columns(rows: List[tuple]) -> List[list]:
+    return [list(column) for column in zip(*rows)]
+
+
+class _Statements:
+    """The SQL of one collection, shared by `PGVector` and `AsyncPGVector`."""
+
+    def __init__(self, collection_name: str, dims: int, distance: str, hnsw_m: int, ef_construction: int):
+        if distance not in DISTANCES:
+            raise ValueError(f"Invalid distance_strategy {distance!r}, must be one of {list(DISTANCES)}")
+        table = sql.Identifier(collection_name)
+        self.table = table
+        self.distance = distance
+        operator, opclass = DISTANCES[distance]
+        self.operator = sql.SQL(operator)
+        generated = sql.SQL(", ").join(
+            sql.SQL("{} text GENERATED ALWAYS AS (payload ->> {}) STORED").format(sql.Identifier(key), sql.Literal(key))
+            for key in SESSION_COLUMNS
+        )
+        indexes = [
+            sql.SQL("CREATE INDEX IF NOT EXISTS {} ON {} ({})").format(
+                sql.Identifier(f"{collection_name}_{suffix}"),
+                table,
+                sql.SQL(", ").join(map(sql.Identifier, columns)),
+            )
+            for suffix, columns in SESSION_INDEXES.items()
+        ]
+        # One round trip: statements without parameters can be sent together.
+        self.create = sql.SQL("; ").join(
+            [
+                sql.SQL("CREATE EXTENSION IF NOT EXISTS vector"),
+                sql.SQL(
+                    "CREATE TABLE IF NOT EXISTS {} (id text PRIMARY KEY, vector vector({}) NOT NULL, "
+                    "payload jsonb NOT NULL DEFAULT '{{}}', {})"
+                ).format(table, sql.Literal(dims), generated),
+                sql.SQL(
+                    "CREATE INDEX IF NOT EXISTS {} ON {} USING hnsw (vector {}) WITH (m = {}, ef_construction = {})"
+                ).format(
+                    sql.Identifier(f"{collection_name}_hnsw"),
+                    table,
+                    sql.SQL(opclass),
+                    sql.Literal(hnsw_m),
+                    sql.Literal(ef_construction),
+                ),
+                *indexes,
+            ]
+        )
+        self.drop = sql.SQL("DROP TABLE IF EXISTS {}").format(table)
+        upsert = sql.SQL(
+            "INSERT INTO {} (id, vector, payload) SELECT id, vector::vector, payload::jsonb FROM {} "
+            "ON CONFLICT (id) DO UPDATE SET vector = EXCLUDED.vector, payload = EXCLUDED.payload"
+        )
+        self.upsert_rows = upsert.format(
+            table, sql.SQL("unnest(%s::text[], %s::text[], %s::text[]) AS batch (id, vector, payload)")
+        )
+        staging = sql.Identifier(STAGING_TABLE)
+        self.create_staging = sql.SQL(
+            "CREATE TEMP TABLE IF NOT EXISTS {} (id text, vector text, payload text) ON COMMIT DELETE ROWS"
+        ).format(staging)
+        self.copy_staging = sql.SQL("COPY {} (id, vector, payload) FROM STDIN").format(staging)
+        # The staging table holds one batch, already free of repeated ids.
+        self.upsert_staging = upsert.format(table, staging)
+        self.set_vector = sql.SQL("UPDATE {} SET vector = %s::vector WHERE id = %s").format(table)
+        self.set_payload = sql.SQL("UPDATE {} SET payload = %s::jsonb WHERE id = %s").format(table)
+        self.merge_payloads = sql.SQL(
+            "UPDATE {0} SET payload = {0}.payload || changes.payload::jsonb "
+            "FROM unnest(%s::text[], %s::text[]) AS changes (id, payload) WHERE {0}.id = changes.id"
+        ).format(table)
+        self.delete_ids = sql.SQL("DELETE FROM {} WHERE id = ANY(%s)").format(table)
+        self.get = sql.SQL("SELECT id, payload FROM {} WHERE id = ANY(%s)").format(table)
+        self.get_with_vectors = sql.SQL("SELECT id, payload, vector::text FROM {} WHERE id = ANY(%s)").format(table)
+        self.info = sql.SQL("SELECT count(*), pg_total_relation_size(quote_ident({})::regclass) FROM {}").format(
+            sql.Literal(collection_name), table
+        )
+        self.list_cols = sql.SQL(
+            "SELECT table_name FROM information_schema.columns "
+            "WHERE table_schema = current_schema() AND column_name = 'vector' AND udt_name = 'vector'"
+        )
+
+    def search(self, vector: list, limit: int, filters: dict) -> Tuple[sql.Composable, list]:
+        where, params = _create_filter(filters)
+        query = sql.SQL(
+            "SELECT id, payload, vector {0} %s::vector FROM {1} WHERE {2} ORDER BY vector {0} %s::vector LIMIT %s"
+        )
+        literal = _vector_literal(vector)
+        return query.format(self.operator, self.table, where), [literal, *params, literal, limit]
+
+    def scroll(self, filters: dict, limit: int, offset: Optional[str]) -> Tuple[sql.Composable, list]:
+        where, params = _create_filter(filters)
+        if offset is not None:
+            where = sql.SQL("{} AND id > %s").format(where)
+            params.append(offset)
+        # One extra row tells whether there is a next page.
+        query = sql.SQL("SELECT id, payload FROM {} WHERE {} ORDER BY id LIMIT %s").format(self.table, where)
+        return query, [*params, limit + 1]
+
+    def delete_where(self, filters: dict) -> Tuple[sql.Composable, list]:
+        where, params = _create_filter(filters)
+        return sql.SQL("DELETE FROM {} WHERE {}").format(self.table, where), params
+
+    def score(self, distance: float) -> float:
+        """Qdrant-compatible score: cosine similarity, inner product, or euclidean distance."""
+        if self.distance == "cosine":
+            return 1.0 - distance
+        if self.distance == "inner_product":
+            # <#> is the negated inner product.
+            return -distance
+        return distance
+
+    def page(self, rows: list, limit: int) -> tuple:
+        points = [Point(id=row[0], payload=row[1]) for row in rows[:limit]]
+        return points, (points[-1].id if len(rows) > limit else None)
+
+
+def _point(row: tuple) -> Point:
+    vector = json.loads(row[2]) if len(row) > 2 else None
+    return Point(id=row[0], payload=row[1], vector=vector)
+
+
+def _conninfo(
+    connection_string: str = None,
+    dbname: str = None,
+    user: str = None,
+    password: str = None,
+    host: str = None,
+    port: int = None,
+) -> str:
+    if connection_string:
+        return connection_string
+    params = {"dbname": dbname, "user": user, "password": password, "host": host, "port": port}
+    return psycopg.conninfo.make_conninfo(**{key: value for key, value in params.items() if value is not None})
+
+
+class PGVector:
+    def __init__(
+        self,
+        collection_name: str,
+        embedding_model_dims: int,
+        dbname: str = "postgres",
+        user: str = None,
+        password: str = None,
+        host: str = None,
+        port: int = None,
+        connection_string: str = None,
+        pool: ConnectionPool = None,
+        min_connections: int = 1,
+        max_connections: int = 10,
+        distance_strategy: str = "cosine",
+        hnsw_m: int = 16,
+        ef_construction: int = 64,
+        ef_search: int = 100,
+        iterative_scan: Optional[str] = "relaxed_order",
+        copy_min_rows: int = 500,
+    ):
+        """
+        Initialize the pgvector store, creating the table and its indexes if they do not exist.
+
+        Args:
+            collection_name (str): Name of the table.
+            embedding_model_dims (int): Dimensions of the embedding model.
+            dbname (str, optional): Database name. Defaults to "postgres".
+            user (str, optional): Database user. Defaults to None.
+            password (str, optional): Database password. Defaults to None.
+            host (str, optional): Database host. Defaults to None.
+            port (int, optional): Database port. Defaults to None.
+            connection_string (str, optional): libpq connection string, used instead of the fields above.
+                Defaults to None.
+            pool (ConnectionPool, optional): Existing pool to share; it should be in autocommit mode. Defaults to None.
+            min_connections (int, optional): Connections the pool keeps open. Defaults to 1.
+            max_connections (int, optional): Upper bound on open connections. Defaults to 10.
+            distance_strategy (str, optional): "cosine", "inner_product" or "euclidean". Defaults to "cosine".
+            hnsw_m (int, optional): Neighbours per HNSW node. Defaults to 16.
+            ef_construction (int, optional): HNSW candidate list size while building. Defaults to 64.
+            ef_search (int, optional): HNSW candidate list size while searching, set on each pooled connection.
+                Defaults to 100.
+            iterative_scan (str, optional): `hnsw.iterative_scan` mode (pgvector 0.8+) that keeps scanning the
+                graph until filtered searches have `limit` rows, or None to leave it off. Defaults to "relaxed_order".
+            copy_min_rows (int, optional): Inserts of at least this many points go through COPY. Defaults to 500.
+        """
+        self.collection_name = collection_name
+        self.embedding_model_dims = embedding_model_dims
+        self.ef_search = ef_search
+        self.iterative_scan = iterative_scan
+        self.copy_min_rows = copy_min_rows
+        self.statements = _Statements(collection_name, embedding_model_dims, distance_strategy, hnsw_m, ef_construction)
+        self.pool = pool or ConnectionPool(
+            _conninfo(connection_string, dbname, user, password, host, port),
+            min_size=min_connections,
+            max_size=max_connections,
+            kwargs={"autocommit": True},
+            configure=self._configure,
+            open=True,
+        )
+        self.create_col()
+
+    def _configure(self, conn: psycopg.Connection):
+        conn.execute(sql.SQL("SET hnsw.ef_search = {}").format(sql.Literal(self.ef_search)))
+        if self.iterative_scan:
+            try:
+                conn.execute(sql.SQL("SET hnsw.iterative_scan = {}").format(sql.Literal(self.iterative_scan)))
+            except psycopg.Error as e:
+                logger.warning(f"hnsw.iterative_scan is not available, filtered searches may return fewer rows: {e}")
+
+    def create_col(self):
+        """
+        Create the table, its HNSW index and the session indexes, unless they exist.
+        """
+        with self.pool.connection() as conn:
+            conn.execute(self.statements.create)
+
+    def insert(self, vectors: list, payloads: list = None, ids: list = None):
+        """
+        Insert vectors into the table. Existing ids are overwritten.
+
+        Args:
+            vectors (list): List of vectors to insert.
+            payloads (list, optional): List of payloads corresponding to vectors. Defaults to None.
+            ids (list, optional): List of IDs corresponding to vectors. Defaults to None.
+        """
+        logger.info(f"Inserting {len(vectors)} vectors into collection {self.collection_name}")
+        rows = _build_rows(vectors, payloads, ids)
+        if not rows:
+            return
+        with self.pool.connection() as conn:
+            if len(rows) < self.copy_min_rows:
+                conn.execute(self.statements.upsert_rows, _columns(rows))
+                return
+            with conn.transaction(), conn.cursor() as cur:
+                cur.execute(self.statements.create_staging)
+                with cur.copy(self.statements.copy_staging) as copy:
+                    for row in rows:
+                        copy.write_row(row)
+                cur.execute(self.statements.upsert_staging)
+
+    def search(self, query: str, vectors: list, limit: int = 5, filters: dict = None) -> list:
+        """
+        Search for similar vectors.
+
+        Args:
+            query (str): Query.
+            vectors (list): Query vector.
+            limit (int, optional): Number of results to return. Defaults to 5.
+            filters (dict, optional): Filters to apply to the search. Defaults to None.
+
+        Returns:
+            list: Search results, best first.
+        """
+        statement, params = self.statements.search(vectors, limit, filters)
+        with self.pool.connection() as conn:
+            if limit <= self.ef_search:
+                rows = conn.execute(statement, params).fetchall()
+            else:
+                # The HNSW scan returns at most ef_search rows; widen it for this query only.
+                with conn.transaction():
+                    conn.execute(sql.SQL("SET LOCAL hnsw.ef_search = {}").format(sql.Literal(limit)))
+                    rows = conn.execute(statement, params).fetchall()
+        return [Point(id=row[0], payload=row[1], score=self.statements.score(row[2])) for row in rows]
+
+    def delete(self, vector_id: str):
+        """
+        Delete a vector by ID.
+
+        Args:
+            vector_id (str): ID of the vector to delete.
+        """
+        self.delete_many([vector_id])
+
+    def update(self, vector_id: str, vector: list = None, payload: dict = None):
+        """
+        Update a vector and its payload. Either left as None keeps its current value.
+
+        Args:
+            vector_id (str): ID of the vector to update.
+            vector (list, optional): Updated vector. Defaults to None.
+            payload (dict, optional): Updated payload. Defaults to None.
+        """
+        with self.pool.connection() as conn:
+            if vector is not None and payload is not None:
+                conn.execute(self.statements.upsert_rows, _columns(_build_rows([vector], [payload], [vector_id])))
+            elif vector is not None:
+                conn.execute(self.statements.set_vector, [_vector_literal(vector), str(vector_id)])
+            elif payload is not None:
+                conn.execute(self.statements.set_payload, [json.dumps(payload), str(vector_id)])
+
+    def get(self, vector_id: str) -> Optional[Point]:
+        """
+        Retrieve a vector by ID.
+
+        Args:
+            vector_id (str): ID of the vector to retrieve.
+
+        Returns:
+            Point: Retrieved point, or None.
+        """
+        points = self.get_many([vector_id])
+        return points[0] if points else None
+
+    def get_many(self, vector_ids: list, with_vectors: bool = False) -> list:
+        """
+        Retrieve several vectors in one query.
+
+        Args:
+            vector_ids (list): IDs of the vectors to retrieve.
+            with_vectors (bool, optional): Include the vectors, not only the payloads. Defaults to False.
+
+        Returns:
+            list: Retrieved points; missing IDs are skipped.
+        """
+        if not vector_ids:
+            return []
+        statement = self.statements.get_with_vectors if with_vectors else self.statements.get
+        with self.pool.connection() as conn:
+            rows = conn.execute(statement, [[str(vector_id) for vector_id in vector_ids]]).fetchall()
+        return [_point(row) for row in rows]
+
+    def delete_many(self, vector_ids: list):
+        """
+        Delete several vectors in one statement.
+
+        Args:
+            vector_ids (list): IDs of the vectors to delete.
+        """
+        if not vector_ids:
+            return
+        with self.pool.connection() as conn:
+            conn.execute(self.statements.delete_ids, [[str(vector_id) for vector_id in vector_ids]])
+
+    def set_payloads(self, payloads: dict):
+        """
+        Merge new payload values into several rows in one statement, leaving their other keys and vectors as they are.
+
+        Args:
+            payloads (dict): Payload keys to set, by point ID.
+        """
+        if not payloads:
+            return
+        ids = [str(point_id) for point_id in payloads]
+        values = [json.dumps(payload) for payload in payloads.values()]
+        with self.pool.connection() as conn:
+            conn.execute(self.statements.merge_payloads, [ids, values])
+
+    def list_cols(self) -> list:
+        """
+        List the tables that hold vectors.
+
+        Returns:
+            list: List of table names.
+        """
+        with self.pool.connection() as conn:
+            return [row[0] for row in conn.execute(self.statements.list_cols).fetchall()]
+
+    def delete_col(self):
+        """
+        Drop the table.
+        """
+        with self.pool.connection() as conn:
+            conn.execute(self.statements.drop)
+
+    def col_info(self) -> dict:
+        """
+        Get information about the table.
+
+        Returns:
+            dict: Table name, number of points and size in bytes, indexes included.
+        """
+        with self.pool.connection() as conn:
+            count, size = conn.execute(self.statements.info).fetchone()
+        return {"name": self.collection_name, "points": count, "size_bytes": size}
+
+    def list(self, filters: dict = None, limit: int = 100) -> tuple:
+        """
+        List vectors in the table.
+
+        Args:
+            filters (dict, optional): Filters to apply to the list. Defaults to None.
+            limit (int, optional): Number of vectors to return. Defaults to 100.
+
+        Returns:
+            tuple: List of points and the offset of the next page, like a Qdrant scroll.
+        """
+        return self.scroll(filters=filters, limit=limit)
+
+    def scroll(self, filters: dict = None, limit: int = 100, offset: str = None) -> tuple:
+        """
+        Read one page of points in id order.
+
+        Args:
+            filters (dict, optional): Filters to apply. Defaults to None.
+            limit (int, optional): Number of points to return. Defaults to 100.
+            offset (str, optional): Where to continue, as returned by the previous page. Defaults to None.
+
+        Returns:
+            tuple: The points, and the offset of the next page or None after the last one.
+        """
+        statement, params = self.statements.scroll(filters, limit, offset)
+        with self.pool.connection() as conn:
+            rows = conn.execute(statement, params).fetchall()
+        return self.statements.page(rows, limit)
+
+    def iter_all(self, filters: dict = None, page_size: int = 100):
+        """
+        Iterate over every vector in the table, page by page.
+
+        Args:
+            filters (dict, optional): Filters to apply. Defaults to None.
+            page_size (int, optional): Number of points fetched per query. Defaults to 100.
+
+        Yields:
+            Point: Points with their payloads, without vectors.
+        """
+        offset = None
+        while True:
+            points, offset = self.scroll(filters=filters, limit=page_size, offset=offset)
+            yield from points
+            if offset is None:
+                return
+
+    def delete_by_filter(self, filters: dict):
+        """
+        Delete every vector matching the filters in a single statement.
+
+        Args:
+            filters (dict): Filters selecting the vectors to delete. Must not be empty.
+        """
+        if not filters:
+            raise ValueError("Refusing to delete by an empty filter, use reset() to clear the collection.")
+        statement, params = self.statements.delete_where(filters)
+        with self.pool.connection() as conn:
+            conn.execute(statement, params)
+
+    def reset(self):
+        """
+        Reset the table by dropping and recreating it.
+        """
+        logger.warning(f"Resetting index {self.collection_name}...")
+        self.delete_col()
+        self.create_col()
+
+    def close(self):
+        """Close the connection pool."""
+        self.pool.close()
+
+
+class AsyncPGVector:
+    def __init__(
+        self,
+        collection_name: str,
+        embedding_model_dims: int,
+        dbname: str = "postgres",
+        user: str = None,
+        password: str = None,
+        host: str = None,
+        port: int = None,
+        connection_string: str = None,
+        pool: AsyncConnectionPool = None,
+        min_connections: int = 1,
+        max_connections: int = 10,
+        distance_strategy: str = "cosine",
+        hnsw_m: int = 16,
+        ef_construction: int = 64,
+        ef_search: int = 100,
+        iterative_scan: Optional[str] = "relaxed_order",
+        copy_min_rows: int = 500,
+    ):
+        """
+        Initialize the asyncio pgvector store. Mirrors `PGVector`, but every operation is a coroutine backed by
+        an `AsyncConnectionPool`. The pool is opened, and the table created, lazily on first use.
+
+        Takes the same arguments as `PGVector`; `pool` is an `AsyncConnectionPool`.
+        """
+        self.collection_name = collection_name
+        self.embedding_model_dims = embedding_model_dims
+        self.ef_search = ef_search
+        self.iterative_scan = iterative_scan
+        self.copy_min_rows = copy_min_rows
+        self.statements = _Statements(collection_name, embedding_model_dims, distance_strategy, hnsw_m, ef_construction)
+        self.pool = pool or AsyncConnectionPool(
+            _conninfo(connection_string, dbname, user, password, host, port),
+            min_size=min_connections,
+            max_size=max_connections,
+            kwargs={"autocommit": True},
+            configure=self._configure,
+            open=False,
+        )
+        self._col_ready = False
+        self._col_lock = None
+
+    async def _configure(self, conn: psycopg.AsyncConnection):
+        await conn.execute(sql.SQL("SET hnsw.ef_search = {}").format(sql.Literal(self.ef_search)))
+        if self.iterative_scan:
+            try:
+                await conn.execute(sql.SQL("SET hnsw.iterative_scan = {}").format(sql.Literal(self.iterative_scan)))
+            except psycopg.Error as e:
+                logger.warning(f"hnsw.iterative_scan is not available, filtered searches may return fewer rows: {e}")
+
+    async def _ensure_col(self):
+        if self._col_ready:
+            return
+        if self._col_lock is None:
+            self._col_lock = asyncio.Lock()
+        async with self._col_lock:
+            if not self._col_ready:
+                # A no-op for a pool that is already open, e.g. one shared with another store.
+                await self.pool.open()
+                await self.create_col()
+                self._col_ready = True
+
+    async def create_col(self):
+        """Create the table, its HNSW index and the session indexes, unless they exist."""
+        async with self.pool.connection() as conn:
+            await conn.execute(self.statements.create)
+
+    async def insert(self, vectors: list, payloads: list = None, ids: list = None):
+        """Insert vectors into the table. Existing ids are overwritten. See `PGVector.insert`."""
+        await self._ensure_col()
+        logger.info(f"Inserting {len(vectors)} vectors into collection {self.collection_name}")
+        rows = _build_rows(vectors, payloads, ids)
+        if not rows:
+            return
+        async with self.pool.connection() as conn:
+            if len(rows) < self.copy_min_rows:
+                await conn.execute(self.statements.upsert_rows, _columns(rows))
+                return
+            async with conn.transaction(), conn.cursor() as cur:
+                await cur.execute(self.statements.create_staging)
+                async with cur.copy(self.statements.copy_staging) as copy:
+                    for row in rows:
+                        await copy.write_row(row)
+                await cur.execute(self.statements.upsert_staging)
+
+    async def search(self, query: str, vectors: list, limit: int = 5, filters: dict = None) -> list:
+        """Search for similar vectors. See `PGVector.search`."""
+        await self._ensure_col()
+        statement, params = self.statements.search(vectors, limit, filters)
+        async with self.pool.connection() as conn:
+            if limit <= self.ef_search:
+                rows = await (await conn.execute(statement, params)).fetchall()
+            else:
+                async with conn.transaction():
+                    await conn.execute(sql.SQL("SET LOCAL hnsw.ef_search = {}").format(sql.Literal(limit)))
+                    rows = await (await conn.execute(statement, params)).fetchall()
+        return [Point(id=row[0], payload=row[1], score=self.statements.score(row[2])) for row in rows]
+
+    async def delete(self, vector_id: str):
+        """Delete a vector by ID."""
+        await self.delete_many([vector_id])
+
+    async def update(self, vector_id: str, vector: list = None, payload: dict = None):
+        """Update a vector and its payload. Either left as None keeps its current value."""
+        await self._ensure_col()
+        async with self.pool.connection() as conn:
+            if vector is not None and payload is not None:
+                await conn.execute(self.statements.upsert_rows, _columns(_build_rows([vector], [payload], [vector_id])))
+            elif vector is not None:
+                await conn.execute(self.statements.set_vector, [_vector_literal(vector), str(vector_id)])
+            elif payload is not None:
+                await conn.execute(self.statements.set_payload, [json.dumps(payload), str(vector_id)])
+
+    async def get(self, vector_id: str) -> Optional[Point]:
+        """Retrieve a vector by ID, or None."""
+        points = await self.get_many([vector_id])
+        return points[0] if points else None
+
+    async def get_many(self, vector_ids: list, with_vectors: bool = False) -> list:
+        """Retrieve several vectors in one query; missing IDs are skipped."""
+        if not vector_ids:
+            return []
+        await self._ensure_col()
+        statement = self.statements.get_with_vectors if with_vectors else self.statements.get
+        async with self.pool.connection() as conn:
+            cursor = await conn.execute(statement, [[str(vector_id) for vector_id in vector_ids]])
+            rows = await cursor.fetchall()
+        return [_point(row) for row in rows]
+
+    async def delete_many(self, vector_ids: list):
+        """Delete several vectors in one statement."""
+        if not vector_ids:
+            return
+        await self._ensure_col()
+        async with self.pool.connection() as conn:
+            await conn.execute(self.statements.delete_ids, [[str(vector_id) for vector_id in vector_ids]])
+
+    async def set_payloads(self, payloads: dict):
+        """Merge new payload values into several rows in one statement."""
+        if not payloads:
+            return
+        await self._ensure_col()
+        ids = [str(point_id) for point_id in payloads]
+        values = [json.dumps(payload) for payload in payloads.values()]
+        async with self.pool.connection() as conn:
+            await conn.execute(self.statements.merge_payloads, [ids, values])
+
+    async def list_cols(self) -> list:
+        """List the tables that hold vectors."""
+        await self._ensure_col()
+        async with self.pool.connection() as conn:
+            return [row[0] for row in await (await conn.execute(self.statements.list_cols)).fetchall()]
+
+    async def delete_col(self):
+        """Drop the table."""
+        await self._ensure_col()
+        async with self.pool.connection() as conn:
+            await conn.execute(self.statements.drop)
+
+    async def col_info(self) -> dict:
+        """Get the table name, number of points and size in bytes."""
+        await self._ensure_col()
+        async with self.pool.connection() as conn:
+            count, size = await (await conn.execute(self.statements.info)).fetchone()
+        return {"name": self.collection_name, "points": count, "size_bytes": size}
+
+    async def list(self, filters: dict = None, limit: int = 100) -> tuple:
+        """List vectors in the table, with the offset of the next page."""
+        return await self.scroll(filters=filters, limit=limit)
+
+    async def scroll(self, filters: dict = None, limit: int = 100, offset: str = None) -> tuple:
+        """Read one page of points in id order. See `PGVector.scroll`."""
+        await self._ensure_col()
+        statement, params = self.statements.scroll(filters, limit, offset)
+        async with self.pool.connection() as conn:
+            rows = await (await conn.execute(statement, params)).fetchall()
+        return self.statements.page(rows, limit)
+
+    async def iter_all(self, filters: dict = None, page_size: int = 100):
+        """Iterate over every vector in the table, page by page."""
+        offset = None
+        while True:
+            points, offset = await self.scroll(filters=filters, limit=page_size, offset=offset)
+            for point in points:
+                yield point
+            if offset is None:
+                return
+
+    async def delete_by_filter(self, filters: dict):
+        """Delete every vector matching the filters in a single statement. `filters` must not be empty."""
+        if not filters:
+            raise ValueError("Refusing to delete by an empty filter, use reset() to clear the collection.")
+        await self._ensure_col()
+        statement, params = self.statements.delete_where(filters)
+        async with self.pool.connection() as conn:
+            await conn.execute(statement, params)
+
+    async def reset(self):
+        """Reset the table by dropping and recreating it."""
+        logger.warning(f"Resetting index {self.collection_name}...")
+        await self.delete_col()
+        await self.create_col()
+
+    async def close(self):
+        """Close the connection pool."""
+        await self.pool.close()
@@ -1,34 +1,135 @@
+import asyncio
 import logging
 import os
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 
-from qdrant_client import QdrantClient
+from qdrant_client import AsyncQdrantClient, QdrantClient
+from qdrant_client.local.async_qdrant_local import AsyncQdrantLocal
+from qdrant_client.local.qdrant_local import QdrantLocal
 from qdrant_client.models import (
     Distance,
     FieldCondition,
     Filter,
+    FilterSelector,
+    MatchAny,
     MatchValue,
+    PayloadSchemaType,
     PointIdsList,
     PointStruct,
     Range,
+    SetPayload,
+    SetPayloadOperation,
     VectorParams,
 )
 
 logger = logging.getLogger(__name__)
 
+# Session-scoping fields that every filtered search and scroll filters on.
+INDEXED_PAYLOAD_FIELDS = ["user_id", "agent_id", "run_id"]
+
+
+def _client_params(
+    host: str, port: int, path: str, url: str, api_key: str, on_disk: bool, prefer_grpc: bool = False
+) -> dict:
+    """Build the keyword arguments shared by `QdrantClient` and `AsyncQdrantClient`."""
+    params = {}
+    if api_key:
+        params["api_key"] = api_key
+    if url:
+        params["url"] = url
+    if host and port:
+        params["host"] = host
+        params["port"] = port
+    if params and prefer_grpc:
+        params["prefer_grpc"] = True
+    if not params:
+        params["path"] = path
+        if not on_disk:
+            if os.path.exists(path) and os.path.isdir(path):
+                shutil.rmtree(path)
+    return params
+
+
+def _create_filter(filters: dict) -> Filter:
+    """
+    Create a Filter object from the provided filters.
+
+    Values are matched exactly, except for dicts: `{"gte": a, "lte": b}` is a range, `{"in": [...]}` matches any
+    of the values and `{"nin": [...]}` excludes them (points without the key are kept).
+
+    Args:
+        filters (dict): Filters to apply.
+
+    Returns:
+        Filter: The created Filter object.
+    """
+    conditions = []
+    exclusions = []
+    for key, value in filters.items():
+        if isinstance(value, dict) and "gte" in value and "lte" in value:
+            conditions.append(FieldCondition(key=key, range=Range(gte=value["gte"], lte=value["lte"])))
+        elif isinstance(value, dict) and "in" in value:
+            conditions.append(FieldCondition(key=key, match=MatchAny(any=list(value["in"]))))
+        elif isinstance(value, dict) and "nin" in value:
+            exclusions.append(FieldCondition(key=key, match=MatchAny(any=list(value["nin"]))))
+        else:
+            conditions.append(FieldCondition(key=key, match=MatchValue(value=value)))
+    if not (conditions or exclusions):
+        return None
+    return Filter(must=conditions or None, must_not=exclusions or None)
+
+
+def _is_local_client(client) -> bool:
+    """Whether an existing client runs Qdrant embedded (`path=` or ":memory:") rather than against a server."""
+    return isinstance(getattr(client, "_client", None), (QdrantLocal, AsyncQdrantLocal))
+
+
+def _set_payload_operations(payloads: dict) -> list:
+    return [
+        SetPayloadOperation(set_payload=SetPayload(payload=payload, points=[point_id]))
+        for point_id, payload in payloads.items()
+    ]
+
+
+def _build_points(vectors: list, payloads: list = None, ids: list = None) -> list:
+    return [
+        PointStruct(
+            id=idx if ids is None else ids[idx],
+            vector=vector,
+            payload=payloads[idx] if payloads else {},
+        )
+        for idx, vector in enumerate(vectors)
+    ]
+
+
+def _chunks(items: list, size: int) -> list:
+    return [items[start : start + size] for start in range(0, len(items), size)]
+
+
+class _QdrantBase:
+    """
+    Connection state and request building shared by `Qdrant` and `AsyncQdrant`. Each `_..._request` method returns
+    the keyword arguments of one client call, so the two classes differ only in how they make the calls.
+    """
+
+    client_class = None
 
-class Qdrant:
     def __init__(
         self,
         collection_name: str,
         embedding_model_dims: int,
-        client: QdrantClient = None,
+        client=None,
         host: str = None,
         port: int = None,
         path: str = None,
         url: str = None,
         api_key: str = None,
         on_disk: bool = False,
+        prefer_grpc: bool = False,
+        batch_size: int = 256,
+        parallel: int = 4,
+        wait: bool = True,
     ):
         """
         Initialize the Qdrant vector store.
@@ -36,37 +137,134 @@ class Qdrant:
         Args:
             collection_name (str): Name of the collection.
             embedding_model_dims (int): Dimensions of the embedding model.
-            client (QdrantClient, optional): Existing Qdrant client instance. Defaults to None.
+            client (QdrantClient or AsyncQdrantClient, optional): Existing Qdrant client instance. Defaults to None.
             host (str, optional): Host address for Qdrant server. Defaults to None.
             port (int, optional): Port for Qdrant server. Defaults to None.
             path (str, optional): Path for local Qdrant database. Defaults to None.
             url (str, optional): Full URL for Qdrant server. Defaults to None.
             api_key (str, optional): API key for Qdrant server. Defaults to None.
             on_disk (bool, optional): Enables persistent storage. Defaults to False.
+            prefer_grpc (bool, optional): Use the gRPC transport for a remote server. Defaults to False.
+            batch_size (int, optional): Number of points sent per upsert request. Defaults to 256.
+            parallel (int, optional): Number of upsert requests in flight at once. Defaults to 4.
+            wait (bool, optional): Wait for upserts to be applied before returning. Defaults to True.
         """
         if client:
             self.client = client
+            self.is_local = _is_local_client(client)
         else:
-            params = {}
-            if api_key:
-                params["api_key"] = api_key
-            if url:
-                params["url"] = url
-            if host and port:
-                params["host"] = host
-                params["port"] = port
-            if not params:
-                params["path"] = path
-                if not on_disk:
-                    if os.path.exists(path) and os.path.isdir(path):
-                        shutil.rmtree(path)
-
-            self.client = QdrantClient(**params)
+            params = _client_params(host, port, path, url, api_key, on_disk, prefer_grpc)
+            self.client = self.client_class(**params)
+            self.is_local = "path" in params
 
         self.collection_name = collection_name
         self.embedding_model_dims = embedding_model_dims
         self.on_disk = on_disk
-        self.create_col(embedding_model_dims, on_disk)
+        self.batch_size = batch_size
+        # The embedded local mode is single-process and gains nothing from concurrent requests.
+        self.parallel = 1 if self.is_local else max(1, parallel)
+        self.wait = wait
+
+    def _create_filter(self, filters: dict) -> Filter:
+        """
+        Create a Filter object from the provided filters.
+
+        Args:
+            filters (dict): Filters to apply.
+
+        Returns:
+            Filter: The created Filter object.
+        """
+        return _create_filter(filters)
+
+    def _exists(self, collections) -> bool:
+        exists = any(collection.name == self.collection_name for collection in collections.collections)
+        if exists:
+            logging.debug(f"Collection {self.collection_name} already exists. Skipping creation.")
+        return exists
+
+    def _create_col_request(self, vector_size: int, on_disk: bool, distance: Distance) -> dict:
+        return {
+            "collection_name": self.collection_name,
+            "vectors_config": VectorParams(size=vector_size, distance=distance, on_disk=on_disk),
+        }
+
+    def _payload_index_requests(self, schema: dict = None) -> list:
+        """Requests for the session field indexes missing from `schema`; none in the embedded local mode."""
+        if self.is_local:
+            return []
+        return [
+            {"collection_name": self.collection_name, "field_name": field, "field_schema": PayloadSchemaType.KEYWORD}
+            for field in INDEXED_PAYLOAD_FIELDS
+            if field not in (schema or {})
+        ]
+
+    def _upsert_requests(self, vectors: list, payloads: list = None, ids: list = None) -> list:
+        logger.info(f"Inserting {len(vectors)} vectors into collection {self.collection_name}")
+        return [
+            {"collection_name": self.collection_name, "points": points, "wait": self.wait}
+            for points in _chunks(_build_points(vectors, payloads, ids), self.batch_size)
+        ]
+
+    def _search_request(self, vectors: list, limit: int, filters: dict = None) -> dict:
+        return {
+            "collection_name": self.collection_name,
+            "query": vectors,
+            "query_filter": self._create_filter(filters) if filters else None,
+            "limit": limit,
+        }
+
+    def _delete_request(self, vector_ids: list) -> dict:
+        return {"collection_name": self.collection_name, "points_selector": PointIdsList(points=list(vector_ids))}
+
+    def _update_request(self, vector_id, vector: list = None, payload: dict = None) -> dict:
+        return {
+            "collection_name": self.collection_name,
+            "points": [PointStruct(id=vector_id, vector=vector, payload=payload)],
+        }
+
+    def _retrieve_request(self, vector_ids: list, with_vectors: bool = False) -> dict:
+        request = {"collection_name": self.collection_name, "ids": list(vector_ids), "with_payload": True}
+        if with_vectors:
+            request["with_vectors"] = True
+        return request
+
+    def _set_payloads_request(self, payloads: dict) -> dict:
+        return {
+            "collection_name": self.collection_name,
+            "update_operations": _set_payload_operations(payloads),
+            "wait": self.wait,
+        }
+
+    def _scroll_request(self, filters: dict = None, limit: int = 100, offset=None) -> dict:
+        return {
+            "collection_name": self.collection_name,
+            "scroll_filter": self._create_filter(filters) if filters else None,
+            "limit": limit,
+            "offset": offset,
+            "with_payload": True,
+            "with_vectors": False,
+        }
+
+    def _delete_by_filter_request(self, filters: dict) -> dict:
+        if not filters:
+            raise ValueError("Refusing to delete by an empty filter, use reset() to clear the collection.")
+        return {
+            "collection_name": self.collection_name,
+            "points_selector": FilterSelector(filter=self._create_filter(filters)),
+        }
+
+
+class Qdrant(_QdrantBase):
+    client_class = QdrantClient
+
+    def __init__(self, collection_name: str, embedding_model_dims: int, **kwargs):
+        """
+        Initialize the Qdrant vector store and create the collection unless it exists. Takes the arguments of
+        `_QdrantBase`; `client` is a `QdrantClient`.
+        """
+        super().__init__(collection_name, embedding_model_dims, **kwargs)
+        self.create_col(embedding_model_dims, self.on_disk)
 
     def create_col(self, vector_size: int, on_disk: bool, distance: Distance = Distance.COSINE):
         """
@@ -77,17 +275,24 @@ class Qdrant:
             on_disk (bool): Enables persistent storage.
             distance (Distance, optional): Distance metric for vector similarity. Defaults to Distance.COSINE.
         """
-        # Skip creating collection if already exists
-        response = self.list_cols()
-        for collection in response.collections:
-            if collection.name == self.collection_name:
-                logging.debug(f"Collection {self.collection_name} already exists. Skipping creation.")
-                return
+        exists = self._exists(self.list_cols())
+        if not exists:
+            self.client.create_collection(**self._create_col_request(vector_size, on_disk, distance))
+        self.create_payload_indexes(existing=exists)
 
-        self.client.create_collection(
-            collection_name=self.collection_name,
-            vectors_config=VectorParams(size=vector_size, distance=distance, on_disk=on_disk),
-        )
+    def create_payload_indexes(self, existing: bool = False):
+        """
+        Create keyword payload indexes on the session-scoping fields so filtered search stays fast as the
+        number of users grows. Indexes are a no-op in the embedded local mode and are skipped there.
+
+        Args:
+            existing (bool, optional): Only create the indexes missing from an existing collection. Defaults to False.
+        """
+        schema = None
+        if existing and not self.is_local:
+            schema = self.client.get_collection(collection_name=self.collection_name).payload_schema
+        for request in self._payload_index_requests(schema):
+            self.client.create_payload_index(**request)
 
     def insert(self, vectors: list, payloads: list = None, ids: list = None):
         """
@@ -98,34 +303,18 @@ class Qdrant:
             payloads (list, optional): List of payloads corresponding to vectors. Defaults to None.
             ids (list, optional): List of IDs corresponding to vectors. Defaults to None.
         """
-        logger.info(f"Inserting {len(vectors)} vectors into collection {self.collection_name}")
-        points = [
-            PointStruct(
-                id=idx if ids is None else ids[idx],
-                vector=vector,
-                payload=payloads[idx] if payloads else {},
-            )
-            for idx, vector in enumerate(vectors)
-        ]
-        self.client.upsert(collection_name=self.collection_name, points=points)
-
-    def _create_filter(self, filters: dict) -> Filter:
-        """
-        Create a Filter object from the provided filters.
+        requests = self._upsert_requests(vectors, payloads, ids)
 
-        Args:
-            filters (dict): Filters to apply.
+        def upsert(request):
+            self.client.upsert(**request)
 
-        Returns:
-            Filter: The created Filter object.
-        """
-        conditions = []
-        for key, value in filters.items():
-            if isinstance(value, dict) and "gte" in value and "lte" in value:
-                conditions.append(FieldCondition(key=key, range=Range(gte=value["gte"], lte=value["lte"])))
-            else:
-                conditions.append(FieldCondition(key=key, match=MatchValue(value=value)))
-        return Filter(must=conditions) if conditions else None
+        if self.parallel == 1 or len(requests) == 1:
+            for request in requests:
+                upsert(request)
+            return
+        with ThreadPoolExecutor(max_workers=min(self.parallel, len(requests))) as executor:
+            # Consume the iterator so the first failing batch raises here.
+            list(executor.map(upsert, requests))
 
     def search(self, query: str, vectors: list, limit: int = 5, filters: dict = None) -> list:
         """
@@ -140,14 +329,7 @@ class Qdrant:
         Returns:
             list: Search results.
         """
-        query_filter = self._create_filter(filters) if filters else None
-        hits = self.client.query_points(
-            collection_name=self.collection_name,
-            query=vectors,
-            query_filter=query_filter,
-            limit=limit,
-        )
-        return hits.points
+        return self.client.query_points(**self._search_request(vectors, limit, filters)).points
 
     def delete(self, vector_id: int):
         """
@@ -156,12 +338,7 @@ class Qdrant:
         Args:
             vector_id (int): ID of the vector to delete.
         """
-        self.client.delete(
-            collection_name=self.collection_name,
-            points_selector=PointIdsList(
-                points=[vector_id],
-            ),
-        )
+        self.client.delete(**self._delete_request([vector_id]))
 
     def update(self, vector_id: int, vector: list = None, payload: dict = None):
         """
@@ -172,8 +349,7 @@ class Qdrant:
             vector (list, optional): Updated vector. Defaults to None.
             payload (dict, optional): Updated payload. Defaults to None.
         """
-        point = PointStruct(id=vector_id, vector=vector, payload=payload)
-        self.client.upsert(collection_name=self.collection_name, points=[point])
+        self.client.upsert(**self._update_request(vector_id, vector, payload))
 
     def get(self, vector_id: int) -> dict:
         """
@@ -185,9 +361,44 @@ class Qdrant:
         Returns:
             dict: Retrieved vector.
         """
-        result = self.client.retrieve(collection_name=self.collection_name, ids=[vector_id], with_payload=True)
+        result = self.client.retrieve(**self._retrieve_request([vector_id]))
         return result[0] if result else None
 
+    def get_many(self, vector_ids: list, with_vectors: bool = False) -> list:
+        """
+        Retrieve several vectors in one request.
+
+        Args:
+            vector_ids (list): IDs of the vectors to retrieve.
+            with_vectors (bool, optional): Include the vectors, not only the payloads. Defaults to False.
+
+        Returns:
+            list: Retrieved vectors; missing IDs are skipped.
+        """
+        if not vector_ids:
+            return []
+        return self.client.retrieve(**self._retrieve_request(vector_ids, with_vectors))
+
+    def delete_many(self, vector_ids: list):
+        """
+        Delete several vectors in one request.
+
+        Args:
+            vector_ids (list): IDs of the vectors to delete.
+        """
+        if vector_ids:
+            self.client.delete(**self._delete_request(vector_ids))
+
+    def set_payloads(self, payloads: dict):
+        """
+        Merge new payload values into several points in one request, leaving their other keys and vectors as they are.
+
+        Args:
+            payloads (dict): Payload keys to set, by point ID.
+        """
+        if payloads:
+            self.client.batch_update_points(**self._set_payloads_request(payloads))
+
     def list_cols(self) -> list:
         """
         List all collections.
@@ -223,19 +434,166 @@ class Qdrant:
         Returns:
             list: List of vectors.
         """
-        query_filter = self._create_filter(filters) if filters else None
-        result = self.client.scroll(
-            collection_name=self.collection_name,
-            scroll_filter=query_filter,
-            limit=limit,
-            with_payload=True,
-            with_vectors=False,
-        )
-        return result
+        return self.client.scroll(**self._scroll_request(filters, limit))
+
+    def iter_all(self, filters: dict = None, page_size: int = 100):
+        """
+        Iterate over every vector in a collection, following scroll offsets page by page.
+
+        Args:
+            filters (dict, optional): Filters to apply. Defaults to None.
+            page_size (int, optional): Number of points fetched per request. Defaults to 100.
+
+        Yields:
+            Record: Points with their payloads, without vectors.
+        """
+        offset = None
+        while True:
+            points, offset = self.client.scroll(**self._scroll_request(filters, page_size, offset))
+            yield from points
+            if offset is None:
+                return
+
+    def delete_by_filter(self, filters: dict):
+        """
+        Delete every vector matching the filters in a single request.
+
+        Args:
+            filters (dict): Filters selecting the vectors to delete. Must not be empty.
+        """
+        self.client.delete(**self._delete_by_filter_request(filters))
 
     def reset(self):
         """
-        Reset the index by deleting and recreating it."""
+        Reset the index by deleting and recreating it.
+        """
         logger.warning(f"Resetting index {self.collection_name}...")
         self.delete_col()
         self.create_col(self.embedding_model_dims, self.on_disk)
+
+
+class AsyncQdrant(_QdrantBase):
+    client_class = AsyncQdrantClient
+
+    def __init__(self, collection_name: str, embedding_model_dims: int, **kwargs):
+        """
+        Initialize the asyncio Qdrant vector store. Mirrors `Qdrant`, but every operation is a coroutine
+        backed by `AsyncQdrantClient`. The collection is created lazily on first use.
+        """
+        super().__init__(collection_name, embedding_model_dims, **kwargs)
+        self._col_ready = False
+
+    async def _ensure_col(self):
+        if not self._col_ready:
+            await self.create_col(self.embedding_model_dims, self.on_disk)
+            self._col_ready = True
+
+    async def create_col(self, vector_size: int, on_disk: bool, distance: Distance = Distance.COSINE):
+        """Create a new collection. See `Qdrant.create_col`."""
+        exists = self._exists(await self.list_cols())
+        if not exists:
+            await self.client.create_collection(**self._create_col_request(vector_size, on_disk, distance))
+        await self.create_payload_indexes(existing=exists)
+
+    async def create_payload_indexes(self, existing: bool = False):
+        """Create keyword payload indexes on the session-scoping fields. See `Qdrant.create_payload_indexes`."""
+        schema = None
+        if existing and not self.is_local:
+            schema = (await self.client.get_collection(collection_name=self.collection_name)).payload_schema
+        await asyncio.gather(
+            *(self.client.create_payload_index(**request) for request in self._payload_index_requests(schema))
+        )
+
+    async def insert(self, vectors: list, payloads: list = None, ids: list = None):
+        """Insert vectors into a collection, at most `parallel` upsert requests at a time."""
+        await self._ensure_col()
+        semaphore = asyncio.Semaphore(self.parallel)
+
+        async def upsert(request):
+            async with semaphore:
+                await self.client.upsert(**request)
+
+        await asyncio.gather(*(upsert(request) for request in self._upsert_requests(vectors, payloads, ids)))
+
+    async def search(self, query: str, vectors: list, limit: int = 5, filters: dict = None) -> list:
+        """Search for similar vectors. See `Qdrant.search`."""
+        await self._ensure_col()
+        return (await self.client.query_points(**self._search_request(vectors, limit, filters))).points
+
+    async def delete(self, vector_id: int):
+        """Delete a vector by ID."""
+        await self._ensure_col()
+        await self.client.delete(**self._delete_request([vector_id]))
+
+    async def update(self, vector_id: int, vector: list = None, payload: dict = None):
+        """Update a vector and its payload."""
+        await self._ensure_col()
+        await self.client.upsert(**self._update_request(vector_id, vector, payload))
+
+    async def get(self, vector_id: int) -> dict:
+        """Retrieve a vector by ID, or None."""
+        await self._ensure_col()
+        result = await self.client.retrieve(**self._retrieve_request([vector_id]))
+        return result[0] if result else None
+
+    async def get_many(self, vector_ids: list, with_vectors: bool = False) -> list:
+        """Retrieve several vectors in one request; missing IDs are skipped."""
+        if not vector_ids:
+            return []
+        await self._ensure_col()
+        return await self.client.retrieve(**self._retrieve_request(vector_ids, with_vectors))
+
+    async def delete_many(self, vector_ids: list):
+        """Delete several vectors in one request."""
+        if not vector_ids:
+            return
+        await self._ensure_col()
+        await self.client.delete(**self._delete_request(vector_ids))
+
+    async def set_payloads(self, payloads: dict):
+        """Merge new payload values into several points in one request."""
+        if not payloads:
+            return
+        await self._ensure_col()
+        await self.client.batch_update_points(**self._set_payloads_request(payloads))
+
+    async def list_cols(self) -> list:
+        """List all collections."""
+        return await self.client.get_collections()
+
+    async def delete_col(self):
+        """Delete a collection."""
+        await self.client.delete_collection(collection_name=self.collection_name)
+        self._col_ready = False
+
+    async def col_info(self) -> dict:
+        """Get information about a collection."""
+        return await self.client.get_collection(collection_name=self.collection_name)
+
+    async def list(self, filters: dict = None, limit: int = 100) -> list:
+        """List all vectors in a collection."""
+        await self._ensure_col()
+        return await self.client.scroll(**self._scroll_request(filters, limit))
+
+    async def iter_all(self, filters: dict = None, page_size: int = 100):
+        """Iterate over every vector in a collection, following scroll offsets page by page."""
+        await self._ensure_col()
+        offset = None
+        while True:
+            points, offset = await self.client.scroll(**self._scroll_request(filters, page_size, offset))
+            for point in points:
+                yield point
+            if offset is None:
+                return
+
+    async def delete_by_filter(self, filters: dict):
+        """Delete every vector matching the filters in a single request. `filters` must not be empty."""
+        request = self._delete_by_filter_request(filters)
+        await self._ensure_col()
+        await self.client.delete(**request)
+
+    async def reset(self):
+        """Reset the index by deleting and recreating it."""
+        logger.warning(f"Resetting index {self.collection_name}...")
+        await self.delete_col()
+        await self._ensure_col()
@@ -4,10 +4,11 @@ from typing import Any, Dict, List, Optional
 
 from dotenv import load_dotenv
 from fastapi import FastAPI, HTTPException
-from fastapi.responses import JSONResponse, RedirectResponse
+from fastapi.responses import JSONResponse, PlainTextResponse, RedirectResponse
 from pydantic import BaseModel, Field
 
 from jmemory import Memory
+from jmemory.memory.telemetry import OpenTelemetryExporter, PrometheusExporter, telemetry
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 
@@ -20,6 +21,12 @@ load_dotenv()
 
 
 
+# Stage latencies and token/byte counters, served on /metrics. Spans also go to OpenTelemetry when an OTLP
+# endpoint is configured (the OpenTelemetry SDK must be set up, e.g. with `opentelemetry-instrument`).
+METRICS = telemetry.add_exporter(PrometheusExporter())
+if os.environ.get("OTEL_EXPORTER_OTLP_ENDPOINT"):
+    telemetry.add_exporter(OpenTelemetryExporter())
+
 MEMORY_INSTANCE = Memory()
 
 app = FastAPI(
@@ -175,6 +182,12 @@ def reset_memory():
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get("/metrics", summary="Prometheus metrics", include_in_schema=False)
+def metrics():
+    """Expose stage latencies and counters in the Prometheus text format."""
+    return PlainTextResponse(METRICS.render(), media_type=PrometheusExporter.content_type)
+
+
 @app.get("/", summary="Redirect to the OpenAPI documentation", include_in_schema=False)
 def home():
     """Redirect to the OpenAPI documentation."""
@@ -0,0 +1,13 @@
+from unittest.mock import Mock
+
+import pytest
+
+from jmemory.configs.embeddings.base import BaseEmbedderConfig
+
+
+@pytest.fixture
+def inner_embedder():
+    embedder = Mock()
+    embedder.config = BaseEmbedderConfig(model="test-model", embedding_dims=2)
+    embedder.embed_batch.side_effect = lambda texts, memory_action=None: [[float(len(t)), 0.5] for t in texts]
+    return embedder
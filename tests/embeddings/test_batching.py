@@ -0,0 +1,90 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from jmemory.embeddings.batching import BatchingEmbedding
+from jmemory.embeddings.sidecar import EmbeddingSidecar, RemoteEmbedding
+
+
+def test_calls_queued_behind_a_busy_model_are_fused_into_one_batch(inner_embedder):
+    batcher = BatchingEmbedding(inner_embedder, max_batch_size=64, max_wait=0.2)
+    busy, release = threading.Event(), threading.Event()
+    embed_batch = inner_embedder.embed_batch.side_effect
+
+    def slow_first_call(texts, memory_action=None):
+        if not busy.is_set():
+            busy.set()
+            release.wait(5)
+        return embed_batch(texts, memory_action)
+
+    inner_embedder.embed_batch.side_effect = slow_first_call
+    first = batcher.submit(["first"])
+    assert busy.wait(5)
+    with ThreadPoolExecutor(8) as pool:
+        searches = [pool.submit(batcher.embed, "x" * i) for i in range(1, 9)]
+        while batcher.stats()["queued"] < 8:
+            time.sleep(0.001)
+        release.set()
+        results = [search.result() for search in searches]
+    batcher.close()
+
+    assert first.result() == [[5.0, 0.5]]
+    assert results == [[float(i), 0.5] for i in range(1, 9)]
+    assert [len(call.args[0]) for call in inner_embedder.embed_batch.call_args_list] == [1, 8]
+    assert batcher.stats()["requests"] == 9
+
+
+def test_a_lone_call_does_not_wait_for_the_window(inner_embedder):
+    batcher = BatchingEmbedding(inner_embedder, max_wait=60)
+
+    assert batcher.submit(["alone"]).result(timeout=5) == [[5.0, 0.5]]
+    batcher.close()
+
+
+def test_batch_size_triggers_dispatch_and_duplicates_are_encoded_once(inner_embedder):
+    batcher = BatchingEmbedding(inner_embedder, max_batch_size=2, max_wait=60)
+
+    assert batcher.embed_batch(["same", "same"]) == [[4.0, 0.5], [4.0, 0.5]]
+    inner_embedder.embed_batch.assert_called_once_with(["same"], None)
+    batcher.close()
+
+
+def test_memory_actions_are_not_mixed(inner_embedder):
+    batcher = BatchingEmbedding(inner_embedder, max_wait=0.2)
+
+    futures = [batcher.submit(["a"], "search"), batcher.submit(["b"], "add")]
+    assert [future.result() for future in futures] == [[[1.0, 0.5]], [[1.0, 0.5]]]
+    batcher.close()
+
+    calls = sorted(call.args for call in inner_embedder.embed_batch.call_args_list)
+    assert calls == [(["a"], "search"), (["b"], "add")]
+
+
+def test_failures_reach_every_caller_in_the_batch(inner_embedder):
+    inner_embedder.embed_batch.side_effect = RuntimeError("model crashed")
+    batcher = BatchingEmbedding(inner_embedder, max_wait=0.2)
+
+    futures = [batcher.submit(["a"]), batcher.submit(["b"])]
+    for future in futures:
+        with pytest.raises(RuntimeError, match="model crashed"):
+            future.result()
+
+    batcher.close()
+    with pytest.raises(RuntimeError):
+        batcher.embed("after close")
+
+
+def test_sidecar_round_trip(inner_embedder):
+    sidecar = EmbeddingSidecar(inner_embedder, port=0, max_wait=0.001).start()
+    try:
+        remote = RemoteEmbedding(sidecar.url)
+
+        assert remote.config.embedding_dims == 2
+        assert remote.embed("hello", "search") == [5.0, 0.5]
+        assert remote.embed_batch(["a", "bb"]) == [[1.0, 0.5], [2.0, 0.5]]
+        inner_embedder.embed_batch.assert_any_call(["hello"], "search")
+        remote.close()
+    finally:
+        sidecar.stop()
@@ -0,0 +1,162 @@
+from unittest.mock import Mock, patch
+
+import numpy as np
+import pytest
+
+from jmemory.configs.embeddings.base import BaseEmbedderConfig
+from jmemory.embeddings.huggingface import HuggingFaceEmbedding
+from jmemory.embeddings.mock import MockEmbeddings
+from jmemory.embeddings.ollama import OllamaEmbedding
+from jmemory.embeddings.openai import OpenAIEmbedding
+
+
+@pytest.fixture
+def mock_sentence_transformer():
+    with patch("jmemory.embeddings.huggingface.SentenceTransformer") as mock_transformer:
+        mock_model = Mock()
+        mock_model.get_sentence_embedding_dimension.return_value = 3
+        mock_transformer.return_value = mock_model
+        yield mock_model
+
+
+@pytest.fixture
+def mock_openai_client():
+    with patch("jmemory.embeddings.openai.OpenAI") as mock_openai:
+        mock_client = Mock()
+        mock_openai.return_value = mock_client
+        yield mock_client
+
+
+@pytest.fixture
+def mock_ollama_client():
+    with patch("jmemory.embeddings.ollama.Client") as mock_ollama:
+        mock_client = Mock()
+        mock_client.list.return_value = {"models": [{"name": "nomic-embed-text"}]}
+        mock_ollama.return_value = mock_client
+        yield mock_client
+
+
+def test_huggingface_embed_batch_single_encode(mock_sentence_transformer):
+    embedder = HuggingFaceEmbedding(BaseEmbedderConfig(), model="BAAI/bge-small-en-v1.5")
+    mock_sentence_transformer.encode.return_value = np.array([[0.1, 0.2, 0.3], [0.4, 0.5, 0.6]])
+
+    result = embedder.embed_batch(["Hello", "World"])
+
+    mock_sentence_transformer.encode.assert_called_once_with(["Hello", "World"], convert_to_numpy=True)
+    assert result == [[0.1, 0.2, 0.3], [0.4, 0.5, 0.6]]
+
+
+def test_openai_embed_batch_single_request(mock_openai_client):
+    embedder = OpenAIEmbedding(BaseEmbedderConfig())
+    mock_response = Mock()
+    # The API is allowed to return items out of order; results must follow the input order.
+    mock_response.data = [Mock(embedding=[0.4], index=1), Mock(embedding=[0.1], index=0)]
+    mock_openai_client.embeddings.create.return_value = mock_response
+
+    result = embedder.embed_batch(["Hello\nworld", "Second"])
+
+    mock_openai_client.embeddings.create.assert_called_once_with(
+        input=["Hello world", "Second"], model="text-embedding-3-small", dimensions=1536
+    )
+    assert result == [[0.1], [0.4]]
+
+
+def test_openai_embed_batch_splits_large_inputs(mock_openai_client):
+    embedder = OpenAIEmbedding(BaseEmbedderConfig())
+    mock_openai_client.embeddings.create.side_effect = lambda input, **kwargs: Mock(
+        data=[Mock(embedding=[float(text)], index=i) for i, text in enumerate(input)]
+    )
+
+    result = embedder.embed_batch([str(i) for i in range(5000)])
+
+    sizes = [len(call.kwargs["input"]) for call in mock_openai_client.embeddings.create.call_args_list]
+    assert sizes == [2048, 2048, 904]
+    assert result == [[float(i)] for i in range(5000)]
+
+
+def test_ollama_embed_batch_single_request(mock_ollama_client):
+    embedder = OllamaEmbedding(BaseEmbedderConfig(model="nomic-embed-text"))
+    mock_ollama_client.embed.return_value = {"embeddings": [[0.1, 0.2], [0.3, 0.4]]}
+
+    result = embedder.embed_batch(["first", "second"])
+
+    mock_ollama_client.embed.assert_called_once_with(model="nomic-embed-text", input=["first", "second"])
+    assert result == [[0.1, 0.2], [0.3, 0.4]]
+
+
+def test_embed_batch_empty_input(mock_openai_client):
+    embedder = OpenAIEmbedding(BaseEmbedderConfig())
+
+    assert embedder.embed_batch([]) == []
+    mock_openai_client.embeddings.create.assert_not_called()
+
+
+def test_default_embed_batch_falls_back_to_embed():
+    embedder = MockEmbeddings()
+
+    result = embedder.embed_batch(["a", "b", "c"])
+
+    assert result == [embedder.embed("a")] * 3
+
+
+def test_huggingface_model_loads_lazily():
+    with patch("jmemory.embeddings.huggingface.SentenceTransformer") as transformer:
+        embedder = HuggingFaceEmbedding(BaseEmbedderConfig(), model="BAAI/bge-small-en-v1.5")
+
+        assert embedder.config.embedding_dims == 384
+        transformer.assert_not_called()
+
+        embedder.warmup(background=True).join()
+        embedder.embed("Hello")
+        transformer.assert_called_once()
+
+
+def test_import_jmemory_does_not_load_torch():
+    import subprocess
+    import sys
+
+    code = "import sys, jmemory; print('torch' in sys.modules or 'sentence_transformers' in sys.modules)"
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    assert output.strip() == "False"
+
+
+def test_huggingface_torch_backend_auto_detects_device_and_threads():
+    with (
+        patch("jmemory.embeddings.huggingface.SentenceTransformer") as transformer,
+        patch("jmemory.embeddings.huggingface.detect_device", return_value="cpu"),
+        patch("torch.set_num_threads") as set_num_threads,
+    ):
+        embedder = HuggingFaceEmbedding(BaseEmbedderConfig(model="BAAI/bge-small-en-v1.5", num_threads=2))
+        embedder.warmup()
+
+    transformer.assert_called_once_with("BAAI/bge-small-en-v1.5", device="cpu")
+    set_num_threads.assert_called_once_with(2)
+
+
+def test_huggingface_onnx_backend_exports_quantized_model_once(tmp_path):
+    model_dir = tmp_path / "bge-small-en-v1.5"
+    model_dir.mkdir()
+
+    def export(model, target, path):
+        (model_dir / "onnx").mkdir()
+        (model_dir / "onnx" / f"model_qint8_{target}.onnx").touch()
+
+    with (
+        patch("jmemory.embeddings.huggingface.SentenceTransformer") as transformer,
+        patch("sentence_transformers.export_dynamic_quantized_onnx_model", side_effect=export) as exporter,
+    ):
+        for _ in range(2):
+            config = BaseEmbedderConfig(model=str(model_dir), backend="onnx", quantize="avx2")
+            HuggingFaceEmbedding(config, model_kwargs={"device": "cpu"}).warmup()
+
+    assert exporter.call_count == 1
+    assert transformer.call_args.kwargs == {
+        "backend": "onnx",
+        "device": "cpu",
+        "model_kwargs": {"provider": "CPUExecutionProvider", "file_name": "onnx/model_qint8_avx2.onnx"},
+    }
+
+
+def test_huggingface_rejects_unknown_backend():
+    with pytest.raises(ValueError):
+        HuggingFaceEmbedding(BaseEmbedderConfig(model="BAAI/bge-small-en-v1.5", backend="tensorrt"))
@@ -0,0 +1,78 @@
+from jmemory.configs.base import MemoryConfig
+from jmemory.configs.embeddings.base import BaseEmbedderConfig
+from jmemory.configs.vector_store import VectorStoreConfig
+from jmemory.embeddings.cache import CachedEmbedding
+from jmemory.embeddings.mock import MockEmbeddings
+from jmemory.memory.main import Memory
+
+
+def test_repeated_text_is_served_from_lru(inner_embedder):
+    cache = CachedEmbedding(inner_embedder, db_path=False)
+
+    first = cache.embed("alice")
+    second = cache.embed("alice")
+
+    assert first == second == [5.0, 0.5]
+    inner_embedder.embed_batch.assert_called_once_with(["alice"], None)
+    assert cache.stats() == {"hits": 1, "disk_hits": 0, "misses": 1, "size": 1}
+
+
+def test_embed_batch_only_sends_misses_once(inner_embedder):
+    cache = CachedEmbedding(inner_embedder, db_path=False)
+    cache.embed("alice")
+
+    result = cache.embed_batch(["alice", "bob", "bob", "carol"])
+
+    assert result == [[5.0, 0.5], [3.0, 0.5], [3.0, 0.5], [5.0, 0.5]]
+    inner_embedder.embed_batch.assert_called_with(["bob", "carol"], None)
+
+
+def test_lru_is_bounded(inner_embedder):
+    cache = CachedEmbedding(inner_embedder, max_size=2, db_path=False)
+
+    cache.embed_batch(["a", "b", "c"])
+
+    assert cache.stats()["size"] == 2
+
+
+def test_disk_tier_survives_new_instance(inner_embedder, tmp_path):
+    db_path = str(tmp_path / "embeddings.db")
+    CachedEmbedding(inner_embedder, db_path=db_path).embed("persisted")
+    inner_embedder.embed_batch.reset_mock()
+
+    cache = CachedEmbedding(inner_embedder, db_path=db_path)
+    result = cache.embed("persisted")
+
+    assert result == [9.0, 0.5]
+    inner_embedder.embed_batch.assert_not_called()
+    assert cache.stats()["disk_hits"] == 1
+
+
+def test_key_includes_model_and_action(inner_embedder):
+    cache = CachedEmbedding(inner_embedder, db_path=False)
+    cache.embed("text", "add")
+    cache.embed("text", "search")
+    cache.config.model = "other-model"
+    cache.embed("text", "add")
+
+    assert inner_embedder.embed_batch.call_count == 3
+
+
+def test_memory_update_embeds_through_the_cache(mocker, tmp_path):
+    mocker.patch("jmemory.memory.main.LlmLoader")
+    inner = MockEmbeddings(BaseEmbedderConfig(embedding_dims=10))
+    mocker.patch("jmemory.memory.main.RemoteEmbedding", return_value=inner)
+    config = MemoryConfig(
+        vector_store=VectorStoreConfig(collection_name="test", path=str(tmp_path / "qdrant")),
+        graph_store=None,
+        embedding_sidecar_url="http://embeddings",
+        embedding_cache_path=str(tmp_path / "embeddings.db"),
+    )
+    memory = Memory(config)
+    memory_id = memory.add("I like green tea", user_id="alice")["results"][0]["id"]
+
+    memory.update(memory_id, {"data": "I like black tea", "user_id": "alice"})
+
+    assert isinstance(memory.embedder, CachedEmbedding)
+    assert memory.get(memory_id)["memory"] == "I like black tea"
+    assert memory.embedder.stats()["size"] == 2
@@ -0,0 +1,98 @@
+from unittest.mock import Mock, patch
+
+import pytest
+
+from jmemory.configs.llms.base import BaseLlmConfig
+from jmemory.llms.cache import MISS, LLMResponseCache
+from jmemory.llms.openai import OpenAILLM
+
+SYSTEM = {"role": "system", "content": "Extract entities."}
+
+
+@pytest.fixture
+def mock_openai_client():
+    with patch("jmemory.llms.openai.OpenAI") as mock_openai:
+        mock_client = Mock()
+        create = mock_client.chat.completions.create
+        create.side_effect = lambda **kwargs: Mock(
+            choices=[Mock(message=Mock(content=f"answer {create.call_count}", tool_calls=None))]
+        )
+        mock_openai.return_value = mock_client
+        yield mock_client
+
+
+def make_llm(**cache_options):
+    return OpenAILLM(BaseLlmConfig(model="gpt-4o", api_key="api_key", cache_path=False, **cache_options))
+
+
+def test_no_cache_by_default(mock_openai_client):
+    llm = make_llm()
+    messages = [SYSTEM, {"role": "user", "content": "Alice works at Acme"}]
+
+    assert llm.cache is None
+    assert llm.generate_response(messages) == "answer 1"
+    assert llm.generate_response(messages) == "answer 2"
+
+
+def test_exact_mode_skips_identical_requests(mock_openai_client):
+    llm = make_llm(cache_mode="exact")
+    messages = [SYSTEM, {"role": "user", "content": "Alice works at Acme"}]
+
+    assert llm.generate_response(messages) == "answer 1"
+    assert llm.generate_response(messages=list(messages)) == "answer 1"
+    assert llm.generate_response(messages, tools=[{"type": "function"}]) != "answer 1"
+
+    assert mock_openai_client.chat.completions.create.call_count == 2
+    assert llm.cache.stats() == {"hits": 1, "semantic_hits": 0, "misses": 2, "size": 2}
+
+
+def test_temperature_is_part_of_the_key(mock_openai_client):
+    messages = [SYSTEM, {"role": "user", "content": "Alice works at Acme"}]
+    llm = make_llm(cache_mode="exact")
+    llm.generate_response(messages)
+
+    llm.config.temperature = 0.9
+    llm.generate_response(messages)
+
+    assert mock_openai_client.chat.completions.create.call_count == 2
+
+
+def test_semantic_mode_reuses_near_identical_prompts(mock_openai_client):
+    vectors = {"Alice works at Acme": [1.0, 0.0], "Alice works at Acme.": [0.99, 0.05], "Bob likes tea": [0.0, 1.0]}
+    llm = make_llm(cache_mode="semantic")
+    llm.cache.embedder = Mock(embed=lambda text: vectors[text])
+
+    first = llm.generate_response([SYSTEM, {"role": "user", "content": "Alice works at Acme"}])
+    near = llm.generate_response([SYSTEM, {"role": "user", "content": "Alice works at Acme."}])
+    other = llm.generate_response([SYSTEM, {"role": "user", "content": "Bob likes tea"}])
+    other_prompt = llm.generate_response(
+        [{"role": "system", "content": "Summarize."}, {"role": "user", "content": "Alice works at Acme."}]
+    )
+
+    assert first == near == "answer 1"
+    assert other == "answer 2"
+    assert other_prompt == "answer 3"
+    assert llm.cache.stats()["semantic_hits"] == 1
+
+
+def test_sqlite_tier_survives_restarts_and_ttl_expires(tmp_path, monkeypatch):
+    path = str(tmp_path / "llm_cache.db")
+    request = {"provider": "test", "model": "m", "arguments": {"messages": [{"role": "user", "content": "hi"}]}}
+    LLMResponseCache(db_path=path).store(request, {"content": None, "tool_calls": [{"name": "noop"}]})
+
+    assert LLMResponseCache(db_path=path).lookup(request)[0] == {"content": None, "tool_calls": [{"name": "noop"}]}
+
+    expired = LLMResponseCache(db_path=path, ttl=10)
+    expired.store(request, "fresh")
+    monkeypatch.setattr("jmemory.llms.cache.time.time", lambda: 2**40)
+    assert expired.lookup(request)[0] is MISS
+
+
+def test_lru_evicts_least_recently_used():
+    cache = LLMResponseCache(max_size=2, db_path=False)
+    requests = [{"arguments": {"messages": [{"role": "user", "content": str(i)}]}} for i in range(3)]
+    for i, request in enumerate(requests):
+        cache.store(request, i)
+
+    assert cache.lookup(requests[0])[0] is MISS
+    assert [cache.lookup(request)[0] for request in requests[1:]] == [1, 2]
@@ -0,0 +1,70 @@
+import importlib
+import sys
+import types
+
+import pytest
+
+from jmemory.configs.base import MemoryConfig
+from jmemory.configs.embeddings.base import BaseEmbedderConfig
+from jmemory.configs.vector_store import VectorStoreConfig
+from jmemory.embeddings.mock import MockEmbeddings
+
+GRAPH_TOOLS = (
+    "DELETE_MEMORY_STRUCT_TOOL_GRAPH",
+    "DELETE_MEMORY_TOOL_GRAPH",
+    "EXTRACT_ENTITIES_STRUCT_TOOL",
+    "EXTRACT_ENTITIES_TOOL",
+    "RELATIONS_STRUCT_TOOL",
+    "RELATIONS_TOOL",
+)
+
+
+def _graph_prompt_modules():
+    tools = types.ModuleType("jmemory.graphs.tools")
+    for name in GRAPH_TOOLS:
+        setattr(tools, name, {"name": name})
+    utils = types.ModuleType("jmemory.graphs.utils")
+    utils.EXTRACT_RELATIONS_PROMPT = "USER_ID CUSTOM_PROMPT"
+    utils.get_delete_messages = lambda existing_memories, data, user_id: ("system", "user")
+    return {"jmemory.graphs.tools": tools, "jmemory.graphs.utils": utils}
+
+
+@pytest.fixture
+def import_graph_backend(monkeypatch):
+    """
+    Import a graph backend module by name.
+
+    The backends import their tool schemas and prompts from `jmemory.graphs.tools` and `jmemory.graphs.utils`;
+    where those are not importable, minimal stand-ins are put in `sys.modules` for the duration of the test.
+    """
+    for name, module in _graph_prompt_modules().items():
+        try:
+            importlib.import_module(name)
+        except ImportError:
+            monkeypatch.setitem(sys.modules, name, module)
+    return importlib.import_module
+
+
+@pytest.fixture
+def embedder(mocker):
+    """The `MockEmbeddings` that every `Memory` or `AsyncMemory` built in the test uses, next to a mocked LLM."""
+    embedder = MockEmbeddings(BaseEmbedderConfig(embedding_dims=10))
+    mocker.patch("jmemory.memory.main.LlmLoader")
+    mocker.patch("jmemory.memory.main._create_embedder", return_value=embedder)
+    return embedder
+
+
+@pytest.fixture
+def make_config(tmp_path):
+    """Factory for a `MemoryConfig` with an embedded Qdrant under `tmp_path` and no graph store."""
+
+    def make(**overrides):
+        return MemoryConfig(
+            **{
+                "vector_store": VectorStoreConfig(collection_name="test", path=str(tmp_path / "qdrant"), on_disk=True),
+                "graph_store": None,
+                **overrides,
+            }
+        )
+
+    return make
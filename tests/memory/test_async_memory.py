@@ -0,0 +1,158 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from jmemory.client.main import AsyncMemoryClient
+from jmemory.configs.base import MemoryConfig
+from jmemory.configs.embeddings.base import BaseEmbedderConfig
+from jmemory.configs.enums import MemoryType
+from jmemory.configs.vector_store import VectorStoreConfig
+from jmemory.embeddings.mock import MockEmbeddings
+from jmemory.memory.main import AsyncMemory
+
+
+@pytest.fixture
+def async_memory(mocker, tmp_path):
+    mocker.patch("jmemory.memory.main.LlmLoader")
+    mocker.patch(
+        "jmemory.memory.main._create_embedder",
+        return_value=MockEmbeddings(BaseEmbedderConfig(embedding_dims=10)),
+    )
+    config = MemoryConfig(
+        vector_store=VectorStoreConfig(collection_name="test", path=str(tmp_path / "qdrant"), on_disk=True),
+        graph_store=None,
+        history_db_path=str(tmp_path / "history.db"),
+    )
+    return AsyncMemory(config)
+
+
+@pytest.mark.asyncio
+async def test_add_then_search_and_get_all(async_memory):
+    added = await async_memory.add(
+        [{"role": "user", "content": "I like tea"}, {"role": "assistant", "content": "Noted"}], user_id="alice"
+    )
+    await async_memory.add("Unrelated", user_id="bob")
+
+    assert [item["memory"] for item in added["results"]] == ["I like tea", "Noted"]
+
+    found = await async_memory.search("tea", user_id="alice", limit=5)
+    assert {item["memory"] for item in found["results"]} == {"I like tea", "Noted"}
+    assert all(item["user_id"] == "alice" for item in found["results"])
+    assert "relations" not in found
+
+    everything = await async_memory.get_all(user_id="alice")
+    assert len(everything["results"]) == 2
+
+
+@pytest.mark.asyncio
+async def test_search_fans_out_to_graph_store(async_memory):
+    graph_store = MagicMock()
+    graph_store.search.return_value = [{"source": "alice", "relationship": "likes", "destination": "tea"}]
+    async_memory.graph_store = graph_store
+
+    await async_memory.add("I like tea", user_id="alice")
+    result = await async_memory.search("tea", user_id="alice")
+
+    graph_store.add.assert_called_once_with("I like tea", {"user_id": "alice"})
+    graph_store.search.assert_called_once_with("tea", {"user_id": "alice"})
+    assert result["relations"] == graph_store.search.return_value
+    assert result["results"][0]["memory"] == "I like tea"
+
+
+@pytest.mark.asyncio
+async def test_delete_all_only_removes_scoped_memories(async_memory):
+    await async_memory.add("first", user_id="alice")
+    await async_memory.add("second", user_id="bob")
+
+    await async_memory.delete_all(user_id="alice")
+
+    assert (await async_memory.get_all(user_id="alice"))["results"] == []
+    assert len((await async_memory.get_all(user_id="bob"))["results"]) == 1
+
+
+@pytest.mark.asyncio
+async def test_get_all_and_iter_all_page_past_first_scroll(async_memory):
+    await async_memory.add([{"role": "user", "content": f"fact {i}"} for i in range(5)], user_id="alice")
+
+    streamed = [memory async for memory in async_memory.iter_all(user_id="alice", page_size=2)]
+    limited = await async_memory.get_all(user_id="alice", limit=3)
+
+    assert sorted(memory["memory"] for memory in streamed) == [f"fact {i}" for i in range(5)]
+    assert len(limited["results"]) == 3
+
+
+@pytest.mark.asyncio
+async def test_short_term_adds_reach_vector_store_on_close(async_memory):
+    added = await async_memory.add("I like tea", user_id="alice", memory_type=MemoryType.SHORT_TERM.value)
+    memory_id = added["results"][0]["id"]
+
+    found = await async_memory.search("tea", user_id="alice")
+    assert [item["id"] for item in found["results"]] == [memory_id]
+
+    await async_memory.close()
+    assert await async_memory.vector_store.get(memory_id) is not None
+
+
+@pytest.mark.asyncio
+async def test_async_client_is_backed_by_async_memory(async_memory):
+    client = AsyncMemoryClient(memory=async_memory)
+
+    await client.add("hello", user_id="alice")
+    result = await client.search("hello", user_id="alice")
+
+    assert result["results"][0]["memory"] == "hello"
+
+
+@pytest.mark.asyncio
+async def test_scope_is_required(async_memory):
+    with pytest.raises(ValueError):
+        await async_memory.search("hello")
+
+
+@pytest.mark.asyncio
+async def test_hybrid_search_ranks_exact_terms_first(async_memory):
+    await async_memory.add([{"role": "user", "content": f"note number {i}"} for i in range(20)], user_id="alice")
+    added = await async_memory.add("Order id ORD-4471 shipped", user_id="alice")
+
+    result = await async_memory.search("ORD-4471", user_id="alice", limit=1, mode="hybrid")
+
+    assert [item["id"] for item in result["results"]] == [added["results"][0]["id"]]
+
+
+@pytest.mark.asyncio
+async def test_history_records_each_change(async_memory):
+    memory_id = (await async_memory.add("I like tea", user_id="alice"))["results"][0]["id"]
+    await async_memory.update(memory_id, {"data": "I like coffee", "user_id": "alice"})
+    await async_memory.delete(memory_id)
+
+    history = await async_memory.history(memory_id)
+
+    assert [(item["event"], item["new_memory"]) for item in history] == [
+        ("ADD", "I like tea"),
+        ("UPDATE", "I like coffee"),
+        ("DELETE", None),
+    ]
+    assert history[1]["old_memory"] == "I like tea"
+
+
+@pytest.mark.asyncio
+async def test_update_of_a_buffered_memory_survives_promotion(async_memory):
+    added = await async_memory.add("I like tea", user_id="alice", memory_type=MemoryType.SHORT_TERM.value)
+    memory_id = added["results"][0]["id"]
+
+    await async_memory.update(memory_id, {"data": "I like coffee", "user_id": "alice"})
+    await async_memory.close()
+
+    assert (await async_memory.get(memory_id))["memory"] == "I like coffee"
+    assert (await async_memory.vector_store.get(memory_id)).payload["data"] == "I like coffee"
+
+
+@pytest.mark.asyncio
+async def test_update_keeps_the_session_of_the_memory(async_memory):
+    added = await async_memory.get((await async_memory.add("I like tea", user_id="alice"))["results"][0]["id"])
+
+    await async_memory.update(added["id"], {"data": "I like coffee"})
+
+    everything = await async_memory.get_all(user_id="alice")
+    assert [item["memory"] for item in everything["results"]] == ["I like coffee"]
+    assert everything["results"][0]["created_at"] == added["created_at"]
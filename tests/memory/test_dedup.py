@@ -0,0 +1,114 @@
+import pytest
+
+from jmemory.configs.enums import MemoryType
+from jmemory.memory.dedup import ContentHashIndex, content_hash, normalize_text
+from jmemory.memory.main import AsyncMemory, Memory
+
+
+@pytest.fixture
+def embedder(embedder, mocker):
+    mocker.spy(embedder, "embed_batch")
+    return embedder
+
+
+def _payload(user_id="alice", **extra):
+    return {"user_id": user_id, **extra}
+
+
+def test_normalization_ignores_case_spacing_and_edge_punctuation():
+    assert normalize_text("  Thanks!! ") == "thanks"
+    assert normalize_text("I like\tgreen   TEA.") == "i like green tea"
+    assert content_hash("Thanks!") == content_hash("thanks")
+    assert content_hash("thanks") != content_hash("no thanks")
+
+
+def test_claim_records_new_hashes_and_counts_repeats(tmp_path):
+    index = ContentHashIndex(str(tmp_path / "hashes.db"))
+    hashes = [content_hash(text) for text in ("thanks", "I like tea", "Thanks!")]
+
+    assert index.claim(["1", "2", "3"], hashes, [_payload()] * 3) == [None, None, ("1", 2)]
+    assert index.claim(["4"], hashes[:1], [_payload()]) == [("1", 3)]
+    # Other sessions and memory layers keep their own entries.
+    other_scopes = [_payload("bob"), _payload(memory_type="episodic_memory")]
+    assert index.claim(["5", "6"], hashes[:2], other_scopes) == [None, None]
+    index.close()
+
+    index = ContentHashIndex(str(tmp_path / "hashes.db"))
+    assert index.mentions("1") == 3
+    index.update("2", content_hash("I like coffee"))
+    assert index.claim(["7"], [content_hash("i like coffee")], [_payload()]) == [("2", 2)]
+    index.delete(["1"])
+    assert index.claim(["8"], hashes[:1], [_payload()]) == [None]
+    index.delete_by_filter({"user_id": "bob"})
+    assert index.mentions("5") == 0
+    with pytest.raises(ValueError):
+        index.delete_by_filter({})
+
+
+def test_repeats_skip_embedding_and_storage(embedder, make_config):
+    memory = Memory(make_config())
+
+    first = memory.add("I like green tea", user_id="alice")["results"][0]
+    messages = [{"role": "user", "content": "i like green tea!"}, {"role": "user", "content": "Thanks"}]
+    repeat = memory.add(messages, user_id="alice")["results"]
+
+    assert repeat[0] == {"id": first["id"], "memory": "i like green tea!", "event": "NONE", "mentions": 2}
+    assert repeat[1]["event"] == "ADD"
+    assert embedder.embed_batch.call_args_list[-1].args == (["Thanks"],)
+    assert len(memory.get_all(user_id="alice")["results"]) == 2
+    assert memory.get(first["id"])["hash"] == content_hash("I like green tea")
+    assert memory.add("I like green tea", user_id="bob")["results"][0]["event"] == "ADD"
+
+    calls = embedder.embed_batch.call_count
+    assert memory.add("thanks.", user_id="alice")["results"][0]["mentions"] == 2
+    assert embedder.embed_batch.call_count == calls
+
+    memory.delete(first["id"])
+    assert memory.add("I like green tea", user_id="alice")["results"][0]["event"] == "ADD"
+
+
+def test_short_term_repeats_are_deduplicated(embedder, make_config):
+    memory = Memory(make_config())
+    short_term = MemoryType.SHORT_TERM.value
+
+    first = memory.add("ok", user_id="alice", memory_type=short_term)["results"][0]
+    repeat = memory.add("OK", user_id="alice", memory_type=short_term)["results"][0]
+
+    assert (repeat["id"], repeat["event"]) == (first["id"], "NONE")
+    assert memory.add("ok", user_id="alice")["results"][0]["event"] == "ADD"
+
+
+def test_failed_inserts_release_their_hashes(embedder, make_config, mocker):
+    memory = Memory(make_config())
+    mocker.patch.object(memory.vector_store, "insert", side_effect=ConnectionError("store down"))
+
+    with pytest.raises(ConnectionError):
+        memory.add("I like green tea", user_id="alice")
+
+    mocker.stopall()
+    assert memory.add("I like green tea", user_id="alice")["results"][0]["event"] == "ADD"
+
+
+def test_dedup_can_be_disabled(embedder, make_config):
+    memory = Memory(make_config(dedup_index=False))
+
+    memory.add("thanks", user_id="alice")
+    memory.add("thanks", user_id="alice")
+
+    assert memory.dedup is None
+    assert len(memory.get_all(user_id="alice")["results"]) == 2
+
+
+@pytest.mark.asyncio
+async def test_async_repeats_skip_embedding(embedder, make_config):
+    memory = AsyncMemory(make_config())
+
+    first = (await memory.add("I like green tea", user_id="alice"))["results"][0]
+    calls = embedder.embed_batch.call_count
+    repeat = (await memory.add("I LIKE GREEN TEA", user_id="alice"))["results"][0]
+
+    assert (repeat["id"], repeat["mentions"]) == (first["id"], 2)
+    assert embedder.embed_batch.call_count == calls
+    await memory.delete_all(user_id="alice")
+    assert (await memory.add("I like green tea", user_id="alice"))["results"][0]["event"] == "ADD"
+    await memory.close()
@@ -0,0 +1,225 @@
+import threading
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+from jmemory.configs.embeddings.base import BaseEmbedderConfig
+from jmemory.embeddings.configs import EmbedderConfig
+from jmemory.embeddings.mock import MockEmbeddings
+from jmemory.memory.telemetry import InMemoryExporter, telemetry
+
+
+def make_config(base_label=True, **embedder_config):
+    graph_config = SimpleNamespace(url="bolt://neo4j", username="neo4j", password="pw", database=None)
+    graph_config.base_label = base_label
+    return SimpleNamespace(
+        graph_store=SimpleNamespace(config=graph_config, llm=None, custom_prompt=None),
+        embedder=EmbedderConfig(config={"model": "test-model", **embedder_config}),
+        vector_store=SimpleNamespace(config=None),
+        llm=SimpleNamespace(provider="openai", config={}),
+    )
+
+
+@pytest.fixture
+def graph_memory(import_graph_backend):
+    return import_graph_backend("jmemory.memory.graph_memory")
+
+
+@pytest.fixture
+def patched_graph(mocker, graph_memory):
+    neo4j = mocker.patch("jmemory.memory.graph_memory.Neo4jGraph").return_value
+    mocker.patch(
+        "jmemory.memory.graph_memory.EmbedderFactory.create",
+        return_value=MockEmbeddings(BaseEmbedderConfig(embedding_dims=10)),
+    )
+    mocker.patch("jmemory.memory.graph_memory.LlmFactory.create", return_value=MagicMock())
+    return neo4j
+
+
+@pytest.fixture
+def graph(patched_graph, graph_memory):
+    graph = graph_memory.MemoryGraph(make_config())
+    patched_graph.query.reset_mock()
+    return graph
+
+
+@pytest.fixture
+def exporter():
+    exporter = telemetry.add_exporter(InMemoryExporter())
+    yield exporter
+    telemetry.remove_exporter(exporter)
+
+
+@pytest.fixture
+def stages(graph, mocker):
+    """Stub every stage of `add`, leaving the orchestration between them."""
+    mocker.patch.object(graph, "_retrieve_nodes_from_data", return_value={"alice": "person"})
+    mocker.patch.object(graph, "_establish_nodes_relations_from_data", return_value=[])
+    mocker.patch.object(graph, "_plan_nodes", return_value={})
+    mocker.patch.object(graph, "_search_graph_db", return_value=[])
+    mocker.patch.object(graph, "_get_delete_entities_from_search_output", return_value=[])
+    mocker.patch.object(graph, "_write_transaction", return_value=([], []))
+    return graph
+
+
+def test_vector_index_dimensions_come_from_the_dict_config(patched_graph, graph_memory):
+    graph_memory.MemoryGraph(make_config(embedding_dims=384))
+    index_query = patched_graph.query.call_args_list[-1].args[0]
+    assert "`vector.dimensions`: 384" in index_query
+
+    # Without `embedding_dims` in the config, the embedder knows its own output size.
+    graph = graph_memory.MemoryGraph(make_config())
+    assert "`vector.dimensions`: 10" in patched_graph.query.call_args_list[-1].args[0]
+    assert graph.vector_index == "entity_embedding"
+
+
+def test_vector_search_grows_k_before_scanning(graph):
+    graph.vector_search_max_k = 400
+    graph.graph.query.side_effect = [
+        [
+            {"name": "alice", "matches": [{"id": "n1", "similarity": 0.99}], "truncated": False},
+            {"name": "bob", "matches": [], "truncated": True},
+        ],
+        [{"name": "bob", "matches": [], "truncated": True}],
+        [{"name": "bob", "matches": [{"id": "n7", "similarity": 0.91}]}],
+    ]
+
+    result = graph._find_similar_nodes({"alice": [1.0, 0.0], "bob": [0.0, 1.0]}, {"user_id": "u1"}, 0.9)
+
+    assert result == {"alice": [{"id": "n1", "similarity": 0.99}], "bob": [{"id": "n7", "similarity": 0.91}]}
+    calls = graph.graph.query.call_args_list
+    assert [call.kwargs["params"].get("k") for call in calls] == [100, 400, None]
+    assert "db.index.vector.queryNodes" not in calls[2].args[0]
+
+
+def run_writes(graph):
+    """Route `execute_write` to a mocked transaction that echoes back the rows it was given."""
+    tx = MagicMock()
+
+    def run(cypher, params):
+        rows = params["rows"]
+        if "MERGE (source)-[r:" in cypher or "DELETE r" in cypher:
+            records = [{"idx": row["idx"], "source": "s", "relationship": "r", "target": "t"} for row in rows]
+        else:
+            records = [{"name": row["name"], "id": row.get("id") or f"new-{row['name']}"} for row in rows]
+        return MagicMock(data=MagicMock(return_value=records))
+
+    tx.run.side_effect = run
+    session = graph.graph._driver.session.return_value.__enter__.return_value
+    session.execute_write.side_effect = lambda work: work(tx)
+    return session, tx
+
+
+def test_add_entities_writes_in_one_transaction(graph, mocker):
+    mocker.patch.object(graph, "_search_node_candidates", return_value={"alice": "n-alice"})
+    session, tx = run_writes(graph)
+    to_be_added = [
+        {"source": "alice", "relationship": "likes", "destination": "tea"},
+        {"source": "alice", "relationship": "likes", "destination": "tea"},
+        {"source": "alice", "relationship": "works_at", "destination": "acme"},
+    ]
+
+    results = graph._add_entities(to_be_added, {"user_id": "u1"}, {"tea": "drink", "acme": "company"})
+
+    session.execute_write.assert_called_once()
+    existing, tea, acme, likes, works_at = tx.run.call_args_list
+    # Mentions are summed per entity across the batch: alice is in three relations, tea in two.
+    assert existing.args[1] == {"rows": [{"name": "alice", "id": "n-alice", "mentions": 3}]}
+    assert [(row["name"], row["mentions"]) for row in tea.args[1]["rows"]] == [("tea", 2)]
+    assert "MERGE (n :`__Entity__` {name: row.name, user_id: $user_id})" in tea.args[0]
+    assert "n:`drink`" in tea.args[0] and "n:`company`" in acme.args[0]
+    assert tea.args[1]["user_id"] == "u1" and len(tea.args[1]["rows"][0]["embedding"]) == 10
+    # Both copies of a repeated relation go through one statement, which MERGEs the edge and bumps it twice.
+    assert "MERGE (source)-[r:likes]->(destination)" in likes.args[0]
+    assert likes.args[1]["rows"] == [
+        {"idx": 0, "source_id": "n-alice", "destination_id": "new-tea"},
+        {"idx": 1, "source_id": "n-alice", "destination_id": "new-tea"},
+    ]
+    assert works_at.args[1]["rows"] == [{"idx": 2, "source_id": "n-alice", "destination_id": "new-acme"}]
+    assert [len(result) for result in results] == [1, 1, 1]
+
+
+def test_plan_nodes_embeds_each_entity_once(graph, mocker):
+    search = mocker.patch.object(graph, "_search_node_candidates", return_value={})
+    embed_batch = mocker.spy(graph.embedding_model, "embed_batch")
+    to_be_added = [
+        {"source": "alice", "relationship": "likes", "destination": "tea"},
+        {"source": "tea", "relationship": "grown_in", "destination": "china"},
+    ]
+
+    plan = graph._plan_nodes(to_be_added, {"user_id": "u1"}, {"alice": "person"})
+
+    embed_batch.assert_called_once_with(["alice", "tea", "china"])
+    assert search.call_args.args[0].keys() == {"alice", "tea", "china"}
+    assert {name: (node["type"], node["mentions"]) for name, node in plan.items()} == {
+        "alice": ("person", 1),
+        "tea": ("__User__", 2),
+        "china": ("__User__", 1),
+    }
+    assert all(node["existing_id"] is None for node in plan.values())
+
+
+def test_delete_entities_groups_rows_by_relationship(graph):
+    session, tx = run_writes(graph)
+    to_be_deleted = [
+        {"source": "alice", "relationship": "likes", "destination": "tea"},
+        {"source": "alice", "relationship": "works_at", "destination": "acme"},
+        {"source": "bob", "relationship": "likes", "destination": "tea"},
+    ]
+
+    results = graph._delete_entities(to_be_deleted, {"user_id": "u1", "agent_id": "a1"})
+
+    session.execute_write.assert_called_once()
+    likes, works_at = tx.run.call_args_list
+    assert "-[r:likes]->" in likes.args[0] and "AND n.agent_id = $agent_id" in likes.args[0]
+    assert likes.args[1] == {
+        "user_id": "u1",
+        "agent_id": "a1",
+        "rows": [
+            {"idx": 0, "source": "alice", "destination": "tea"},
+            {"idx": 2, "source": "bob", "destination": "tea"},
+        ],
+    }
+    assert works_at.args[1]["rows"] == [{"idx": 1, "source": "alice", "destination": "acme"}]
+    assert [len(result) for result in results] == [1, 1, 1]
+
+
+def test_add_runs_relation_extraction_and_graph_search_side_by_side(stages, exporter):
+    # Each stage waits for the other to start, so this only completes if they overlap.
+    both_running = threading.Barrier(2, timeout=5)
+
+    def meet(*args, **kwargs):
+        both_running.wait()
+        return []
+
+    stages._establish_nodes_relations_from_data.side_effect = meet
+    stages._search_graph_db.side_effect = meet
+
+    assert stages.add("alice likes tea", {"user_id": "u1"}) == {"deleted_entities": [], "added_entities": []}
+    stages._get_delete_entities_from_search_output.assert_called_once()
+    stages._plan_nodes.assert_called_once()
+
+    spans = {span.name: span for span in exporter.spans}
+    assert {name for name in spans if name.startswith("graph.add.")} == {
+        "graph.add.extract_entities",
+        "graph.add.extract_relations",
+        "graph.add.resolve_nodes",
+        "graph.add.search_graph",
+        "graph.add.decide_deletes",
+        "graph.add.write",
+    }
+    # Stages run on the pool still nest under the add that started them.
+    assert spans["graph.add.search_graph"].parent is spans["graph.add"]
+    stages.close()
+    assert stages._executor is None
+
+
+@pytest.mark.parametrize("failing", ["_search_graph_db", "_establish_nodes_relations_from_data"])
+def test_add_raises_when_either_concurrent_stage_fails(stages, failing):
+    getattr(stages, failing).side_effect = RuntimeError("stage failed")
+
+    with pytest.raises(RuntimeError, match="stage failed"):
+        stages.add("alice likes tea", {"user_id": "u1"})
+    stages._write_transaction.assert_not_called()
+    stages.close()
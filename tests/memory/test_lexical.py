@@ -0,0 +1,143 @@
+import pytest
+
+from jmemory.memory.lexical import BM25Index, bm25_rank, reciprocal_rank_fusion, tokenize
+from jmemory.memory.main import Memory
+
+
+def test_tokenize_splits_ids_and_lowercases():
+    tokens = tokenize("Ticket INV-2024-17, owner: Zoë works_at")
+
+    assert tokens == ["ticket", "inv", "2024", "17", "owner", "zoë", "works", "at"]
+
+
+def test_index_scores_within_session_scope():
+    index = BM25Index()
+    index.add(
+        ["a1", "a2", "b1"],
+        ["Alice ordered INV-2024-17", "Alice likes tea", "Bob ordered INV-2024-17 too"],
+        [{"user_id": "alice"}, {"user_id": "alice"}, {"user_id": "bob"}],
+    )
+
+    hits = index.search("invoice INV-2024-17", {"user_id": "alice"}, limit=5)
+
+    assert [doc_id for doc_id, _ in hits] == ["a1"]
+    assert hits[0][1] > 0
+
+
+def test_index_updates_and_deletes_incrementally():
+    index = BM25Index()
+    index.add(["a1", "a2"], ["green tea", "black coffee"], [{"user_id": "alice"}, {"user_id": "alice"}])
+
+    index.update("a1", "oolong")
+    assert index.search("tea", {"user_id": "alice"}) == []
+    assert [doc_id for doc_id, _ in index.search("oolong", {"user_id": "alice"})] == ["a1"]
+
+    index.delete(["a2"])
+    assert index.search("coffee", {"user_id": "alice"}) == []
+
+    index.add(["b1"], ["oolong"], [{"user_id": "bob"}])
+    index.delete_by_filter({"user_id": "alice"})
+    assert index.search("oolong", {}) == [("b1", pytest.approx(index.search("oolong", {})[0][1]))]
+    with pytest.raises(ValueError):
+        index.delete_by_filter({})
+
+
+@pytest.mark.parametrize(
+    "condition, expected",
+    [({"in": ["alice", "carol"]}, ["a1", "c1"]), ({"nin": ["alice"]}, ["b1", "c1", "d1"]), ("bob", ["b1"])],
+    ids=["in", "nin", "eq"],
+)
+def test_index_scope_applies_filter_operators(condition, expected):
+    index = BM25Index()
+    index.add(
+        ["a1", "b1", "c1", "d1"],
+        ["green tea"] * 4,
+        [{"user_id": "alice"}, {"user_id": "bob"}, {"user_id": "carol"}, {"agent_id": "x"}],
+    )
+
+    assert sorted(doc_id for doc_id, _ in index.search("tea", {"user_id": condition})) == expected
+
+    index.delete_by_filter({"user_id": condition})
+    remaining = sorted(doc_id for doc_id, _ in index.search("tea", {}))
+    assert remaining == sorted({"a1", "b1", "c1", "d1"} - set(expected))
+
+
+def test_index_persists_across_instances(tmp_path):
+    path = str(tmp_path / "bm25.db")
+    BM25Index(path).add(["a1"], ["persistent postings"], [{"user_id": "alice"}])
+
+    assert [doc_id for doc_id, _ in BM25Index(path).search("postings", {"user_id": "alice"})] == ["a1"]
+
+
+def test_bm25_rank_and_reciprocal_rank_fusion():
+    documents = [tokenize("alice lives_in paris"), tokenize("alice works_at acme"), tokenize("bob likes tea")]
+
+    assert bm25_rank("who is alice at", documents, limit=2) == [1, 0]
+    scores = reciprocal_rank_fusion([["x", "y"], ["y", "z"]])
+    assert sorted(scores, key=scores.get, reverse=True) == ["y", "x", "z"]
+
+
+@pytest.fixture
+def memory(embedder, make_config):
+    return Memory(make_config(short_term=None))
+
+
+def test_hybrid_search_recovers_exact_term_matches(memory):
+    # MockEmbeddings gives every text the same vector, so dense ranking alone is arbitrary.
+    memory.add([{"role": "user", "content": f"note number {i}"} for i in range(20)], user_id="alice")
+    added = memory.add("The router serial is SN-88213", user_id="alice")
+    memory.add("The router serial is SN-88213", user_id="bob")
+
+    result = memory.search("SN-88213", user_id="alice", limit=1, mode="hybrid")
+
+    assert [item["id"] for item in result["results"]] == [added["results"][0]["id"]]
+    assert result["results"][0]["user_id"] == "alice"
+
+
+@pytest.mark.parametrize(
+    "condition",
+    [{"in": ["hardware", "network"]}, {"nin": ["travel"]}, {"gte": 2, "lte": 3}],
+    ids=["in", "nin", "range"],
+)
+def test_hybrid_search_applies_filter_operators_to_lexical_hits(memory, condition):
+    key = "rank" if "gte" in condition else "topic"
+    added = memory.add("The router serial is SN-88213", user_id="alice", metadata={"topic": "hardware", "rank": 3})
+    memory.add("The router serial is SN-88213 again", user_id="alice", metadata={"topic": "travel", "rank": 9})
+    # Added last, so they win the tie between identical mock vectors and fill the dense candidates.
+    memory.add(
+        [{"role": "user", "content": f"note number {i}"} for i in range(40)],
+        user_id="alice",
+        metadata={"topic": "hardware", "rank": 2},
+    )
+
+    result = memory.search("SN-88213", user_id="alice", limit=5, filters={key: condition}, mode="hybrid")
+
+    memories = [item["memory"] for item in result["results"]]
+    assert added["results"][0]["memory"] in memories
+    assert "The router serial is SN-88213 again" not in memories
+
+
+def test_deleted_memories_leave_the_lexical_index(memory):
+    added = memory.add("serial SN-1", user_id="alice")
+    memory.delete(added["results"][0]["id"])
+    memory.add("serial SN-2", user_id="alice")
+    memory.delete_all(user_id="alice")
+
+    assert memory.lexical.search("serial", {"user_id": "alice"}) == []
+    with pytest.raises(ValueError):
+        memory.search("serial", user_id="alice", mode="fuzzy")
+
+
+def test_updated_memory_keeps_its_session_and_stays_searchable(memory):
+    added = memory.get(memory.add("The router serial is SN-88213", user_id="alice")["results"][0]["id"])
+
+    memory.update(added["id"], "The router serial is SN-99999")
+
+    updated = memory.get(added["id"])
+    assert updated["memory"] == "The router serial is SN-99999"
+    assert updated["user_id"] == "alice"
+    assert updated["created_at"] == added["created_at"]
+    assert updated["updated_at"] is not None
+    assert [item["id"] for item in memory.get_all(user_id="alice")["results"]] == [added["id"]]
+    result = memory.search("SN-99999", user_id="alice", limit=1, mode="hybrid")
+    assert [item["id"] for item in result["results"]] == [added["id"]]
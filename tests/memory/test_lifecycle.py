@@ -0,0 +1,111 @@
+import functools
+import time
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from jmemory.configs.enums import MemoryType
+from jmemory.configs.lifecycle import LifecycleConfig
+from jmemory.memory.lifecycle import Usage, UsageCounters, plan_page
+from jmemory.memory.main import AsyncMemory, Memory
+
+HOUR = 60 * 60
+MID = MemoryType.MEDIUM_TERM.value
+LONG = MemoryType.LONG_TERM.value
+NOW = datetime(2025, 1, 31, tzinfo=timezone.utc).timestamp()
+CONFIG = LifecycleConfig(half_life=HOUR, promote_after=3, archive_below=0.5)
+
+
+def _point(point_id, age=0.0, **payload):
+    created_at = datetime.fromtimestamp(NOW - age, tz=timezone.utc).isoformat()
+    return SimpleNamespace(id=point_id, payload={"data": point_id, "created_at": created_at, **payload})
+
+
+@pytest.fixture
+def make_config(make_config):
+    lifecycle = LifecycleConfig(interval=3600, half_life=HOUR, promote_after=3, archive_below=0.5)
+    return functools.partial(make_config, lifecycle=lifecycle)
+
+
+def test_usage_counters_drain_and_requeue():
+    counters = UsageCounters()
+    counters.record_access(["a", "b"], at=10.0)
+    counters.record_mentions(["a"])
+
+    pending = counters.drain()
+    assert pending == {"a": Usage(accesses=1, mentions=1, last_accessed=10.0), "b": Usage(1, 0, 10.0)}
+    assert len(counters) == 0
+
+    counters.record_access(["a"], at=20.0)
+    counters.requeue(pending)
+    assert counters.drain()["a"] == Usage(accesses=2, mentions=1, last_accessed=20.0)
+
+
+def test_plan_page_promotes_repeated_and_archives_faded_mid_term_memories():
+    points = [
+        _point("repeated", memory_type=MID, mentions=2),
+        _point("faded", age=2 * HOUR, memory_type=MID),
+        _point("recalled", age=2 * HOUR, memory_type=MID, last_accessed_at=datetime.fromtimestamp(NOW).isoformat()),
+        _point("old long-term", age=100 * HOUR, memory_type=LONG),
+        _point("untouched", memory_type=MID),
+    ]
+    pending = {"repeated": Usage(accesses=1, last_accessed=NOW), "old long-term": Usage(mentions=4)}
+
+    plan = plan_page(points, pending, CONFIG, NOW)
+
+    assert plan.promoted == 1
+    assert plan.updates["repeated"]["memory_type"] == LONG
+    assert (plan.updates["repeated"]["mentions"], plan.updates["repeated"]["access_count"]) == (2, 1)
+    assert plan.updates["old long-term"] == {"access_count": 0, "mentions": 5}
+    assert list(plan.archived) == ["faded"]
+    assert "archived_at" in plan.archived["faded"]
+    # A recent search hit keeps a memory alive; memories without news are left alone.
+    assert "recalled" not in plan.archived and "untouched" not in plan.updates
+
+
+def test_background_pass_promotes_and_archives(embedder, make_config):
+    memory = Memory(make_config())
+    kept = memory.add("I prefer window seats", user_id="alice", memory_type=MID)["results"][0]["id"]
+    memory.add("i prefer window seats!", user_id="alice", memory_type=MID)
+    faded = memory.add("The hotel wifi password is 1234", user_id="alice", memory_type=MID)["results"][0]["id"]
+    memory.search("window seats", user_id="alice", limit=1, mode="hybrid")
+
+    stats = memory.run_lifecycle()
+    assert stats == {"scanned": 2, "updated": 1, "promoted": 1, "archived": 0}
+    promoted = memory.get(kept)
+    assert promoted["metadata"]["memory_type"] == LONG
+    assert promoted["metadata"]["mentions"] == 2 and promoted["metadata"]["access_count"] == 1
+
+    stats = memory.run_lifecycle(now=time.time() + 24 * HOUR)
+    assert stats["archived"] == 1
+    assert [item["id"] for item in memory.get_all(user_id="alice")["results"]] == [kept]
+    assert memory.search("wifi password", user_id="alice", mode="hybrid")["results"][0]["id"] == kept
+    # Archived, not lost.
+    assert memory.get(faded)["memory"] == "The hotel wifi password is 1234"
+    assert "archived_at" in memory.get(faded)["metadata"]
+
+    memory.delete_all(user_id="alice")
+    assert memory.get(faded) is None
+    memory._lifecycle.stop()
+
+
+def test_lifecycle_is_off_by_default(embedder, make_config):
+    memory = Memory(make_config(lifecycle=None))
+
+    assert memory.usage is None and memory.archive is None
+    with pytest.raises(ValueError):
+        memory.run_lifecycle()
+
+
+@pytest.mark.asyncio
+async def test_async_background_pass(embedder, make_config):
+    memory = AsyncMemory(make_config())
+    faded = (await memory.add("Parked on level 3", user_id="alice", memory_type=MID))["results"][0]["id"]
+
+    stats = await memory.run_lifecycle(now=time.time() + 24 * HOUR)
+
+    assert stats["archived"] == 1
+    assert (await memory.get_all(user_id="alice"))["results"] == []
+    assert (await memory.get(faded))["memory"] == "Parked on level 3"
+    await memory.close()
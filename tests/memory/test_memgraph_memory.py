@@ -0,0 +1,139 @@
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+pytest.importorskip("langchain_memgraph")
+
+from jmemory.configs.base import MemoryConfig  # noqa: E402
+from jmemory.configs.embeddings.base import BaseEmbedderConfig  # noqa: E402
+from jmemory.embeddings.configs import EmbedderConfig  # noqa: E402
+from jmemory.embeddings.mock import MockEmbeddings  # noqa: E402
+
+
+def make_config():
+    graph_config = SimpleNamespace(url="bolt://memgraph", username="memgraph", password="pw")
+    return SimpleNamespace(
+        graph_store=SimpleNamespace(config=graph_config, llm=None, custom_prompt=None),
+        embedder=EmbedderConfig(config={"embedding_dims": 2}),
+        llm=SimpleNamespace(provider="openai", config={}),
+    )
+
+
+@pytest.fixture
+def memgraph(mocker, import_graph_backend):
+    memgraph_memory = import_graph_backend("jmemory.memory.memgraph_memory")
+    mocker.patch.object(memgraph_memory, "Memgraph", return_value=MagicMock())
+    mocker.patch.object(
+        memgraph_memory.EmbedderFactory, "create", return_value=MockEmbeddings(BaseEmbedderConfig(embedding_dims=2))
+    )
+    mocker.patch.object(memgraph_memory.LlmFactory, "create", return_value=MagicMock())
+    graph = memgraph_memory.MemoryGraph(make_config())
+    graph.graph.query.reset_mock()
+    return graph
+
+
+def test_uses_vector_index(memgraph):
+    memgraph.graph.query.return_value = [
+        {"name": "alice", "matches": [{"id": 1, "similarity": 0.95}], "truncated": False}
+    ]
+
+    result = memgraph._find_similar_nodes({"alice": [1.0, 0.0]}, {"user_id": "u1"}, threshold=0.9)
+
+    assert result == {"alice": [{"id": 1, "similarity": 0.95}]}
+    cypher = memgraph.graph.query.call_args.args[0]
+    assert "vector_search.search" in cypher
+    assert memgraph.graph.query.call_count == 1
+
+
+def test_falls_back_to_scan_when_index_fails(memgraph):
+    memgraph.graph.query.side_effect = [
+        Exception("no such procedure"),
+        [{"id": 1, "embedding": [1.0, 0.0]}, {"id": 2, "embedding": [0.0, 1.0]}],
+    ]
+
+    result = memgraph._find_similar_nodes({"alice": [0.9, 0.1]}, {"user_id": "u1"}, threshold=0.9)
+
+    assert [match["id"] for match in result["alice"]] == [1]
+    assert memgraph.vector_index is None
+
+
+def test_grows_k_for_entities_with_truncated_index_results(memgraph):
+    memgraph.graph.query.side_effect = [
+        [
+            {"name": "alice", "matches": [{"id": 1, "similarity": 0.99}], "truncated": False},
+            {"name": "bob", "matches": [], "truncated": True},
+        ],
+        [{"name": "bob", "matches": [{"id": 7, "similarity": 0.95}], "truncated": False}],
+    ]
+
+    result = memgraph._find_similar_nodes({"alice": [1.0, 0.0], "bob": [0.0, 1.0]}, {"user_id": "u1"}, 0.9)
+
+    assert result == {"alice": [{"id": 1, "similarity": 0.99}], "bob": [{"id": 7, "similarity": 0.95}]}
+    first, second = (call.kwargs["params"] for call in memgraph.graph.query.call_args_list)
+    assert (first["k"], second["k"]) == (100, 400)
+    assert [item["name"] for item in second["items"]] == ["bob"]
+
+
+def test_rescans_entities_still_truncated_at_max_k(memgraph):
+    memgraph.vector_search_max_k = memgraph.vector_search_k
+    memgraph.graph.query.side_effect = [
+        [
+            {"name": "alice", "matches": [{"id": 1, "similarity": 0.99}], "truncated": True},
+            {"name": "bob", "matches": [], "truncated": True},
+        ],
+        [{"id": 7, "embedding": [0.0, 1.0]}],
+    ]
+
+    result = memgraph._find_similar_nodes(
+        {"alice": [1.0, 0.0], "bob": [0.0, 1.0]}, {"user_id": "u1", "agent_id": "a1"}, threshold=0.9
+    )
+
+    assert result == {"alice": [{"id": 1, "similarity": 0.99}], "bob": [{"id": 7, "similarity": 1.0}]}
+    scan_params = memgraph.graph.query.call_args.kwargs["params"]
+    assert scan_params == {"user_id": "u1", "agent_id": "a1"}
+
+
+def test_search_graph_db_expands_the_nodes_found_through_the_index(memgraph, mocker):
+    find = mocker.patch.object(memgraph, "_find_similar_nodes", return_value={"alice": [{"id": 1, "similarity": 0.9}]})
+    embed_batch = mocker.spy(memgraph.embedding_model, "embed_batch")
+
+    memgraph._search_graph_db(["alice", "tea"], {"user_id": "u1"})
+
+    embed_batch.assert_called_once_with(["alice", "tea"])
+    assert find.call_args.args[0].keys() == {"alice", "tea"}
+    cypher, params = memgraph.graph.query.call_args.args[0], memgraph.graph.query.call_args.kwargs["params"]
+    assert "cosine_pairwise" not in cypher
+    assert params["rows"] == [{"matches": [{"id": 1, "similarity": 0.9}]}, {"matches": []}]
+
+
+def test_add_entities_embeds_and_resolves_each_entity_once(memgraph, mocker):
+    find = mocker.patch.object(memgraph, "_find_similar_nodes", return_value={"alice": [{"id": 0, "similarity": 0.95}]})
+    embed_batch = mocker.spy(memgraph.embedding_model, "embed_batch")
+    to_be_added = [
+        {"source": "alice", "relationship": "likes", "destination": "tea"},
+        {"source": "tea", "relationship": "grown_in", "destination": "china"},
+    ]
+
+    memgraph._add_entities(to_be_added, {"user_id": "u1"}, {"alice": "person"})
+
+    embed_batch.assert_called_once_with(["alice", "tea", "china"])
+    find.assert_called_once()
+    first, second = memgraph.graph.query.call_args_list
+    # alice resolved to the existing node 0; tea and china are new.
+    assert first.kwargs["params"]["source_id"] == 0
+    assert "source_id" not in second.kwargs["params"]
+
+
+def test_graph_store_reads_embedding_dims_from_the_embedder_config(mocker):
+    from jmemory.graphs.memgraph_memory import MemoryGraph
+
+    mocker.patch("jmemory.graphs.memgraph_memory.Memgraph", return_value=MagicMock())
+    config = MemoryConfig()
+    config.embedder.config["embedding_dims"] = 3
+
+    graph = MemoryGraph(config)
+
+    assert "'dimension': 3" in graph.graph.query.call_args_list[0].args[0]
+    with pytest.raises(ValueError):
+        MemoryGraph(MemoryConfig())
@@ -0,0 +1,143 @@
+import asyncio
+import time
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from jmemory.configs.enums import MemoryType
+from jmemory.configs.retrieval import LayerConfig, RetrievalConfig
+from jmemory.memory.main import AsyncMemory, Memory
+from jmemory.memory.retrieval import LayeredRetriever
+
+SHORT = MemoryType.SHORT_TERM.value
+LONG = MemoryType.LONG_TERM.value
+EPISODIC = MemoryType.EPISODIC.value
+NOW = datetime(2025, 1, 31, tzinfo=timezone.utc).timestamp()
+
+
+def _point(point_id, score, age=0.0):
+    written = datetime.fromtimestamp(NOW - age, tz=timezone.utc).isoformat()
+    return SimpleNamespace(id=point_id, score=score, payload={"data": point_id, "created_at": written})
+
+
+def test_plan_routes_untyped_memories_to_their_layer():
+    retriever = LayeredRetriever(
+        RetrievalConfig(layers={SHORT: LayerConfig(top_k=20), LONG: LayerConfig(deadline_ms=50)}, deadline_ms=100)
+    )
+
+    plan = {name: (filters, k, deadline) for name, filters, k, deadline in retriever.plan({"user_id": "alice"}, 5)}
+
+    assert plan[SHORT] == ({"user_id": "alice", "memory_type": SHORT}, 20, 0.1)
+    filters, k, deadline = plan[LONG]
+    assert (k, deadline) == (5, 0.05)
+    assert LONG not in filters["memory_type"]["nin"] and SHORT in filters["memory_type"]["nin"]
+    assert [entry[0] for entry in retriever.plan({"user_id": "alice", "memory_type": SHORT}, 5)] == [SHORT]
+
+
+def test_rank_combines_similarity_recency_and_weight():
+    retriever = LayeredRetriever(
+        RetrievalConfig(
+            layers={SHORT: LayerConfig(half_life=3600), LONG: LayerConfig(), EPISODIC: LayerConfig(weight=0.5)},
+            recency_weight=0.5,
+        )
+    )
+    hits = {
+        SHORT: [_point("fresh", 0.8), _point("stale", 0.8, age=3600), _point("shared", 0.6)],
+        LONG: [_point("shared", 0.9, age=10**6)],
+        EPISODIC: [_point("episode", 1.0)],
+    }
+
+    ranked = retriever.rank(hits, limit=10, now=NOW)
+
+    assert [point.id for point in ranked] == ["shared", "fresh", "stale", "episode"]
+    scores = {point.id: point.score for point in ranked}
+    assert scores["fresh"] == pytest.approx(0.9)
+    assert scores["stale"] == pytest.approx(0.65)
+    assert scores["shared"] == pytest.approx(0.95)
+    assert scores["episode"] == pytest.approx(0.5)
+    assert [point.id for point in retriever.rank(hits, limit=2, now=NOW)] == ["shared", "fresh"]
+
+
+def test_slow_layers_return_partial_results():
+    retriever = LayeredRetriever(
+        RetrievalConfig(layers={SHORT: LayerConfig(), LONG: LayerConfig(deadline_ms=50)}, deadline_ms=1000)
+    )
+
+    def search_layer(layer, filters, k):
+        if layer == LONG:
+            time.sleep(0.5)
+        return [_point(layer, 0.5)]
+
+    start = time.monotonic()
+    points, report = retriever.search(search_layer, {"user_id": "alice"}, 5)
+
+    assert time.monotonic() - start < 0.4
+    assert [point.id for point in points] == [SHORT]
+    assert report == {SHORT: {"status": "ok", "hits": 1}, LONG: {"status": "timeout", "hits": 0}}
+    retriever.close()
+
+
+def test_failing_layers_are_reported_unless_all_fail():
+    retriever = LayeredRetriever(RetrievalConfig(layers={SHORT: LayerConfig(), LONG: LayerConfig()}))
+
+    def search_layer(layer, filters, k):
+        if layer == LONG:
+            raise ConnectionError("store down")
+        return [_point(layer, 0.5)]
+
+    points, report = retriever.search(search_layer, {}, 5)
+    assert [point.id for point in points] == [SHORT]
+    assert report[LONG] == {"status": "error", "hits": 0, "error": "store down"}
+
+    with pytest.raises(ConnectionError):
+        retriever.search(lambda layer, filters, k: search_layer(LONG, filters, k), {}, 5)
+    retriever.close()
+
+
+@pytest.mark.asyncio
+async def test_async_slow_layers_return_partial_results():
+    retriever = LayeredRetriever(
+        RetrievalConfig(layers={SHORT: LayerConfig(deadline_ms=50), LONG: LayerConfig()}, deadline_ms=1000)
+    )
+
+    async def search_layer(layer, filters, k):
+        if layer == SHORT:
+            await asyncio.sleep(0.5)
+        return [_point(layer, 0.5)]
+
+    points, report = await retriever.asearch(search_layer, {}, 5)
+
+    assert [point.id for point in points] == [LONG]
+    assert report[SHORT]["status"] == "timeout"
+
+
+def test_layered_search_queries_every_layer(embedder, make_config):
+    memory = Memory(make_config())
+    memory.add("I like green tea", user_id="alice")
+    memory.add("We met in Lisbon", user_id="alice", memory_type=EPISODIC)
+    memory.add("Just said hello", user_id="alice", memory_type=SHORT)
+    memory.add("Bob likes coffee", user_id="bob")
+
+    result = memory.search("tea", user_id="alice", limit=10, mode="layered")
+
+    assert {item["memory"] for item in result["results"]} == {"I like green tea", "We met in Lisbon", "Just said hello"}
+    assert set(result["layers"]) == {memory_type.value for memory_type in MemoryType}
+    assert all(layer["status"] == "ok" for layer in result["layers"].values())
+    assert result["layers"][EPISODIC]["hits"] == 1
+    # The default weights rank the episodic layer below equally similar long-term memories.
+    assert result["results"][-1]["memory"] == "We met in Lisbon"
+    assert "layers" not in memory.search("tea", user_id="alice")
+
+
+@pytest.mark.asyncio
+async def test_async_layered_search(embedder, make_config):
+    memory = AsyncMemory(make_config())
+    await memory.add("I like green tea", user_id="alice")
+    await memory.add("We met in Lisbon", user_id="alice", memory_type=EPISODIC)
+
+    result = await memory.search("tea", user_id="alice", mode="layered")
+
+    assert [item["memory"] for item in result["results"]] == ["I like green tea", "We met in Lisbon"]
+    assert result["layers"][LONG] == {"status": "ok", "hits": 1}
+    await memory.close()
@@ -0,0 +1,192 @@
+import gc
+import threading
+import time
+import weakref
+
+import pytest
+
+from jmemory.configs.enums import MemoryType
+from jmemory.configs.short_term import ShortTermConfig
+from jmemory.memory.main import Memory
+from jmemory.memory.short_term import ShortTermBuffer, ShortTermPromoter
+
+
+def _payload(text, user_id="alice", **extra):
+    return {"data": text, "user_id": user_id, **extra}
+
+
+def test_recent_is_scoped_and_newest_first():
+    buffer = ShortTermBuffer()
+    buffer.add(["1", "2"], [[1.0, 0.0], [0.0, 1.0]], [_payload("first"), _payload("second")])
+    buffer.add(["3"], [[1.0, 1.0]], [_payload("other", user_id="bob")])
+
+    assert [entry.id for entry in buffer.recent({"user_id": "alice"})] == ["2", "1"]
+    assert [entry.id for entry in buffer.recent({"user_id": "bob"})] == ["3"]
+
+
+def test_session_filters_match_wider_sessions():
+    buffer = ShortTermBuffer()
+    buffer.add(["1"], [[1.0, 0.0]], [_payload("hello", run_id="r1")])
+
+    assert [entry.id for entry in buffer.recent({"user_id": "alice"})] == ["1"]
+    assert buffer.recent({"user_id": "alice", "run_id": "r2"}) == []
+
+
+def test_lookup_and_search():
+    buffer = ShortTermBuffer()
+    buffer.add(["1", "2"], [[1.0, 0.0], [0.0, 1.0]], [_payload("tea"), _payload("coffee")])
+
+    assert buffer.lookup({"user_id": "alice"}, "coffee").id == "2"
+    assert buffer.lookup({"user_id": "bob"}, "coffee") is None
+
+    hits = buffer.search({"user_id": "alice"}, [0.1, 0.9], limit=1)
+    assert [hit.id for hit in hits] == ["2"]
+    assert hits[0].score == pytest.approx(0.9939, abs=1e-3)
+
+
+def test_ring_is_bounded_but_everything_is_promoted():
+    buffer = ShortTermBuffer(capacity=2)
+    buffer.add(["1", "2", "3"], [[1.0]] * 3, [_payload(str(i)) for i in range(3)])
+
+    assert [entry.id for entry in buffer.recent({"user_id": "alice"})] == ["3", "2"]
+    assert buffer.lookup({"user_id": "alice"}, "0") is None
+    assert [entry.id for entry in buffer.drain()] == ["1", "2", "3"]
+
+
+def test_entries_expire_after_ttl():
+    buffer = ShortTermBuffer(ttl=0.01)
+    buffer.add(["1"], [[1.0]], [_payload("old")])
+    time.sleep(0.02)
+
+    assert buffer.recent({"user_id": "alice"}) == []
+
+
+def test_promoter_requeues_failed_batches():
+    buffer = ShortTermBuffer()
+    buffer.add(["1", "2", "3"], [[1.0]] * 3, [_payload(str(i)) for i in range(3)])
+    promoted = []
+    calls = {"count": 0}
+
+    def sink(entries):
+        calls["count"] += 1
+        if calls["count"] == 1:
+            raise RuntimeError("vector store down")
+        promoted.extend(entry.id for entry in entries)
+
+    promoter = ShortTermPromoter(buffer, sink, batch_size=2, interval=60)
+    with pytest.raises(RuntimeError):
+        promoter.flush()
+    promoter.stop()
+
+    assert promoted == ["1", "2", "3"]
+    assert buffer.pending() == 0
+
+
+def test_get_and_update_by_id():
+    buffer = ShortTermBuffer(capacity=2)
+    buffer.add(["1", "2"], [[1.0, 0.0], [0.0, 1.0]], [_payload("tea"), _payload("coffee")])
+
+    assert buffer.update("1", [0.5, 0.5], _payload("green tea"))
+    assert buffer.get("1").payload["data"] == "green tea"
+    assert buffer.lookup({"user_id": "alice"}, "green tea").id == "1"
+    assert [entry.payload["data"] for entry in buffer.drain()] == ["green tea", "coffee"]
+
+    buffer.add(["3"], [[1.0, 1.0]], [_payload("water")])
+    assert buffer.get("1") is None  # evicted from the ring
+    buffer.discard("2")
+    assert buffer.get("2") is None and buffer.get("3").id == "3"
+    assert not buffer.update("2", [0.0, 1.0], _payload("juice"))
+
+
+@pytest.fixture
+def config(embedder, make_config):
+    return make_config(short_term=ShortTermConfig(promote_interval=60))
+
+
+@pytest.fixture
+def memory(config):
+    with Memory(config) as memory:
+        yield memory
+
+
+def test_short_term_adds_are_buffered_then_promoted(memory):
+    added = memory.add("I like tea", user_id="alice", memory_type=MemoryType.SHORT_TERM.value)
+    memory_id = added["results"][0]["id"]
+
+    assert memory.vector_store.get(memory_id) is None
+    assert [item["id"] for item in memory.search("tea", user_id="alice")["results"]] == [memory_id]
+
+    memory._promoter.flush()
+    assert memory.vector_store.get(memory_id) is not None
+    # Promoted entries stay readable from the buffer without showing up twice.
+    assert len(memory.search("tea", user_id="alice")["results"]) == 1
+
+
+def test_update_of_a_buffered_memory_survives_promotion(memory):
+    memory_id = memory.add("I like tea", user_id="alice", memory_type=MemoryType.SHORT_TERM.value)["results"][0]["id"]
+
+    memory.update(memory_id, {"data": "I like coffee", "user_id": "alice"})
+    memory._promoter.flush()
+
+    assert memory.get(memory_id)["memory"] == "I like coffee"
+    assert memory.vector_store.get(memory_id).payload["data"] == "I like coffee"
+
+
+def test_delete_waits_for_an_in_flight_promotion(memory):
+    memory_id = memory.add("I like tea", user_id="alice", memory_type=MemoryType.SHORT_TERM.value)["results"][0]["id"]
+    draining, release = threading.Event(), threading.Event()
+    sink = memory._promoter.sink
+
+    def slow_sink(entries):
+        draining.set()
+        release.wait(5)
+        sink(entries)
+
+    memory._promoter.sink = slow_sink
+    promotion = threading.Thread(target=memory._promoter.flush)
+    promotion.start()
+    assert draining.wait(5)
+
+    # The batch holding the memory is already off the queue; the delete must not run before it lands.
+    deleter = threading.Thread(target=memory.delete, args=(memory_id,))
+    deleter.start()
+    deleter.join(0.2)
+    assert deleter.is_alive()
+    release.set()
+    promotion.join(5)
+    deleter.join(5)
+
+    assert memory.vector_store.get(memory_id) is None
+    assert memory.get(memory_id) is None
+
+
+def test_recent_and_lookup_are_served_from_the_buffer(memory):
+    memory.add("I like tea", user_id="alice", memory_type=MemoryType.SHORT_TERM.value)
+    coffee = memory.add("I like coffee", user_id="alice", memory_type=MemoryType.SHORT_TERM.value)["results"][0]
+    memory.add("I like water", user_id="bob", memory_type=MemoryType.SHORT_TERM.value)
+
+    assert [item["memory"] for item in memory.recent(user_id="alice")["results"]] == ["I like coffee", "I like tea"]
+    assert memory.lookup("I like coffee", user_id="alice")["id"] == coffee["id"]
+    assert memory.lookup("I like coffee", user_id="bob") is None
+
+
+def test_close_promotes_the_buffer_and_stops_the_promoter(memory):
+    memory_id = memory.add("I like tea", user_id="alice", memory_type=MemoryType.SHORT_TERM.value)["results"][0]["id"]
+
+    memory.close()
+
+    assert not memory._promoter._thread.is_alive()
+    assert memory.vector_store.get(memory_id) is not None
+
+
+def test_unreferenced_memory_is_freed_after_promoting_its_buffer(config):
+    memory = Memory(config)
+    vector_store = memory.vector_store
+    memory_id = memory.add("I like tea", user_id="alice", memory_type=MemoryType.SHORT_TERM.value)["results"][0]["id"]
+    ref = weakref.ref(memory)
+
+    del memory
+    gc.collect()
+
+    assert ref() is None
+    assert vector_store.get(memory_id) is not None
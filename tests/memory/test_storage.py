@@ -0,0 +1,132 @@
+import subprocess
+import sys
+import threading
+
+import pytest
+
+from jmemory.configs.base import MemoryConfig
+from jmemory.configs.embeddings.base import BaseEmbedderConfig
+from jmemory.configs.vector_store import VectorStoreConfig
+from jmemory.embeddings.mock import MockEmbeddings
+from jmemory.memory.main import Memory
+from jmemory.memory.storage import SQLiteManager
+
+
+@pytest.fixture
+def manager(tmp_path):
+    manager = SQLiteManager(str(tmp_path / "history.db"))
+    yield manager
+    manager.close()
+
+
+def test_uses_wal_and_memory_id_index(manager):
+    journal_mode = manager.connection.execute("PRAGMA journal_mode").fetchone()[0]
+    plan = manager.connection.execute(
+        "EXPLAIN QUERY PLAN SELECT * FROM history WHERE memory_id = ? ORDER BY created_at", ("m1",)
+    ).fetchall()
+
+    assert journal_mode == "wal"
+    assert any("idx_history_memory_id_created_at" in row[-1] for row in plan)
+
+
+def test_add_history_many_in_order(manager):
+    manager.add_history_many(
+        [
+            {"memory_id": "m1", "old_memory": None, "new_memory": "a", "event": "ADD", "created_at": "1"},
+            {"memory_id": "m1", "old_memory": "a", "new_memory": "b", "event": "UPDATE", "created_at": "2"},
+            {"memory_id": "m2", "old_memory": None, "new_memory": "c", "event": "ADD", "created_at": "1"},
+        ]
+    )
+
+    history = manager.get_history("m1")
+
+    assert [item["event"] for item in history] == ["ADD", "UPDATE"]
+    assert history[1]["old_memory"] == "a"
+    assert history[0]["is_deleted"] is False
+
+
+def test_write_behind_is_visible_after_flush(tmp_path):
+    manager = SQLiteManager(str(tmp_path / "history.db"), write_behind=True, batch_size=2, flush_interval=0.01)
+    for i in range(5):
+        manager.add_history("m1", None, str(i), "ADD", created_at=str(i))
+
+    manager.flush()
+    count = manager.connection.execute("SELECT COUNT(*) FROM history").fetchone()[0]
+    manager.close()
+
+    assert count == 5
+
+
+def test_close_drains_write_behind_queue(tmp_path):
+    db_path = str(tmp_path / "history.db")
+    manager = SQLiteManager(db_path, write_behind=True)
+    manager.add_history("m1", None, "a", "ADD")
+    manager.close()
+
+    reopened = SQLiteManager(db_path)
+    assert len(reopened.get_history("m1")) == 1
+    reopened.close()
+
+
+def test_write_behind_queue_is_written_at_exit(tmp_path):
+    db_path = str(tmp_path / "history.db")
+    code = (
+        "import sys; from jmemory.memory.storage import SQLiteManager; "
+        "manager = SQLiteManager(sys.argv[1], write_behind=True); "
+        "[manager.add_history('m1', None, str(i), 'ADD') for i in range(500)]"
+    )
+    subprocess.run([sys.executable, "-c", code, db_path], check=True)
+
+    reopened = SQLiteManager(db_path)
+    assert len(reopened.get_history("m1")) == 500
+    reopened.close()
+
+
+def test_reset_recreates_table(manager):
+    manager.add_history("m1", None, "a", "ADD")
+
+    manager.reset()
+
+    assert manager.get_history("m1") == []
+
+
+def test_reads_do_not_wait_for_the_write_lock(manager):
+    manager.add_history("m1", None, "a", "ADD")
+    history = []
+
+    with manager._lock:
+        reader = threading.Thread(target=lambda: history.extend(manager.get_history("m1")))
+        reader.start()
+        reader.join(timeout=5)
+        assert not reader.is_alive()
+
+    assert [item["new_memory"] for item in history] == ["a"]
+
+
+def test_memory_records_add_update_and_delete(mocker, tmp_path):
+    mocker.patch("jmemory.memory.main.LlmLoader")
+    mocker.patch(
+        "jmemory.memory.main._create_embedder", return_value=MockEmbeddings(BaseEmbedderConfig(embedding_dims=10))
+    )
+    memory = Memory(
+        MemoryConfig(
+            vector_store=VectorStoreConfig(collection_name="test", path=str(tmp_path / "qdrant"), on_disk=True),
+            graph_store=None,
+            history_db_path=str(tmp_path / "history.db"),
+            history_write_behind=True,
+        )
+    )
+    memory_id = memory.add("I like tea", user_id="alice")["results"][0]["id"]
+    memory.update(memory_id, {"data": "I like coffee", "user_id": "alice"})
+    memory.delete(memory_id)
+
+    history = memory.history(memory_id)
+
+    assert [(item["event"], item["old_memory"], item["new_memory"]) for item in history] == [
+        ("ADD", None, "I like tea"),
+        ("UPDATE", "I like tea", "I like coffee"),
+        ("DELETE", "I like coffee", None),
+    ]
+    assert history[2]["is_deleted"] is True
+    assert memory.db._writer is not None
+    memory.close()
@@ -0,0 +1,131 @@
+import functools
+from unittest.mock import Mock, patch
+
+import pytest
+
+from jmemory.configs.llms.base import BaseLlmConfig
+from jmemory.llms.openai import OpenAILLM
+from jmemory.memory.main import AsyncMemory, Memory
+from jmemory.memory.storage import SQLiteManager
+from jmemory.memory.telemetry import InMemoryExporter, PrometheusExporter, telemetry
+
+
+@pytest.fixture
+def exporter():
+    exporter = telemetry.add_exporter(InMemoryExporter())
+    yield exporter
+    telemetry.remove_exporter(exporter)
+
+
+@pytest.fixture
+def make_config(make_config):
+    # A history store's write-behind thread would record history.write spans into later tests' exporters.
+    return functools.partial(make_config, history_db_path=None)
+
+
+def test_spans_are_not_recorded_without_exporters():
+    with telemetry.span("anything") as span:
+        span.set_attribute("ignored", True)
+    assert not telemetry.enabled
+
+
+def test_memory_operations_record_nested_stage_spans(embedder, make_config, exporter):
+    memory = Memory(make_config())
+
+    memory.add("I live in Lisbon", user_id="alice")
+    memory.search("Lisbon", user_id="alice", mode="hybrid")
+
+    assert exporter.summary("memory.add")["count"] == 1
+    assert exporter.summary("memory.search")["count"] == 1
+    search = next(span for span in exporter.spans if span.name == "memory.search")
+    assert [child.name for child in exporter.children(search)] == ["embed", "vector_store.search", "lexical.search"]
+    summary = exporter.summary("embed")
+    assert summary["count"] == 2
+    assert 0 <= summary["p50"] <= summary["p99"] <= summary["max"]
+    assert exporter.counter("embed.texts") == 2
+    assert exporter.counter("embed.bytes") == len("I live in Lisbon") + len("Lisbon")
+
+
+@pytest.mark.asyncio
+async def test_async_spans_nest_across_threads_and_gather(embedder, make_config, exporter):
+    memory = AsyncMemory(make_config())
+
+    await memory.add("I live in Lisbon", user_id="alice")
+
+    add = next(span for span in exporter.spans if span.name == "memory.add")
+    assert {child.name for child in exporter.children(add)} == {
+        "dedup.claim",
+        "embed",
+        "vector_store.insert",
+        "lexical.add",
+    }
+
+
+def test_failed_spans_are_marked(exporter):
+    prometheus = telemetry.add_exporter(PrometheusExporter(buckets=(0.1, 1.0)))
+    try:
+        with pytest.raises(RuntimeError):
+            with telemetry.span("graph.search"):
+                raise RuntimeError("boom")
+        telemetry.count("llm.prompt_tokens", 12, model="gpt-4o")
+        telemetry.count("embed.bytes", 1234567)
+        telemetry.count("embed.bytes", 0.5)
+    finally:
+        telemetry.remove_exporter(prometheus)
+
+    assert exporter.spans[-1].error == "RuntimeError"
+    text = prometheus.render()
+    assert 'jmemory_span_duration_seconds_bucket{le="0.1",span="graph.search",status="error"} 1' in text
+    assert 'jmemory_span_duration_seconds_count{span="graph.search",status="error"} 1' in text
+    assert 'jmemory_llm_prompt_tokens_total{model="gpt-4o"} 12' in text
+    assert "jmemory_embed_bytes_total 1234567.5" in text
+
+
+def test_llm_calls_record_spans_and_tokens(exporter):
+    with patch("jmemory.llms.openai.OpenAI") as mock_openai:
+        mock_openai.return_value.chat.completions.create.return_value = Mock(
+            choices=[Mock(message=Mock(content="hello", tool_calls=None))],
+            usage=Mock(prompt_tokens=11, completion_tokens=3),
+        )
+        llm = OpenAILLM(BaseLlmConfig(model="gpt-4o", api_key="api_key"))
+        assert llm.generate_response([{"role": "user", "content": "hi"}]) == "hello"
+
+    assert exporter.summary("llm.generate")["count"] == 1
+    assert exporter.counter("llm.calls", provider="OpenAILLM") == 1
+    assert exporter.counter("llm.prompt_tokens", model="gpt-4o") == 11
+    assert exporter.counter("llm.completion_tokens") == 3
+    assert exporter.counter("llm.response_bytes") == len('"hello"')
+
+
+def test_history_writes_are_timed(tmp_path, exporter):
+    manager = SQLiteManager(str(tmp_path / "history.db"))
+    manager.add_history_many(
+        [{"memory_id": "m1", "old_memory": None, "new_memory": "a", "event": "ADD"} for _ in range(3)]
+    )
+
+    assert exporter.summary("history.write")["count"] == 1
+    assert exporter.counter("history.rows") == 3
+
+
+def test_opentelemetry_exporter_keeps_parent_links():
+    sdk_trace = pytest.importorskip("opentelemetry.sdk.trace")
+    from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+    from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+    from jmemory.memory.telemetry import OpenTelemetryExporter
+
+    spans = InMemorySpanExporter()
+    provider = sdk_trace.TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(spans))
+    exporter = telemetry.add_exporter(OpenTelemetryExporter(tracer_provider=provider))
+    try:
+        with telemetry.span("memory.search"):
+            with telemetry.span("embed", texts=1):
+                pass
+    finally:
+        telemetry.remove_exporter(exporter)
+
+    embed, search = spans.get_finished_spans()
+    assert (embed.name, search.name) == ("embed", "memory.search")
+    assert embed.parent.span_id == search.context.span_id
+    assert embed.attributes["texts"] == 1
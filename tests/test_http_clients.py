@@ -0,0 +1,102 @@
+import threading
+from unittest.mock import MagicMock, Mock
+
+import httpx
+import pytest
+
+from jmemory.configs.llms.base import BaseLlmConfig
+from jmemory.llms.openai import OpenAILLM
+from jmemory.utils import http
+from jmemory.utils.factory import LlmFactory, _InstanceRegistry
+
+
+@pytest.fixture(autouse=True)
+def clean_registry():
+    http.close_all()
+    LlmFactory.instances.clear()
+    yield
+    http.close_all()
+    LlmFactory.instances.clear()
+
+
+def test_shared_client_reuses_instances_and_pools():
+    sdk = MagicMock()
+
+    first = http.shared_client(sdk, api_key="sk-secret", base_url="https://api.example.com/v1")
+    second = http.shared_client(sdk, api_key="sk-secret", base_url="https://api.example.com/v1")
+    http.shared_client(sdk, api_key="other", base_url="https://api.example.com/v2")
+
+    assert first is second
+    assert sdk.call_count == 2
+    pools = [call.kwargs["http_client"] for call in sdk.call_args_list]
+    # Same origin, different credentials: separate SDK clients over one connection pool.
+    assert pools[0] is pools[1]
+    assert isinstance(pools[0], httpx.Client)
+    assert http.stats()["pools"] == ["https://api.example.com:443"]
+    assert "sk-secret" not in repr(list(http._clients))
+
+
+def test_shared_client_keeps_explicit_http_client():
+    sdk = Mock()
+    proxied = Mock()
+
+    http.shared_client(sdk, api_key="key", http_client=proxied)
+
+    assert sdk.call_args.kwargs["http_client"] is proxied
+    assert http.stats()["pools"] == []
+
+
+def test_shared_client_passes_pool_settings_to_sdks_without_http_client():
+    sdk = Mock()
+    http.configure_http(max_connections=7, keepalive_expiry=5.0)
+    try:
+        http.shared_client(sdk, http_client_param=None, host="http://localhost:11434")
+    finally:
+        http.configure_http(max_connections=100, keepalive_expiry=60.0)
+
+    kwargs = sdk.call_args.kwargs
+    assert kwargs["host"] == "http://localhost:11434"
+    assert kwargs["limits"].max_connections == 7
+    assert kwargs["limits"].keepalive_expiry == 5.0
+    assert "http_client" not in kwargs
+
+
+def test_openai_llms_share_one_client():
+    config = {"model": "gpt-4o-mini", "api_key": "api_key", "openai_base_url": "https://api.example.com/v1"}
+
+    first = OpenAILLM(BaseLlmConfig(**config))
+    second = OpenAILLM(BaseLlmConfig(**config, temperature=0.5))
+
+    assert first.client is second.client
+    assert first.client._client is http.http_client("https://api.example.com/v1")
+
+
+def test_llm_factory_reuses_instances():
+    config = {"model": "gpt-4o-mini", "api_key": "api_key"}
+
+    llm = LlmFactory.create("openai", config)
+
+    assert LlmFactory.create("openai", dict(config)) is llm
+    assert LlmFactory.create("openai", {**config, "temperature": 0.5}) is not llm
+    assert LlmFactory.create("openai", config, reuse=False) is not llm
+
+
+def test_registry_builds_outside_its_lock():
+    registry = _InstanceRegistry()
+    building, release = threading.Event(), threading.Event()
+
+    def slow_build():
+        building.set()
+        release.wait(5)
+        return "slow"
+
+    slow = threading.Thread(target=registry.get_or_create, args=(OpenAILLM, {"model": "a"}, slow_build))
+    slow.start()
+    assert building.wait(5)
+    # Another config is served while the first one is still being built.
+    assert registry.get_or_create(OpenAILLM, {"model": "b"}, lambda: "fast") == "fast"
+    # Two builds racing for one config both get the first one to finish.
+    assert registry.get_or_create(OpenAILLM, {"model": "a"}, lambda: "first") == "first"
+    release.set()
+    slow.join(5)
+    assert registry.get_or_create(OpenAILLM, {"model": "a"}, lambda: "again") == "first"
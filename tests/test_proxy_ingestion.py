@@ -0,0 +1,98 @@
+import queue
+import threading
+import time
+from unittest.mock import Mock
+
+import pytest
+
+from jmemory.proxy.ingestion import IngestionQueue
+from jmemory.proxy.main import Completions
+
+
+def _wait_until_picked_up(ingestion):
+    while ingestion.metrics()["depth"]:
+        time.sleep(0.001)
+
+
+def test_consecutive_turns_of_a_session_are_coalesced_in_order():
+    gate = threading.Event()
+    calls = []
+
+    def add_fn(messages, **kwargs):
+        gate.wait()
+        calls.append((kwargs["user_id"], [m["content"] for m in messages]))
+
+    ingestion = IngestionQueue(add_fn, num_workers=1)
+    ingestion.submit([{"role": "user", "content": "warmup"}], user_id="alice")
+    _wait_until_picked_up(ingestion)
+    for i in range(3):
+        ingestion.submit([{"role": "user", "content": f"a{i}"}], user_id="alice")
+    ingestion.submit([{"role": "user", "content": "b0"}], user_id="bob")
+    ingestion.submit([{"role": "user", "content": "a3"}], user_id="alice")
+    gate.set()
+    ingestion.shutdown()
+
+    assert calls == [
+        ("alice", ["warmup"]),
+        ("alice", ["a0", "a1", "a2"]),
+        ("bob", ["b0"]),
+        ("alice", ["a3"]),
+    ]
+    metrics = ingestion.metrics()
+    assert metrics["processed"] == 6
+    assert metrics["adds"] == 4
+    assert metrics["coalesced"] == 2
+    assert metrics["depth"] == 0
+
+
+def test_submit_applies_backpressure_when_full():
+    gate = threading.Event()
+    ingestion = IngestionQueue(
+        lambda messages, **kwargs: gate.wait(), num_workers=1, max_queue_size=1, put_timeout=0.05
+    )
+    ingestion.submit(["first"], user_id="alice")
+    _wait_until_picked_up(ingestion)
+    ingestion.submit(["second"], user_id="alice")
+
+    with pytest.raises(queue.Full):
+        ingestion.submit(["third"], user_id="alice")
+
+    gate.set()
+    ingestion.shutdown()
+
+
+def test_failures_are_counted_and_do_not_stop_the_worker():
+    add_fn = Mock(side_effect=[RuntimeError("boom"), None])
+    ingestion = IngestionQueue(add_fn, num_workers=1, max_batch=1)
+    ingestion.submit(["one"], user_id="alice")
+    ingestion.submit(["two"], user_id="alice")
+    ingestion.shutdown()
+
+    assert add_fn.call_count == 2
+    assert ingestion.metrics()["failed"] == 1
+
+
+def test_shutdown_rejects_new_jobs():
+    ingestion = IngestionQueue(Mock(), num_workers=1)
+    ingestion.shutdown()
+
+    with pytest.raises(RuntimeError):
+        ingestion.submit(["late"], user_id="alice")
+
+
+def test_completions_queue_short_term_adds():
+    client = Mock()
+    completions = Completions(client)
+
+    completions._async_add_to_memory([{"role": "user", "content": "hi"}], "alice", None, None, None, None)
+    completions.ingestion.shutdown()
+
+    client.add.assert_called_once_with(
+        messages=[{"role": "user", "content": "hi"}],
+        memory_type="short_term_memory",
+        user_id="alice",
+        agent_id=None,
+        run_id=None,
+        metadata=None,
+        filters=None,
+    )
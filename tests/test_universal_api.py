@@ -0,0 +1,105 @@
+import asyncio
+import importlib
+import json
+import sys
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("litellm")
+
+
+@pytest.fixture
+def api(mocker):
+    # The module builds its AsyncMemory at import time; swap it out before importing.
+    memory = mocker.patch("jmemory.memory.main.AsyncMemory").return_value
+    memory.search = AsyncMock(return_value={"results": []})
+    memory.add = AsyncMock()
+    sys.modules.pop("universal_api.main", None)
+    module = importlib.import_module("universal_api.main")
+    yield module
+    sys.modules.pop("universal_api.main", None)
+
+
+def chunk(content):
+    delta = SimpleNamespace(content=content)
+    return SimpleNamespace(
+        choices=[SimpleNamespace(delta=delta)], model_dump_json=lambda: json.dumps({"content": content})
+    )
+
+
+def fake_stream(*contents, hang=False):
+    async def stream():
+        for content in contents:
+            yield chunk(content)
+        if hang:
+            # A slow provider: the client gives up before the next chunk.
+            await asyncio.Event().wait()
+
+    return AsyncMock(return_value=stream())
+
+
+async def post_stream(app, disconnect_after_first_chunk=False):
+    """Drive one streaming request through the ASGI app and return the body chunks it sent."""
+    body = json.dumps({"model": "gpt-4o", "messages": [{"role": "user", "content": "hi"}], "stream": True})
+    first_chunk_sent = asyncio.Event()
+    requested = False
+    sent = []
+
+    async def receive():
+        nonlocal requested
+        if not requested:
+            requested = True
+            return {"type": "http.request", "body": body.encode(), "more_body": False}
+        if disconnect_after_first_chunk:
+            await first_chunk_sent.wait()
+            return {"type": "http.disconnect"}
+        await asyncio.Event().wait()
+
+    async def send(message):
+        if message["type"] == "http.response.body" and message.get("body"):
+            sent.append(message["body"].decode())
+            first_chunk_sent.set()
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": "/v1/chat/completions",
+        "raw_path": b"/v1/chat/completions",
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"content-type", b"application/json")],
+        "client": ("testclient", 123),
+        "server": ("testserver", 80),
+    }
+    await asyncio.wait_for(app(scope, receive, send), timeout=5)
+    return sent
+
+
+@pytest.mark.asyncio
+async def test_stream_is_remembered_once_after_done(api, mocker):
+    mocker.patch.object(api.litellm, "acompletion", fake_stream("Hello", None, " world"))
+
+    sent = await post_stream(api.app)
+
+    assert sent[-1] == "data: [DONE]\n\n"
+    assert len(sent) == 4
+    api.jmemory.add.assert_awaited_once_with(
+        messages=[{"role": "user", "content": "hi"}, {"role": "assistant", "content": "Hello world"}],
+        user_id="test_user",
+    )
+
+
+@pytest.mark.asyncio
+async def test_stream_abandoned_before_done_is_not_remembered(api, mocker):
+    mocker.patch.object(api.litellm, "acompletion", fake_stream("Hello", hang=True))
+
+    sent = await post_stream(api.app, disconnect_after_first_chunk=True)
+
+    assert sent == ['data: {"content": "Hello"}\n\n']
+    api.jmemory.add.assert_not_awaited()
@@ -1,291 +1,193 @@
 import os
-import tempfile
-from unittest.mock import Mock, patch
 
-import faiss
 import numpy as np
 import pytest
 
-from mem0.vector_stores.faiss import FAISS, OutputData
+pytest.importorskip("faiss")
 
+from jmemory.configs.base import MemoryConfig  # noqa: E402
+from jmemory.configs.embeddings.base import BaseEmbedderConfig  # noqa: E402
+from jmemory.configs.vector_store import VectorStoreConfig  # noqa: E402
+from jmemory.configs.vector_stores.faiss import FAISSConfig  # noqa: E402
+from jmemory.embeddings.mock import MockEmbeddings  # noqa: E402
+from jmemory.memory.main import AsyncMemory, Memory  # noqa: E402
+from jmemory.vector_stores.faiss import WAL_FILE, AsyncFAISS, FAISS  # noqa: E402
 
-@pytest.fixture
-def mock_faiss_index():
-    index = Mock(spec=faiss.IndexFlatL2)
-    index.d = 128  # Dimension of the vectors
-    index.ntotal = 0  # Number of vectors in the index
-    return index
-
-
-@pytest.fixture
-def faiss_instance(mock_faiss_index):
-    with tempfile.TemporaryDirectory() as temp_dir:
-        # Mock the faiss index creation
-        with patch("faiss.IndexFlatL2", return_value=mock_faiss_index):
-            # Mock the faiss.write_index function
-            with patch("faiss.write_index"):
-                # Create a FAISS instance with a temporary directory
-                faiss_store = FAISS(
-                    collection_name="test_collection",
-                    path=os.path.join(temp_dir, "test_faiss"),
-                    distance_strategy="euclidean",
-                )
-                # Set up the mock index
-                faiss_store.index = mock_faiss_index
-                yield faiss_store
-
-
-def test_create_col(faiss_instance, mock_faiss_index):
-    # Test creating a collection with euclidean distance
-    with patch("faiss.IndexFlatL2", return_value=mock_faiss_index) as mock_index_flat_l2:
-        with patch("faiss.write_index"):
-            faiss_instance.create_col(name="new_collection")
-            mock_index_flat_l2.assert_called_once_with(faiss_instance.embedding_model_dims)
-
-    # Test creating a collection with inner product distance
-    with patch("faiss.IndexFlatIP", return_value=mock_faiss_index) as mock_index_flat_ip:
-        with patch("faiss.write_index"):
-            faiss_instance.create_col(name="new_collection", distance="inner_product")
-            mock_index_flat_ip.assert_called_once_with(faiss_instance.embedding_model_dims)
-
-
-def test_insert(faiss_instance, mock_faiss_index):
-    # Prepare test data
-    vectors = [[0.1, 0.2, 0.3], [0.4, 0.5, 0.6]]
-    payloads = [{"name": "vector1"}, {"name": "vector2"}]
-    ids = ["id1", "id2"]
-
-    # Mock the numpy array conversion
-    with patch("numpy.array", return_value=np.array(vectors, dtype=np.float32)) as mock_np_array:
-        # Mock index.add
-        mock_faiss_index.add.return_value = None
-
-        # Call insert
-        faiss_instance.insert(vectors=vectors, payloads=payloads, ids=ids)
-
-        # Verify numpy.array was called
-        mock_np_array.assert_called_once_with(vectors, dtype=np.float32)
-
-        # Verify index.add was called
-        mock_faiss_index.add.assert_called_once()
-
-        # Verify docstore and index_to_id were updated
-        assert faiss_instance.docstore["id1"] == {"name": "vector1"}
-        assert faiss_instance.docstore["id2"] == {"name": "vector2"}
-        assert faiss_instance.index_to_id[0] == "id1"
-        assert faiss_instance.index_to_id[1] == "id2"
-
-
-def test_search(faiss_instance, mock_faiss_index):
-    # Prepare test data
-    query_vector = [0.1, 0.2, 0.3]
-
-    # Setup the docstore and index_to_id mapping
-    faiss_instance.docstore = {"id1": {"name": "vector1"}, "id2": {"name": "vector2"}}
-    faiss_instance.index_to_id = {0: "id1", 1: "id2"}
-
-    # First, create the mock for the search return values
-    search_scores = np.array([[0.9, 0.8]])
-    search_indices = np.array([[0, 1]])
-    mock_faiss_index.search.return_value = (search_scores, search_indices)
-
-    # Then patch numpy.array only for the query vector conversion
-    with patch("numpy.array") as mock_np_array:
-        mock_np_array.return_value = np.array(query_vector, dtype=np.float32)
-
-        # Then patch _parse_output to return the expected results
-        expected_results = [
-            OutputData(id="id1", score=0.9, payload={"name": "vector1"}),
-            OutputData(id="id2", score=0.8, payload={"name": "vector2"}),
-        ]
-
-        with patch.object(faiss_instance, "_parse_output", return_value=expected_results):
-            # Call search
-            results = faiss_instance.search(query="test query", vectors=query_vector, limit=2)
-
-            # Verify numpy.array was called (but we don't check exact call arguments since it's complex)
-            assert mock_np_array.called
-
-            # Verify index.search was called
-            mock_faiss_index.search.assert_called_once()
-
-            # Verify results
-            assert len(results) == 2
-            assert results[0].id == "id1"
-            assert results[0].score == 0.9
-            assert results[0].payload == {"name": "vector1"}
-            assert results[1].id == "id2"
-            assert results[1].score == 0.8
-            assert results[1].payload == {"name": "vector2"}
-
-
-def test_search_with_filters(faiss_instance, mock_faiss_index):
-    # Prepare test data
-    query_vector = [0.1, 0.2, 0.3]
-
-    # Setup the docstore and index_to_id mapping
-    faiss_instance.docstore = {"id1": {"name": "vector1", "category": "A"}, "id2": {"name": "vector2", "category": "B"}}
-    faiss_instance.index_to_id = {0: "id1", 1: "id2"}
-
-    # First set up the search return values
-    search_scores = np.array([[0.9, 0.8]])
-    search_indices = np.array([[0, 1]])
-    mock_faiss_index.search.return_value = (search_scores, search_indices)
-
-    # Patch numpy.array for query vector conversion
-    with patch("numpy.array") as mock_np_array:
-        mock_np_array.return_value = np.array(query_vector, dtype=np.float32)
-
-        # Directly mock the _parse_output method to return our expected values
-        # We're simulating that _parse_output filters to just the first result
-        all_results = [
-            OutputData(id="id1", score=0.9, payload={"name": "vector1", "category": "A"}),
-            OutputData(id="id2", score=0.8, payload={"name": "vector2", "category": "B"}),
-        ]
-
-        # Replace the _apply_filters method to handle our test case
-        with patch.object(faiss_instance, "_parse_output", return_value=all_results):
-            with patch.object(faiss_instance, "_apply_filters", side_effect=lambda p, f: p.get("category") == "A"):
-                # Call search with filters
-                results = faiss_instance.search(
-                    query="test query", vectors=query_vector, limit=2, filters={"category": "A"}
-                )
-
-                # Verify numpy.array was called
-                assert mock_np_array.called
-
-                # Verify index.search was called
-                mock_faiss_index.search.assert_called_once()
-
-                # Verify filtered results - since we've mocked everything,
-                # we should get just the result we want
-                assert len(results) == 1
-                assert results[0].id == "id1"
-                assert results[0].score == 0.9
-                assert results[0].payload == {"name": "vector1", "category": "A"}
-
-
-def test_delete(faiss_instance):
-    # Setup the docstore and index_to_id mapping
-    faiss_instance.docstore = {"id1": {"name": "vector1"}, "id2": {"name": "vector2"}}
-    faiss_instance.index_to_id = {0: "id1", 1: "id2"}
-
-    # Call delete
-    faiss_instance.delete(vector_id="id1")
-
-    # Verify the vector was removed from docstore and index_to_id
-    assert "id1" not in faiss_instance.docstore
-    assert 0 not in faiss_instance.index_to_id
-    assert "id2" in faiss_instance.docstore
-    assert 1 in faiss_instance.index_to_id
-
-
-def test_update(faiss_instance, mock_faiss_index):
-    # Setup the docstore and index_to_id mapping
-    faiss_instance.docstore = {"id1": {"name": "vector1"}, "id2": {"name": "vector2"}}
-    faiss_instance.index_to_id = {0: "id1", 1: "id2"}
-
-    # Test updating payload only
-    faiss_instance.update(vector_id="id1", payload={"name": "updated_vector1"})
-    assert faiss_instance.docstore["id1"] == {"name": "updated_vector1"}
-
-    # Test updating vector
-    # This requires mocking the delete and insert methods
-    with patch.object(faiss_instance, "delete") as mock_delete:
-        with patch.object(faiss_instance, "insert") as mock_insert:
-            new_vector = [0.7, 0.8, 0.9]
-            faiss_instance.update(vector_id="id2", vector=new_vector)
-
-            # Verify delete and insert were called
-            # Match the actual call signature (positional arg instead of keyword)
-            mock_delete.assert_called_once_with("id2")
-            mock_insert.assert_called_once()
-
-
-def test_get(faiss_instance):
-    # Setup the docstore
-    faiss_instance.docstore = {"id1": {"name": "vector1"}, "id2": {"name": "vector2"}}
-
-    # Test getting an existing vector
-    result = faiss_instance.get(vector_id="id1")
-    assert result.id == "id1"
-    assert result.payload == {"name": "vector1"}
-    assert result.score is None
-
-    # Test getting a non-existent vector
-    result = faiss_instance.get(vector_id="id3")
-    assert result is None
-
-
-def test_list(faiss_instance):
-    # Setup the docstore
-    faiss_instance.docstore = {
-        "id1": {"name": "vector1", "category": "A"},
-        "id2": {"name": "vector2", "category": "B"},
-        "id3": {"name": "vector3", "category": "A"},
-    }
-
-    # Test listing all vectors
-    results = faiss_instance.list()
-    # Fix the expected result - the list method returns a list of lists
-    assert len(results[0]) == 3
-
-    # Test listing with a limit
-    results = faiss_instance.list(limit=2)
-    assert len(results[0]) == 2
+DIMS = 8
 
-    # Test listing with filters
-    results = faiss_instance.list(filters={"category": "A"})
-    assert len(results[0]) == 2
-    for result in results[0]:
-        assert result.payload["category"] == "A"
 
+def _vectors(count, seed=0):
+    return np.random.default_rng(seed).normal(size=(count, DIMS)).astype(np.float32)
 
-def test_col_info(faiss_instance, mock_faiss_index):
-    # Mock index attributes
-    mock_faiss_index.ntotal = 5
-    mock_faiss_index.d = 128
 
-    # Get collection info
-    info = faiss_instance.col_info()
-
-    # Verify the returned info
-    assert info["name"] == "test_collection"
-    assert info["count"] == 5
-    assert info["dimension"] == 128
-    assert info["distance"] == "euclidean"
-
-
-def test_delete_col(faiss_instance):
-    # Mock the os.remove function
-    with patch("os.remove") as mock_remove:
-        with patch("os.path.exists", return_value=True):
-            # Call delete_col
-            faiss_instance.delete_col()
-
-            # Verify os.remove was called twice (for index and docstore files)
-            assert mock_remove.call_count == 2
-
-            # Verify the internal state was reset
-            assert faiss_instance.index is None
-            assert faiss_instance.docstore == {}
-            assert faiss_instance.index_to_id == {}
+def _payload(index):
+    return {
+        "data": f"memory {index}",
+        "user_id": f"user{index % 3}",
+        "memory_type": "episodic_memory" if index % 2 else None,
+        "rank": index,
+    }
 
 
-def test_normalize_L2(faiss_instance, mock_faiss_index):
-    # Setup a FAISS instance with normalize_L2=True
-    faiss_instance.normalize_L2 = True
+def _store(tmp_path, **kwargs):
+    return FAISS(collection_name="test", embedding_model_dims=DIMS, path=str(tmp_path), on_disk=True, **kwargs)
 
-    # Prepare test data
-    vectors = [[0.1, 0.2, 0.3]]
 
-    # Mock numpy array conversion
-    # Mock numpy array conversion
-    with patch("numpy.array", return_value=np.array(vectors, dtype=np.float32)):
-        # Mock faiss.normalize_L2
-        with patch("faiss.normalize_L2") as mock_normalize:
-            # Call insert
-            faiss_instance.insert(vectors=vectors, ids=["id1"])
+@pytest.fixture
+def store(tmp_path):
+    store = _store(tmp_path)
+    vectors = _vectors(60)
+    store.insert(vectors.tolist(), [_payload(i) for i in range(60)], [f"id{i}" for i in range(60)])
+    return store
+
+
+def test_search_filters_on_columns_and_payload(store):
+    query = _vectors(60)[4].tolist()
+
+    hits = store.search("query", query, limit=3, filters={"user_id": "user1"})
+    assert hits[0].id == "id4" and hits[0].score == pytest.approx(1.0)
+    assert all(hit.payload["user_id"] == "user1" for hit in hits)
+    assert [hit.score for hit in hits] == sorted((hit.score for hit in hits), reverse=True)
+
+    untyped = store.search("query", query, limit=50, filters={"memory_type": {"nin": ["episodic_memory"]}})
+    assert len(untyped) == 30 and all(hit.payload["memory_type"] is None for hit in untyped)
+    either = store.search("query", query, limit=50, filters={"user_id": {"in": ["user0", "user2", "nobody"]}})
+    assert {hit.payload["user_id"] for hit in either} == {"user0", "user2"}
+    ranged = store.search("query", query, limit=50, filters={"user_id": "user1", "rank": {"gte": 10, "lte": 20}})
+    assert sorted(hit.payload["rank"] for hit in ranged) == [10, 13, 16, 19]
+    assert store.search("query", query, filters={"user_id": "nobody"}) == []
+
+
+def test_graph_search_respects_the_filter_bitmap(tmp_path):
+    vectors = _vectors(500, seed=1)
+    payloads = [_payload(i) for i in range(500)]
+    exact = _store(tmp_path / "exact", index_type="flat")
+    graph = _store(tmp_path / "graph", exact_search_threshold=0)
+    for store in (exact, graph):
+        store.insert(vectors.tolist(), payloads, [f"id{i}" for i in range(500)])
+
+    filters = {"user_id": "user2", "memory_type": "episodic_memory"}
+    expected = [hit.id for hit in exact.search("query", vectors[7].tolist(), limit=5, filters=filters)]
+    found = graph.search("query", vectors[7].tolist(), limit=5, filters=filters)
+    assert [hit.id for hit in found] == expected
+    assert all(hit.payload["user_id"] == "user2" for hit in found)
+
+
+def test_updates_and_deletes(store):
+    vector = _vectors(1, seed=9)[0].tolist()
+
+    store.update("id1", vector=vector)
+    assert store.search("query", vector, limit=1)[0].id == "id1"
+    assert store.get("id1").payload["rank"] == 1
+    store.update("id1", payload={"user_id": "user9"})
+    assert store.search("query", vector, limit=1, filters={"user_id": "user9"})[0].id == "id1"
+    store.set_payloads({"id1": {"mentions": 2}, "missing": {"mentions": 1}})
+    assert store.get("id1").payload == {"user_id": "user9", "mentions": 2}
+    with pytest.raises(ValueError):
+        store.update("missing", payload={})
+
+    store.delete("id1")
+    store.delete_many(["id2", "id3"])
+    assert store.get("id1") is None and store.get_many(["id2", "id4"]) == [store.get("id4")]
+    store.delete_by_filter({"user_id": "user0"})
+    assert store.col_info()["points"] == 38
+    assert len(list(store.iter_all(page_size=7))) == 38
+    with pytest.raises(ValueError):
+        store.delete_by_filter({})
+
+
+def test_reopen_loads_the_snapshot_and_replays_the_log(tmp_path, store):
+    store.checkpoint()
+    store.insert(_vectors(1, seed=5).tolist(), [{"user_id": "user1"}], ["late"])
+    store.delete("id0")
+    assert os.path.getsize(tmp_path / "test" / WAL_FILE) > 0
+
+    reopened = _store(tmp_path)
+    assert reopened.col_info()["points"] == 60
+    assert reopened.get("id0") is None
+    assert reopened.search("query", _vectors(1, seed=5)[0].tolist(), limit=1)[0].id == "late"
+    assert reopened.get_many(["id5"], with_vectors=True)[0].vector == pytest.approx(
+        (_vectors(60)[5] / np.linalg.norm(_vectors(60)[5])).tolist(), abs=1e-6
+    )
+
+    reopened.close()
+    assert os.path.getsize(tmp_path / "test" / WAL_FILE) == 0
+    assert _store(tmp_path).col_info()["points"] == 60
+
+
+def test_partial_log_entry_is_dropped(tmp_path, store):
+    with open(tmp_path / "test" / WAL_FILE, "ab") as f:
+        f.write(b'{"op": "delete", "ids": ["id')
+
+    reopened = _store(tmp_path)
+    assert reopened.col_info()["points"] == 60
+    reopened.delete("id7")
+    assert _store(tmp_path).get("id7") is None
+
+
+def test_compaction_keeps_scroll_position(tmp_path):
+    store = _store(tmp_path, checkpoint_every=10**6)
+    store.insert(_vectors(20).tolist(), [{"rank": i} for i in range(20)], [f"id{i}" for i in range(20)])
+
+    first, offset = store.scroll(limit=10)
+    store.delete_many([f"id{i}" for i in range(10)])
+    store.checkpoint()
+    rest, end = store.scroll(limit=10, offset=offset)
+
+    assert store.col_info()["rows"] == 10
+    assert [point.payload["rank"] for point in first + rest] == list(range(20))
+    assert end is None
+
+
+@pytest.mark.asyncio
+async def test_async_store(tmp_path):
+    store = AsyncFAISS(collection_name="test", embedding_model_dims=DIMS, path=str(tmp_path), on_disk=True)
+    await store.insert(_vectors(3).tolist(), [_payload(i) for i in range(3)], ["a", "b", "c"])
+
+    hits = await store.search("query", _vectors(3)[1].tolist(), limit=1, filters={"user_id": "user1"})
+    points = [point async for point in store.iter_all(page_size=2)]
+
+    assert hits[0].id == "b"
+    assert [point.id for point in points] == ["a", "b", "c"]
+    await store.close()
+
+
+def test_memory_uses_the_faiss_provider(mocker, tmp_path):
+    mocker.patch("jmemory.memory.main.LlmLoader")
+    mocker.patch(
+        "jmemory.memory.main._create_embedder", return_value=MockEmbeddings(BaseEmbedderConfig(embedding_dims=10))
+    )
+    vector_store = VectorStoreConfig(
+        provider="faiss", collection_name="test", path=str(tmp_path), faiss=FAISSConfig(index_type="flat")
+    )
+    memory = Memory(MemoryConfig(vector_store=vector_store, graph_store=None))
+
+    added = memory.add("I like green tea", user_id="alice")["results"][0]
+    memory.add("I like coffee", user_id="bob")
+
+    assert isinstance(memory.vector_store, FAISS) and memory.vector_store.index_type == "flat"
+    assert [hit["id"] for hit in memory.search("tea", user_id="alice")["results"]] == [added["id"]]
+    memory.delete_all(user_id="alice")
+    assert memory.get_all(user_id="alice")["results"] == []
+    assert len(Memory(MemoryConfig(vector_store=vector_store, graph_store=None)).get_all(user_id="bob")["results"]) == 1
+
+
+def test_unknown_provider_is_rejected():
+    with pytest.raises(ValueError):
+        VectorStoreConfig(provider="chroma")
+
+
+@pytest.mark.asyncio
+async def test_async_memory_uses_the_faiss_provider(mocker, tmp_path):
+    mocker.patch("jmemory.memory.main.LlmLoader")
+    mocker.patch(
+        "jmemory.memory.main._create_embedder", return_value=MockEmbeddings(BaseEmbedderConfig(embedding_dims=10))
+    )
+    vector_store = VectorStoreConfig(provider="faiss", collection_name="test", path=str(tmp_path))
+    memory = AsyncMemory(MemoryConfig(vector_store=vector_store, graph_store=None))
 
-            # Verify faiss.normalize_L2 was called
-            mock_normalize.assert_called_once()
+    added = (await memory.add("I like green tea", user_id="alice"))["results"][0]
+
+    assert isinstance(memory.vector_store, AsyncFAISS)
+    assert (await memory.search("tea", user_id="alice"))["results"][0]["id"] == added["id"]
+    await memory.close()
@@ -1,11 +1,24 @@
 import unittest
 import uuid
-from unittest.mock import MagicMock
-
-from qdrant_client import QdrantClient
-from qdrant_client.models import Distance, PointIdsList, PointStruct, VectorParams
-
-from mem0.vector_stores.qdrant import Qdrant
+from unittest.mock import AsyncMock, MagicMock
+
+from qdrant_client import AsyncQdrantClient, QdrantClient
+from qdrant_client.models import (
+    Distance,
+    FieldCondition,
+    Filter,
+    FilterSelector,
+    MatchAny,
+    MatchValue,
+    PayloadSchemaType,
+    PointIdsList,
+    PointStruct,
+    SetPayload,
+    SetPayloadOperation,
+    VectorParams,
+)
+
+from jmemory.vector_stores.qdrant import AsyncQdrant, Qdrant, _client_params
 
 
 class TestQdrant(unittest.TestCase):
@@ -46,6 +59,47 @@ class TestQdrant(unittest.TestCase):
 
         self.assertEqual(points[0].payload, payloads[0])
 
+    def test_insert_is_chunked(self):
+        self.qdrant.batch_size = 2
+        self.qdrant.wait = False
+        vectors = [[float(i), 0.0] for i in range(5)]
+
+        self.qdrant.insert(vectors=vectors, ids=list(range(5)))
+
+        self.assertEqual(self.client_mock.upsert.call_count, 3)
+        sent = sorted(point.id for call in self.client_mock.upsert.call_args_list for point in call[1]["points"])
+        self.assertEqual(sent, [0, 1, 2, 3, 4])
+        self.assertTrue(all(call[1]["wait"] is False for call in self.client_mock.upsert.call_args_list))
+
+    def test_create_col_indexes_session_fields(self):
+        self.client_mock.get_collections.return_value = MagicMock(collections=[])
+        self.client_mock.create_payload_index.reset_mock()
+
+        self.qdrant.create_col(vector_size=128, on_disk=True)
+
+        indexed = {call[1]["field_name"] for call in self.client_mock.create_payload_index.call_args_list}
+        self.assertEqual(indexed, {"user_id", "agent_id", "run_id"})
+        for call in self.client_mock.create_payload_index.call_args_list:
+            self.assertEqual(call[1]["field_schema"], PayloadSchemaType.KEYWORD)
+
+    def test_create_col_only_adds_missing_indexes(self):
+        existing = MagicMock()
+        existing.name = "test_collection"
+        self.client_mock.get_collections.return_value = MagicMock(collections=[existing])
+        self.client_mock.get_collection.return_value = MagicMock(payload_schema={"user_id": MagicMock()})
+        self.client_mock.create_payload_index.reset_mock()
+        self.client_mock.create_collection.reset_mock()
+
+        self.qdrant.create_col(vector_size=128, on_disk=True)
+
+        self.client_mock.create_collection.assert_not_called()
+        indexed = {call[1]["field_name"] for call in self.client_mock.create_payload_index.call_args_list}
+        self.assertEqual(indexed, {"agent_id", "run_id"})
+
+    def test_prefer_grpc_only_for_servers(self):
+        self.assertTrue(_client_params("localhost", 6333, None, None, None, True, prefer_grpc=True)["prefer_grpc"])
+        self.assertNotIn("prefer_grpc", _client_params(None, None, "/tmp/qdrant", None, None, True, prefer_grpc=True))
+
     def test_search(self):
         vectors = [[0.1, 0.2]]
         mock_point = MagicMock(id=str(uuid.uuid4()), score=0.95, payload={"key": "value"})
@@ -73,6 +127,57 @@ class TestQdrant(unittest.TestCase):
             points_selector=PointIdsList(points=[vector_id]),
         )
 
+    def test_iter_all_follows_scroll_offsets(self):
+        self.client_mock.scroll.side_effect = [(["a", "b"], "next-page"), (["c"], None)]
+
+        result = list(self.qdrant.iter_all(filters={"user_id": "alice"}, page_size=2))
+
+        self.assertEqual(result, ["a", "b", "c"])
+        self.assertEqual(self.client_mock.scroll.call_count, 2)
+        self.assertEqual(self.client_mock.scroll.call_args_list[0][1]["offset"], None)
+        self.assertEqual(self.client_mock.scroll.call_args_list[1][1]["offset"], "next-page")
+
+    def test_delete_by_filter(self):
+        self.qdrant.delete_by_filter({"user_id": "alice"})
+
+        self.client_mock.delete.assert_called_once_with(
+            collection_name="test_collection",
+            points_selector=FilterSelector(
+                filter=Filter(must=[FieldCondition(key="user_id", match=MatchValue(value="alice"))])
+            ),
+        )
+
+    def test_delete_many_is_one_request(self):
+        self.qdrant.delete_many(["a", "b"])
+        self.qdrant.delete_many([])
+
+        self.client_mock.delete.assert_called_once_with(
+            collection_name="test_collection", points_selector=PointIdsList(points=["a", "b"])
+        )
+
+    def test_set_payloads_is_one_batch_request(self):
+        self.qdrant.set_payloads({"a": {"mentions": 2}, "b": {"mentions": 3}})
+
+        self.client_mock.batch_update_points.assert_called_once_with(
+            collection_name="test_collection",
+            update_operations=[
+                SetPayloadOperation(set_payload=SetPayload(payload={"mentions": 2}, points=["a"])),
+                SetPayloadOperation(set_payload=SetPayload(payload={"mentions": 3}, points=["b"])),
+            ],
+            wait=True,
+        )
+
+    def test_in_and_nin_filters(self):
+        query_filter = self.qdrant._create_filter({"user_id": {"in": ["a", "b"]}, "memory_type": {"nin": ["x"]}})
+
+        self.assertEqual(query_filter.must, [FieldCondition(key="user_id", match=MatchAny(any=["a", "b"]))])
+        self.assertEqual(query_filter.must_not, [FieldCondition(key="memory_type", match=MatchAny(any=["x"]))])
+
+    def test_delete_by_empty_filter_is_rejected(self):
+        with self.assertRaises(ValueError):
+            self.qdrant.delete_by_filter({})
+        self.client_mock.delete.assert_not_called()
+
     def test_update(self):
         vector_id = str(uuid.uuid4())
         updated_vector = [0.2, 0.3]
@@ -113,3 +218,28 @@ class TestQdrant(unittest.TestCase):
 
     def tearDown(self):
         del self.qdrant
+
+
+class TestAsyncQdrant(unittest.IsolatedAsyncioTestCase):
+    async def test_requests_match_the_sync_store(self):
+        sync_client = MagicMock(spec=QdrantClient)
+        async_client = AsyncMock(spec=AsyncQdrantClient)
+        async_client.get_collections.return_value = MagicMock(collections=[])
+        sync_client.get_collections.return_value = MagicMock(collections=[])
+        kwargs = {"collection_name": "test_collection", "embedding_model_dims": 2, "batch_size": 1}
+        qdrant = Qdrant(client=sync_client, **kwargs)
+        async_qdrant = AsyncQdrant(client=async_client, **kwargs)
+        filters = {"user_id": "alice", "memory_type": {"nin": ["x"]}}
+
+        qdrant.insert([[0.1, 0.2], [0.3, 0.4]], ids=[1, 2])
+        qdrant.search("", [0.1, 0.2], limit=3, filters=filters)
+        qdrant.delete_by_filter(filters)
+        await async_qdrant.insert([[0.1, 0.2], [0.3, 0.4]], ids=[1, 2])
+        await async_qdrant.search("", [0.1, 0.2], limit=3, filters=filters)
+        await async_qdrant.delete_by_filter(filters)
+
+        self.assertEqual(async_client.upsert.call_args_list, sync_client.upsert.call_args_list)
+        self.assertEqual(async_client.query_points.call_args, sync_client.query_points.call_args)
+        self.assertEqual(async_client.delete.call_args, sync_client.delete.call_args)
+        with self.assertRaises(ValueError):
+            await async_qdrant.delete_by_filter({})
@@ -3,11 +3,12 @@
 import os
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.responses import JSONResponse, StreamingResponse
+from starlette.background import BackgroundTask
 import litellm
 from pydantic import BaseModel
 from typing import List, Dict, Any, Optional
 
-from jmemory.memory.main import Memory
+from jmemory.memory.main import AsyncMemory
 from jmemory.configs.base import MemoryConfig
 
 # Initialize FastAPI app
@@ -17,7 +18,7 @@ app = FastAPI(
 )
 
 # Initialize jmemory
-jmemory = Memory(MemoryConfig())
+jmemory = AsyncMemory(MemoryConfig())
 
 # --- Pydantic Models for API ---
 
@@ -43,13 +44,13 @@ async def jmemory_preprocess(request_data: Dict[str, Any], user_id: str) -> Dict
     print("--- Jmemory Pre-processing ---")
     # For now, we'll just add a simple memory retrieval.
     # In a real implementation, this would involve more sophisticated memory retrieval and injection.
-    retrieved_memories = jmemory.search(query=request_data["messages"][-1]["content"], user_id=user_id)
-    if retrieved_memories:
-        memory_context = "\nRelevant memories:\n" + "\n".join([m["memory"] for m in retrieved_memories])
+    retrieved_memories = await jmemory.search(query=request_data["messages"][-1]["content"], user_id=user_id)
+    if retrieved_memories["results"]:
+        memory_context = "\nRelevant memories:\n" + "\n".join([m["memory"] for m in retrieved_memories["results"]])
         request_data["messages"].insert(0, {"role": "system", "content": memory_context})
     return request_data
 
-async def jmemory_postprocess(response: Any, user_id: str):
+async def jmemory_postprocess(last_user_message: str, ai_response: str, user_id: str):
     """
     Jmemory post-processing.
     Updates memory based on the conversation.
@@ -57,10 +58,7 @@ async def jmemory_postprocess(response: Any, user_id: str):
     print("--- Jmemory Post-processing ---")
     # For now, we'll just add the last user message and the AI's response to memory.
     # In a real implementation, this would involve more sophisticated fact extraction and memory updates.
-    last_user_message = response.request.messages[-1]["content"]
-    ai_response = response.choices[0].message.content
-    jmemory.add(messages=[{"role": "user", "content": last_user_message}, {"role": "assistant", "content": ai_response}], user_id=user_id)
-    return response
+    await jmemory.add(messages=[{"role": "user", "content": last_user_message}, {"role": "assistant", "content": ai_response}], user_id=user_id)
 
 # --- API Endpoint ---
 
@@ -78,29 +76,40 @@ async def chat_completions(request: ChatCompletionRequest):
         # 1. Jmemory Pre-processing
         enriched_data = await jmemory_preprocess(request_data, user_id)
 
+        last_user_message = request_data["messages"][-1]["content"]
+
         # 2. Route to LLM provider via LiteLLM
         if enriched_data.get("stream"):
-            # Handle streaming responses
+            # Handle streaming responses: chunks are forwarded as they arrive and only their text is
+            # accumulated; memory is updated once, after the stream has been fully sent.
+            streamed = {"parts": [], "done": False}
+
             async def stream_generator():
-                streaming_response = await litellm.acompletion(**enriched_data, stream=True)
+                streaming_response = await litellm.acompletion(**enriched_data)
                 async for chunk in streaming_response:
-            # 6. Jmemory Post-processing (can be done chunk-by-chunk or after completion)
-            # Note: Post-processing for streaming is more complex and might require accumulating chunks.
-            # For simplicity, this example processes each chunk, but a full implementation
-            # would likely process the complete streamed response.
-                    processed_chunk = await jmemory_postprocess(chunk, user_id)
-                    yield f"data: {processed_chunk.model_dump_json()}\n\n"
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        streamed["parts"].append(chunk.choices[0].delta.content)
+                    yield f"data: {chunk.model_dump_json()}\n\n"
                 yield "data: [DONE]\n\n"
-            
-            return StreamingResponse(stream_generator(), media_type="text/event-stream")
+                streamed["done"] = True
+
+            async def remember_stream():
+                # Skip streams the client abandoned before [DONE]
+                if streamed["done"]:
+                    # 6. Jmemory Post-processing
+                    await jmemory_postprocess(last_user_message, "".join(streamed["parts"]), user_id)
+
+            return StreamingResponse(
+                stream_generator(), media_type="text/event-stream", background=BackgroundTask(remember_stream)
+            )
         else:
             # Handle non-streaming responses
             response = await litellm.acompletion(**enriched_data)
             
             # 6. Jmemory Post-processing
-            final_response = await jmemory_postprocess(response, user_id)
+            await jmemory_postprocess(last_user_message, response.choices[0].message.content, user_id)
             
-            return JSONResponse(content=final_response.model_dump())
+            return JSONResponse(content=response.model_dump())
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))